@@ -367,7 +367,7 @@ export function NewApplication({ onRunStatusChange }: NewApplicationProps = {})
             <CardContent>
               <div className="border rounded-lg h-96 bg-gray-100 flex items-center justify-center">
                 {screencastFrame ? (
-                  <img src={`data:image/png;base64,${screencastFrame}`} alt="Browser view" className="max-w-full max-h-full" />
+                  <img src={screencastFrame} alt="Browser view" className="max-w-full max-h-full" />
                 ) : (
                   <div className="text-gray-500">
                     Browser view will appear here when the automation starts
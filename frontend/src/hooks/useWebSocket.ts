@@ -28,7 +28,8 @@ export interface RunStatus {
 
 export interface ScreencastFrame {
   run_id: number;
-  frame: string; // Base64 encoded image
+  frame: ArrayBuffer; // JPEG bytes, sent as a binary attachment
+  format: 'jpeg';
   timestamp: number;
 }
 
@@ -44,10 +45,12 @@ export function useWebSocket(runId?: number) {
   const [isConnected, setIsConnected] = useState(false);
   const [events, setEvents] = useState<RunEvent[]>([]);
   const [status, setStatus] = useState<RunStatus | null>(null);
+  // Object URL of the latest frame
   const [screencastFrame, setScreencastFrame] = useState<string | null>(null);
   const [consoleLogs, setConsoleLogs] = useState<ConsoleLog[]>([]);
   const [runError, setRunError] = useState<any>(null);
   const socketRef = useRef<Socket | null>(null);
+  const frameSocketRef = useRef<Socket | null>(null);
 
   useEffect(() => {
     console.log('🔌 Initializing WebSocket connection...');
@@ -83,17 +86,6 @@ export function useWebSocket(runId?: number) {
       setStatus(data);
     });
 
-    newSocket.on('screencast_frame', (data: ScreencastFrame) => {
-      console.log('🖼️ [VERBOSE] Received screencast frame, size:', data.frame?.length || 0);
-      console.log('🖼️ [VERBOSE] Screencast frame data:', {
-        run_id: data.run_id,
-        timestamp: data.timestamp,
-        frameLength: data.frame?.length || 0
-      });
-      setScreencastFrame(data.frame);
-      console.log('✅ [VERBOSE] Screencast frame state updated');
-    });
-
     newSocket.on('console_log', (data: ConsoleLog) => {
       console.log('💬 Received console log:', data);
       setConsoleLogs(prev => [...prev, data]);
@@ -112,11 +104,30 @@ export function useWebSocket(runId?: number) {
       setRunError(data);
     });
 
+    // Frames get their own connection so video never queues ahead of events
+    const frameSocket = io('http://localhost:8000/screencast', {
+      transports: ['websocket'],
+      timeout: 5000,
+      forceNew: true,
+    });
+
+    frameSocket.on('frame', (data: ScreencastFrame, ack?: () => void) => {
+      const url = URL.createObjectURL(new Blob([data.frame], { type: 'image/jpeg' }));
+      setScreencastFrame(prev => {
+        if (prev) URL.revokeObjectURL(prev);
+        return url;
+      });
+      // The server sends the next (latest) frame only after this ack
+      ack?.();
+    });
+
     socketRef.current = newSocket;
+    frameSocketRef.current = frameSocket;
     setSocket(newSocket);
 
     return () => {
       newSocket.close();
+      frameSocket.close();
     };
   }, []);
 
@@ -128,10 +139,18 @@ export function useWebSocket(runId?: number) {
       socket.emit('join_run', { run_id: runId });
       console.log(`✅ [VERBOSE] Join run request sent for run ${runId}`);
 
+      // Subscribe to frames (again after any reconnect of the frame socket)
+      const frameSocket = frameSocketRef.current;
+      const watch = () => frameSocket?.emit('watch', { run_id: runId });
+      frameSocket?.on('connect', watch);
+      if (frameSocket?.connected) watch();
+
       return () => {
         console.log(`🚪 [VERBOSE] Leaving run room: ${runId}`);
         // Leave the run room
         socket.emit('leave_run', { run_id: runId });
+        frameSocket?.off('connect', watch);
+        frameSocket?.emit('unwatch', { run_id: runId });
         console.log(`✅ [VERBOSE] Leave run request sent for run ${runId}`);
       };
     }
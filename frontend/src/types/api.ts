@@ -35,6 +35,8 @@ export interface UserProfile {
 export interface CreateRunRequest {
   initial_url: string;
   headless?: boolean;
+  force_rediscover?: boolean;
+  lean_browsing?: boolean;
 }
 
 export interface CreateRunEventRequest {
@@ -1,14 +1,15 @@
 """Runs API blueprint."""
 
-import asyncio
+import time
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
 from flask import Blueprint, jsonify, request
 from pydantic import ValidationError
 
-from ..database.repository import RunRepository, RunEventRepository, ArtifactRepository
-from ..models.entities import Run, RunEvent, RunResultStatus
+from ..database.repository import ArtifactRepository, JobPostingRepository, RunEventRepository, RunRepository
+from ..models.entities import EventCategory, EventLevel, Run, RunEvent, RunResultStatus
+from ..services.async_runtime import get_async_runtime
 from ..services.playwright_service import playwright_service
 from ..websocket.handlers import get_websocket_manager
 
@@ -67,6 +68,8 @@ def get_run_events(run_id: int):
     """Get events for a specific run."""
     try:
         limit = request.args.get("limit", 1000, type=int)
+        # Write out buffered events first so the history is up to date
+        get_async_runtime().run(playwright_service.events.flush(), timeout=10)
         events = RunEventRepository.get_by_run(run_id, limit=limit)
         
         events_data = []
@@ -103,6 +106,17 @@ def get_run_artifacts(run_id: int):
         return jsonify({"error": str(e)}), 500
 
 
+@runs_bp.route("/<int:run_id>/screencast", methods=["GET"])
+def get_run_screencast(run_id: int):
+    """Get screencast frame rate and bandwidth for an active run."""
+    stats = playwright_service.screencast_stats(run_id)
+    if stats is None:
+        return jsonify({"error": "Run not active"}), 404
+    # Per-socket delivery: frames sent and acked, and stale frames dropped for slow clients
+    stats["delivery"] = get_websocket_manager().frames.stats(run_id)
+    return jsonify(stats)
+
+
 @runs_bp.route("/", methods=["POST"])
 def create_run():
     """Create a new run."""
@@ -133,6 +147,30 @@ def create_run():
         if not ('.' in initial_url.split('://')[-1] if '://' in initial_url else '.' in initial_url):
             return jsonify({"error": "Invalid URL format"}), 400
         
+        # A previously resolved aggregator posting starts on its application form
+        # unless the caller forces rediscovery
+        start_url = initial_url
+        raw = data.get("raw")
+        if not data.get("force_rediscover"):
+            try:
+                posting = JobPostingRepository.get_resolved_by_aggregator_url(initial_url)
+            except Exception as e:
+                print(f"⚠️ [API] Aggregator resolution lookup failed: {e}")
+                posting = None
+            if posting:
+                start_url = posting.apply_url
+                raw = {
+                    **(raw or {}),
+                    "resolution": {
+                        "cached": True,
+                        "job_posting_id": posting.id,
+                        "official_identifier": posting.official_identifier,
+                        "apply_url": posting.apply_url,
+                        "resolved_at": posting.resolved_at.isoformat() if posting.resolved_at else None,
+                    },
+                }
+                print(f"📚 [API] Cached resolution for {initial_url}: starting at {start_url}")
+        
         # Create run object
         run_data = {
             "initial_url": initial_url,
@@ -140,73 +178,25 @@ def create_run():
             "application_id": data.get("application_id"),
             "result_status": data.get("result_status", RunResultStatus.IN_PROGRESS),
             "summary": data.get("summary"),
-            "raw": data.get("raw"),
+            "raw": raw,
         }
         
         run = Run(**run_data)
         created_run = RunRepository.create(run)
         
-        # Start Playwright automation
-        print(f"🎬 [API] Starting Playwright automation for run {created_run.id}...")
-        print(f"🔍 [API] Playwright service browser: {playwright_service.browser}")
-        print(f"🔍 [API] Playwright service playwright: {playwright_service.playwright}")
-        print(f"🔍 [API] Playwright service active_runs: {playwright_service.active_runs}")
-        try:
-            print(f"🔍 [API] About to call playwright_service.start_run...")
-            print(f"🔍 [API] Parameters: run_id={created_run.id}, url={created_run.initial_url}, headless={created_run.headless}")
-            print(f"🔍 [API] Starting asyncio.run() call at {datetime.now().isoformat()}")
-            
-            import time
-            start_time = time.time()
-            result = asyncio.run(playwright_service.start_run(
-                created_run.id, 
-                created_run.initial_url, 
-                created_run.headless
-            ))
-            end_time = time.time()
-            
-            print(f"✅ [API] Playwright automation started successfully in {end_time - start_time:.2f}s: {result}")
-            
-            # Emit WebSocket status update
-            print(f"📡 [API] Emitting WebSocket status update for run {created_run.id}...")
-            ws_manager = get_websocket_manager()
-            ws_manager.emit_run_status(created_run.id, {
-                'run_id': created_run.id,
-                'status': result.get('status', 'IN_PROGRESS'),
-                'message': result.get('message', 'Run started'),
-                'timestamp': datetime.now().isoformat()
-            })
-            print(f"✅ [API] WebSocket status update emitted")
-            
-        except Exception as e:
-            error_message = str(e)
-            print(f"❌ [VERBOSE] Error starting Playwright automation: {error_message}")
-            import traceback
-            print(f"❌ [VERBOSE] Playwright error traceback: {traceback.format_exc()}")
-            
-            # Update run status to failed
-            RunRepository.update_status(created_run.id, RunResultStatus.FAILED)
-            created_run.result_status = RunResultStatus.FAILED
-            
-            # Emit error via WebSocket
-            try:
-                ws_manager = get_websocket_manager()
-                ws_manager.emit_error(created_run.id, {
-                    'run_id': created_run.id,
-                    'error': error_message,
-                    'status': 'FAILED',
-                    'timestamp': datetime.now().isoformat()
-                })
-                print(f"✅ [VERBOSE] Error event emitted via WebSocket for run {created_run.id}")
-            except Exception as ws_error:
-                print(f"⚠️ [VERBOSE] Failed to emit error via WebSocket: {ws_error}")
-            
-            # Return error response
-            return jsonify({
-                "error": "Failed to start automation", 
-                "details": error_message,
-                "run_id": created_run.id
-            }), 500
+        # Start Playwright automation on the long-lived runtime loop; progress and
+        # failures reach the client over WebSocket, so the request returns at once
+        print(f"🎬 [API] Scheduling Playwright automation for run {created_run.id}...")
+        get_async_runtime().spawn(
+            _start_automation(
+                created_run.id,
+                start_url,
+                created_run.headless,
+                # A cached start URL is the application form, which always loads in full
+                lean_browsing=bool(data.get("lean_browsing")) and start_url == initial_url,
+            ),
+            description=f"start of run {created_run.id}",
+        )
         
         run_dict = created_run.dict()
         # Convert datetime objects to ISO format
@@ -217,14 +207,44 @@ def create_run():
         if run_dict.get("created_at"):
             run_dict["created_at"] = run_dict["created_at"].isoformat()
         
-        print(f"📤 [API] Returning successful response for run {created_run.id} at {datetime.now().isoformat()}")
-        return jsonify(run_dict), 201
+        print(f"📤 [API] Returning accepted run {created_run.id} at {datetime.now().isoformat()}")
+        return jsonify(run_dict), 202
     except ValidationError as e:
         return jsonify({"error": "Validation error", "details": e.errors()}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
+async def _start_automation(run_id: int, start_url: str, headless: bool, *, lean_browsing: bool = False):
+    """Start a run's browser session on the runtime loop and report the outcome over WebSocket."""
+    start_time = time.time()
+    try:
+        result = await playwright_service.start_run(run_id, start_url, headless, lean_browsing=lean_browsing)
+        print(f"✅ [API] Playwright automation started in {time.time() - start_time:.2f}s: {result}")
+        get_websocket_manager().emit_run_status(run_id, {
+            'run_id': run_id,
+            'status': result.get('status', 'IN_PROGRESS'),
+            'message': result.get('message', 'Run started'),
+            'timestamp': datetime.now().isoformat()
+        })
+    except Exception as e:
+        error_message = str(e)
+        print(f"❌ [VERBOSE] Error starting Playwright automation: {error_message}")
+        import traceback
+        print(f"❌ [VERBOSE] Playwright error traceback: {traceback.format_exc()}")
+        
+        RunRepository.update_status(run_id, RunResultStatus.FAILED)
+        try:
+            get_websocket_manager().emit_error(run_id, {
+                'run_id': run_id,
+                'error': error_message,
+                'status': 'FAILED',
+                'timestamp': datetime.now().isoformat()
+            })
+        except Exception as ws_error:
+            print(f"⚠️ [VERBOSE] Failed to emit error via WebSocket: {ws_error}")
+
+
 @runs_bp.route("/<int:run_id>/status", methods=["PUT"])
 def update_run_status(run_id: int):
     """Update run status."""
@@ -306,3 +326,68 @@ def get_error_summary():
         return jsonify({"error_summary": [{"code": code, "count": count} for code, count in error_summary]})
     except Exception as e:
         return jsonify({"error": str(e)}), 500
+
+
+@runs_bp.route("/event-sink", methods=["GET"])
+def get_event_sink_metrics():
+    """Queue depth, drops and flush latency of the batched run-event writer."""
+    return jsonify(playwright_service.events.metrics())
+
+
+@runs_bp.route("/<int:run_id>/llm-calls", methods=["POST"])
+def record_llm_calls(run_id: int):
+    """Store per-call LLM telemetry posted by a webbot run."""
+    try:
+        data = request.get_json()
+        if not data:
+            return jsonify({"error": "No data provided"}), 400
+        if not RunRepository.get_by_id(run_id):
+            return jsonify({"error": "Run not found"}), 404
+        
+        calls = data.get("calls") or []
+        RunEventRepository.create_many([
+            RunEvent(
+                run_id=run_id,
+                ts=datetime.fromtimestamp(call["ts"]) if call.get("ts") else None,
+                level=EventLevel.ERROR if call.get("outcome") == "error" else EventLevel.INFO,
+                category=EventCategory.LLM,
+                code="llm_call",
+                message=f"{call.get('stage')} {call.get('model')} {call.get('wall_ms')}ms",
+                data=call,
+            )
+            for call in calls
+        ])
+        if data.get("rollup"):
+            RunRepository.merge_raw(run_id, {"llm": data["rollup"]})
+        
+        return jsonify({"stored": len(calls)}), 201
+    except ValidationError as e:
+        return jsonify({"error": "Validation error", "details": e.errors()}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@runs_bp.route("/<int:run_id>/llm-usage", methods=["GET"])
+def get_run_llm_usage(run_id: int):
+    """Get LLM latency, token and cost rollups for a run, by stage and model."""
+    try:
+        rows = RunEventRepository.get_llm_rollup(run_id=run_id)
+        return jsonify({"run_id": run_id, "by_stage": rows, "total": _sum_llm_rows(rows)})
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@runs_bp.route("/llm-usage", methods=["GET"])
+def get_llm_usage():
+    """Get LLM rollups by stage and model across the most recent runs."""
+    try:
+        limit = request.args.get("limit", 100, type=int)
+        rows = RunEventRepository.get_llm_rollup(recent_runs=limit)
+        return jsonify({"runs": limit, "by_stage": rows, "total": _sum_llm_rows(rows)})
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+def _sum_llm_rows(rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+    keys = ("calls", "errors", "cache_hits", "wall_ms", "prompt_tokens", "cached_tokens", "completion_tokens", "cost_usd")
+    return {k: sum(float(r.get(k) or 0) for r in rows) for k in keys}
@@ -1,5 +1,6 @@
 """Main Flask application."""
 
+import atexit
 import os
 from contextlib import asynccontextmanager
 
@@ -11,6 +12,7 @@ from .api.runs import runs_bp
 from .api.users import users_bp
 from .api.console import console_bp
 from .websocket.handlers import init_websocket_manager
+from .services.async_runtime import get_async_runtime
 from .services.playwright_service import playwright_service
 
 
@@ -73,7 +75,12 @@ def create_app(test_config=None):
     @app.route("/health")
     def health_check():
         """Health check endpoint."""
-        return {"status": "healthy", "message": "WebBot backend is running"}
+        return {
+            "status": "healthy",
+            "message": "WebBot backend is running",
+            # Saturation shows up here first: utilization near 1.0 and growing waits
+            "db_pool": db_manager.stats(),
+        }
     
     # Test endpoint
     @app.route("/test")
@@ -90,7 +97,11 @@ def create_app(test_config=None):
             print(f"Failed to initialize database: {e}")
             raise
 
-    # Initialize Playwright service (lazy initialization)
+    # Playwright lives on one long-lived event loop; it is still initialized
+    # lazily, on that loop, by the first run
+    runtime = get_async_runtime()
+    runtime.start()
+    atexit.register(shutdown_runtime)
     print("Playwright service will be initialized on first use")
     
     # Note: We don't close the connection pool on each request teardown
@@ -107,6 +118,18 @@ def create_app(test_config=None):
     return app
 
 
+def shutdown_runtime():
+    """Close Playwright on the runtime loop, then stop the loop thread."""
+    runtime = get_async_runtime()
+    if not runtime.is_running:
+        return
+    try:
+        runtime.run(playwright_service.cleanup(), timeout=15)
+    except Exception as e:
+        print(f"⚠️ [VERBOSE] Playwright cleanup on shutdown failed: {e}")
+    runtime.stop()
+
+
 def create_test_app():
     """Create Flask app for testing."""
     return create_app({
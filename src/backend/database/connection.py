@@ -5,7 +5,9 @@ from contextlib import contextmanager
 from typing import Generator
 
 import psycopg2
-import psycopg2.pool
+import psycopg2.extras
+
+from .pool import ConnectionPool, PooledConnection, numbered_placeholders, statement_name
 
 
 class DatabaseManager:
@@ -21,7 +23,13 @@ class DatabaseManager:
         if not self.database_url:
             raise ValueError("DATABASE_URL environment variable is required")
         
-        self.pool: psycopg2.pool.SimpleConnectionPool | None = None
+        self.pool: ConnectionPool | None = None
+        self.min_connections = int(os.getenv("DB_POOL_MIN", "1"))
+        self.max_connections = int(os.getenv("DB_POOL_MAX", "10"))
+        self.checkout_timeout_s = float(os.getenv("DB_POOL_TIMEOUT_S", "10"))
+        self.idle_timeout_s = float(os.getenv("DB_POOL_IDLE_S", "300"))
+        # Default per-statement limit; queries can pass their own timeout_ms
+        self.statement_timeout_ms = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "15000"))
     
     def initialize(self) -> None:
         """Initialize the connection pool."""
@@ -32,10 +40,19 @@ class DatabaseManager:
         else:
             conn_str = self.database_url
         
-        self.pool = psycopg2.pool.SimpleConnectionPool(
-            minconn=1,
-            maxconn=10,
-            dsn=conn_str
+        def connect():
+            return psycopg2.connect(
+                conn_str,
+                connection_factory=PooledConnection,
+                options=f"-c statement_timeout={self.statement_timeout_ms}",
+            )
+        
+        self.pool = ConnectionPool(
+            connect,
+            min_size=self.min_connections,
+            max_size=self.max_connections,
+            timeout_s=self.checkout_timeout_s,
+            idle_timeout_s=self.idle_timeout_s,
         )
     
     def close(self) -> None:
@@ -52,38 +69,88 @@ class DatabaseManager:
         conn = self.pool.getconn()
         try:
             yield conn
+        except Exception:
+            # A failed statement may have aborted the transaction, and with it a
+            # PREPARE; start the connection's statement cache over
+            try:
+                conn.rollback()
+                if getattr(conn, "prepared", None):
+                    with conn.cursor() as cur:
+                        cur.execute("DEALLOCATE ALL")
+                    conn.commit()
+                    conn.prepared.clear()
+            except Exception:
+                pass
+            raise
         finally:
             self.pool.putconn(conn)
     
-    def execute_query(self, query: str, params: tuple | None = None) -> None:
-        """Execute a query without returning results."""
+    def stats(self) -> dict:
+        """Pool size, utilization and checkout wait times."""
+        return self.pool.stats() if self.pool else {}
+    
+    def _execute(self, cur, query: str, params: tuple | None, prepare: bool, timeout_ms: int | None) -> None:
+        """Run a query, optionally as a server-side prepared statement and with its own timeout."""
+        if timeout_ms is not None:
+            cur.execute("SET LOCAL statement_timeout = %s", (int(timeout_ms),))
+        prepared = getattr(cur.connection, "prepared", None)
+        if not prepare or prepared is None:
+            cur.execute(query, params)
+            return
+        name = statement_name(query)
+        if name not in prepared:
+            cur.execute(f"PREPARE {name} AS {numbered_placeholders(query)}")
+            prepared.add(name)
+        placeholders = ", ".join(["%s"] * len(params or ()))
+        cur.execute(f"EXECUTE {name} ({placeholders})" if placeholders else f"EXECUTE {name}", params)
+    
+    def execute_query(self, query: str, params: tuple | None = None, *,
+                      prepare: bool = False, timeout_ms: int | None = None) -> None:
+        """Execute a query without returning results.
+        
+        ``prepare`` reuses a server-side prepared statement for fixed queries;
+        ``timeout_ms`` overrides the default statement timeout for this query.
+        """
         with self.get_connection() as conn:
             with conn.cursor() as cur:
-                cur.execute(query, params)
+                self._execute(cur, query, params, prepare, timeout_ms)
                 conn.commit()
     
-    def fetch_one(self, query: str, params: tuple | None = None) -> dict | None:
+    def fetch_one(self, query: str, params: tuple | None = None, *,
+                  prepare: bool = False, timeout_ms: int | None = None) -> dict | None:
         """Fetch a single row."""
         with self.get_connection() as conn:
             with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
-                cur.execute(query, params)
+                self._execute(cur, query, params, prepare, timeout_ms)
                 result = cur.fetchone()
                 # Commit if this is an INSERT/UPDATE/DELETE query
                 if query.strip().upper().startswith(('INSERT', 'UPDATE', 'DELETE')):
                     conn.commit()
                 return dict(result) if result else None
     
-    def fetch_all(self, query: str, params: tuple | None = None) -> list[dict]:
+    def fetch_all(self, query: str, params: tuple | None = None, *,
+                  prepare: bool = False, timeout_ms: int | None = None) -> list[dict]:
         """Fetch all rows."""
         with self.get_connection() as conn:
             with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
-                cur.execute(query, params)
+                self._execute(cur, query, params, prepare, timeout_ms)
                 results = cur.fetchall()
                 # Commit if this is an INSERT/UPDATE/DELETE query
                 if query.strip().upper().startswith(('INSERT', 'UPDATE', 'DELETE')):
                     conn.commit()
                 return [dict(result) for result in results]
 
+    
+    def execute_values(self, query: str, rows: list[tuple], page_size: int = 500, *,
+                       timeout_ms: int | None = None) -> None:
+        """Insert many rows with multi-row VALUES statements (``VALUES %s`` in the query)."""
+        with self.get_connection() as conn:
+            with conn.cursor() as cur:
+                if timeout_ms is not None:
+                    cur.execute("SET LOCAL statement_timeout = %s", (int(timeout_ms),))
+                psycopg2.extras.execute_values(cur, query, rows, page_size=page_size)
+                conn.commit()
+
 
 # Global database manager instance
 db_manager = DatabaseManager()
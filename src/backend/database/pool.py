@@ -0,0 +1,237 @@
+"""Thread-safe, instrumented psycopg2 connection pool."""
+
+import hashlib
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+import psycopg2
+import psycopg2.extensions
+import psycopg2.pool
+
+logger = logging.getLogger(__name__)
+
+
+class PoolTimeout(psycopg2.pool.PoolError):
+    """No connection became free within the checkout timeout."""
+
+
+class PooledConnection(psycopg2.extensions.connection):
+    """psycopg2 connection that remembers its server-side prepared statements."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prepared: set[str] = set()
+
+
+def statement_name(query: str) -> str:
+    """Stable server-side name for a fixed query."""
+    return "stmt_" + hashlib.sha1(query.encode()).hexdigest()[:16]
+
+
+def numbered_placeholders(query: str) -> str:
+    """Rewrite psycopg2 ``%s`` placeholders as PREPARE-style ``$1, $2, ...``."""
+    parts = query.split("%s")
+    out = [parts[0]]
+    for i, part in enumerate(parts[1:], start=1):
+        out.append(f"${i}{part}")
+    return "".join(out)
+
+
+def ping(conn) -> bool:
+    """Round-trip check used to validate connections that sat idle."""
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SELECT 1")
+        conn.rollback()
+        return True
+    except Exception:
+        return False
+
+
+def reset(conn) -> bool:
+    """End any transaction a borrower left open; False if the connection is unusable."""
+    if conn.closed:
+        return False
+    try:
+        if conn.get_transaction_status() != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+            conn.rollback()
+        return True
+    except Exception:
+        return False
+
+
+class ConnectionPool:
+    """Connection pool that is safe to share between threads.
+
+    Unlike ``SimpleConnectionPool`` it can be used from Flask, Socket.IO and
+    event-loop worker threads at once. It opens connections on demand up to
+    ``max_size``, and when all are busy ``getconn`` waits up to ``timeout_s``
+    instead of failing. Connections idle for longer than ``validate_idle_s`` are
+    pinged on checkout. Idle connections above ``min_size`` are closed after
+    ``idle_timeout_s``. ``stats()`` reports wait times and utilization.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], Any],
+        *,
+        min_size: int = 1,
+        max_size: int = 10,
+        timeout_s: float = 10.0,
+        idle_timeout_s: float = 300.0,
+        validate_idle_s: float = 30.0,
+        validate: Callable[[Any], bool] = ping,
+        reset: Callable[[Any], bool] = reset,
+    ):
+        self.connect = connect
+        self.max_size = max(1, max_size)
+        self.min_size = max(0, min(min_size, self.max_size))
+        self.timeout_s = timeout_s
+        self.idle_timeout_s = idle_timeout_s
+        self.validate_idle_s = validate_idle_s
+        self.validate = validate
+        self.reset = reset
+        self._idle: List[Tuple[Any, float]] = []  # (connection, returned_at), most recent last
+        self._in_use: set[int] = set()
+        self._size = 0  # open connections plus ones being opened
+        self._closed = False
+        self._cond = threading.Condition()
+        self._peak_in_use = 0
+        self.counters = {
+            "checkouts": 0, "waits": 0, "timeouts": 0, "created": 0, "closed": 0, "validation_failures": 0,
+        }
+        self._wait_ms_total = 0.0
+        self._wait_ms_max = 0.0
+        for _ in range(self.min_size):
+            conn = self._open()
+            with self._cond:
+                self._size += 1
+                self._idle.append((conn, time.monotonic()))
+
+    def getconn(self):
+        """Borrow a connection, waiting up to ``timeout_s`` for one to be returned."""
+        started = time.monotonic()
+        deadline = started + self.timeout_s
+        waited = False
+        while True:
+            with self._cond:
+                if self._closed:
+                    raise psycopg2.pool.PoolError("connection pool is closed")
+                conn = None
+                if self._idle:
+                    conn, returned_at = self._idle.pop()
+                    self._mark_in_use(conn)
+                elif self._size < self.max_size:
+                    self._size += 1  # reserve the slot; connect outside the lock
+                else:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.counters["timeouts"] += 1
+                        raise PoolTimeout(
+                            f"no database connection free after {self.timeout_s}s "
+                            f"({self.max_size} in use)"
+                        )
+                    if not waited:
+                        waited = True
+                        self.counters["waits"] += 1
+                    self._cond.wait(remaining)
+                    continue
+            if conn is None:
+                try:
+                    conn = self._open()
+                except Exception:
+                    with self._cond:
+                        self._size -= 1
+                        self._cond.notify()
+                    raise
+                with self._cond:
+                    self._mark_in_use(conn)
+            elif conn.closed or (time.monotonic() - returned_at > self.validate_idle_s and not self.validate(conn)):
+                with self._cond:
+                    self.counters["validation_failures"] += 1
+                self._discard(conn)
+                continue
+            self._record_wait((time.monotonic() - started) * 1000)
+            return conn
+
+    def putconn(self, conn) -> None:
+        """Return a borrowed connection; broken ones are closed rather than reused."""
+        usable = self.reset(conn)
+        with self._cond:
+            self._in_use.discard(id(conn))
+            if usable and not self._closed:
+                self._idle.append((conn, time.monotonic()))
+                expired = self._expire_idle()
+            else:
+                expired = []
+            self._cond.notify()
+        if not usable or self._closed:
+            self._discard(conn)
+        for stale in expired:
+            self._discard(stale)
+
+    def closeall(self) -> None:
+        with self._cond:
+            self._closed = True
+            idle = [conn for conn, _ in self._idle]
+            self._idle.clear()
+            self._cond.notify_all()
+        for conn in idle:
+            self._discard(conn)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            in_use = len(self._in_use)
+            checkouts = self.counters["checkouts"]
+            return {
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": in_use,
+                "peak_in_use": self._peak_in_use,
+                "max_size": self.max_size,
+                "utilization": round(in_use / self.max_size, 2),
+                **self.counters,
+                "avg_wait_ms": round(self._wait_ms_total / checkouts, 2) if checkouts else 0.0,
+                "max_wait_ms": round(self._wait_ms_max, 2),
+            }
+
+    def _open(self):
+        conn = self.connect()
+        with self._cond:
+            self.counters["created"] += 1
+        return conn
+
+    def _mark_in_use(self, conn) -> None:
+        self._in_use.add(id(conn))
+        self._peak_in_use = max(self._peak_in_use, len(self._in_use))
+
+    def _record_wait(self, wait_ms: float) -> None:
+        with self._cond:
+            self.counters["checkouts"] += 1
+            self._wait_ms_total += wait_ms
+            self._wait_ms_max = max(self._wait_ms_max, wait_ms)
+
+    def _expire_idle(self) -> List[Any]:
+        """Pop connections idle past ``idle_timeout_s`` beyond ``min_size`` (oldest first)."""
+        now = time.monotonic()
+        expired = []
+        while (
+            self._idle
+            and self._size - len(expired) > self.min_size
+            and now - self._idle[0][1] > self.idle_timeout_s
+        ):
+            expired.append(self._idle.pop(0)[0])
+        return expired
+
+    def _discard(self, conn) -> None:
+        with self._cond:
+            self._in_use.discard(id(conn))
+            self._size -= 1
+            self.counters["closed"] += 1
+            self._cond.notify()
+        try:
+            conn.close()
+        except Exception:
+            pass
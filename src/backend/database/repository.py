@@ -22,6 +22,17 @@ from ..models.entities import (
 from .connection import db_manager
 
 
+def _strip_nul(value: Any) -> Any:
+    """Remove NUL characters from strings, recursing into dicts and lists."""
+    if isinstance(value, str):
+        return value.replace("\x00", "")
+    if isinstance(value, dict):
+        return {_strip_nul(k): _strip_nul(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_strip_nul(v) for v in value]
+    return value
+
+
 class CompanyRepository:
     """Repository for company operations."""
     
@@ -29,12 +40,20 @@ class CompanyRepository:
     def create(company: Company) -> Company:
         """Create a new company."""
         query = """
-            INSERT INTO companies (name, normalized_domain, website_url)
-            VALUES (%s, %s, %s)
-            RETURNING id, name, normalized_domain, website_url, created_at, updated_at
+            INSERT INTO companies (name, normalized_domain, website_url, aliases, confidence, verified_at)
+            VALUES (%s, %s, %s, %s, %s, %s)
+            RETURNING id, name, normalized_domain, website_url, aliases, confidence, verified_at, created_at, updated_at
         """
         result = db_manager.fetch_one(
-            query, (company.name, company.normalized_domain, company.website_url)
+            query,
+            (
+                company.name,
+                company.normalized_domain,
+                company.website_url,
+                company.aliases,
+                company.confidence,
+                company.verified_at,
+            ),
         )
         return Company(**result)
     
@@ -42,7 +61,7 @@ class CompanyRepository:
     def get_by_domain(normalized_domain: str) -> Optional[Company]:
         """Get company by normalized domain."""
         query = """
-            SELECT id, name, normalized_domain, website_url, created_at, updated_at
+            SELECT id, name, normalized_domain, website_url, aliases, confidence, verified_at, created_at, updated_at
             FROM companies
             WHERE normalized_domain = %s
         """
@@ -53,13 +72,52 @@ class CompanyRepository:
     def get_by_id(company_id: int) -> Optional[Company]:
         """Get company by ID."""
         query = """
-            SELECT id, name, normalized_domain, website_url, created_at, updated_at
+            SELECT id, name, normalized_domain, website_url, aliases, confidence, verified_at, created_at, updated_at
             FROM companies
             WHERE id = %s
         """
         result = db_manager.fetch_one(query, (company_id,))
         return Company(**result) if result else None
 
+    @staticmethod
+    def get_by_alias(alias: str) -> Optional[Company]:
+        """Get the most confident company whose aliases include a normalized name."""
+        query = """
+            SELECT id, name, normalized_domain, website_url, aliases, confidence, verified_at, created_at, updated_at
+            FROM companies
+            WHERE aliases @> ARRAY[%s]::TEXT[]
+            ORDER BY confidence DESC, verified_at DESC NULLS LAST
+            LIMIT 1
+        """
+        result = db_manager.fetch_one(query, (alias,))
+        return Company(**result) if result else None
+    
+    @staticmethod
+    def upsert_resolution(company: Company) -> Company:
+        """Insert or refresh a company-to-domain resolution, merging aliases."""
+        query = """
+            INSERT INTO companies (name, normalized_domain, website_url, aliases, confidence, verified_at)
+            VALUES (%s, %s, %s, %s, %s, COALESCE(%s, NOW()))
+            ON CONFLICT (normalized_domain) DO UPDATE SET
+                website_url = COALESCE(EXCLUDED.website_url, companies.website_url),
+                aliases = ARRAY(SELECT DISTINCT unnest(companies.aliases || EXCLUDED.aliases)),
+                confidence = EXCLUDED.confidence,
+                verified_at = EXCLUDED.verified_at
+            RETURNING id, name, normalized_domain, website_url, aliases, confidence, verified_at, created_at, updated_at
+        """
+        result = db_manager.fetch_one(
+            query,
+            (
+                company.name,
+                company.normalized_domain,
+                company.website_url,
+                company.aliases,
+                company.confidence,
+                company.verified_at,
+            ),
+        )
+        return Company(**result)
+
 
 class JobPostingRepository:
     """Repository for job posting operations."""
@@ -70,7 +128,7 @@ class JobPostingRepository:
         query = """
             INSERT INTO job_postings (company_id, title, official_identifier, work_mode, compensation, raw_extracted, source_aggregator_url)
             VALUES (%s, %s, %s, %s, %s, %s, %s)
-            RETURNING id, company_id, title, official_identifier, work_mode, compensation, raw_extracted, source_aggregator_url, created_at, updated_at
+            RETURNING id, company_id, title, official_identifier, work_mode, compensation, raw_extracted, source_aggregator_url, apply_url, resolution, resolved_at, created_at, updated_at
         """
         result = db_manager.fetch_one(
             query,
@@ -90,7 +148,7 @@ class JobPostingRepository:
     def get_by_identifier(official_identifier: str) -> Optional[JobPosting]:
         """Get job posting by official identifier."""
         query = """
-            SELECT id, company_id, title, official_identifier, work_mode, compensation, raw_extracted, source_aggregator_url, created_at, updated_at
+            SELECT id, company_id, title, official_identifier, work_mode, compensation, raw_extracted, source_aggregator_url, apply_url, resolution, resolved_at, created_at, updated_at
             FROM job_postings
             WHERE official_identifier = %s
         """
@@ -101,12 +159,26 @@ class JobPostingRepository:
     def get_by_id(job_id: int) -> Optional[JobPosting]:
         """Get job posting by ID."""
         query = """
-            SELECT id, company_id, title, official_identifier, work_mode, compensation, raw_extracted, source_aggregator_url, created_at, updated_at
+            SELECT id, company_id, title, official_identifier, work_mode, compensation, raw_extracted, source_aggregator_url, apply_url, resolution, resolved_at, created_at, updated_at
             FROM job_postings
             WHERE id = %s
         """
         result = db_manager.fetch_one(query, (job_id,))
         return JobPosting(**result) if result else None
+    
+    @staticmethod
+    def get_resolved_by_aggregator_url(source_aggregator_url: str) -> Optional[JobPosting]:
+        """Get the most recently resolved posting for an aggregator URL (ignores trailing slash and fragment)."""
+        query = """
+            SELECT id, company_id, title, official_identifier, work_mode, compensation, raw_extracted, source_aggregator_url, apply_url, resolution, resolved_at, created_at, updated_at
+            FROM job_postings
+            WHERE source_aggregator_url = %s AND apply_url IS NOT NULL
+            ORDER BY resolved_at DESC NULLS LAST
+            LIMIT 1
+        """
+        key = source_aggregator_url.strip().split("#", 1)[0].rstrip("/")
+        result = db_manager.fetch_one(query, (key,), prepare=True)
+        return JobPosting(**result) if result else None
 
 
 class UserProfileRepository:
@@ -244,7 +316,7 @@ class RunRepository:
             FROM runs
             WHERE id = %s
         """
-        result = db_manager.fetch_one(query, (run_id,))
+        result = db_manager.fetch_one(query, (run_id,), prepare=True)
         return Run(**result) if result else None
     
     @staticmethod
@@ -255,7 +327,17 @@ class RunRepository:
             SET result_status = %s, summary = %s, ended_at = %s
             WHERE id = %s
         """
-        db_manager.execute_query(query, (result_status, summary, ended_at or datetime.now(), run_id))
+        db_manager.execute_query(query, (result_status, summary, ended_at or datetime.now(), run_id), prepare=True)
+    
+    @staticmethod
+    def merge_raw(run_id: int, patch: Dict[str, Any]) -> None:
+        """Merge top-level keys into the run's raw JSON."""
+        query = """
+            UPDATE runs
+            SET raw = COALESCE(raw, '{}'::jsonb) || %s::jsonb
+            WHERE id = %s
+        """
+        db_manager.execute_query(query, (json.dumps(patch), run_id), prepare=True)
     
     @staticmethod
     def get_recent_runs(limit: int = 50) -> List[Run]:
@@ -266,7 +348,7 @@ class RunRepository:
             ORDER BY started_at DESC
             LIMIT %s
         """
-        results = db_manager.fetch_all(query, (limit,))
+        results = db_manager.fetch_all(query, (limit,), prepare=True)
         return [Run(**result) for result in results]
 
 
@@ -295,7 +377,7 @@ class ArtifactRepository:
             WHERE run_id = %s
             ORDER BY created_at
         """
-        results = db_manager.fetch_all(query, (run_id,))
+        results = db_manager.fetch_all(query, (run_id,), prepare=True)
         return [Artifact(**result) for result in results]
 
 
@@ -321,9 +403,35 @@ class RunEventRepository:
                 event.message,
                 json.dumps(event.data) if event.data else None,
             ),
+            prepare=True,
         )
         return RunEvent(**result)
     
+    @staticmethod
+    def create_many(events: List[RunEvent]) -> int:
+        """Insert a batch of run events in one round trip per page; returns the row count."""
+        if not events:
+            return 0
+        query = """
+            INSERT INTO run_events (run_id, ts, level, category, code, message, data)
+            VALUES %s
+        """
+        # Page console text can carry NULs, which Postgres rejects in text and jsonb
+        rows = [
+            (
+                event.run_id,
+                event.ts or datetime.now(),
+                event.level,
+                event.category,
+                _strip_nul(event.code),
+                _strip_nul(event.message),
+                json.dumps(_strip_nul(event.data)) if event.data else None,
+            )
+            for event in events
+        ]
+        db_manager.execute_values(query, rows)
+        return len(rows)
+    
     @staticmethod
     def get_by_run(run_id: int, limit: int = 1000) -> List[RunEvent]:
         """Get events for a run."""
@@ -334,7 +442,7 @@ class RunEventRepository:
             ORDER BY ts DESC
             LIMIT %s
         """
-        results = db_manager.fetch_all(query, (run_id, limit))
+        results = db_manager.fetch_all(query, (run_id, limit), prepare=True)
         return [RunEvent(**result) for result in results]
     
     @staticmethod
@@ -348,6 +456,38 @@ class RunEventRepository:
             ORDER BY count DESC
             LIMIT 20
         """
-        results = db_manager.fetch_all(query)
+        results = db_manager.fetch_all(query, prepare=True)
         return [(row['code'], row['count']) for row in results]
 
+    
+    @staticmethod
+    def get_llm_rollup(run_id: Optional[int] = None, recent_runs: int = 100) -> List[Dict[str, Any]]:
+        """Aggregate llm_call events by stage and model, for one run or the most recent runs."""
+        if run_id is not None:
+            scope, params = "run_id = %s", (run_id,)
+        else:
+            scope = "run_id IN (SELECT id FROM runs ORDER BY started_at DESC LIMIT %s)"
+            params = (recent_runs,)
+        query = f"""
+            SELECT
+                COALESCE(data->>'stage', 'unscoped') AS stage,
+                data->>'model' AS model,
+                COUNT(*) AS calls,
+                COUNT(DISTINCT run_id) AS runs,
+                SUM(CASE WHEN data->>'outcome' = 'error' THEN 1 ELSE 0 END) AS errors,
+                SUM(CASE WHEN data->>'outcome' = 'cache_hit' THEN 1 ELSE 0 END) AS cache_hits,
+                SUM((data->>'wall_ms')::float) AS wall_ms,
+                AVG((data->>'wall_ms')::float) AS avg_wall_ms,
+                percentile_cont(0.95) WITHIN GROUP (ORDER BY (data->>'wall_ms')::float) AS p95_wall_ms,
+                AVG((data->>'ttft_ms')::float) AS avg_ttft_ms,
+                SUM((data->>'prompt_tokens')::bigint) AS prompt_tokens,
+                SUM((data->>'cached_tokens')::bigint) AS cached_tokens,
+                SUM((data->>'completion_tokens')::bigint) AS completion_tokens,
+                SUM(COALESCE((data->>'cost_usd')::float, 0)) AS cost_usd
+            FROM run_events
+            WHERE category = 'LLM' AND code = 'llm_call' AND {scope}
+            GROUP BY 1, 2
+            ORDER BY cost_usd DESC, wall_ms DESC
+        """
+        # Aggregates across runs; allow longer than the default statement timeout
+        return db_manager.fetch_all(query, params, timeout_ms=60_000)
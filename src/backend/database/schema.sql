@@ -9,10 +9,24 @@ CREATE TABLE companies (
     name TEXT NOT NULL,
     normalized_domain TEXT UNIQUE NOT NULL,
     website_url TEXT,
+    aliases TEXT[] NOT NULL DEFAULT '{}', -- normalized company names that resolve to this domain
+    confidence REAL NOT NULL DEFAULT 0,
+    verified_at TIMESTAMPTZ,
     created_at TIMESTAMPTZ DEFAULT NOW(),
     updated_at TIMESTAMPTZ DEFAULT NOW()
 );
 
+-- Stage 2 careers-page discovery per official domain; found = FALSE caches a negative result
+CREATE TABLE company_careers (
+    normalized_domain TEXT PRIMARY KEY,
+    found BOOLEAN NOT NULL,
+    careers_url TEXT,
+    ats_provider TEXT, -- greenhouse | lever | ashby | workday | ...
+    ats_tenant TEXT,
+    email_instructions TEXT,
+    checked_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
 -- Job postings table
 CREATE TABLE job_postings (
     id BIGSERIAL PRIMARY KEY,
@@ -23,6 +37,9 @@ CREATE TABLE job_postings (
     compensation JSONB,
     raw_extracted JSONB,
     source_aggregator_url TEXT,
+    apply_url TEXT, -- application form the aggregator posting resolved to
+    resolution JSONB, -- official domain and per-finder picks from discovery
+    resolved_at TIMESTAMPTZ,
     created_at TIMESTAMPTZ DEFAULT NOW(),
     updated_at TIMESTAMPTZ DEFAULT NOW()
 );
@@ -89,8 +106,10 @@ CREATE TABLE run_events (
 
 -- Indexes for performance
 CREATE INDEX idx_companies_normalized_domain ON companies(normalized_domain);
+CREATE INDEX idx_companies_aliases ON companies USING GIN (aliases);
 CREATE INDEX idx_job_postings_company_id ON job_postings(company_id);
 CREATE INDEX idx_job_postings_official_identifier ON job_postings(official_identifier);
+CREATE INDEX idx_job_postings_source_aggregator_url ON job_postings(source_aggregator_url);
 CREATE INDEX idx_applications_user_profile_id ON applications(user_profile_id);
 CREATE INDEX idx_applications_job_posting_id ON applications(job_posting_id);
 CREATE INDEX idx_applications_status ON applications(status);
@@ -1,7 +1,7 @@
 """Pydantic models for database entities."""
 
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 from pydantic import BaseModel, Field
 
@@ -13,6 +13,9 @@ class Company(BaseModel):
     name: str = Field(..., description="Company display name")
     normalized_domain: str = Field(..., description="Normalized domain (e.g., acme.com)")
     website_url: Optional[str] = Field(None, description="Company website URL")
+    aliases: List[str] = Field(default_factory=list, description="Normalized company names resolving to this domain")
+    confidence: float = Field(0.0, description="Confidence that normalized_domain is the official site (0-1)")
+    verified_at: Optional[datetime] = Field(None, description="When the domain was last confirmed")
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
 
@@ -28,6 +31,9 @@ class JobPosting(BaseModel):
     compensation: Optional[Dict[str, Any]] = Field(None, description="Compensation details")
     raw_extracted: Optional[Dict[str, Any]] = Field(None, description="Raw extracted data from aggregator")
     source_aggregator_url: Optional[str] = Field(None, description="Original aggregator URL")
+    apply_url: Optional[str] = Field(None, description="Application form the aggregator URL resolved to")
+    resolution: Optional[Dict[str, Any]] = Field(None, description="Discovery details (official domain, finder picks)")
+    resolved_at: Optional[datetime] = Field(None, description="When apply_url was last confirmed")
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
 
@@ -0,0 +1,110 @@
+"""Process-wide asyncio event loop running in a background thread."""
+
+import asyncio
+import concurrent.futures
+import logging
+import threading
+from typing import Any, Coroutine, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncRuntime:
+    """One long-lived event loop on a daemon thread.
+
+    Playwright objects are bound to the loop that created them, so every
+    coroutine touching the browser is submitted here from Flask and Socket.IO
+    handler threads instead of being run on a throwaway ``asyncio.run`` loop.
+    """
+
+    def __init__(self, name: str = "backend-async-runtime"):
+        self.name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        return self.start()
+
+    def start(self) -> asyncio.AbstractEventLoop:
+        """Start the loop thread if needed; safe to call from any thread."""
+        with self._lock:
+            if self.is_running and self._loop is not None:
+                return self._loop
+            loop = asyncio.new_event_loop()
+            ready = threading.Event()
+
+            def run():
+                asyncio.set_event_loop(loop)
+                loop.call_soon(ready.set)
+                loop.run_forever()
+                loop.close()
+
+            self._thread = threading.Thread(target=run, name=self.name, daemon=True)
+            self._thread.start()
+            ready.wait()
+            self._loop = loop
+            print(f"🧵 [VERBOSE] Async runtime started on thread {self.name}")
+            return loop
+
+    def submit(self, coro: Coroutine[Any, Any, Any]) -> concurrent.futures.Future:
+        """Schedule a coroutine on the runtime loop and return its future."""
+        loop = self.start()
+        if threading.current_thread() is self._thread:
+            raise RuntimeError("submit() called from the runtime thread; await the coroutine instead")
+        return asyncio.run_coroutine_threadsafe(coro, loop)
+
+    def run(self, coro: Coroutine[Any, Any, Any], timeout: Optional[float] = None) -> Any:
+        """Run a coroutine on the runtime loop and block the calling thread for its result."""
+        return self.submit(coro).result(timeout)
+
+    def spawn(self, coro: Coroutine[Any, Any, Any], description: str = "task") -> concurrent.futures.Future:
+        """Fire-and-forget: schedule a coroutine and log (rather than raise) its failure."""
+        future = self.submit(coro)
+
+        def log_failure(f: concurrent.futures.Future):
+            if f.cancelled():
+                return
+            error = f.exception()
+            if error is not None:
+                print(f"❌ [VERBOSE] Background {description} failed: {error}")
+                logger.error(f"Background {description} failed: {error}")
+
+        future.add_done_callback(log_failure)
+        return future
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Cancel outstanding tasks, stop the loop and join the thread."""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            if loop is None or thread is None or not thread.is_alive():
+                return
+
+            async def cancel_pending():
+                tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+            try:
+                asyncio.run_coroutine_threadsafe(cancel_pending(), loop).result(timeout)
+            except Exception as e:
+                logger.warning(f"Error cancelling runtime tasks: {e}")
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout)
+            self._loop = None
+            self._thread = None
+
+
+# Global runtime instance
+async_runtime = AsyncRuntime()
+
+
+def get_async_runtime() -> AsyncRuntime:
+    """Get the global async runtime."""
+    return async_runtime
@@ -0,0 +1,292 @@
+"""Pool of warm Playwright browser contexts leased to runs."""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+from urllib.parse import urlsplit
+
+from playwright.async_api import Browser, BrowserContext, Page
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PooledContext:
+    """A browser context and its page, leased to at most one run at a time."""
+
+    context: BrowserContext
+    page: Page
+    created_at: float = field(default_factory=time.time)
+    uses: int = 0
+    run_id: Optional[int] = None
+    crashed: bool = False
+    one_shot: bool = False  # created with per-run options (e.g. video); never reused
+    origins: Set[str] = field(default_factory=set)  # origins requested since the last reset
+    _listeners: List[Tuple[Any, str, Callable]] = field(default_factory=list)
+
+    def on(self, target: Any, event: str, handler: Callable) -> None:
+        """Register a run-scoped listener on the context or page; removed on release."""
+        target.on(event, handler)
+        self._listeners.append((target, event, handler))
+
+    def remove_listeners(self) -> None:
+        for target, event, handler in self._listeners:
+            try:
+                target.remove_listener(event, handler)
+            except Exception:
+                pass
+        self._listeners.clear()
+
+
+class BrowserContextPool:
+    """Bounded pool of browser contexts with warm spares, per-run leasing and health checks.
+
+    At most ``max_contexts`` contexts are leased at once; further ``acquire`` calls
+    queue until a run releases its lease. Released contexts get their cookies
+    cleared, the storage of every origin they requested (localStorage, IndexedDB,
+    service workers, caches) wiped and a fresh page, and go back to the idle list
+    until they have served ``max_uses`` runs. A context whose storage cannot be
+    wiped is closed instead. Idle contexts whose page no longer responds are evicted.
+    """
+
+    def __init__(
+        self,
+        browser: Browser,
+        *,
+        max_contexts: int = 4,
+        warm_contexts: int = 1,
+        max_uses: int = 20,
+        context_options: Optional[Dict[str, Any]] = None,
+        health_timeout_s: float = 5.0,
+    ):
+        self.browser = browser
+        self.max_contexts = max(1, max_contexts)
+        self.warm_contexts = max(0, min(warm_contexts, self.max_contexts))
+        self.max_uses = max(1, max_uses)
+        self.context_options = context_options or {}
+        self.health_timeout_s = health_timeout_s
+        self._idle: List[PooledContext] = []
+        self._leased: Dict[int, PooledContext] = {}
+        self._slots = asyncio.Semaphore(self.max_contexts)
+        self._waiting = 0
+        self._acquiring = 0  # slots taken by acquire() calls not yet in _leased
+        self._fill_lock = asyncio.Lock()
+        self._closed = False
+        self._health_task: Optional[asyncio.Task] = None
+        self.counters = {"created": 0, "reused": 0, "closed": 0, "evicted": 0, "queued": 0}
+
+    async def start(self, health_interval_s: float = 0.0) -> None:
+        """Pre-create the warm contexts and optionally start periodic health checks."""
+        await self.fill_warm()
+        if health_interval_s > 0 and self._health_task is None:
+            self._health_task = asyncio.create_task(self._health_loop(health_interval_s))
+
+    @property
+    def exhausted(self) -> bool:
+        return self._slots.locked()
+
+    def lease_for(self, run_id: int) -> Optional[PooledContext]:
+        return self._leased.get(run_id)
+
+    async def acquire(self, run_id: int, *, context_options: Optional[Dict[str, Any]] = None) -> PooledContext:
+        """Lease a context to ``run_id``, waiting for a free slot when the pool is exhausted.
+
+        ``context_options`` that differ from the pool's (such as ``record_video_dir``)
+        get a dedicated context that is closed on release.
+        """
+        if self._closed:
+            raise RuntimeError("Browser context pool is closed")
+        if run_id in self._leased:
+            raise ValueError(f"Run {run_id} already holds a browser context")
+        if self.exhausted:
+            self.counters["queued"] += 1
+            logger.info(f"Browser context pool exhausted; run {run_id} is queued")
+        self._waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self._waiting -= 1
+        self._acquiring += 1
+        try:
+            entry = None
+            if not context_options:
+                while self._idle and entry is None:
+                    candidate = self._idle.pop()
+                    if await self._is_healthy(candidate):
+                        entry = candidate
+                        self.counters["reused"] += 1
+                    else:
+                        self.counters["evicted"] += 1
+                        await self._discard(candidate)
+            if entry is None:
+                entry = await self._create(context_options)
+        except BaseException:
+            self._slots.release()
+            raise
+        finally:
+            self._acquiring -= 1
+        entry.uses += 1
+        entry.run_id = run_id
+        self._leased[run_id] = entry
+        return entry
+
+    async def release(self, run_id: int) -> None:
+        """Return a run's context to the pool (or close it when it cannot be reused)."""
+        entry = self._leased.pop(run_id, None)
+        if entry is None:
+            return
+        try:
+            entry.remove_listeners()
+            entry.run_id = None
+            reusable = not (entry.one_shot or entry.crashed or self._closed or entry.uses >= self.max_uses)
+            if reusable and await self._reset(entry):
+                self._idle.append(entry)
+            else:
+                await self._discard(entry)
+        finally:
+            self._slots.release()
+        if not self._closed:
+            await self.fill_warm()
+
+    async def fill_warm(self) -> None:
+        """Create idle contexts until ``warm_contexts`` are ready (within ``max_contexts``).
+
+        Serialized, so overlapping releases cannot both create the last spare.
+        """
+        async with self._fill_lock:
+            while (
+                not self._closed
+                and len(self._idle) < self.warm_contexts
+                and len(self._idle) + len(self._leased) + self._acquiring < self.max_contexts
+            ):
+                try:
+                    entry = await self._create(None)
+                except Exception as e:
+                    logger.warning(f"Failed to pre-create browser context: {e}")
+                    return
+                if self._closed:
+                    await self._discard(entry)
+                    return
+                self._idle.append(entry)
+
+    async def health_check(self) -> int:
+        """Evict idle contexts that crashed or stopped responding; returns how many were evicted."""
+        evicted = 0
+        for entry in list(self._idle):
+            if entry not in self._idle:
+                continue  # leased while an earlier check was awaiting
+            self._idle.remove(entry)  # so acquire() cannot lease it mid-check
+            if await self._is_healthy(entry):
+                self._idle.append(entry)
+            else:
+                await self._discard(entry)
+                evicted += 1
+        self.counters["evicted"] += evicted
+        if evicted:
+            await self.fill_warm()
+        return evicted
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_contexts": self.max_contexts,
+            "idle": len(self._idle),
+            "leased": len(self._leased),
+            "waiting": self._waiting,
+            "runs": sorted(self._leased),
+            **self.counters,
+        }
+
+    async def close(self) -> None:
+        self._closed = True
+        if self._health_task is not None:
+            self._health_task.cancel()
+            self._health_task = None
+        for entry in self._idle + list(self._leased.values()):
+            entry.remove_listeners()
+            await self._discard(entry)
+        self._idle.clear()
+        self._leased.clear()
+
+    async def _create(self, context_options: Optional[Dict[str, Any]]) -> PooledContext:
+        options = {**self.context_options, **(context_options or {})}
+        context = await self.browser.new_context(**options)
+        page = await context.new_page()
+        entry = PooledContext(context=context, page=page, one_shot=bool(context_options))
+        self._watch(entry)
+        self.counters["created"] += 1
+        return entry
+
+    def _watch(self, entry: PooledContext, *, page_only: bool = False) -> None:
+        def mark_crashed(*_):
+            entry.crashed = True
+
+        def track_origin(request):
+            parts = urlsplit(request.url)
+            if parts.scheme in ("http", "https") and parts.netloc:
+                entry.origins.add(f"{parts.scheme}://{parts.netloc}")
+
+        if not page_only:
+            entry.context.on("close", mark_crashed)
+            entry.context.on("request", track_origin)  # every page and frame of the context
+        entry.page.on("crash", mark_crashed)
+
+    async def _is_healthy(self, entry: PooledContext) -> bool:
+        if entry.crashed or entry.page.is_closed():
+            return False
+        try:
+            await asyncio.wait_for(entry.page.evaluate("1"), timeout=self.health_timeout_s)
+            return True
+        except Exception:
+            return False
+
+    async def _reset(self, entry: PooledContext) -> bool:
+        """Clear run state: cookies, permissions, origin storage and pages (a fresh page drops old handlers)."""
+        try:
+            await entry.context.clear_cookies()
+            await entry.context.clear_permissions()
+            if entry.origins:
+                await self._clear_origin_storage(entry)
+            for page in list(entry.context.pages):
+                await page.close()
+            entry.page = await entry.context.new_page()
+            self._watch(entry, page_only=True)
+            return True
+        except Exception as e:
+            logger.warning(f"Failed to reset browser context: {e}")
+            return False
+
+    async def _clear_origin_storage(self, entry: PooledContext) -> None:
+        """Wipe localStorage, IndexedDB, service workers and caches of the origins the run requested.
+
+        sessionStorage goes with the pages closed afterwards. Uses CDP, so on
+        non-Chromium browsers this raises and the context is discarded instead.
+        """
+        session = await entry.context.new_cdp_session(entry.page)
+        try:
+            for origin in sorted(entry.origins):
+                await session.send("Storage.clearDataForOrigin", {"origin": origin, "storageTypes": "all"})
+        finally:
+            try:
+                await session.detach()
+            except Exception:
+                pass
+        entry.origins.clear()
+
+    async def _discard(self, entry: PooledContext) -> None:
+        self.counters["closed"] += 1
+        try:
+            await entry.context.close()
+        except Exception:
+            pass
+
+    async def _health_loop(self, interval_s: float) -> None:
+        while not self._closed:
+            await asyncio.sleep(interval_s)
+            try:
+                evicted = await self.health_check()
+                if evicted:
+                    logger.info(f"Evicted {evicted} unhealthy browser context(s)")
+            except Exception as e:
+                logger.warning(f"Browser context health check failed: {e}")
@@ -0,0 +1,197 @@
+"""Buffered, batched writer for run events."""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, Tuple, Type
+
+import psycopg2
+
+from ..database.pool import PoolTimeout
+from ..models.entities import EventLevel, RunEvent
+
+logger = logging.getLogger(__name__)
+
+# Shed first when the buffer is full
+LOW_PRIORITY_LEVELS = frozenset({EventLevel.TRACE, EventLevel.DEBUG})
+# The database is unreachable: keep the batch and retry on the next flush.
+# Any other error is about the rows themselves.
+RETRYABLE_ERRORS: Tuple[Type[BaseException], ...] = (psycopg2.OperationalError, PoolTimeout)
+
+
+class RunEventSink:
+    """Buffers run events in memory and writes them in batches.
+
+    ``add`` never touches the database: events are queued and written by a
+    background task when ``max_batch`` are waiting or every ``flush_interval_s``,
+    with the blocking write running in a worker thread. The buffer holds at most
+    ``max_buffered`` events; when full, an incoming TRACE/DEBUG event is dropped,
+    and anything more important evicts the oldest buffered event instead.
+    ``flush()`` returns once everything queued before it has been written.
+    A batch that fails on connection errors is requeued; any other failure is
+    bisected so only the offending events are dropped.
+    """
+
+    def __init__(
+        self,
+        write: Callable[[List[RunEvent]], int],
+        *,
+        max_batch: int = 200,
+        flush_interval_s: float = 0.25,
+        max_buffered: int = 5000,
+        retryable: Tuple[Type[BaseException], ...] = RETRYABLE_ERRORS,
+    ):
+        self.write = write
+        self.retryable = retryable
+        self.max_batch = max(1, max_batch)
+        self.flush_interval_s = flush_interval_s
+        self.max_buffered = max(self.max_batch, max_buffered)
+        self._buffer: Deque[RunEvent] = deque()
+        self._lock = threading.Lock()  # add() is also called from Socket.IO threads
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+        self.counters = {
+            "enqueued": 0, "written": 0, "dropped": 0, "rejected": 0, "batches": 0, "failed_batches": 0,
+        }
+        self._max_depth = 0
+        self._flush_ms: Deque[float] = deque(maxlen=100)
+
+    @classmethod
+    def from_env(cls, write: Callable[[List[RunEvent]], int]) -> "RunEventSink":
+        return cls(
+            write,
+            max_batch=int(os.environ.get("EVENT_SINK_MAX_BATCH", "200")),
+            flush_interval_s=float(os.environ.get("EVENT_SINK_FLUSH_INTERVAL_S", "0.25")),
+            max_buffered=int(os.environ.get("EVENT_SINK_MAX_BUFFERED", "5000")),
+        )
+
+    def start(self) -> None:
+        """Start the flush task on the running loop (idempotent)."""
+        if self._task is not None and not self._task.done():
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task = self._loop.create_task(self._run())
+
+    def add(self, event: RunEvent) -> bool:
+        """Queue an event; returns False if the overflow policy dropped it."""
+        with self._lock:
+            accepted = True
+            if len(self._buffer) >= self.max_buffered:
+                self.counters["dropped"] += 1
+                if event.level in LOW_PRIORITY_LEVELS:
+                    accepted = False
+                else:
+                    self._buffer.popleft()
+            if accepted:
+                self._buffer.append(event)
+                self.counters["enqueued"] += 1
+                self._max_depth = max(self._max_depth, len(self._buffer))
+            full = len(self._buffer) >= self.max_batch
+        if full and self._loop is not None and self._wake is not None:
+            try:
+                self._loop.call_soon_threadsafe(self._wake.set)
+            except RuntimeError:
+                pass  # loop already closed
+        return accepted
+
+    async def flush(self) -> int:
+        """Write everything buffered so far; returns how many events were written."""
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        written = 0
+        async with self._flush_lock:
+            while True:
+                with self._lock:
+                    batch = [self._buffer.popleft() for _ in range(min(self.max_batch, len(self._buffer)))]
+                if not batch:
+                    return written
+                ok, count = await self._write_batch(batch)
+                written += count
+                if not ok:
+                    return written
+
+    async def close(self) -> None:
+        """Stop the flush task and write what is left."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    def metrics(self) -> Dict[str, float]:
+        with self._lock:
+            depth = len(self._buffer)
+        flush_ms = list(self._flush_ms)
+        return {
+            "queue_depth": depth,
+            "max_queue_depth": self._max_depth,
+            **self.counters,
+            "last_flush_ms": round(flush_ms[-1], 1) if flush_ms else 0.0,
+            "avg_flush_ms": round(sum(flush_ms) / len(flush_ms), 1) if flush_ms else 0.0,
+            "max_flush_ms": round(max(flush_ms), 1) if flush_ms else 0.0,
+        }
+
+    async def _write_batch(self, batch: List[RunEvent]) -> Tuple[bool, int]:
+        """Write a batch; returns (database reachable, events written)."""
+        progress = [0, 0]  # events handled (written or rejected), events written
+        try:
+            await self._write_rows(batch, progress)
+        except self.retryable as e:
+            self.counters["failed_batches"] += 1
+            logger.error(f"Failed to write {len(batch) - progress[0]} run events: {e}")
+            # Put the unwritten events back for the next flush, within the buffer bound
+            remaining = batch[progress[0]:]
+            with self._lock:
+                room = self.max_buffered - len(self._buffer)
+                keep = remaining[-room:] if room > 0 else []
+                self.counters["dropped"] += len(remaining) - len(keep)
+                self._buffer.extendleft(reversed(keep))
+            return False, progress[1]
+        return True, progress[1]
+
+    async def _write_rows(self, batch: List[RunEvent], progress: List[int]) -> None:
+        """Write ``batch``, bisecting on row-level errors so only rejected events are lost."""
+        started = time.perf_counter()
+        try:
+            await asyncio.to_thread(self.write, batch)
+        except self.retryable:
+            raise
+        except Exception as e:
+            self.counters["failed_batches"] += 1
+            if len(batch) == 1:
+                self.counters["rejected"] += 1
+                self.counters["dropped"] += 1
+                progress[0] += 1
+                logger.error(f"Dropped run event the database rejected: {e}")
+                return
+            mid = len(batch) // 2
+            await self._write_rows(batch[:mid], progress)
+            await self._write_rows(batch[mid:], progress)
+            return
+        self._flush_ms.append((time.perf_counter() - started) * 1000)
+        self.counters["written"] += len(batch)
+        self.counters["batches"] += 1
+        progress[0] += len(batch)
+        progress[1] += len(batch)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.flush_interval_s)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Run event flush failed: {e}")
@@ -4,10 +4,15 @@ import asyncio
 import base64
 import json
 import logging
+import os
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set
 
-from playwright.async_api import async_playwright, Browser, BrowserContext, Page
+from playwright.async_api import async_playwright, Browser
+from ...webbot.browser import LeanBrowsingPolicy
+from .context_pool import BrowserContextPool
+from .event_sink import RunEventSink
+from .screencast import RunScreencast
 
 from ..database.repository import RunRepository, RunEventRepository
 from ..models.entities import RunEvent, EventLevel, EventCategory
@@ -20,10 +25,22 @@ class PlaywrightService:
 
     def __init__(self):
         self.browser: Optional[Browser] = None
-        self.context: Optional[BrowserContext] = None
-        self.page: Optional[Page] = None
+        self.pool: Optional[BrowserContextPool] = None
         self.playwright = None
         self.active_runs: Dict[int, Dict[str, Any]] = {}
+        self._init_lock = asyncio.Lock()
+        # Socket.IO sids watching each run; the screencast only runs while non-empty
+        self.screencast_viewers: Dict[int, Set[str]] = {}
+        self.screenshot_quality = int(os.environ.get("SCREENCAST_QUALITY", "60"))
+        # Console, network and control events are written to the database in batches
+        self.events = RunEventSink.from_env(RunEventRepository.create_many)
+        # Concurrent runs each lease their own context from the pool
+        self.max_contexts = int(os.environ.get("PLAYWRIGHT_MAX_CONTEXTS", "4"))
+        self.warm_contexts = int(os.environ.get("PLAYWRIGHT_WARM_CONTEXTS", "1"))
+        self.context_max_uses = int(os.environ.get("PLAYWRIGHT_CONTEXT_MAX_USES", "20"))
+        self.health_interval_s = float(os.environ.get("PLAYWRIGHT_HEALTH_INTERVAL_S", "30"))
+        # Video needs a dedicated context per run, so it is opt-in
+        self.record_video = os.environ.get("PLAYWRIGHT_RECORD_VIDEO", "").lower() in ("1", "true", "yes")
 
     async def initialize(self):
         """Initialize Playwright browser."""
@@ -38,6 +55,16 @@ class PlaywrightService:
                 args=['--no-sandbox', '--disable-setuid-sandbox']
             )
             print(f"✅ [VERBOSE] Chromium browser launched successfully")
+            
+            self.pool = BrowserContextPool(
+                self.browser,
+                max_contexts=self.max_contexts,
+                warm_contexts=self.warm_contexts,
+                max_uses=self.context_max_uses,
+                context_options={'viewport': {'width': 1280, 'height': 720}},
+            )
+            await self.pool.start(health_interval_s=self.health_interval_s)
+            print(f"✅ [VERBOSE] Context pool ready: {self.pool.stats()}")
             logger.info("Playwright browser initialized")
         except Exception as e:
             print(f"❌ [VERBOSE] Failed to initialize Playwright: {e}")
@@ -56,13 +83,10 @@ class PlaywrightService:
             from ..models.entities import RunResultStatus
             RunRepository.update_status(run_id, RunResultStatus.TERMINATED, f"Terminated by user: {reason}")
             
-            # Cancel screenshot task and remove from active runs
+            # Stop streaming and remove from active runs
             if run_id in self.active_runs:
-                run_info = self.active_runs[run_id]
-                if 'screenshot_task' in run_info:
-                    run_info['screenshot_task'].cancel()
-                    print(f"🛑 [VERBOSE] Cancelled screenshot task for run {run_id}")
-                del self.active_runs[run_id]
+                run_info = self.active_runs.pop(run_id)
+                asyncio.create_task(self._release_context(run_id, run_info))
                 print(f"🗑️ [VERBOSE] Removed run {run_id} from active runs")
             
             # Emit WebSocket event
@@ -80,8 +104,7 @@ class PlaywrightService:
                 print(f"⚠️ [VERBOSE] Failed to emit termination event via WebSocket: {ws_error}")
             
             # Log the event
-            asyncio.create_task(self._log_event(run_id, EventLevel.INFO, EventCategory.SYSTEM, 
-                                              f"Run terminated by user: {reason}"))
+            asyncio.create_task(self._log_run_end(run_id, EventLevel.INFO, f"Run terminated by user: {reason}"))
             
         except Exception as e:
             print(f"❌ [VERBOSE] Error handling browser close: {e}")
@@ -91,10 +114,9 @@ class PlaywrightService:
     async def cleanup(self):
         """Cleanup Playwright resources."""
         try:
-            if self.page:
-                await self.page.close()
-            if self.context:
-                await self.context.close()
+            await self.events.close()
+            if self.pool:
+                await self.pool.close()
             if self.browser:
                 await self.browser.close()
             if self.playwright:
@@ -103,91 +125,96 @@ class PlaywrightService:
         except Exception as e:
             logger.error(f"Error during Playwright cleanup: {e}")
 
-    async def start_run(self, run_id: int, initial_url: str, headless: bool = False) -> Dict[str, Any]:
-        """Start a new automation run."""
+    async def start_run(
+        self, run_id: int, initial_url: str, headless: bool = False, lean_browsing: bool = False
+    ) -> Dict[str, Any]:
+        """Start a new automation run.
+
+        With ``lean_browsing`` the run starts in discovery mode (no images, fonts,
+        media or trackers) until ``set_browsing_mode(run_id, "full")``.
+        """
+        lean_policy = None
         try:
             print(f"🚀 [VERBOSE] Starting Playwright automation for run {run_id}")
             print(f"🌐 [VERBOSE] URL: {initial_url}")
             print(f"👁️ [VERBOSE] Headless: {headless}")
             print(f"🔍 [VERBOSE] Current active runs: {list(self.active_runs.keys())}")
             
-            # Initialize Playwright if not already done
-            if not self.browser:
-                print(f"🔧 [VERBOSE] Initializing Playwright for run {run_id}...")
-                await self.initialize()
-                print(f"✅ [VERBOSE] Playwright initialized successfully")
-            else:
-                print(f"✅ [VERBOSE] Playwright already initialized")
-            
-            # Create browser context for this run
-            print(f"🔧 [VERBOSE] Creating browser context for run {run_id}...")
-            self.context = await self.browser.new_context(
-                viewport={'width': 1280, 'height': 720},
-                record_video_dir='./videos' if not headless else None
-            )
-            print(f"✅ [VERBOSE] Browser context created successfully")
+            # Initialize Playwright if not already done; runs start concurrently on
+            # the runtime loop, so only the first one launches the browser
+            async with self._init_lock:
+                if not self.browser:
+                    print(f"🔧 [VERBOSE] Initializing Playwright for run {run_id}...")
+                    await self.initialize()
+                    print(f"✅ [VERBOSE] Playwright initialized successfully")
+                else:
+                    print(f"✅ [VERBOSE] Playwright already initialized")
+            
+            # Lease a browser context for this run (queues while the pool is exhausted)
+            if self.pool.exhausted:
+                print(f"⏳ [VERBOSE] Context pool exhausted, run {run_id} is queued: {self.pool.stats()}")
+                await self._log_event(run_id, EventLevel.INFO, EventCategory.SYSTEM,
+                                    "Waiting for a free browser context", data=self.pool.stats())
+            video_options = {'record_video_dir': './videos'} if self.record_video and not headless else None
+            lease = await self.pool.acquire(run_id, context_options=video_options)
+            context, page = lease.context, lease.page
+            print(f"✅ [VERBOSE] Leased browser context for run {run_id}: {self.pool.stats()}")
             
             # Add context close detection
-            def on_context_close():
+            def on_context_close(*_):
                 print(f"🔍 [VERBOSE] Browser context closed for run {run_id}")
                 self._handle_browser_close(run_id, "Browser context closed")
             
-            self.context.on("close", on_context_close)
+            lease.on(context, "close", on_context_close)
             
-            # Create new page
-            print(f"📄 [VERBOSE] Creating new page for run {run_id}...")
-            self.page = await self.context.new_page()
-            print(f"✅ [VERBOSE] New page created successfully")
+            if lean_browsing:
+                lean_policy = LeanBrowsingPolicy.from_settings(
+                    on_navigation=lambda data: self._log_lean_navigation(run_id, data)
+                )
+                if lean_policy is not None:
+                    await lean_policy.lean(context)
+                    print(f"🪶 [VERBOSE] Lean browsing enabled for run {run_id}")
             
             # Add page close detection
-            def on_page_close():
+            def on_page_close(*_):
                 print(f"🔍 [VERBOSE] Browser page closed for run {run_id}")
                 self._handle_browser_close(run_id, "Browser page closed")
             
-            self.page.on("close", on_page_close)
+            lease.on(page, "close", on_page_close)
             
             # Set up console logging
             print(f"📝 [VERBOSE] Setting up console logging for run {run_id}...")
-            await self._setup_console_logging(run_id)
+            await self._setup_console_logging(run_id, lease)
             print(f"✅ [VERBOSE] Console logging setup complete")
             
             # Set up network monitoring
             print(f"🌐 [VERBOSE] Setting up network monitoring for run {run_id}...")
-            await self._setup_network_monitoring(run_id)
+            await self._setup_network_monitoring(run_id, lease)
             print(f"✅ [VERBOSE] Network monitoring setup complete")
             
             # Store run info
             print(f"💾 [VERBOSE] Storing run info for run {run_id}...")
             self.active_runs[run_id] = {
-                'page': self.page,
-                'context': self.context,
+                'page': page,
+                'context': context,
+                'lease': lease,
+                'lean_policy': lean_policy,
                 'started_at': datetime.now(),
                 'status': 'IN_PROGRESS'
             }
             print(f"✅ [VERBOSE] Run {run_id} stored in active runs. Total active runs: {len(self.active_runs)}")
             
+            # Stream the page if a client is already watching the run
+            await self._sync_screencast(run_id)
+            
             # Navigate to initial URL
             print(f"🧭 [VERBOSE] Navigating to {initial_url}...")
             await self._log_event(run_id, EventLevel.INFO, EventCategory.BROWSER, 
                                 f"Navigating to {initial_url}")
             
-            await self.page.goto(initial_url, wait_until='networkidle')
+            await page.goto(initial_url, wait_until='networkidle')
             print(f"✅ [VERBOSE] Successfully navigated to {initial_url}")
             
-            # Take initial screenshot
-            print(f"📸 [VERBOSE] Taking initial screenshot for run {run_id}...")
-            await self._take_screenshot(run_id)
-            print(f"✅ [VERBOSE] Initial screenshot taken and sent")
-            
-            # Start continuous screenshot loop
-            print(f"🎬 [VERBOSE] Starting screenshot loop for run {run_id}...")
-            screenshot_task = asyncio.create_task(self._screenshot_loop(run_id))
-            print(f"✅ [VERBOSE] Screenshot loop task created: {screenshot_task}")
-            
-            # Store the task in active runs for cleanup
-            if run_id in self.active_runs:
-                self.active_runs[run_id]['screenshot_task'] = screenshot_task
-            
             result = {
                 'run_id': run_id,
                 'status': 'IN_PROGRESS',
@@ -199,27 +226,32 @@ class PlaywrightService:
         except Exception as e:
             print(f"❌ Error starting run {run_id}: {e}")
             logger.error(f"Error starting run {run_id}: {e}")
-            await self._log_event(run_id, EventLevel.ERROR, EventCategory.SYSTEM, 
-                                f"Failed to start run: {str(e)}")
+            run_info = self.active_runs.pop(run_id, None) or {'lean_policy': lean_policy}
+            await self._release_context(run_id, run_info)
+            await self._log_run_end(run_id, EventLevel.ERROR, f"Failed to start run: {str(e)}")
             raise
 
+    async def _release_context(self, run_id: int, run_info: Dict[str, Any]):
+        """Return a run's context to the pool without its screencast or request routing."""
+        self.screencast_viewers.pop(run_id, None)
+        if run_info.get('screencast') is not None:
+            await run_info['screencast'].stop()
+        if run_info.get('lean_policy') is not None:
+            await run_info['lean_policy'].full()
+        if self.pool is not None:
+            await self.pool.release(run_id)
+            print(f"♻️ [VERBOSE] Released browser context for run {run_id}: {self.pool.stats()}")
+
     async def stop_run(self, run_id: int) -> Dict[str, Any]:
         """Stop an active run."""
         try:
             if run_id in self.active_runs:
-                run_info = self.active_runs[run_id]
-                
-                # Close page and context
-                if run_info['page']:
-                    await run_info['page'].close()
-                if run_info['context']:
-                    await run_info['context'].close()
+                run_info = self.active_runs.pop(run_id)
                 
-                # Remove from active runs
-                del self.active_runs[run_id]
+                # Hand the context back to the pool (reset for the next run, or closed)
+                await self._release_context(run_id, run_info)
                 
-                await self._log_event(run_id, EventLevel.INFO, EventCategory.SYSTEM, 
-                                    "Run stopped by user")
+                await self._log_run_end(run_id, EventLevel.INFO, "Run stopped by user")
                 
                 return {
                     'run_id': run_id,
@@ -237,6 +269,34 @@ class PlaywrightService:
             logger.error(f"Error stopping run {run_id}: {e}")
             raise
 
+    async def set_browsing_mode(self, run_id: int, mode: str) -> Dict[str, Any]:
+        """Switch a run between lean discovery browsing and full fidelity ("lean" | "full")."""
+        if run_id not in self.active_runs:
+            raise ValueError(f"Run {run_id} not found")
+        if mode not in ("lean", "full"):
+            raise ValueError(f"Unknown browsing mode: {mode}")
+        run_info = self.active_runs[run_id]
+        policy = run_info.get('lean_policy')
+        if mode == "full":
+            if policy is not None:
+                await policy.full()
+        else:
+            if policy is None:
+                policy = LeanBrowsingPolicy(on_navigation=lambda data: self._log_lean_navigation(run_id, data))
+                run_info['lean_policy'] = policy
+            await policy.lean(run_info['context'])
+        summary = policy.summary() if policy is not None else {}
+        await self._log_event(run_id, EventLevel.INFO, EventCategory.BROWSER,
+                              f"Browsing mode set to {mode}", code="BROWSING_MODE", data=summary)
+        return {'run_id': run_id, 'mode': mode, 'lean_summary': summary}
+
+    def _log_lean_navigation(self, run_id: int, data: Dict[str, Any]):
+        """Record the estimated bytes/ms a lean navigation saved."""
+        message = (f"Lean navigation {data.get('url')}: {data.get('blocked')} blocked, "
+                   f"{data.get('stubbed')} stubbed, ~{int(data.get('bytes_saved_est') or 0) // 1024} KB saved")
+        asyncio.create_task(self._log_event(run_id, EventLevel.DEBUG, EventCategory.NETWORK, message,
+                                            code="LEAN_NAVIGATION", data=data))
+
     async def pause_run(self, run_id: int) -> Dict[str, Any]:
         """Pause an active run."""
         try:
@@ -294,8 +354,8 @@ class PlaywrightService:
                 page = run_info['page']
                 print(f"✅ [VERBOSE] Found run {run_id}, taking screenshot...")
                 
-                # Take screenshot
-                screenshot_bytes = await page.screenshot(full_page=True)
+                # Viewport only: the viewer shows what the browser shows
+                screenshot_bytes = await page.screenshot(type='jpeg', quality=self.screenshot_quality)
                 screenshot_b64 = base64.b64encode(screenshot_bytes).decode('utf-8')
                 print(f"✅ [VERBOSE] Screenshot taken successfully, size: {len(screenshot_b64)} chars")
                 
@@ -311,10 +371,8 @@ class PlaywrightService:
             logger.error(f"Error taking screenshot for run {run_id}: {e}")
             raise
 
-    async def _setup_console_logging(self, run_id: int):
-        """Set up console logging for the page."""
-        if not self.page:
-            return
+    async def _setup_console_logging(self, run_id: int, lease):
+        """Set up console logging for the run's page."""
             
         async def handle_console(msg):
             level = msg.type
@@ -342,12 +400,10 @@ class PlaywrightService:
             prefix = "\\033[0;35m[BROWSER/PLAYWRIGHT]\\033[0m"  # Magenta for Playwright
             print(f"{prefix} {level}: {message}")
         
-        self.page.on('console', handle_console)
+        lease.on(lease.page, 'console', handle_console)
 
-    async def _setup_network_monitoring(self, run_id: int):
-        """Set up network request monitoring."""
-        if not self.page:
-            return
+    async def _setup_network_monitoring(self, run_id: int, lease):
+        """Set up network request monitoring for the run's page."""
             
         async def handle_request(request):
             await self._log_event(run_id, EventLevel.DEBUG, EventCategory.NETWORK, 
@@ -365,73 +421,69 @@ class PlaywrightService:
                 await self._log_event(run_id, EventLevel.DEBUG, EventCategory.NETWORK, 
                                     f"Response: {status} {url}")
         
-        self.page.on('request', handle_request)
-        self.page.on('response', handle_response)
+        lease.on(lease.page, 'request', handle_request)
+        lease.on(lease.page, 'response', handle_response)
+
+    async def add_screencast_viewer(self, run_id: int, sid: str):
+        """A client joined the run room; start streaming if it is the first one."""
+        self.screencast_viewers.setdefault(run_id, set()).add(sid)
+        await self._sync_screencast(run_id)
+
+    async def remove_screencast_viewer(self, run_id: int, sid: str):
+        """A client left the run room; stop streaming once nobody is watching."""
+        viewers = self.screencast_viewers.get(run_id)
+        if viewers is not None:
+            viewers.discard(sid)
+            if not viewers:
+                del self.screencast_viewers[run_id]
+        await self._sync_screencast(run_id)
+
+    async def drop_screencast_viewer(self, sid: str):
+        """A client disconnected; remove it from every run it was watching."""
+        for run_id in [rid for rid, viewers in self.screencast_viewers.items() if sid in viewers]:
+            await self.remove_screencast_viewer(run_id, sid)
 
-    async def _screenshot_loop(self, run_id: int):
-        """Continuous screenshot loop for video streaming."""
-        print(f"🎬 [VERBOSE] Screenshot loop started for run {run_id}")
+    def screencast_stats(self, run_id: int) -> Optional[Dict[str, Any]]:
+        """Frame rate and bandwidth of a run's screencast, or None if the run is not active."""
+        run_info = self.active_runs.get(run_id)
+        if run_info is None:
+            return None
+        screencast = run_info.get('screencast')
+        stats = screencast.summary() if screencast is not None else {'active': False}
+        return {'run_id': run_id, 'viewers': len(self.screencast_viewers.get(run_id, ())), **stats}
+
+    async def _sync_screencast(self, run_id: int):
+        """Start or stop a run's CDP screencast to match whether anyone is watching."""
+        run_info = self.active_runs.get(run_id)
+        if run_info is None:
+            return
+        watching = bool(self.screencast_viewers.get(run_id))
+        screencast = run_info.get('screencast')
         try:
-            loop_count = 0
-            while run_id in self.active_runs:
-                loop_count += 1
-                print(f"🔄 [VERBOSE] Screenshot loop iteration {loop_count} for run {run_id}")
-                
-                # Check if page is still available
-                if run_id not in self.active_runs or not self.active_runs[run_id].get('page'):
-                    print(f"🔍 [VERBOSE] Page no longer available for run {run_id}, stopping screenshot loop")
-                    break
-                
-                try:
-                    await self._take_screenshot(run_id)
-                except Exception as screenshot_error:
-                    print(f"❌ [VERBOSE] Screenshot failed for run {run_id}: {screenshot_error}")
-                    # If screenshot fails, it might mean the page is closed
-                    if "Target page, context or browser has been closed" in str(screenshot_error):
-                        print(f"🔍 [VERBOSE] Page closed detected for run {run_id}, stopping screenshot loop")
-                        self._handle_browser_close(run_id, "Page closed during screenshot")
-                        break
-                    # For other errors, continue but log them
-                    logger.warning(f"Screenshot failed for run {run_id}: {screenshot_error}")
-                
-                print(f"⏰ [VERBOSE] Waiting 1 second before next screenshot for run {run_id}")
-                await asyncio.sleep(1)  # Take screenshot every second
-                
-        except asyncio.CancelledError:
-            print(f"🛑 [VERBOSE] Screenshot loop cancelled for run {run_id}")
-            raise  # Re-raise CancelledError
+            if watching and screencast is None:
+                screencast = RunScreencast.from_env(
+                    run_info['page'], lambda data, metadata: self._emit_screencast_frame(run_id, data)
+                )
+                run_info['screencast'] = screencast
+            if screencast is None:
+                return
+            if watching and not screencast.active:
+                await screencast.start()
+                print(f"🎬 [VERBOSE] Screencast started for run {run_id}")
+            elif not watching and screencast.active:
+                await screencast.stop()
+                print(f"🛑 [VERBOSE] Screencast stopped for run {run_id}: {screencast.summary()}")
         except Exception as e:
-            print(f"❌ [VERBOSE] Error in screenshot loop for run {run_id}: {e}")
-            logger.error(f"Error in screenshot loop for run {run_id}: {e}")
-        print(f"🛑 [VERBOSE] Screenshot loop ended for run {run_id}")
+            print(f"❌ [VERBOSE] Error updating screencast for run {run_id}: {e}")
+            logger.error(f"Error updating screencast for run {run_id}: {e}")
 
-    async def _take_screenshot(self, run_id: int):
-        """Take a screenshot and emit it via WebSocket."""
+    def _emit_screencast_frame(self, run_id: int, frame_b64: str):
+        """Emit a screencast frame via WebSocket."""
+        from ..websocket.handlers import get_websocket_manager
         try:
-            print(f"📸 [VERBOSE] Taking screenshot for run {run_id}...")
-            screenshot_b64 = await self.take_screenshot(run_id)
-            print(f"✅ [VERBOSE] Screenshot taken, size: {len(screenshot_b64)} chars")
-            
-            # Emit via WebSocket
-            from ..websocket.handlers import get_websocket_manager
-            try:
-                print(f"📡 [VERBOSE] Getting WebSocket manager for run {run_id}...")
-                ws_manager = get_websocket_manager()
-                print(f"📡 [VERBOSE] Emitting screencast frame via WebSocket for run {run_id}...")
-                ws_manager.emit_screencast_frame(run_id, screenshot_b64)
-                print(f"🖼️ [VERBOSE] Screenshot emitted via WebSocket for run {run_id}")
-            except Exception as ws_error:
-                print(f"⚠️ [VERBOSE] Failed to emit screenshot via WebSocket: {ws_error}")
-                import traceback
-                print(f"⚠️ [VERBOSE] WebSocket error traceback: {traceback.format_exc()}")
-            
-            logger.info(f"Screenshot taken for run {run_id}")
-            
-        except Exception as e:
-            print(f"❌ [VERBOSE] Error taking screenshot for run {run_id}: {e}")
-            import traceback
-            print(f"❌ [VERBOSE] Screenshot error traceback: {traceback.format_exc()}")
-            logger.error(f"Error taking screenshot for run {run_id}: {e}")
+            get_websocket_manager().emit_screencast_frame(run_id, frame_b64)
+        except Exception as ws_error:
+            print(f"⚠️ [VERBOSE] Failed to emit screencast frame via WebSocket: {ws_error}")
 
     async def _log_event(self, run_id: int, level: EventLevel, category: EventCategory, 
                         message: str, code: Optional[str] = None, data: Optional[Dict] = None):
@@ -447,8 +499,9 @@ class PlaywrightService:
                 data=data
             )
             
-            # Save to database
-            RunEventRepository.create(event)
+            # Queue for the next batched write
+            self.events.start()
+            self.events.add(event)
             
             # Emit via WebSocket
             from ..websocket.handlers import get_websocket_manager
@@ -467,6 +520,14 @@ class PlaywrightService:
             print(f"❌ Error logging event for run {run_id}: {e}")
             logger.error(f"Error logging event for run {run_id}: {e}")
 
+    async def _log_run_end(self, run_id: int, level: str, message: str):
+        """Log a run's final event and flush buffered events so the run's history is complete."""
+        await self._log_event(run_id, level, EventCategory.SYSTEM, message)
+        try:
+            await self.events.flush()
+        except Exception as e:
+            logger.error(f"Error flushing events for run {run_id}: {e}")
+
     async def _emit_console_log(self, run_id: int, level: str, message: str):
         """Emit a console log via WebSocket."""
         try:
@@ -0,0 +1,151 @@
+"""CDP screencast streaming for a run's page."""
+
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+
+from playwright.async_api import CDPSession, Page
+
+logger = logging.getLogger(__name__)
+
+# Called with (base64 JPEG data, CDP frame metadata)
+FrameHandler = Callable[[str, Dict[str, Any]], None]
+
+
+class ScreencastStats:
+    """Frame and byte counters with rates over a sliding window."""
+
+    def __init__(self, window_s: float = 5.0):
+        self.window_s = window_s
+        self.frames = 0
+        self.bytes = 0
+        self.started_at: Optional[float] = None
+        self._recent: Deque[Tuple[float, int]] = deque()
+
+    def record(self, size: int, now: Optional[float] = None) -> None:
+        now = time.monotonic() if now is None else now
+        if self.started_at is None:
+            self.started_at = now
+        self.frames += 1
+        self.bytes += size
+        self._recent.append((now, size))
+        self._trim(now)
+
+    def snapshot(self, now: Optional[float] = None) -> Dict[str, Any]:
+        now = time.monotonic() if now is None else now
+        self._trim(now)
+        span = min(self.window_s, now - self.started_at) if self.started_at is not None else 0.0
+        recent_bytes = sum(size for _, size in self._recent)
+        return {
+            "frames": self.frames,
+            "bytes": self.bytes,
+            "fps": round(len(self._recent) / span, 2) if span > 0 else 0.0,
+            "bytes_per_s": round(recent_bytes / span, 1) if span > 0 else 0.0,
+        }
+
+    def _trim(self, now: float) -> None:
+        while self._recent and now - self._recent[0][0] > self.window_s:
+            self._recent.popleft()
+
+
+class RunScreencast:
+    """Streams a page over CDP ``Page.startScreencast`` as JPEG frames.
+
+    Chrome only sends the next frame after the previous one is acknowledged, so
+    acking after the frame handler returns keeps capture paced to delivery.
+    """
+
+    def __init__(
+        self,
+        page: Page,
+        on_frame: FrameHandler,
+        *,
+        quality: int = 60,
+        max_width: int = 1280,
+        max_height: int = 720,
+        every_nth_frame: int = 1,
+    ):
+        self.page = page
+        self.on_frame = on_frame
+        self.quality = max(1, min(quality, 100))
+        self.max_width = max_width
+        self.max_height = max_height
+        self.every_nth_frame = max(1, every_nth_frame)
+        self.stats = ScreencastStats()
+        self._session: Optional[CDPSession] = None
+        self._lock = asyncio.Lock()  # viewers join and leave concurrently
+
+    @classmethod
+    def from_env(cls, page: Page, on_frame: FrameHandler) -> "RunScreencast":
+        return cls(
+            page,
+            on_frame,
+            quality=int(os.environ.get("SCREENCAST_QUALITY", "60")),
+            max_width=int(os.environ.get("SCREENCAST_MAX_WIDTH", "1280")),
+            max_height=int(os.environ.get("SCREENCAST_MAX_HEIGHT", "720")),
+            every_nth_frame=int(os.environ.get("SCREENCAST_EVERY_NTH_FRAME", "1")),
+        )
+
+    @property
+    def active(self) -> bool:
+        return self._session is not None
+
+    async def start(self) -> None:
+        async with self._lock:
+            if self._session is not None:
+                return
+            session = await self.page.context.new_cdp_session(self.page)
+            self._session = session
+            session.on("Page.screencastFrame", self._handle_frame)
+            try:
+                await session.send("Page.startScreencast", {
+                    "format": "jpeg",
+                    "quality": self.quality,
+                    "maxWidth": self.max_width,
+                    "maxHeight": self.max_height,
+                    "everyNthFrame": self.every_nth_frame,
+                })
+            except Exception:
+                self._session = None
+                raise
+
+    async def stop(self) -> None:
+        async with self._lock:
+            session, self._session = self._session, None
+            if session is None:
+                return
+            try:
+                await session.send("Page.stopScreencast")
+                await session.detach()
+            except Exception as e:
+                # The page may already be gone; nothing left to stop
+                logger.debug(f"Screencast stop failed: {e}")
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "active": self.active,
+            "quality": self.quality,
+            "max_width": self.max_width,
+            "max_height": self.max_height,
+            **self.stats.snapshot(),
+        }
+
+    def _handle_frame(self, params: Dict[str, Any]) -> None:
+        data = params.get("data", "")
+        self.stats.record(len(data) * 3 // 4)  # decoded JPEG size
+        try:
+            self.on_frame(data, params.get("metadata") or {})
+        except Exception as e:
+            logger.warning(f"Screencast frame handler failed: {e}")
+        session = self._session
+        if session is not None:
+            asyncio.create_task(self._ack(session, params.get("sessionId")))
+
+    async def _ack(self, session: CDPSession, frame_session_id: Any) -> None:
+        try:
+            await session.send("Page.screencastFrameAck", {"sessionId": frame_session_id})
+        except Exception as e:
+            logger.debug(f"Screencast frame ack failed: {e}")
@@ -0,0 +1,131 @@
+"""Latest-frame-wins delivery of screencast frames, one channel per socket."""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Set, Tuple
+
+# Frames travel on their own namespace (and client connection), so a slow
+# video consumer never delays run events and console logs on "/"
+SCREENCAST_NAMESPACE = "/screencast"
+
+# send(payload, on_ack) delivers one frame to the socket and calls on_ack once
+# the client has taken it
+FrameSender = Callable[[Dict[str, Any], Callable[..., None]], None]
+
+
+class FrameChannel:
+    """Send queue of depth 1 for a single socket.
+
+    At most one frame is in flight; the next is sent when the client acks it.
+    Frames offered meanwhile replace the pending one, so a slow client skips
+    ahead to the latest frame instead of falling behind. An unacked frame is
+    written off after ``ack_timeout_s``. Each send carries a sequence number, so a
+    late ack for a written-off frame cannot release the frame sent after it.
+    """
+
+    def __init__(self, sid: str, send: FrameSender, ack_timeout_s: float = 2.0):
+        self.sid = sid
+        self.send = send
+        self.ack_timeout_s = ack_timeout_s
+        self.counters = {"sent": 0, "acked": 0, "dropped": 0, "timeouts": 0, "bytes": 0}
+        self._pending: Optional[Dict[str, Any]] = None
+        self._in_flight_since: Optional[float] = None
+        self._in_flight_seq = 0
+        self._seq = 0
+        self._lock = threading.Lock()
+
+    def offer(self, payload: Dict[str, Any], now: Optional[float] = None) -> None:
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            if self._pending is not None:
+                self.counters["dropped"] += 1
+            self._pending = payload
+            if self._in_flight_since is not None and now - self._in_flight_since > self.ack_timeout_s:
+                self.counters["timeouts"] += 1
+                self._in_flight_since = None
+            taken = self._take(now)
+        if taken is not None:
+            self._send(*taken)
+
+    def on_ack(self, seq: int) -> None:
+        with self._lock:
+            if seq != self._in_flight_seq or self._in_flight_since is None:
+                return  # ack for a frame already written off
+            self.counters["acked"] += 1
+            self._in_flight_since = None
+            taken = self._take(time.monotonic())
+        if taken is not None:
+            self._send(*taken)
+
+    def _take(self, now: float) -> Optional[Tuple[int, Dict[str, Any]]]:
+        if self._in_flight_since is not None or self._pending is None:
+            return None
+        payload, self._pending = self._pending, None
+        self._seq += 1
+        self._in_flight_seq = self._seq
+        self._in_flight_since = now
+        self.counters["sent"] += 1
+        self.counters["bytes"] += len(payload.get("frame") or b"")
+        return self._seq, payload
+
+    def _send(self, seq: int, payload: Dict[str, Any]) -> None:
+        try:
+            self.send(payload, lambda *_: self.on_ack(seq))
+        except Exception as e:
+            print(f"⚠️ [VERBOSE] Failed to send frame to {self.sid}: {e}")
+            with self._lock:
+                if self._in_flight_seq == seq:
+                    self._in_flight_since = None
+
+
+class FrameHub:
+    """Routes each run's frames to the channels of the sockets watching it."""
+
+    def __init__(self, make_sender: Callable[[str], FrameSender], ack_timeout_s: float = 2.0):
+        self.make_sender = make_sender
+        self.ack_timeout_s = ack_timeout_s
+        self._channels: Dict[str, FrameChannel] = {}
+        self._watchers: Dict[int, Set[str]] = {}
+        self._lock = threading.Lock()
+
+    def watch(self, run_id: int, sid: str) -> FrameChannel:
+        with self._lock:
+            channel = self._channels.get(sid)
+            if channel is None:
+                channel = FrameChannel(sid, self.make_sender(sid), self.ack_timeout_s)
+                self._channels[sid] = channel
+            self._watchers.setdefault(run_id, set()).add(sid)
+            return channel
+
+    def unwatch(self, run_id: int, sid: str) -> None:
+        with self._lock:
+            watchers = self._watchers.get(run_id)
+            if watchers is not None:
+                watchers.discard(sid)
+                if not watchers:
+                    del self._watchers[run_id]
+
+    def disconnect(self, sid: str) -> None:
+        with self._lock:
+            self._channels.pop(sid, None)
+            for run_id in [rid for rid, sids in self._watchers.items() if sid in sids]:
+                self._watchers[run_id].discard(sid)
+                if not self._watchers[run_id]:
+                    del self._watchers[run_id]
+
+    def publish(self, run_id: int, payload: Dict[str, Any]) -> int:
+        """Offer a frame to every socket watching ``run_id``; returns how many."""
+        with self._lock:
+            channels = [self._channels[sid] for sid in self._watchers.get(run_id, ()) if sid in self._channels]
+        for channel in channels:
+            channel.offer(payload)
+        return len(channels)
+
+    def stats(self, run_id: int) -> Dict[str, Any]:
+        with self._lock:
+            channels = [self._channels[sid] for sid in self._watchers.get(run_id, ()) if sid in self._channels]
+        totals = {"sockets": len(channels), "sent": 0, "acked": 0, "dropped": 0, "timeouts": 0, "bytes": 0}
+        for channel in channels:
+            for key, value in channel.counters.items():
+                totals[key] += value
+        return totals
@@ -1,7 +1,7 @@
 """WebSocket handlers for real-time communication."""
 
+import base64
 import json
-import asyncio
 import time
 from typing import Any, Dict, Optional
 
@@ -11,7 +11,12 @@ from flask_socketio import SocketIO
 
 from ..database.repository import RunRepository, RunEventRepository
 from ..models.entities import RunEvent, EventLevel, EventCategory
+from ..services.async_runtime import get_async_runtime
 from ..services.playwright_service import playwright_service
+from .frames import SCREENCAST_NAMESPACE, FrameHub
+
+# Pause/resume/stop are short; don't hold a Socket.IO handler thread forever
+CONTROL_TIMEOUT_S = 30.0
 
 
 class WebSocketManager:
@@ -25,8 +30,10 @@ class WebSocketManager:
         """
         self.socketio = socketio
         self.active_runs: Dict[int, Dict[str, Any]] = {}
-        self.current_screencast_frames: Dict[int, str] = {}  # Store latest frame for each run
+        self.current_screencast_frames: Dict[int, bytes] = {}  # Store latest JPEG for each run
+        self.frames = FrameHub(self._frame_sender)
         self.setup_handlers()
+        self.setup_screencast_handlers()
     
     def setup_handlers(self):
         """Set up WebSocket event handlers."""
@@ -64,18 +71,6 @@ class WebSocketManager:
                 emit("run_status", self.active_runs[run_id])
             else:
                 print(f"ℹ️ [VERBOSE] No active status found for run {run_id}")
-            
-            # Send current screencast frame if available
-            if run_id in self.current_screencast_frames:
-                frame_data = self.current_screencast_frames[run_id]
-                print(f"🖼️ [VERBOSE] Sending current screencast frame for run {run_id}, size: {len(frame_data)}")
-                emit("screencast_frame", {
-                    "run_id": run_id,
-                    "frame": frame_data,
-                    "timestamp": time.time()
-                })
-            else:
-                print(f"ℹ️ [VERBOSE] No current screencast frame found for run {run_id}")
         
         @self.socketio.on("leave_run")
         def handle_leave_run(data):
@@ -108,11 +103,11 @@ class WebSocketManager:
                 print(f"🔧 Executing {command} command for run {run_id}...")
                 # Handle commands with Playwright service
                 if command == 'pause':
-                    result = asyncio.run(playwright_service.pause_run(run_id))
+                    result = get_async_runtime().run(playwright_service.pause_run(run_id), timeout=CONTROL_TIMEOUT_S)
                 elif command == 'resume':
-                    result = asyncio.run(playwright_service.resume_run(run_id))
+                    result = get_async_runtime().run(playwright_service.resume_run(run_id), timeout=CONTROL_TIMEOUT_S)
                 elif command == 'stop':
-                    result = asyncio.run(playwright_service.stop_run(run_id))
+                    result = get_async_runtime().run(playwright_service.stop_run(run_id), timeout=CONTROL_TIMEOUT_S)
                 else:
                     result = {'status': 'error', 'message': 'Unknown command'}
                 
@@ -154,8 +149,8 @@ class WebSocketManager:
                 message=f"Run control: {action}",
                 data={"action": action}
             )
-            # Note: This would need to be async in a real implementation
-            # For now, we'll just print it
+            # Queued for the batched writer; safe to call from handler threads
+            playwright_service.events.add(event)
             print(f"Control event: Run {run_id} - {action}")
         except Exception as e:
             print(f"Error logging control event: {e}")
@@ -180,28 +175,66 @@ class WebSocketManager:
         print(f"💾 Updated active runs cache for run {run_id}")
     
     def emit_screencast_frame(self, run_id: int, frame_data: str):
-        """Emit a screencast frame to all clients monitoring the run."""
-        room = f"run_{run_id}"
-        print(f"🖼️ [VERBOSE] Emitting screencast frame to room {room}, size: {len(frame_data)}")
-        print(f"🔍 [VERBOSE] Active runs in WebSocket manager: {list(self.active_runs.keys())}")
-        
-        # Store the latest frame for this run
-        self.current_screencast_frames[run_id] = frame_data
-        print(f"💾 [VERBOSE] Stored latest frame for run {run_id}")
+        """Send a screencast frame (base64 JPEG from CDP) to the sockets watching the run.
         
+        Frames go out as binary attachments through each socket's depth-1 queue,
+        so slow clients drop stale frames instead of backing up the server.
+        """
         try:
-            import time
-            self.socketio.emit("screencast_frame", {
-                "run_id": run_id,
-                "frame": frame_data,
-                "timestamp": time.time()
-            }, room=room)
-            print(f"✅ [VERBOSE] Screencast frame emitted successfully to room {room}")
+            frame = base64.b64decode(frame_data)
+            # Store the latest frame for this run
+            self.current_screencast_frames[run_id] = frame
+            self.frames.publish(run_id, self._frame_payload(run_id, frame))
         except Exception as e:
             print(f"❌ [VERBOSE] Error emitting screencast frame: {e}")
             import traceback
             print(f"❌ [VERBOSE] Emit error traceback: {traceback.format_exc()}")
     
+    def setup_screencast_handlers(self):
+        """Set up the frame channel, separate from run events on the default namespace."""
+        
+        @self.socketio.on("watch", namespace=SCREENCAST_NAMESPACE)
+        def handle_watch(data):
+            """Subscribe this socket to a run's frames; capture starts with the first watcher."""
+            run_id = data.get("run_id")
+            if not run_id:
+                emit("error", {"message": "run_id is required"})
+                return
+            run_id = int(run_id)
+            channel = self.frames.watch(run_id, request.sid)
+            print(f"🎥 [VERBOSE] Client {request.sid} watching run {run_id}")
+            get_async_runtime().spawn(playwright_service.add_screencast_viewer(run_id, request.sid),
+                                      description=f"screencast start for run {run_id}")
+            # Show the last frame straight away rather than waiting for the page to change
+            if run_id in self.current_screencast_frames:
+                channel.offer(self._frame_payload(run_id, self.current_screencast_frames[run_id]))
+        
+        @self.socketio.on("unwatch", namespace=SCREENCAST_NAMESPACE)
+        def handle_unwatch(data):
+            """Unsubscribe this socket from a run's frames."""
+            run_id = data.get("run_id")
+            if not run_id:
+                return
+            run_id = int(run_id)
+            self.frames.unwatch(run_id, request.sid)
+            get_async_runtime().spawn(playwright_service.remove_screencast_viewer(run_id, request.sid),
+                                      description=f"screencast stop for run {run_id}")
+        
+        @self.socketio.on("disconnect", namespace=SCREENCAST_NAMESPACE)
+        def handle_screencast_disconnect(reason=None):
+            """Drop the socket's frame channel and any screencasts it kept alive."""
+            self.frames.disconnect(request.sid)
+            get_async_runtime().spawn(playwright_service.drop_screencast_viewer(request.sid),
+                                      description="screencast viewer cleanup")
+    
+    def _frame_sender(self, sid: str):
+        def send(payload: Dict[str, Any], on_ack):
+            self.socketio.emit("frame", payload, to=sid, namespace=SCREENCAST_NAMESPACE, callback=on_ack)
+        return send
+    
+    def _frame_payload(self, run_id: int, frame: bytes) -> Dict[str, Any]:
+        return {"run_id": run_id, "frame": frame, "format": "jpeg", "timestamp": time.time()}
+    
     def emit_console_log(self, run_id: int, log_data: Dict[str, Any]):
         """Emit console log to all clients monitoring the run."""
         room = f"run_{run_id}"
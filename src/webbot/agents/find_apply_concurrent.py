@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from ..browser import goto_and_wait
+from ..company_kb import detect_ats
+from ..tracing import event
+
+FinderFn = Callable[[Any], Awaitable[Tuple[Optional[str], Dict[str, Any]]]]
+
+# agentic5beta/agentic report a 0-1 confidence in their parsed JSON
+CONFIDENT_SCORE = 0.8
+
+
+@dataclass
+class Finder:
+    """One apply-URL strategy; ``run`` gets its own page (None when ``needs_page`` is False)."""
+
+    name: str
+    run: FinderFn
+    needs_page: bool = True
+    start_url: Optional[str] = None  # load this first (e.g. the job page the finder reads)
+
+
+@dataclass
+class FinderResult:
+    name: str
+    url: Optional[str] = None
+    trace: Dict[str, Any] = field(default_factory=dict)
+    elapsed_s: float = 0.0
+    error: Optional[str] = None
+    confident: bool = False
+
+
+def is_confident(url: Optional[str], trace: Dict[str, Any]) -> bool:
+    """High-confidence apply URL: a job on a hosted ATS board, or a finder's own score >= 0.8."""
+    if not url:
+        return False
+    provider, tenant = detect_ats(url)
+    if provider and tenant and len([p for p in urlparse(url).path.split("/") if p]) >= 2:
+        return True
+    raw = trace.get("raw") if isinstance(trace.get("raw"), dict) else trace.get("picks") or {}
+    try:
+        return float(raw.get("confidence") or 0) >= CONFIDENT_SCORE
+    except (TypeError, ValueError):
+        return False
+
+
+async def _run_one(ctx, finder: Finder) -> FinderResult:
+    started = time.perf_counter()
+    page = None
+    try:
+        if finder.needs_page:
+            page = await ctx.new_page()
+            if finder.start_url:
+                await goto_and_wait(page, finder.start_url)
+        url, trace = await finder.run(page)
+        return FinderResult(finder.name, url, trace or {}, time.perf_counter() - started, confident=is_confident(url, trace or {}))
+    except Exception as e:
+        return FinderResult(finder.name, None, {}, time.perf_counter() - started, error=str(e))
+    finally:
+        if page is not None:
+            try:
+                await page.close()
+            except Exception:
+                pass
+
+
+async def run_finders(
+    ctx,
+    finders: List[Finder],
+    *,
+    deadline_s: float,
+    early_exit: bool = False,
+    on_result: Optional[Callable[[FinderResult], None]] = None,
+) -> Dict[str, FinderResult]:
+    """Run finders concurrently, each in its own page of ``ctx``, under one overall deadline.
+
+    Results are reported through ``on_result`` as they complete. With ``early_exit``
+    the remaining finders are cancelled once one returns a confident URL. Finders
+    still running at the deadline are cancelled and reported with an error.
+    """
+    started = time.perf_counter()
+    tasks = {asyncio.create_task(_run_one(ctx, f)): f for f in finders}
+    results: Dict[str, FinderResult] = {}
+    pending = set(tasks)
+    stop_reason = None
+    while pending:
+        remaining = deadline_s - (time.perf_counter() - started)
+        if remaining <= 0:
+            stop_reason = "deadline"
+            break
+        done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            result = task.result()
+            results[result.name] = result
+            event(
+                "FIND_APPLY",
+                "INFO",
+                "finder_done",
+                finder=result.name,
+                url=result.url,
+                confident=result.confident,
+                elapsed_s=round(result.elapsed_s, 2),
+                error=result.error,
+            )
+            if on_result is not None:
+                on_result(result)
+        if early_exit and any(r.confident for r in results.values()):
+            stop_reason = "early_exit"
+            break
+    for task in pending:
+        task.cancel()
+    if pending:
+        await asyncio.gather(*pending, return_exceptions=True)
+    elapsed = time.perf_counter() - started
+    for task in pending:
+        name = tasks[task].name
+        results[name] = FinderResult(name, elapsed_s=elapsed, error=f"cancelled ({stop_reason})")
+    event(
+        "FIND_APPLY",
+        "INFO",
+        "finders_summary",
+        elapsed_s=round(elapsed, 2),
+        stop_reason=stop_reason or "all_done",
+        serial_s=round(sum(r.elapsed_s for r in results.values()), 2),
+        found={n: r.url for n, r in results.items()},
+    )
+    return results
@@ -1,9 +1,11 @@
 from __future__ import annotations
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any
 from pydantic import BaseModel
 
-from ..ai_search import get_openai_client
-from ..apply_finder import duckduckgo_html_search, domain
+from ..llm.chat import acreate_chat_completion
+from ..llm.telemetry import llm_stage
+from ..apply_finder import domain
+from ..search import dedup_urls, get_search_client
 from playwright.async_api import Page
 from ..tracing import action, json_blob
 
@@ -21,7 +23,7 @@ async def smart_find_apply_url(
 ) -> tuple[Optional[str], Dict[str, Any]]:
     """
     Use an LLM to choose the official domain, careers page, and best apply URL
-    from DuckDuckGo candidates.
+    from web search candidates (see webbot.search; ``page`` is left untouched).
 
     Returns (best_url, trace) where trace contains the prompt/response and picks.
     """
@@ -33,20 +35,12 @@ async def smart_find_apply_url(
         f"{company_name} jobs {job_title}",
         f"site:linkedin.com/company {company_name}",
     ]
-    candidates: List[str] = []
-    for q in queries:
-        try:
-            with action("duckduckgo_query", category="FIND_APPLY", query=q):
-                results = await duckduckgo_html_search(page, q, limit=10)
-                json_blob("FIND_APPLY", "TRACE", "duckduckgo_results", {"query": q, "results": results})
-                for url in results:
-                    if url not in candidates:
-                        candidates.append(url)
-        except Exception:
-            continue
+    with action("search_queries", category="FIND_APPLY", queries=len(queries)):
+        by_query = await get_search_client().search_many(queries, limit=10)
+        json_blob("FIND_APPLY", "TRACE", "search_results", by_query)
+    candidates = dedup_urls(url for q in queries for url in by_query[q])
 
     # Prepare prompt for the LLM
-    client = get_openai_client()
     prompt = (
         "You are given a company name and a target job title. "
         "From the candidate URLs, identify: (1) the official company domain (e.g., example.com), "
@@ -69,13 +63,14 @@ async def smart_find_apply_url(
     ]
 
     json_blob("LLM", "DEBUG", "find_apply_prompt", {"messages": messages})
-    resp = client.chat.completions.create(
-        model="gpt-4o-mini",
-        response_format={"type": "json_object"},
-        messages=messages,
-        temperature=0.1,
-        max_tokens=600,
-    )
+    with llm_stage("find_apply"):
+        resp = await acreate_chat_completion(
+            model="gpt-4o-mini",
+            response_format={"type": "json_object"},
+            messages=messages,
+            temperature=0.1,
+            max_tokens=600,
+        )
 
     raw_content = resp.choices[0].message.content or "{}"
     import json
@@ -1,27 +1,91 @@
 import json
 import re
 from typing import Optional, Dict, Any, List
-from urllib.parse import urljoin, urlparse
+from urllib.parse import urlparse
 from ddgs import DDGS
-from openai import OpenAI
+from webbot.company_kb import averify_domain, get_company_kb
+from webbot.config import load_settings
+from webbot.harvest import HarvestResult, harvest_links
+from webbot.link_rank import LinkRanking, rank_links
+from webbot.llm.chat import acreate_chat_completion
+from webbot.llm.telemetry import llm_stage
+from webbot.llm.tokens import count_tokens
 from webbot.tracing import action, event, json_blob, text, image
 
 
+# Fixed scroll sleeps each page load used to spend before harvest_links replaced them
+_LEGACY_SCROLL_WAIT_S = {
+    "stage2_main": 3.5,
+    "stage2_about": 0.5,
+    "careers_page": 1.0,
+    "about_page": 0.0,
+    "stage3_careers": 4.4,
+    "stage3_job": 1.0,
+}
+
+
+def _record_harvest(trace, where: str, harvest: HarvestResult) -> None:
+    """Add one page's harvest metrics to the trace, with running totals of time saved."""
+    totals = trace.setdefault("harvest", {"pages": [], "elapsed_s": 0.0, "saved_s": 0.0})
+    metrics = harvest.metrics(_LEGACY_SCROLL_WAIT_S.get(where, 0.0))
+    totals["pages"].append({"where": where, **metrics})
+    totals["elapsed_s"] = round(totals["elapsed_s"] + metrics["elapsed_s"], 3)
+    totals["saved_s"] = round(totals["saved_s"] + metrics["saved_s"], 3)
+
+
+def _format_links(links: List[Dict[str, Any]]) -> str:
+    return "\n".join(f"- {link['text']}: {link['url']}" for link in links)
+
+
+def _record_link_prompt(trace, where: str, ranking: LinkRanking, prompt: Optional[str], legacy_window: int) -> None:
+    """Track link-prompt size (vs the old first-N DOM window) and how often the LLM was skipped."""
+    totals = trace.setdefault("link_rank", {"llm_calls": 0, "llm_skipped": 0, "prompt_tokens": 0, "calls": []})
+    entry = {"where": where, **ranking.summary()}
+    if prompt is None:
+        totals["llm_skipped"] += 1
+        entry["llm_skipped"] = True
+    else:
+        totals["llm_calls"] += 1
+        entry["prompt_tokens"] = count_tokens(prompt)
+        entry["link_tokens"] = count_tokens(_format_links(ranking.shortlist))
+        entry["legacy_link_tokens"] = count_tokens(_format_links(ranking.original[:legacy_window]))
+        totals["prompt_tokens"] += entry["prompt_tokens"]
+    totals["calls"].append(entry)
+    event(
+        "FIND_APPLY",
+        "INFO",
+        "link_prompt",
+        where=where,
+        links=entry["links"],
+        shortlist=entry["shortlist"],
+        llm_skipped=prompt is None,
+        prompt_tokens=entry.get("prompt_tokens"),
+        legacy_link_tokens=entry.get("legacy_link_tokens"),
+    )
+
+
 async def agentic5_find_apply_url(
     job_url: str,
     job_description_summary: str,
     do_not_apply_domains: List[str],
     page,
     max_rounds: int = 6,
+    company_name: Optional[str] = None,
 ) -> tuple[Optional[str], Dict[str, Any]]:
-    """Three-stage deterministic approach to find apply URL."""
+    """Three-stage deterministic approach to find apply URL.
+
+    ``company_name`` (when already extracted) lets stage 1 skip its name-extraction call.
+    """
     trace = {"stages": {}}
     
     # Stage 1: Find official company website
     print("\n🔍 STAGE 1: Finding official company website...")
     event("FIND_APPLY", "INFO", "agentic5_stage1_start", job_url=job_url)
     
-    stage1_result = _stage1_find_official_website(job_url, job_description_summary, page, trace)
+    with llm_stage("agentic5.stage1"):
+        stage1_result = await _stage1_find_official_website(
+            job_url, job_description_summary, page, trace, company_name=company_name
+        )
     if not stage1_result:
         print("❌ Stage 1 failed: Could not find official company website")
         return None, trace
@@ -33,10 +97,14 @@ async def agentic5_find_apply_url(
     print("\n🔍 STAGE 2: Finding careers page on official website...")
     event("FIND_APPLY", "INFO", "agentic5_stage2_start", official_domain=official_domain)
     
-    stage2_result = await _stage2_find_careers_page(official_domain, page, trace)
+    with llm_stage("agentic5.stage2"):
+        stage2_result = await _stage2_find_careers_page(official_domain, page, trace)
     if not stage2_result:
         print("❌ Stage 2 failed: Could not find careers page")
         return None, trace
+    kb = get_company_kb()
+    if kb is not None and stage1_result.get("source") != "company_kb" and trace.get("company_name"):
+        kb.confirm(trace["company_name"], official_domain)
     
     careers_url = stage2_result.get("careers_url")
     apply_url = stage2_result.get("apply_url")
@@ -52,7 +120,8 @@ async def agentic5_find_apply_url(
         print("\n🔍 STAGE 3: Validating careers page and navigating to specific job...")
         event("FIND_APPLY", "INFO", "agentic5_stage3_start", careers_url=careers_url)
         
-        stage3_result = await _stage3_validate_and_navigate(careers_url, job_description_summary, page, trace)
+        with llm_stage("agentic5.stage3"):
+            stage3_result = await _stage3_validate_and_navigate(careers_url, job_description_summary, page, trace)
         if stage3_result:
             return stage3_result, trace
         else:
@@ -65,27 +134,73 @@ async def agentic5_find_apply_url(
         return None, trace
 
 
-def _stage1_find_official_website(job_url: str, job_description_summary: str, page, trace) -> Optional[Dict[str, Any]]:
-    """Stage 1: Find the official company website using search."""
-    client = OpenAI()
-    
-    # Extract company name from job description
-    company_extract_prompt = f"""
-    Extract the company name from this job posting summary. Return only the company name, nothing else.
-    
-    Job posting: {job_description_summary}
-    """
-    
-    with action("company_extract", category="LLM"):
-        resp = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[{"role": "user", "content": company_extract_prompt}],
-            temperature=0.0,
-        )
-        company_name = resp.choices[0].message.content.strip()
-        json_blob("LLM", "DEBUG", "stage1_company_extract", {"prompt": company_extract_prompt, "response": company_name})
+def _company_from_summary(job_description_summary: str) -> Optional[str]:
+    """Company name from the "Company: ..." line the CLI writes into the summary."""
+    m = re.search(r"^Company:\s*(.+)$", job_description_summary or "", re.MULTILINE)
+    return m.group(1).strip() if m else None
+
+
+def _title_from_summary(job_description_summary: str) -> Optional[str]:
+    """Job title from the "Title: ..." line of the summary, else its first line."""
+    m = re.search(r"^Title:\s*(.+)$", job_description_summary or "", re.MULTILINE)
+    if m:
+        return m.group(1).strip()
+    lines = [line.strip() for line in (job_description_summary or "").splitlines() if line.strip()]
+    return lines[0] if lines else None
+
+
+async def _stage1_from_knowledge_base(company_name: str, trace) -> Optional[Dict[str, Any]]:
+    """Answer stage 1 from the company knowledge base, re-verifying stale entries first."""
+    kb = get_company_kb()
+    known = kb.resolve(company_name) if kb else None
+    if known is None:
+        return None
+    if kb.is_stale(known):
+        ok = await averify_domain(known.normalized_domain)
+        known = kb.mark_verified(known, ok)
+        event("FIND_APPLY", "INFO", "company_kb_reverified", company=company_name, domain=known.normalized_domain, ok=ok)
+        if known.confidence < kb.min_confidence:
+            return None
+    result = {
+        "official_domain": known.normalized_domain,
+        "confidence": known.confidence,
+        "rationale": "Known company domain (company knowledge base)",
+        "source": "company_kb",
+    }
+    trace["stages"]["stage1"] = result
+    event("FIND_APPLY", "INFO", "company_kb_hit", company=company_name, domain=known.normalized_domain)
+    return result
+
+
+async def _stage1_find_official_website(
+    job_url: str, job_description_summary: str, page, trace, company_name: Optional[str] = None
+) -> Optional[Dict[str, Any]]:
+    """Stage 1: Find the official company website, from the knowledge base or by search."""
+    company_name = company_name or _company_from_summary(job_description_summary)
+    if not company_name:
+        # Extract company name from job description
+        company_extract_prompt = f"""
+        Extract the company name from this job posting summary. Return only the company name, nothing else.
+        
+        Job posting: {job_description_summary}
+        """
+        
+        with action("company_extract", category="LLM"):
+            resp = await acreate_chat_completion(
+                model="gpt-4o-mini",
+                messages=[{"role": "user", "content": company_extract_prompt}],
+                temperature=0.0,
+            )
+            company_name = resp.choices[0].message.content.strip()
+            json_blob("LLM", "DEBUG", "stage1_company_extract", {"prompt": company_extract_prompt, "response": company_name})
     
     print(f"🏢 Company name extracted: {company_name}")
+    trace["company_name"] = company_name
+    
+    known = await _stage1_from_knowledge_base(company_name, trace)
+    if known is not None:
+        print(f"📚 Official website from knowledge base: {known['official_domain']}")
+        return known
     
     # Search for official website
     search_prompt = f"""
@@ -107,7 +222,7 @@ def _stage1_find_official_website(job_url: str, job_description_summary: str, pa
     """
     
     with action("official_website_search", category="LLM"):
-        resp = client.chat.completions.create(
+        resp = await acreate_chat_completion(
             model="gpt-4o-mini",
             messages=[{"role": "user", "content": search_prompt}],
             temperature=0.0,
@@ -120,6 +235,10 @@ def _stage1_find_official_website(job_url: str, job_description_summary: str, pa
         try:
             result = json.loads(content)
             trace["stages"]["stage1"] = result
+            kb = get_company_kb()
+            if kb is not None and result.get("official_domain"):
+                # Unverified until stage 2 finds a careers page on it
+                kb.remember(company_name, result["official_domain"], confidence=result.get("confidence"))
             return result
         except json.JSONDecodeError as e:
             print(f"❌ Failed to parse Stage 1 JSON response: {e}")
@@ -128,68 +247,58 @@ def _stage1_find_official_website(job_url: str, job_description_summary: str, pa
 
 
 async def _stage2_find_careers_page(official_domain: str, page, trace) -> Optional[Dict[str, Any]]:
-    """Stage 2: Find careers page on official website."""
-    client = OpenAI()
-    
+    """Stage 2: Find careers page on official website, reusing the per-domain careers cache."""
+    kb = get_company_kb()
+    cached = kb.careers(official_domain) if kb else None
+    if cached is not None:
+        trace["stages"]["stage2_cache"] = cached.as_dict()
+        event("FIND_APPLY", "INFO", "careers_cache_hit", domain=official_domain, found=cached.found, ats=cached.ats_provider)
+        if not cached.found:
+            print(f"📚 Cached: no careers page on {official_domain}")
+            return None
+        if not cached.careers_url:
+            return {"email_instructions": cached.email_instructions}
+        print(f"📚 Cached careers page: {cached.careers_url}")
+        result = await _analyze_careers_page(cached.careers_url, page, trace)
+        if result:
+            return result
+        # The remembered page no longer loads; rediscover it
+        kb.forget_careers(official_domain)
+        trace["stages"].pop("stage2_error", None)
+
+    result = await _crawl_for_careers_page(official_domain, page, trace)
+    # Errors (page load, unparseable LLM output) may be transient and are not cached
+    if kb is not None and "stage2_error" not in trace["stages"]:
+        result = result or {}
+        kb.remember_careers(
+            official_domain,
+            careers_url=result.get("careers_url"),
+            email_instructions=result.get("email_instructions"),
+            apply_url=result.get("apply_url"),
+        )
+    return result or None
+
+
+async def _crawl_for_careers_page(official_domain: str, page, trace) -> Optional[Dict[str, Any]]:
+    """Crawl the homepage and about pages and ask the LLM which links lead to careers."""
     # Load the main page
     main_url = f"https://{official_domain}"
     print(f"🌐 Loading main page: {main_url}")
     
     try:
         await page.goto(main_url, wait_until="domcontentloaded", timeout=15000)
-        try:
-            await page.wait_for_load_state("networkidle", timeout=10000)
-        except Exception:
-            pass  # Continue even if networkidle times out
-        
-        # Comprehensive scrolling to trigger lazy content
-        print("📜 Scrolling to load all content...")
-        await page.evaluate("window.scrollTo(0, 0)")  # Start at top
-        await page.wait_for_timeout(500)
-        
-        # Scroll down in chunks
-        for i in range(5):
-            await page.evaluate(f"window.scrollTo(0, {(i+1) * 1000})")
-            await page.wait_for_timeout(300)
-        
-        # Scroll to bottom
-        await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-        await page.wait_for_timeout(1000)
-        
-        # Scroll back to top
-        await page.evaluate("window.scrollTo(0, 0)")
-        await page.wait_for_timeout(500)
-        
-        # Extract all links
-        links = await page.evaluate("""
-            () => {
-                const anchors = document.querySelectorAll('a[href]');
-                return Array.from(anchors).map(a => ({
-                    text: a.textContent.trim(),
-                    href: a.href,
-                    title: a.title || ''
-                })).filter(link => link.text.length > 0);
-            }
-        """)
-        
-        # Resolve relative URLs to absolute
-        resolved_links = []
-        for link in links:
-            try:
-                absolute_url = urljoin(main_url, link["href"])
-                resolved_links.append({
-                    "text": link["text"],
-                    "url": absolute_url,
-                    "title": link["title"]
-                })
-            except Exception:
-                continue
-        
+
+        print("📜 Harvesting links until no new content loads...")
+        harvest = await harvest_links(page)
+        _record_harvest(trace, "stage2_main", harvest)
+        resolved_links = harvest.links
+
         print(f"🔗 Found {len(resolved_links)} links on main page")
         json_blob("LINKS", "DEBUG", "stage2_main_page_links", {"count": len(resolved_links), "links": resolved_links[:20]})
         
         # Also check about/company pages for additional links
         all_links = resolved_links.copy()
+        seen_urls = {link["url"] for link in all_links}
         about_links = [link for link in resolved_links if any(keyword in link["text"].lower() for keyword in ["about", "company", "team"])]
         
         if about_links:
@@ -198,39 +307,13 @@ async def _stage2_find_careers_page(official_domain: str, page, trace) -> Option
                 try:
                     print(f"🔍 Visiting about page: {about_link['url']}")
                     await page.goto(about_link["url"], wait_until="domcontentloaded", timeout=10000)
-                    try:
-                        await page.wait_for_load_state("networkidle", timeout=5000)
-                    except Exception:
-                        pass
-                    
-                    # Scroll to load content
-                    await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-                    await page.wait_for_timeout(500)
-                    
-                    about_page_links = await page.evaluate("""
-                        () => {
-                            const anchors = document.querySelectorAll('a[href]');
-                            return Array.from(anchors).map(a => ({
-                                text: a.textContent.trim(),
-                                href: a.href,
-                                title: a.title || ''
-                            })).filter(link => link.text.length > 0);
-                        }
-                    """)
-                    
-                    # Resolve relative URLs
-                    for link in about_page_links:
-                        try:
-                            absolute_url = urljoin(about_link["url"], link["href"])
-                            all_links.append({
-                                "text": link["text"],
-                                "url": absolute_url,
-                                "title": link["title"]
-                            })
-                        except Exception:
-                            continue
+                    about_harvest = await harvest_links(page)
+                    _record_harvest(trace, "stage2_about", about_harvest)
+                    new_links = [link for link in about_harvest.links if link["url"] not in seen_urls]
+                    seen_urls.update(link["url"] for link in new_links)
+                    all_links.extend(new_links)
                     
-                    print(f"🔗 Added {len(about_page_links)} links from about page")
+                    print(f"🔗 Added {len(new_links)} links from about page")
                     
                 except Exception as e:
                     print(f"❌ Error checking about page {about_link['url']}: {e}")
@@ -238,8 +321,20 @@ async def _stage2_find_careers_page(official_domain: str, page, trace) -> Option
         
         print(f"🔗 Total links collected: {len(all_links)}")
         
-        # Analyze links with LLM
-        links_text = "\n".join([f"- {link['text']}: {link['url']}" for link in all_links[:80]])
+        # Pre-rank locally; an obvious careers link skips the LLM entirely
+        settings = load_settings()
+        ranking = rank_links(all_links, base_domain=official_domain, purpose="careers", top_n=settings.link_rank_top_n)
+        dominant = ranking.dominant(settings.link_rank_skip_margin)
+        if dominant is not None:
+            print(f"🎯 Careers link stands out locally, skipping link analysis: {dominant['url']}")
+            careers_result = await _analyze_careers_page(dominant["url"], page, trace)
+            if careers_result:
+                _record_link_prompt(trace, "stage2_link_analysis", ranking, None, legacy_window=80)
+                return careers_result
+            trace["stages"].pop("stage2_error", None)  # fall back to the LLM below
+        
+        # Analyze the top-ranked links with LLM
+        links_text = _format_links(ranking.shortlist)
         
         link_analysis_prompt = f"""
         Analyze these links from the company's main page and about pages. Look for:
@@ -249,7 +344,7 @@ async def _stage2_find_careers_page(official_domain: str, page, trace) -> Option
         4. Any links that might lead to job postings
         
         Total links found: {len(all_links)}
-        Links:
+        Most relevant links (pre-ranked, best first):
         {links_text}
         
         Return ONLY a valid JSON object with these exact keys:
@@ -267,8 +362,9 @@ async def _stage2_find_careers_page(official_domain: str, page, trace) -> Option
         }}
         """
         
+        _record_link_prompt(trace, "stage2_link_analysis", ranking, link_analysis_prompt, legacy_window=80)
         with action("link_analysis", category="LLM"):
-            resp = client.chat.completions.create(
+            resp = await acreate_chat_completion(
                 model="gpt-4o-mini",
                 messages=[{"role": "user", "content": link_analysis_prompt}],
                 temperature=0.0,
@@ -328,63 +424,35 @@ async def _stage2_find_careers_page(official_domain: str, page, trace) -> Option
             except json.JSONDecodeError as e:
                 print(f"❌ Failed to parse Stage 2 link analysis JSON: {e}")
                 print(f"❌ Raw response: {repr(content)}")
+                trace["stages"]["stage2_error"] = str(e)
                 return None
                 
     except Exception as e:
         print(f"❌ Error loading main page: {e}")
+        trace["stages"]["stage2_error"] = str(e)
         return None
 
 
 async def _analyze_careers_page(careers_url: str, page, trace) -> Optional[Dict[str, Any]]:
     """Analyze a careers page to find specific job listings."""
-    client = OpenAI()
-    
     try:
         await page.goto(careers_url, wait_until="domcontentloaded", timeout=15000)
-        try:
-            await page.wait_for_load_state("networkidle", timeout=10000)
-        except Exception:
-            pass  # Continue even if networkidle times out
-        
-        # Scroll to trigger lazy content
-        await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-        await page.wait_for_timeout(1000)
-        
-        # Extract page content
-        page_text = await page.evaluate("document.body.innerText")
-        page_title = await page.evaluate("document.title")
+        harvest = await harvest_links(page, include_text=True)
+        _record_harvest(trace, "careers_page", harvest)
+        page_text = harvest.text or ""
+        page_title = harvest.title
         
         print(f"📄 Careers page title: {page_title}")
         print(f"📄 Careers page text length: {len(page_text)} characters")
         
-        # Extract job listing links
-        job_links = await page.evaluate("""
-            () => {
-                const anchors = document.querySelectorAll('a[href]');
-                return Array.from(anchors).map(a => ({
-                    text: a.textContent.trim(),
-                    href: a.href,
-                    title: a.title || ''
-                })).filter(link => link.text.length > 0);
-            }
-        """)
-        
-        resolved_job_links = []
-        for link in job_links:
-            try:
-                absolute_url = urljoin(careers_url, link["href"])
-                resolved_job_links.append({
-                    "text": link["text"],
-                    "url": absolute_url,
-                    "title": link["title"]
-                })
-            except Exception:
-                continue
-        
+        resolved_job_links = harvest.links
         print(f"🔗 Found {len(resolved_job_links)} links on careers page")
         
-        # Analyze with LLM
-        links_text = "\n".join([f"- {link['text']}: {link['url']}" for link in resolved_job_links[:30]])
+        # Analyze the top-ranked links with LLM
+        ranking = rank_links(
+            resolved_job_links, base_domain=careers_url, purpose="jobs", top_n=load_settings().link_rank_top_n
+        )
+        links_text = _format_links(ranking.shortlist)
         
         careers_analysis_prompt = f"""
         Analyze this careers page to find specific job application URLs.
@@ -410,8 +478,9 @@ async def _analyze_careers_page(careers_url: str, page, trace) -> Optional[Dict[
         }}
         """
         
+        _record_link_prompt(trace, "careers_analysis", ranking, careers_analysis_prompt, legacy_window=30)
         with action("careers_analysis", category="LLM"):
-            resp = client.chat.completions.create(
+            resp = await acreate_chat_completion(
                 model="gpt-4o-mini",
                 messages=[{"role": "user", "content": careers_analysis_prompt}],
                 temperature=0.0,
@@ -451,49 +520,19 @@ async def _analyze_careers_page(careers_url: str, page, trace) -> Optional[Dict[
                 
     except Exception as e:
         print(f"❌ Error analyzing careers page: {e}")
+        trace["stages"]["stage2_error"] = str(e)
         return None
 
 
 async def _analyze_about_page(about_url: str, page, trace) -> Optional[Dict[str, Any]]:
     """Analyze an about page to find careers information."""
-    client = OpenAI()
-    
     try:
         await page.goto(about_url, wait_until="domcontentloaded", timeout=15000)
-        try:
-            await page.wait_for_load_state("networkidle", timeout=10000)
-        except Exception:
-            pass  # Continue even if networkidle times out
-        
-        # Extract page content
-        page_text = await page.evaluate("document.body.innerText")
-        page_title = await page.evaluate("document.title")
-        
-        print(f"📄 About page title: {page_title}")
-        
-        # Extract links
-        links = await page.evaluate("""
-            () => {
-                const anchors = document.querySelectorAll('a[href]');
-                return Array.from(anchors).map(a => ({
-                    text: a.textContent.trim(),
-                    href: a.href,
-                    title: a.title || ''
-                })).filter(link => link.text.length > 0);
-            }
-        """)
-        
-        resolved_links = []
-        for link in links:
-            try:
-                absolute_url = urljoin(about_url, link["href"])
-                resolved_links.append({
-                    "text": link["text"],
-                    "url": absolute_url,
-                    "title": link["title"]
-                })
-            except Exception:
-                continue
+        harvest = await harvest_links(page)
+        _record_harvest(trace, "about_page", harvest)
+        
+        print(f"📄 About page title: {harvest.title}")
+        resolved_links = harvest.links
         
         # Look for careers links
         careers_links = [link for link in resolved_links if any(keyword in link["text"].lower() for keyword in ["career", "job", "work", "apply"])]
@@ -515,67 +554,47 @@ async def _analyze_about_page(about_url: str, page, trace) -> Optional[Dict[str,
 
 async def _stage3_validate_and_navigate(careers_url: str, job_description_summary: str, page, trace) -> Optional[str]:
     """Stage 3: Validate careers page and navigate to specific job posting."""
-    client = OpenAI()
-    
     try:
         print(f"🌐 Loading careers page: {careers_url}")
         await page.goto(careers_url, wait_until="domcontentloaded", timeout=15000)
-        try:
-            await page.wait_for_load_state("networkidle", timeout=10000)
-        except Exception:
-            pass  # Continue even if networkidle times out
-        
-        # Comprehensive scrolling to load all content
-        print("📜 Scrolling careers page to load all content...")
-        await page.evaluate("window.scrollTo(0, 0)")  # Start at top
-        await page.wait_for_timeout(500)
         
-        # Scroll down in chunks
-        for i in range(8):  # More scrolling for careers pages
-            await page.evaluate(f"window.scrollTo(0, {(i+1) * 800})")
-            await page.wait_for_timeout(300)
-        
-        # Scroll to bottom
-        await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-        await page.wait_for_timeout(1000)
-        
-        # Scroll back to top
-        await page.evaluate("window.scrollTo(0, 0)")
-        await page.wait_for_timeout(500)
-        
-        # Extract page content
-        page_text = await page.evaluate("document.body.innerText")
-        page_title = await page.evaluate("document.title")
+        print("📜 Harvesting careers page links until no new content loads...")
+        harvest = await harvest_links(page, include_text=True)
+        _record_harvest(trace, "stage3_careers", harvest)
+        page_text = harvest.text or ""
+        page_title = harvest.title
         
         print(f"📄 Careers page title: {page_title}")
         print(f"📄 Careers page text length: {len(page_text)} characters")
         
-        # Extract all links
-        links = await page.evaluate("""
-            () => {
-                const anchors = document.querySelectorAll('a[href]');
-                return Array.from(anchors).map(a => ({
-                    text: a.textContent.trim(),
-                    href: a.href,
-                    title: a.title || ''
-                })).filter(link => link.text.length > 0);
-            }
-        """)
-        
-        resolved_links = []
-        for link in links:
-            try:
-                absolute_url = urljoin(careers_url, link["href"])
-                resolved_links.append({
-                    "text": link["text"],
-                    "url": absolute_url,
-                    "title": link["title"]
-                })
-            except Exception:
-                continue
-        
+        resolved_links = harvest.links
         print(f"🔗 Found {len(resolved_links)} links on careers page")
         
+        # A job link that clearly matches the searched title goes straight to verification
+        settings = load_settings()
+        ranking = rank_links(
+            resolved_links,
+            base_domain=careers_url,
+            purpose="jobs",
+            query=_title_from_summary(job_description_summary),
+            top_n=settings.link_rank_top_n,
+        )
+        dominant = ranking.dominant(settings.link_rank_skip_margin, min_score=6.0)
+        if dominant is not None:
+            print(f"🎯 Job link stands out locally, skipping page analysis: {dominant['url']}")
+            try:
+                verified = await _verify_job_posting(dominant["url"], job_description_summary, page, trace)
+            except Exception as e:
+                # A posting that fails to load must not cost us the LLM pass below
+                print(f"⚠️ Could not verify locally ranked job link: {e}")
+                trace["stages"]["stage3_shortcut_error"] = str(e)
+                event("FIND_APPLY", "INFO", "stage3_shortcut_failed", url=dominant["url"], error=str(e))
+                verified = None
+            if verified:
+                _record_link_prompt(trace, "stage3_analysis", ranking, None, legacy_window=50)
+                return verified
+            await page.goto(careers_url, wait_until="domcontentloaded", timeout=15000)  # back for the LLM pass
+        
         # Stage 3 Analysis: Determine page type and navigate accordingly
         stage3_analysis_prompt = f"""
         Analyze this careers page to determine its type and next steps.
@@ -584,8 +603,8 @@ async def _stage3_validate_and_navigate(careers_url: str, job_description_summar
         Page title: {page_title}
         Page text preview: {page_text[:1500]}...
         
-        Links found ({len(resolved_links)} total):
-        {chr(10).join([f"- {link['text']}: {link['url']}" for link in resolved_links[:50]])}
+        Most relevant links ({len(ranking.shortlist)} of {len(resolved_links)}, pre-ranked, best first):
+        {_format_links(ranking.shortlist)}
         
         Determine if this page is:
         1. A specific job posting page (with detailed job description and apply button)
@@ -611,8 +630,9 @@ async def _stage3_validate_and_navigate(careers_url: str, job_description_summar
         }}
         """
         
+        _record_link_prompt(trace, "stage3_analysis", ranking, stage3_analysis_prompt, legacy_window=50)
         with action("stage3_analysis", category="LLM"):
-            resp = client.chat.completions.create(
+            resp = await acreate_chat_completion(
                 model="gpt-4o-mini",
                 messages=[{"role": "user", "content": stage3_analysis_prompt}],
                 temperature=0.0,
@@ -688,113 +708,7 @@ async def _stage3_validate_and_navigate(careers_url: str, job_description_summar
                         job_url = matching_job_links[0]
                         print(f"🔍 Visiting potential job posting: {job_url}")
                         
-                        # Navigate to the job posting
-                        await page.goto(job_url, wait_until="domcontentloaded", timeout=15000)
-                        try:
-                            await page.wait_for_load_state("networkidle", timeout=10000)
-                        except Exception:
-                            pass
-                        
-                        # Scroll to load content
-                        await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-                        await page.wait_for_timeout(1000)
-                        
-                        # Verify this is the right job posting
-                        job_page_text = await page.evaluate("document.body.innerText")
-                        job_page_title = await page.evaluate("document.title")
-                        
-                        print(f"📄 Job page title: {job_page_title}")
-                        
-                        # Use LLM to verify this matches our original search
-                        verification_prompt = f"""
-                        Verify if this job posting matches our original search.
-                        
-                        Original search: {job_description_summary}
-                        Current page title: {job_page_title}
-                        Current page text: {job_page_text[:1000]}...
-                        
-                        Return ONLY a valid JSON object with:
-                        - "matches": true/false
-                        - "confidence": High/Medium/Low
-                        - "rationale": "explanation of match or mismatch"
-                        - "apply_button_found": true/false
-                        - "apply_button_text": "text of apply button if found"
-                        
-                        Example response format:
-                        {{
-                            "matches": true,
-                            "confidence": "High",
-                            "rationale": "Job title and requirements match",
-                            "apply_button_found": true,
-                            "apply_button_text": "Apply for this Job"
-                        }}
-                        """
-                        
-                        with action("job_verification", category="LLM"):
-                            resp = client.chat.completions.create(
-                                model="gpt-4o-mini",
-                                messages=[{"role": "user", "content": verification_prompt}],
-                                temperature=0.0,
-                            )
-                            verification_content = resp.choices[0].message.content
-                            json_blob("LLM", "DEBUG", "job_verification", {"prompt": verification_prompt, "response": verification_content})
-                            
-                            print(f"🔍 Job verification response: {verification_content}")
-                            
-                            try:
-                                # Clean up markdown code blocks if present
-                                cleaned_content = verification_content.strip()
-                                if cleaned_content.startswith("```json"):
-                                    cleaned_content = cleaned_content[7:]  # Remove ```json
-                                if cleaned_content.endswith("```"):
-                                    cleaned_content = cleaned_content[:-3]  # Remove ```
-                                cleaned_content = cleaned_content.strip()
-                                
-                                verification = json.loads(cleaned_content)
-                                matches = verification.get("matches", False)
-                                confidence = verification.get("confidence", "Low")
-                                rationale = verification.get("rationale", "")
-                                apply_button_found = verification.get("apply_button_found", False)
-                                apply_button_text = verification.get("apply_button_text", "")
-                                
-                                print(f"📊 Job match: {matches} (confidence: {confidence})")
-                                print(f"📊 Rationale: {rationale}")
-                                
-                                if matches and apply_button_found:
-                                    print(f"🎯 Found matching job with apply button: '{apply_button_text}'")
-                                    print("🖱️ Clicking apply button...")
-                                    
-                                    # Try to click the apply button
-                                    try:
-                                        apply_button = await page.locator(f"text={apply_button_text}").first
-                                        await apply_button.click()
-                                        await page.wait_for_timeout(2000)
-                                        
-                                        final_url = page.url
-                                        print(f"✅ Navigated to application form: {final_url}")
-                                        
-                                        # Take screenshot
-                                        try:
-                                            png = await page.screenshot(full_page=False)
-                                            image("BROWSER", "DEBUG", "stage3_final_application_form", png)
-                                        except Exception:
-                                            pass
-                                        
-                                        return final_url
-                                        
-                                    except Exception as e:
-                                        print(f"❌ Failed to click apply button: {e}")
-                                        return job_url  # Return job URL as fallback
-                                elif matches:
-                                    print("✅ Found matching job posting")
-                                    return job_url
-                                else:
-                                    print("❌ Job posting doesn't match our search")
-                                    return None
-                                    
-                            except json.JSONDecodeError as e:
-                                print(f"❌ Failed to parse job verification JSON: {e}")
-                                return job_url  # Return job URL as fallback
+                        return await _verify_job_posting(job_url, job_description_summary, page, trace)
                     else:
                         print("❌ No matching job links found in listings")
                         return None
@@ -829,3 +743,108 @@ async def _stage3_validate_and_navigate(careers_url: str, job_description_summar
     except Exception as e:
         print(f"❌ Error in Stage 3: {e}")
         return None
+
+
+async def _verify_job_posting(job_url: str, job_description_summary: str, page, trace) -> Optional[str]:
+    """Open a candidate job posting, confirm it matches the search, and click through to apply."""
+    # Navigate to the job posting
+    await page.goto(job_url, wait_until="domcontentloaded", timeout=15000)
+    job_harvest = await harvest_links(page, include_text=True)
+    _record_harvest(trace, "stage3_job", job_harvest)
+    
+    # Verify this is the right job posting
+    job_page_text = job_harvest.text or ""
+    job_page_title = job_harvest.title
+    
+    print(f"📄 Job page title: {job_page_title}")
+    
+    # Use LLM to verify this matches our original search
+    verification_prompt = f"""
+    Verify if this job posting matches our original search.
+    
+    Original search: {job_description_summary}
+    Current page title: {job_page_title}
+    Current page text: {job_page_text[:1000]}...
+    
+    Return ONLY a valid JSON object with:
+    - "matches": true/false
+    - "confidence": High/Medium/Low
+    - "rationale": "explanation of match or mismatch"
+    - "apply_button_found": true/false
+    - "apply_button_text": "text of apply button if found"
+    
+    Example response format:
+    {{
+        "matches": true,
+        "confidence": "High",
+        "rationale": "Job title and requirements match",
+        "apply_button_found": true,
+        "apply_button_text": "Apply for this Job"
+    }}
+    """
+    
+    with action("job_verification", category="LLM"):
+        resp = await acreate_chat_completion(
+            model="gpt-4o-mini",
+            messages=[{"role": "user", "content": verification_prompt}],
+            temperature=0.0,
+        )
+        verification_content = resp.choices[0].message.content
+        json_blob("LLM", "DEBUG", "job_verification", {"prompt": verification_prompt, "response": verification_content})
+        
+        print(f"🔍 Job verification response: {verification_content}")
+        
+        try:
+            # Clean up markdown code blocks if present
+            cleaned_content = verification_content.strip()
+            if cleaned_content.startswith("```json"):
+                cleaned_content = cleaned_content[7:]  # Remove ```json
+            if cleaned_content.endswith("```"):
+                cleaned_content = cleaned_content[:-3]  # Remove ```
+            cleaned_content = cleaned_content.strip()
+            
+            verification = json.loads(cleaned_content)
+            matches = verification.get("matches", False)
+            confidence = verification.get("confidence", "Low")
+            rationale = verification.get("rationale", "")
+            apply_button_found = verification.get("apply_button_found", False)
+            apply_button_text = verification.get("apply_button_text", "")
+            
+            print(f"📊 Job match: {matches} (confidence: {confidence})")
+            print(f"📊 Rationale: {rationale}")
+            
+            if matches and apply_button_found:
+                print(f"🎯 Found matching job with apply button: '{apply_button_text}'")
+                print("🖱️ Clicking apply button...")
+                
+                # Try to click the apply button
+                try:
+                    apply_button = await page.locator(f"text={apply_button_text}").first
+                    await apply_button.click()
+                    await page.wait_for_timeout(2000)
+                    
+                    final_url = page.url
+                    print(f"✅ Navigated to application form: {final_url}")
+                    
+                    # Take screenshot
+                    try:
+                        png = await page.screenshot(full_page=False)
+                        image("BROWSER", "DEBUG", "stage3_final_application_form", png)
+                    except Exception:
+                        pass
+                    
+                    return final_url
+                    
+                except Exception as e:
+                    print(f"❌ Failed to click apply button: {e}")
+                    return job_url  # Return job URL as fallback
+            elif matches:
+                print("✅ Found matching job posting")
+                return job_url
+            else:
+                print("❌ Job posting doesn't match our search")
+                return None
+                
+        except json.JSONDecodeError as e:
+            print(f"❌ Failed to parse job verification JSON: {e}")
+            return job_url  # Return job URL as fallback
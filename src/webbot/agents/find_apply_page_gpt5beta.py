@@ -1,9 +1,12 @@
 from __future__ import annotations
 from typing import Optional, Dict, Any, List
+import asyncio
 import json
 import time
 
-from ..ai_search import get_openai_client
+from ..llm.client import get_async_openai_client
+from ..llm.ratelimit import acall_with_limits, estimate_tokens
+from ..llm.telemetry import llm_stage, record_call
 from ..apply_finder import domain
 from ..tracing import action, json_blob, event
 
@@ -65,19 +68,27 @@ async def agentic5beta_find_apply_url(
     This runs entirely server-side: we don't execute any local searches.
     """
     disallowed = disallowed_domains or []
-    client = get_openai_client()
+    client = await get_async_openai_client()
 
     prompt = _build_prompt(company_name, job_title, extra_keywords, disallowed, distilled_fragments)
     json_blob("LLM", "DEBUG", "agentic5beta_prompt", {"model": model, "prompt": prompt})
 
     with action("agentic5beta_setup", category="FIND_APPLY", company=company_name, title=job_title):
-        assistant = client.beta.assistants.create(
+        # Management calls are cheap on TPM; the run itself is sized by its prompt
+        assistant = await acall_with_limits(model, 0, lambda: client.beta.assistants.create(
             name="Job Search Agent",
             model=model,
             tools=[{"type": "web"}],  # relies on OpenAI web tool in Assistants API
+        ))
+        thread = await acall_with_limits(
+            model, 0, lambda: client.beta.threads.create(messages=[{"role": "user", "content": prompt}])
+        )
+        run_started = time.perf_counter()
+        run = await acall_with_limits(
+            model,
+            estimate_tokens([{"role": "user", "content": prompt}]),
+            lambda: client.beta.threads.runs.create(thread_id=thread.id, assistant_id=assistant.id),
         )
-        thread = client.beta.threads.create(messages=[{"role": "user", "content": prompt}])
-        run = client.beta.threads.runs.create(thread_id=thread.id, assistant_id=assistant.id)
         json_blob("FIND_APPLY", "TRACE", "agentic5beta_run_started", {"assistant_id": assistant.id, "thread_id": thread.id, "run_id": run.id})
 
     # Poll until completion
@@ -85,16 +96,27 @@ async def agentic5beta_find_apply_url(
     status = run.status
     with action("agentic5beta_run", category="FIND_APPLY", run_id=run.id):
         while status not in {"completed", "failed", "cancelled", "expired"}:
-            time.sleep(poll_interval_s)
-            run = client.beta.threads.runs.retrieve(thread_id=thread.id, run_id=run.id)
+            await asyncio.sleep(poll_interval_s)
+            run = await acall_with_limits(
+                model, 0, lambda: client.beta.threads.runs.retrieve(thread_id=thread.id, run_id=run.id)
+            )
             status = run.status
             event("FIND_APPLY", "TRACE", "agentic5beta_status", status=status)
             if time.time() - start > max_wait_s:
                 event("FIND_APPLY", "INFO", "agentic5beta_timeout", seconds=max_wait_s)
                 break
 
+        with llm_stage("agentic5beta.run"):
+            record_call(
+                model,
+                run_started,
+                usage=getattr(run, "usage", None),
+                kind="assistant",
+                error=None if status == "completed" else RuntimeError(f"assistant run {status}"),
+            )
+
         # Collect messages
-        msgs = client.beta.threads.messages.list(thread_id=thread.id)
+        msgs = await acall_with_limits(model, 0, lambda: client.beta.threads.messages.list(thread_id=thread.id))
         # Convert to simple Python dicts
         items = [m.to_dict() if hasattr(m, "to_dict") else m for m in getattr(msgs, "data", [])]
         json_blob("FIND_APPLY", "TRACE", "agentic5beta_messages", items)
@@ -3,6 +3,7 @@ import tldextract
 from playwright.async_api import Page
 from .config import repo_root
 from .ai_search import generate_search_queries
+from .search import get_search_client
 
 
 def load_do_not_apply_domains() -> set[str]:
@@ -59,9 +60,11 @@ async def duckduckgo_html_search(page: Page, query: str, limit: int = 10) -> lis
 async def find_apply_url(
     page: Page, company_name: str, job_title: str, company_domain: str | None
 ) -> str | None:
-    queries = generate_search_queries(company_name, job_title, company_domain)
+    queries = await generate_search_queries(company_name, job_title, company_domain)
+    # All queries go out at once over HTTP; results are still considered in query order
+    by_query = await get_search_client().search_many(queries, limit=10)
     for q in queries:
-        results = await duckduckgo_html_search(page, q, limit=10)
+        results = by_query[q]
         # Prefer links on the official domain if we know it, otherwise look for typical ATS providers
         ats_hints = (
             "greenhouse.io",
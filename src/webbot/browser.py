@@ -1,6 +1,13 @@
 from __future__ import annotations
-from playwright.async_api import async_playwright, BrowserContext, Page
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass
+from typing import AsyncIterator, Callable, Dict, Iterable, List, Optional
+from urllib.parse import urlparse
+import time
+from playwright.async_api import async_playwright, BrowserContext, Page, Request, Route
 from .browser_profiles import BrowserProfile
+from .config import load_settings
+from .tracing import event
 import asyncio
 
 
@@ -98,3 +105,184 @@ async def goto_and_wait(page: Page, url: str) -> None:
     resp = await page.goto(url, wait_until="domcontentloaded", timeout=60000)
     if not resp:
         raise RuntimeError(f"Navigation returned no response for {url}")
+
+
+# Analytics, tag-manager and ad hosts never needed to read a page (matched with subdomains)
+DEFAULT_TRACKER_DOMAINS = (
+    "google-analytics.com", "googletagmanager.com", "doubleclick.net", "googlesyndication.com",
+    "googleadservices.com", "connect.facebook.net", "hotjar.com", "cdn.segment.com", "api.segment.io",
+    "mixpanel.com", "amplitude.com", "fullstory.com", "heap.io", "heapanalytics.com", "clarity.ms",
+    "bat.bing.com", "px.ads.linkedin.com", "snap.licdn.com", "analytics.tiktok.com", "hs-analytics.net",
+    "hs-banner.com", "hubspot.net", "nr-data.net", "optimizely.com", "quantserve.com",
+    "scorecardresearch.com", "adroll.com", "taboola.com", "outbrain.com", "criteo.com", "intercomcdn.com",
+    "widget.intercom.io", "js.driftt.com", "static.ads-twitter.com",
+)
+
+# Typical transfer size (bytes) and load time (ms) of a skipped request, for saved-cost estimates
+_SKIP_COST = {
+    "image": (40_000, 40),
+    "media": (500_000, 300),
+    "font": (30_000, 35),
+    "script": (60_000, 60),
+    "stylesheet": (20_000, 30),
+}
+_DEFAULT_SKIP_COST = (5_000, 20)
+
+
+@dataclass
+class NavigationSavings:
+    url: str
+    started_at: float
+    requests: int = 0
+    blocked: int = 0
+    stubbed: int = 0
+    bytes_saved_est: int = 0
+    ms_saved_est: int = 0
+
+    def as_dict(self) -> Dict[str, object]:
+        data = asdict(self)
+        data.pop("started_at")
+        data["elapsed_s"] = round(time.time() - self.started_at, 3)
+        return data
+
+
+class LeanBrowsingPolicy:
+    """Context-level request routing for discovery navigation.
+
+    In ``lean`` mode, images, media and fonts (``block_types``) are aborted and
+    requests to tracker hosts are stubbed: scripts get an empty body, beacons a 204.
+    ``full`` mode removes the route so form pages and screenshots load with full
+    fidelity. Savings are estimated per main-frame navigation and handed to
+    ``on_navigation`` when the next navigation starts or on ``flush()``.
+    """
+
+    def __init__(
+        self,
+        *,
+        block_types: Iterable[str] = ("image", "media", "font"),
+        tracker_domains: Iterable[str] = DEFAULT_TRACKER_DOMAINS,
+        on_navigation: Optional[Callable[[Dict[str, object]], None]] = None,
+    ):
+        self.block_types = frozenset(t.strip() for t in block_types if t.strip())
+        self.tracker_domains = tuple(d.strip().lower().lstrip(".") for d in tracker_domains if d.strip())
+        self.on_navigation = on_navigation or _emit_lean_navigation
+        self.mode = "full"
+        self.history: List[Dict[str, object]] = []
+        self._ctx: Optional[BrowserContext] = None
+        self._current: Dict[int, NavigationSavings] = {}
+
+    @classmethod
+    def from_settings(cls, **kwargs) -> Optional["LeanBrowsingPolicy"]:
+        """Policy configured from Settings, or None when lean browsing is disabled."""
+        s = load_settings()
+        if not s.lean_browsing:
+            return None
+        extra = [d for d in (s.lean_tracker_domains or "").split(",") if d.strip()]
+        return cls(
+            block_types=(s.lean_block_types or "").split(","),
+            tracker_domains=DEFAULT_TRACKER_DOMAINS + tuple(extra),
+            **kwargs,
+        )
+
+    def is_tracker(self, url: str) -> bool:
+        host = (urlparse(url).hostname or "").lower()
+        return any(host == d or host.endswith("." + d) for d in self.tracker_domains)
+
+    async def lean(self, ctx: BrowserContext) -> None:
+        """Start routing ``ctx`` through the policy (idempotent)."""
+        if self.mode == "lean" and self._ctx is ctx:
+            return
+        await ctx.route("**/*", self._handle)
+        self._ctx, self.mode = ctx, "lean"
+
+    async def full(self) -> None:
+        """Stop intercepting; later navigations load every resource."""
+        if self.mode != "lean" or self._ctx is None:
+            return
+        try:
+            await self._ctx.unroute("**/*", self._handle)
+        except Exception:
+            pass  # context already closed
+        self.mode = "full"
+        self.flush()
+
+    def flush(self) -> None:
+        """Report the navigations still being counted."""
+        for key in list(self._current):
+            self._finish(key)
+
+    def summary(self) -> Dict[str, object]:
+        return {
+            "navigations": len(self.history),
+            "blocked": sum(int(h["blocked"]) for h in self.history),
+            "stubbed": sum(int(h["stubbed"]) for h in self.history),
+            "bytes_saved_est": sum(int(h["bytes_saved_est"]) for h in self.history),
+            "ms_saved_est": sum(int(h["ms_saved_est"]) for h in self.history),
+        }
+
+    def _finish(self, key: int) -> None:
+        nav = self._current.pop(key, None)
+        if nav is None:
+            return
+        data = nav.as_dict()
+        self.history.append(data)
+        try:
+            self.on_navigation(data)
+        except Exception:
+            pass
+
+    def _savings_for(self, request: Request) -> Optional[NavigationSavings]:
+        try:
+            frame = request.frame
+            page_key = id(frame.page)
+            if request.is_navigation_request() and frame.parent_frame is None:
+                self._finish(page_key)
+                self._current[page_key] = NavigationSavings(url=request.url, started_at=time.time())
+        except Exception:
+            return None  # service-worker and similar requests have no page
+        return self._current.get(page_key)
+
+    async def _handle(self, route: Route, request: Request) -> None:
+        nav = self._savings_for(request)
+        if nav is not None:
+            nav.requests += 1
+        rtype = request.resource_type
+        tracker = self.is_tracker(request.url)
+        if rtype not in self.block_types and not tracker:
+            await route.fallback()
+            return
+        size, ms = _SKIP_COST.get(rtype, _DEFAULT_SKIP_COST)
+        if nav is not None:
+            nav.bytes_saved_est += size
+            nav.ms_saved_est += ms
+        if tracker and rtype == "script":
+            if nav is not None:
+                nav.stubbed += 1
+            await route.fulfill(status=200, content_type="application/javascript", body="")
+        elif tracker and rtype in ("xhr", "fetch", "ping", "beacon", "other"):
+            if nav is not None:
+                nav.stubbed += 1
+            await route.fulfill(status=204, body="")
+        else:
+            if nav is not None:
+                nav.blocked += 1
+            await route.abort("blockedbyclient")
+
+
+def _emit_lean_navigation(data: Dict[str, object]) -> None:
+    event("BROWSER", "INFO", "lean_navigation", **data)
+
+
+@asynccontextmanager
+async def lean_browsing(ctx: BrowserContext) -> AsyncIterator[Optional[LeanBrowsingPolicy]]:
+    """Run a discovery phase under the configured lean policy; full fidelity is restored on exit."""
+    policy = LeanBrowsingPolicy.from_settings()
+    if policy is None:
+        yield None
+        return
+    await policy.lean(ctx)
+    try:
+        yield policy
+    finally:
+        await policy.full()
+        event("BROWSER", "INFO", "lean_browsing_summary", **policy.summary())
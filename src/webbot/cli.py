@@ -1,7 +1,8 @@
 from __future__ import annotations
 import asyncio
 import typer
-from typing import Optional
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
 from pathlib import Path
 from .browser_profiles import discover_browser_profiles, find_browser_profile_by_name_or_dir, BrowserProfile
 from .user_profiles import (
@@ -12,11 +13,12 @@ from .user_profiles import (
     load_user_settings,
     save_user_settings,
 )
-from .browser import smart_launch_with_profile, goto_and_wait
+from .browser import smart_launch_with_profile, goto_and_wait, lean_browsing
 from .forms import snapshot_page
 from .forms.extractor import extract_form_schema_from_snapshot_dir, extract_form_schema_from_page
-from .forms.executor import execute_fill_plan
-from .forms.answerer import generate_answers
+from .forms.executor import execute_fill_plan, execute_fill_stream
+from .forms.answerer import agenerate_answers, apply_answer_completion, astream_answers, build_answer_request
+from .forms.answer_bank import AnswerBank
 from .user_profiles import find_user_profile_by_name
 from .extract import extract_visible_text
 from .apply_finder import (
@@ -29,10 +31,19 @@ from .ai_search import get_openai_client, OpenAIConfigError
 from .agents.find_apply_page import smart_find_apply_url
 from .agents.find_apply_page_gpt5 import agentic5_find_apply_url
 from .agents.find_apply_page_gpt5beta import agentic5beta_find_apply_url
+from .agents.find_apply_concurrent import Finder, FinderResult, run_finders
+from .company_kb import get_company_kb
+from .forms.schema import FormSchema
 from .struct_extract import parse_job_page, AIMode, JobPostingExtract
 from .google_drive import google_drive_login, refresh_resumes
-from .resume_alignment import run_alignment_for_files, select_best_resume_for_job_description
-from .config import repo_root
+from .resume_alignment import run_alignment_for_files, aselect_best_resume_for_job_description
+from .config import load_settings, repo_root
+from .llm.cache import CacheMode, set_cache_mode, get_cache_mode, get_response_cache
+from .llm.batch import BatchRequest, collect_batch, load_batch_job, submit_batch, wait_for_batch
+from .llm.chat import replay_misses
+from .llm.ratelimit import throttle_scope
+from .llm.telemetry import post_run_telemetry, rollup, telemetry_scope
+from .llm.tokens import usage_scope
 from .tracing import init_tracing, action, event, json_blob, image, generate_html_report, enable_console_capture
 
 app = typer.Typer(add_completion=False, no_args_is_help=True)
@@ -48,7 +59,14 @@ def _root(
             "data/test_job_desc1.txt with a strong OpenAI model."
         ),
     ),
+    llm_cache_mode: Optional[CacheMode] = typer.Option(
+        None,
+        "--llm-cache-mode",
+        help="LLM response cache: off, read_through, record, or replay (strict; a miss fails the run). Overrides LLM_CACHE_MODE.",
+    ),
 ) -> None:
+    if llm_cache_mode is not None:
+        set_cache_mode(llm_cache_mode)
     if test_resume_selection:
         profile = _resolve_user_profile("user_ben")
         job_path = repo_root() / "data/test_job_desc1.txt"
@@ -201,6 +219,58 @@ def test_openai_key() -> None:
         raise typer.Exit(code=1)
 
 
+@app.command("bench-openai-client")
+def bench_openai_client(
+    calls: int = typer.Option(
+        8,
+        "--calls",
+        help="LLM calls per path. A full apply-flow makes roughly 8 (extract, agentic5 stages, alignment, answers).",
+    ),
+    model: str = typer.Option("gpt-4o-mini", "--model", help="Model for the tiny probe completion"),
+):
+    """Benchmark per-call latency: fresh validated client per call (old behaviour) vs. the pooled client."""
+    import statistics
+    import time as _t
+    from openai import OpenAI
+    from .config import load_settings
+    from .llm.client import get_client_pool_stats
+
+    messages = [{"role": "user", "content": "Reply with OK."}]
+
+    def _probe(client) -> None:
+        client.chat.completions.create(model=model, messages=messages, max_tokens=1, temperature=0)
+
+    try:
+        api_key = load_settings().openai_api_key
+        if not api_key:
+            raise OpenAIConfigError("Missing OPENAI_API_KEY")
+
+        fresh: list[float] = []
+        for _ in range(calls):
+            t0 = _t.perf_counter()
+            c = OpenAI(api_key=api_key)
+            c.models.list()
+            _probe(c)
+            fresh.append(_t.perf_counter() - t0)
+            c.close()
+
+        pooled: list[float] = []
+        for _ in range(calls):
+            t0 = _t.perf_counter()
+            _probe(get_openai_client())
+            pooled.append(_t.perf_counter() - t0)
+    except Exception as e:
+        typer.echo(f"❌ Benchmark failed: {e}")
+        raise typer.Exit(code=1)
+
+    saved = statistics.mean(fresh) - statistics.mean(pooled)
+    typer.echo(f"Fresh client per call:  mean {statistics.mean(fresh) * 1000:.0f} ms, median {statistics.median(fresh) * 1000:.0f} ms")
+    typer.echo(f"Pooled client:          mean {statistics.mean(pooled) * 1000:.0f} ms, median {statistics.median(pooled) * 1000:.0f} ms")
+    typer.echo(f"Saved per call:         {saved * 1000:.0f} ms")
+    typer.echo(f"Saved per apply-flow:   {saved * calls:.2f} s (~{calls} LLM calls)")
+    typer.echo(f"Pool stats:             {get_client_pool_stats()}")
+
+
 def _resolve_browser_profile(name_or_dir: Optional[str]) -> BrowserProfile:
     if name_or_dir:
         p = find_browser_profile_by_name_or_dir(name_or_dir)
@@ -238,6 +308,229 @@ def _resolve_user_profile(name: str) -> UserProfile:
     return p
 
 
+def _fail_on_replay_misses() -> None:
+    """In strict replay mode, any cache miss fails the command."""
+    if get_cache_mode() == CacheMode.REPLAY and replay_misses() > 0:
+        typer.echo(f"❌ {replay_misses()} LLM cache miss(es) in replay mode; record them with --llm-cache-mode record.")
+        raise typer.Exit(code=1)
+
+
+def _echo_answer_bank(bank: AnswerBank, learned: int = 0) -> None:
+    st = bank.stats
+    typer.echo(
+        f"🏦 Answer bank: {st.hits}/{st.lookups} fields answered locally ({st.hit_rate():.0%})"
+        + (f", {learned} new answers learned" if learned else "")
+    )
+
+
+_FINDER_LABELS = {
+    "agentic5": "Agentic5",
+    "agentic5beta": "Agentic5beta",
+    "agentic": "Agentic AI",
+    "legacy": "Legacy approach",
+}
+
+
+def _echo_finder_result(r: FinderResult) -> None:
+    label = _FINDER_LABELS.get(r.name, r.name)
+    if r.error:
+        typer.echo(f"❌ {label} failed: {r.error}")
+        event("FIND_APPLY", "INFO", f"{r.name}_failed", error=r.error)
+        return
+    if r.name == "agentic5":
+        json_blob("LLM", "DEBUG", "agentic5_rounds", r.trace.get("rounds", []))
+        json_blob("LLM", "DEBUG", "agentic5_final", {"picks": r.trace.get("picks"), "final": r.trace.get("final")})
+    elif r.name == "agentic5beta":
+        json_blob("LLM", "DEBUG", "agentic5beta_picks", r.trace.get("picks"))
+    elif r.name == "agentic":
+        json_blob("LLM", "DEBUG", "agentic_prompt", {"prompt": r.trace.get("prompt")})
+        json_blob("LLM", "DEBUG", "agentic_response", {"response": r.trace.get("response")})
+    if r.url:
+        typer.echo(f"✅ {label} found apply URL in {r.elapsed_s:.1f}s: {r.url}" + (" (confident)" if r.confident else ""))
+    else:
+        typer.echo(f"❌ {label} found no apply URL")
+
+
+@contextmanager
+def _llm_run_scope(name: str):
+    """Collect LLM throttling, token usage and per-call telemetry for one command run and print a summary."""
+    with throttle_scope(name) as throttle, usage_scope(name) as usage, telemetry_scope(name) as calls:
+        yield
+    if usage.calls:
+        typer.echo(
+            f"🧮 LLM tokens: {usage.prompt_tokens} prompt ({usage.cached_tokens} cached, "
+            f"{usage.cached_ratio():.0%}), {usage.completion_tokens} completion over {usage.calls} calls"
+        )
+    if calls:
+        for stage, agg in sorted(rollup(calls).items(), key=lambda kv: -kv[1]["cost_usd"]):
+            typer.echo(
+                f"   {stage:<22} {agg['calls']:>4} calls  {agg['wall_ms'] / 1000:7.1f}s  ${agg['cost_usd']:.4f}"
+            )
+        s = load_settings()
+        if s.telemetry_backend_url and s.telemetry_run_id:
+            post_run_telemetry(s.telemetry_backend_url, s.telemetry_run_id, calls)
+    if throttle.throttled_s or throttle.retries or throttle.failures:
+        typer.echo(
+            f"⏳ LLM throttling: {throttle.throttled_s:.1f}s waiting on rate limits, "
+            f"{throttle.retries} retries ({throttle.backoff_s:.1f}s backoff), {throttle.failures} failed calls"
+        )
+
+
+@app.command("llm-cache-info")
+def llm_cache_info(
+    purge_expired: bool = typer.Option(False, "--purge-expired", help="Delete entries older than the TTL first"),
+):
+    """Show LLM response cache location, size and hit counters."""
+    import json as _json
+
+    cache = get_response_cache()
+    if cache is None:
+        typer.echo("LLM cache is off. Enable with --llm-cache-mode or LLM_CACHE_MODE.")
+        raise typer.Exit(code=0)
+    if purge_expired:
+        typer.echo(f"Purged {cache.purge_expired()} expired entries")
+    typer.echo(_json.dumps({"mode": get_cache_mode().value, **cache.summary()}, indent=2))
+
+
+@app.command("llm-batch-status")
+def llm_batch_status(job_id: str = typer.Argument(..., help="Batch job id printed at submission")):
+    """Poll a batch job once and show how many requests are done, failed or still pending."""
+    import json as _json
+
+    try:
+        result = collect_batch(job_id)
+    except FileNotFoundError as e:
+        typer.echo(f"❌ {e}")
+        raise typer.Exit(code=2)
+    typer.echo(
+        _json.dumps(
+            {
+                "job_id": job_id,
+                "label": result.job.label,
+                "backend": result.job.backend,
+                "status": result.job.status,
+                "completed": len(result.completions),
+                "failed": len(result.errors),
+                "pending": len(result.pending),
+            },
+            indent=2,
+        )
+    )
+
+
+@app.command("parse-jobs-batch")
+def parse_jobs_batch(
+    urls_file: Optional[Path] = typer.Argument(None, help="Text file with one job posting URL per line"),
+    use_browser_profile: Optional[str] = typer.Option(
+        None,
+        "--use-browser-profile",
+        help="Chrome browser profile name or dir (e.g., 'Default', 'Profile 1').",
+    ),
+    batch_job_id: Optional[str] = typer.Option(None, "--batch-job-id", help="Resume a previously submitted batch job"),
+    batch_timeout: float = typer.Option(0.0, "--batch-timeout", help="Seconds to wait for the batch (0 = poll once)"),
+    batch_poll_interval: float = typer.Option(30.0, "--batch-poll-interval"),
+):
+    """Scrape many job postings, then run structured extraction for all of them as one LLM batch job."""
+    import json as _json
+    from .struct_extract import (
+        build_extract_request,
+        get_extract_stats,
+        heuristic_extract,
+        parse_extract_completion,
+        record_extract_route,
+        score_heuristic,
+        weak_fields,
+    )
+
+    if not batch_job_id:
+        if urls_file is None or not urls_file.exists():
+            typer.echo("❌ Provide a URLs file or --batch-job-id")
+            raise typer.Exit(code=2)
+        urls = [u.strip() for u in urls_file.read_text(encoding="utf-8").splitlines() if u.strip() and not u.startswith("#")]
+        browser_profile = _resolve_browser_profile(use_browser_profile)
+
+        async def scrape() -> list[BatchRequest]:
+            queued: list[BatchRequest] = []
+            ctx, page = await smart_launch_with_profile(browser_profile, headless=True)
+            try:
+                for i, url in enumerate(urls):
+                    try:
+                        await goto_and_wait(page, url)
+                        text = await extract_visible_text(page)
+                        title = await page.title()
+                        heur = heuristic_extract(text, title)
+                    except Exception as e:
+                        typer.echo(f"⚠️  {url}: {e}")
+                        continue
+                    # Confident heuristics need no model call; weak fields get a narrowed one
+                    weak = weak_fields(score_heuristic(text, heur, title))
+                    route = record_extract_route(weak)
+                    if route == "skip":
+                        confident.append({"url": url, "extract": heur.model_dump(mode="json"), "source": "heuristic"})
+                        continue
+                    fields = weak if route == "narrow" else None
+                    queued.append(
+                        BatchRequest(
+                            custom_id=f"job-{i}",
+                            body=build_extract_request(text, heur, fields),
+                            context={"url": url, "heuristic": heur.model_dump(mode="json"), "fields": fields},
+                        )
+                    )
+            finally:
+                await ctx.close()
+            return queued
+
+        confident: list[dict] = []
+        queued = asyncio.run(scrape())
+        stats = get_extract_stats()
+        typer.echo(
+            f"[extract] {stats['pages']} pages: {stats['skipped']} from heuristics alone, "
+            f"{stats['narrowed']} narrowed, {stats['full']} full LLM extractions"
+        )
+        if not queued:
+            typer.echo(_json.dumps(confident, indent=2))
+            if not confident:
+                typer.echo("⚠️  No pages scraped; nothing to submit.")
+                raise typer.Exit(code=1)
+            return
+        batch_job_id = submit_batch(queued, label="parse-jobs-batch").job_id
+        typer.echo(f"[batch] submitted {len(queued)} postings as job {batch_job_id}")
+    else:
+        confident = []
+
+    try:
+        result = wait_for_batch(batch_job_id, poll_interval_s=batch_poll_interval, timeout_s=batch_timeout)
+    except FileNotFoundError as e:
+        typer.echo(f"❌ {e}")
+        raise typer.Exit(code=2)
+    rows: list[dict] = list(confident)
+    for cid, ctx in result.job.contexts.items():
+        row: dict = {"url": ctx["url"]}
+        if cid in result.completions:
+            try:
+                heur = JobPostingExtract.model_validate(ctx["heuristic"])
+                content = result.completions[cid].choices[0].message.content
+                extract = parse_extract_completion(content, heur, ctx.get("fields"))
+                row["extract"] = extract.model_dump(mode="json")
+            except Exception as e:
+                row["error"] = str(e)
+        elif cid in result.errors:
+            row["error"] = result.errors[cid]
+        else:
+            row["pending"] = True
+        if "extract" not in row:
+            # Heuristics stand in until the model result arrives (or when it failed)
+            row["heuristic"] = JobPostingExtract.model_validate(ctx["heuristic"]).model_dump(mode="json")
+        rows.append(row)
+    typer.echo(_json.dumps(rows, indent=2))
+    typer.echo(
+        f"[batch] job {batch_job_id}: {result.job.status}, {len(result.completions)} done, "
+        f"{len(result.errors)} failed, {len(result.pending)} pending"
+    )
+    if result.pending:
+        typer.echo(f"[batch] resume with --batch-job-id {batch_job_id}")
+
+
 @app.command("google-drive-login")
 def google_drive_login_cmd(
     user_profile: str = typer.Argument(..., help="User profile name to link to Google Drive"),
@@ -297,6 +590,14 @@ def run(
         "--ai-mode",
         help="AI mode for structured extraction: OPEN_AI (default) or LLM_OFF for heuristics only.",
     ),
+    finder_deadline: float = typer.Option(
+        180.0, "--finder-deadline", help="Overall seconds allowed for the concurrent apply-URL finders"
+    ),
+    early_exit: bool = typer.Option(
+        False,
+        "--early-exit/--no-early-exit",
+        help="Stop the other finder once one returns a high-confidence apply URL",
+    ),
 ):
     """
     Intelligently launch Chrome: attach to existing instance if possible, otherwise launch new instance with chosen profile.
@@ -352,13 +653,32 @@ def run(
                     
                     typer.echo(f"🔍 Searching for apply URL for: {company_name} - {job_title}")
                     
-                    # Agentic approach (default) - use LLM to find the best apply URL
-                    try:
-                        typer.echo("\n🤖 Using agentic AI approach...")
-                        agentic_url, agentic_trace = await smart_find_apply_url(
-                            page, company_name=company_name, job_title=job_title
+                    async def _find_agentic(p):
+                        return await smart_find_apply_url(p, company_name=company_name, job_title=job_title)
+
+                    async def _find_legacy(p):
+                        company_home = await find_company_homepage_from_job_page(p)
+                        title_txt = (await p.title()) or ""
+                        company_dom = domain(company_home) if company_home else None
+                        return await find_apply_url(p, company_name, title_txt, company_dom), {}
+
+                    # Both finders run at once, each on its own page; legacy re-reads the job page
+                    typer.echo(f"\n🤖 Running agentic AI and legacy approaches concurrently (deadline {finder_deadline:.0f}s)...")
+                    async with lean_browsing(ctx):
+                        results = await run_finders(
+                            ctx,
+                            [
+                                Finder("agentic", _find_agentic, needs_page=False),
+                                Finder("legacy", _find_legacy, start_url=initial_job_url),
+                            ],
+                            deadline_s=finder_deadline,
+                            early_exit=early_exit,
+                            on_result=_echo_finder_result,
                         )
-                        
+                    agentic_url = results["agentic"].url
+                    legacy_url = results["legacy"].url
+                    agentic_trace = results["agentic"].trace
+                    if agentic_trace.get("prompt"):
                         # Print LLM prompts and responses with colored separators
                         typer.echo("\n" + "🔵"*20 + " AGENTIC AI PROMPT " + "🔵"*20)
                         typer.echo(agentic_trace["prompt"])
@@ -367,34 +687,6 @@ def run(
                         typer.echo("\n" + "🟡"*20 + " AGENTIC AI PICKS " + "🟡"*20)
                         for key, value in agentic_trace["picks"].items():
                             typer.echo(f"  {key}: {value}")
-                        
-                        if agentic_url:
-                            typer.echo(f"\n✅ Agentic AI found apply URL: {agentic_url}")
-                        else:
-                            typer.echo("\n❌ Agentic AI found no apply URL")
-                            
-                    except Exception as e:
-                        typer.echo(f"❌ Agentic AI approach failed: {e}")
-                        agentic_url = None
-                    
-                    # Legacy approach for comparison
-                    try:
-                        typer.echo("\n🔍 Using legacy heuristic approach...")
-                        company_home = await find_company_homepage_from_job_page(page)
-                        title_txt = (await page.title()) or ""
-                        company_dom = domain(company_home) if company_home else None
-                        legacy_url = await find_apply_url(
-                            page, company_name, title_txt, company_dom
-                        )
-                        
-                        if legacy_url:
-                            typer.echo(f"✅ Legacy approach found apply URL: {legacy_url}")
-                        else:
-                            typer.echo("❌ Legacy approach found no apply URL")
-                            
-                    except Exception as e:
-                        typer.echo(f"❌ Legacy approach failed: {e}")
-                        legacy_url = None
                     
                     # Compare results
                     typer.echo("\n" + "🔄"*20 + " COMPARISON " + "🔄"*20)
@@ -456,6 +748,24 @@ def apply_flow(
         "--apply-url-mode",
         help="Which strategy to use: agentic5beta (default), agentic5, agentic, legacy, or compare",
     ),
+    stream_answers: bool = typer.Option(
+        False,
+        "--stream-answers/--no-stream-answers",
+        help="Fill each field as soon as its streamed answer arrives instead of waiting for all answers",
+    ),
+    rediscover: bool = typer.Option(
+        False,
+        "--rediscover",
+        help="Ignore the cached apply URL for this posting and run discovery again",
+    ),
+    finder_deadline: float = typer.Option(
+        180.0, "--finder-deadline", help="Overall seconds allowed for the concurrent finders in compare mode"
+    ),
+    early_exit: bool = typer.Option(
+        False,
+        "--early-exit/--no-early-exit",
+        help="In compare mode, stop the other finders once one returns a high-confidence apply URL",
+    ),
 ):
     """
     End-to-end application flow in one command:
@@ -469,6 +779,7 @@ def apply_flow(
 
     browser_profile = _resolve_browser_profile(use_browser_profile)
     user_profile_obj = _resolve_user_profile(user_profile)
+    answer_bank = AnswerBank.load(user_profile_obj)
 
     # Initialize tracing
     import time as _t
@@ -525,98 +836,91 @@ def apply_flow(
     async def main():
         ctx, page = await smart_launch_with_profile(browser_profile, headless=headless)
         try:
-            with action("navigate_initial", category="BROWSER", url=initial_job_url):
-                await goto_and_wait(page, initial_job_url)
+            kb = get_company_kb()
+            cached = None if rediscover or kb is None else kb.resolved_posting(initial_job_url)
+            resolution: Dict[str, Any] = {}
+            if cached is not None:
+                # Re-run of a resolved posting: skip extraction and apply-URL discovery
+                typer.echo(f"📚 Cached resolution for this posting: {cached.apply_url} (use --rediscover to refresh)")
+                event("FIND_APPLY", "INFO", "posting_cache_hit", url=initial_job_url, apply_url=cached.apply_url)
+                with action("navigate_apply", category="BROWSER", url=cached.apply_url, cached=True):
+                    await goto_and_wait(page, cached.apply_url)
                 try:
-                    png = await page.screenshot(full_page=False)
-                    image("BROWSER", "DEBUG", "initial_view", png)
+                    await page.wait_for_load_state(state="networkidle", timeout=20000)
+                except Exception:
+                    pass
+                try:
+                    initial_text = await extract_visible_text(page)
+                except Exception:
+                    initial_text = ""
+                initial_text = initial_text or cached.resolution.get("job_description_summary") or ""
+            else:
+                with action("navigate_initial", category="BROWSER", url=initial_job_url):
+                    await goto_and_wait(page, initial_job_url)
+                    try:
+                        png = await page.screenshot(full_page=False)
+                        image("BROWSER", "DEBUG", "initial_view", png)
+                    except Exception:
+                        pass
+                try:
+                    await page.wait_for_load_state(state="networkidle", timeout=20000)
                 except Exception:
                     pass
-            try:
-                await page.wait_for_load_state(state="networkidle", timeout=20000)
-            except Exception:
-                pass
 
-            # Extract job context from live DOM
-            try:
-                initial_text = await extract_visible_text(page)
-            except Exception:
-                initial_text = ""
+                # Extract job context from live DOM
+                try:
+                    initial_text = await extract_visible_text(page)
+                except Exception:
+                    initial_text = ""
 
-            # Structured extract for company/title
-            try:
-                with action("parse_job_page", category="EXTRACT", mode=str(AIMode.OPEN_AI)):
-                    extract = await parse_job_page(page, mode=AIMode.OPEN_AI)
-                    _pretty_print_extract(extract)
-            except OpenAIConfigError:
-                with action("parse_job_page", category="EXTRACT", mode=str(AIMode.LLM_OFF)):
-                    extract = await parse_job_page(page, mode=AIMode.LLM_OFF)
-                    _pretty_print_extract(extract)
-            except Exception:
-                extract = None
-
-            company_name = (extract.company_name if extract else None) or "Unknown Company"
-            job_title = (extract.title if extract else None) or (await page.title() or "Unknown Role")
-
-            # Create job description summary for agentic5
-            job_description_summary = ""
-            if extract:
-                if extract.title:
-                    job_description_summary += f"Title: {extract.title}\n"
-                if extract.company_name:
-                    job_description_summary += f"Company: {extract.company_name}\n"
-                if extract.requirements:
-                    job_description_summary += f"Requirements: {'; '.join(extract.requirements[:5])}\n"
-                if extract.locations:
-                    job_description_summary += f"Locations: {', '.join(extract.locations)}\n"
-            if not job_description_summary:
-                job_description_summary = f"Job posting for {company_name} - {job_title}"
-
-            # Find apply URL using selected mode
-            agentic_url = None
-            legacy_url = None
-            agentic5_url = None
-            agentic_trace = {}
-            agentic5_trace = {}
-
-            dna = load_do_not_apply_domains() | {"ycombinator.com", "workatastartup.com"}
-
-            if apply_url_mode in {"agentic5", "compare"}:
+                # Structured extract for company/title
                 try:
-                    typer.echo("\n🤖 Using agentic AI - GPT5 agent mode to find apply URL...")
+                    with action("parse_job_page", category="EXTRACT", mode=str(AIMode.OPEN_AI)):
+                        extract = await parse_job_page(page, mode=AIMode.OPEN_AI)
+                        _pretty_print_extract(extract)
+                except OpenAIConfigError:
+                    with action("parse_job_page", category="EXTRACT", mode=str(AIMode.LLM_OFF)):
+                        extract = await parse_job_page(page, mode=AIMode.LLM_OFF)
+                        _pretty_print_extract(extract)
+                except Exception:
+                    extract = None
+
+                company_name = (extract.company_name if extract else None) or "Unknown Company"
+                job_title = (extract.title if extract else None) or (await page.title() or "Unknown Role")
+
+                # Create job description summary for agentic5
+                job_description_summary = ""
+                if extract:
+                    if extract.title:
+                        job_description_summary += f"Title: {extract.title}\n"
+                    if extract.company_name:
+                        job_description_summary += f"Company: {extract.company_name}\n"
+                    if extract.requirements:
+                        job_description_summary += f"Requirements: {'; '.join(extract.requirements[:5])}\n"
+                    if extract.locations:
+                        job_description_summary += f"Locations: {', '.join(extract.locations)}\n"
+                if not job_description_summary:
+                    job_description_summary = f"Job posting for {company_name} - {job_title}"
+
+                # Find apply URL using selected mode
+                dna = load_do_not_apply_domains() | {"ycombinator.com", "workatastartup.com"}
+
+                async def _find_agentic5(p):
                     with action("find_apply_agentic5", category="FIND_APPLY", company=company_name, title=job_title):
-                        agentic5_url, agentic5_trace = await agentic5_find_apply_url(
+                        return await agentic5_find_apply_url(
                             job_url=initial_job_url,
                             job_description_summary=job_description_summary,
                             do_not_apply_domains=list(dna),
-                            page=page,
+                            page=p,
                             max_rounds=3,
+                            company_name=extract.company_name if extract else None,
                         )
-                    json_blob("LLM", "DEBUG", "agentic5_rounds", agentic5_trace.get("rounds", []))
-                    json_blob("LLM", "DEBUG", "agentic5_final", {
-                        "picks": agentic5_trace.get("picks"),
-                        "final": agentic5_trace.get("final"),
-                    })
-                    if agentic5_url:
-                        typer.echo(f"✅ Agentic5 found apply URL: {agentic5_url}")
-                    else:
-                        typer.echo("❌ Agentic5 found no apply URL")
-                except Exception as e:
-                    typer.echo(f"❌ Agentic5 approach failed: {e}")
-                    event("FIND_APPLY", "INFO", "agentic5_failed", error=str(e))
 
-            if apply_url_mode in {"agentic5beta", "compare"}:
-                try:
-                    typer.echo("\n🤖 Using agentic AI - GPT5 beta (Assistants web tool) to find apply URL...")
+                async def _find_agentic5beta(p):
                     with action("find_apply_agentic5beta", category="FIND_APPLY", company=company_name, title=job_title):
                         # Provide distilled fragments from the extracted posting to help matching
-                        distilled = []
-                        try:
-                            if extract and extract.requirements:
-                                distilled = [req for req in extract.requirements[:6]]
-                        except Exception:
-                            distilled = []
-                        agentic5b_url, agentic5b_trace = await agentic5beta_find_apply_url(
+                        distilled = list(extract.requirements[:6]) if extract and extract.requirements else []
+                        return await agentic5beta_find_apply_url(
                             company_name=company_name,
                             job_title=job_title,
                             extra_keywords=["ATS", "Ashby", "Greenhouse", "Lever"],
@@ -624,102 +928,129 @@ def apply_flow(
                             distilled_fragments=distilled,
                             model="gpt-4.1",
                         )
-                    json_blob("LLM", "DEBUG", "agentic5beta_picks", agentic5b_trace.get("picks"))
-                    if agentic5b_url:
-                        typer.echo(f"✅ Agentic5beta found apply URL: {agentic5b_url}")
-                    else:
-                        typer.echo("❌ Agentic5beta found no apply URL")
-                except Exception as e:
-                    typer.echo(f"❌ Agentic5beta approach failed: {e}")
-                    event("FIND_APPLY", "INFO", "agentic5beta_failed", error=str(e))
 
-            if apply_url_mode in {"agentic", "compare"}:
-                try:
-                    typer.echo("\n🤖 Using agentic AI approach to find apply URL...")
+                async def _find_agentic(p):
                     with action("find_apply_agentic", category="FIND_APPLY", company=company_name, title=job_title):
-                        agentic_url, agentic_trace = await smart_find_apply_url(page, company_name=company_name, job_title=job_title)
-                        json_blob("LLM", "DEBUG", "agentic_prompt", {"prompt": agentic_trace.get("prompt")})
-                        json_blob("LLM", "DEBUG", "agentic_response", {"response": agentic_trace.get("response")})
-                    if agentic_url:
-                        typer.echo(f"✅ Agentic AI found apply URL: {agentic_url}")
-                    else:
-                        typer.echo("❌ Agentic AI found no apply URL")
-                except Exception as e:
-                    typer.echo(f"❌ Agentic AI approach failed: {e}")
-                    event("FIND_APPLY", "INFO", "agentic_failed", error=str(e))
+                        return await smart_find_apply_url(p, company_name=company_name, job_title=job_title)
 
-            if apply_url_mode in {"legacy", "compare"}:
-                try:
-                    typer.echo("\n🔍 Using legacy heuristic DuckDuckGo approach...")
+                async def _find_legacy(p):
                     with action("find_apply_legacy", category="FIND_APPLY", company=company_name, title=job_title):
-                        company_home = await find_company_homepage_from_job_page(page)
-                        title_txt = (await page.title()) or ""
+                        company_home = await find_company_homepage_from_job_page(p)
+                        title_txt = (await p.title()) or ""
                         company_dom = domain(company_home) if company_home else None
-                        legacy_url = await find_apply_url(page, company_name, title_txt, company_dom)
-                    if legacy_url:
-                        typer.echo(f"✅ Legacy approach found apply URL: {legacy_url}")
+                        return await find_apply_url(p, company_name, title_txt, company_dom), {}
+
+                finders = [
+                    Finder("agentic5", _find_agentic5),
+                    Finder("agentic5beta", _find_agentic5beta, needs_page=False),
+                    Finder("agentic", _find_agentic, needs_page=False),
+                    # Reads the company homepage link off the job page
+                    Finder("legacy", _find_legacy, start_url=initial_job_url),
+                ]
+                # Discovery skips images, fonts, media and trackers; the form page loads in full
+                async with lean_browsing(ctx):
+                    if apply_url_mode == "compare":
+                        typer.echo(
+                            f"\n🤖 Running {len(finders)} apply-URL finders concurrently "
+                            f"(deadline {finder_deadline:.0f}s{', early exit' if early_exit else ''})..."
+                        )
+                        results = await run_finders(
+                            ctx, finders, deadline_s=finder_deadline, early_exit=early_exit, on_result=_echo_finder_result
+                        )
                     else:
-                        typer.echo("❌ Legacy approach found no apply URL")
-                except Exception as e:
-                    typer.echo(f"❌ Legacy approach failed: {e}")
-                    event("FIND_APPLY", "INFO", "legacy_failed", error=str(e))
-
-            # Comparison output if relevant
-            if apply_url_mode == "compare":
-                typer.echo("\n" + "🔄"*20 + " COMPARISON " + "🔄"*20)
-                typer.echo(f"Agentic5:   {agentic5_url or 'None'}")
-                typer.echo(f"Agentic AI: {agentic_url or 'None'}")
-                typer.echo(f"Legacy:     {legacy_url or 'None'}")
-
-            # Choose based on mode
-            if apply_url_mode == "agentic5":
-                chosen_apply_url = agentic5_url or agentic_url or legacy_url
-            elif apply_url_mode == "agentic5beta":
-                chosen_apply_url = locals().get("agentic5b_url") or agentic5_url or agentic_url or legacy_url
-            elif apply_url_mode == "agentic":
-                chosen_apply_url = agentic_url or agentic5_url or legacy_url
-            elif apply_url_mode == "legacy":
-                chosen_apply_url = legacy_url or agentic5_url or agentic_url
-            else:  # compare
-                chosen_apply_url = locals().get("agentic5b_url") or agentic5_url or agentic_url or legacy_url
-
-            # Print final picks to console for visibility
-            try:
-                if agentic5_url or agentic_url or legacy_url:
-                    typer.echo("\n" + "📌"*10 + " FINAL APPLY CANDIDATES " + "📌"*10)
-                    if agentic5_url:
-                        typer.echo(f"agentic5:   {agentic5_url}")
-                    if apply_url_mode in {"agentic5beta", "compare"} and 'agentic5b_url' in locals():
-                        typer.echo(f"agentic5beta: {locals().get('agentic5b_url')}")
-                    if agentic_url:
-                        typer.echo(f"agentic:    {agentic_url}")
-                    if legacy_url:
-                        typer.echo(f"legacy:     {legacy_url}")
-            except Exception:
-                pass
+                        # A single finder keeps using the job page it was opened on
+                        results = {}
+                        for f in finders:
+                            if f.name != apply_url_mode:
+                                continue
+                            typer.echo(f"\n🤖 Finding apply URL with {_FINDER_LABELS[f.name]}...")
+                            try:
+                                url, finder_trace = await f.run(page)
+                                results[f.name] = FinderResult(f.name, url, finder_trace or {})
+                            except Exception as e:
+                                results[f.name] = FinderResult(f.name, error=str(e))
+                            _echo_finder_result(results[f.name])
+
+                agentic5_url = results["agentic5"].url if "agentic5" in results else None
+                agentic5_trace = results["agentic5"].trace if "agentic5" in results else {}
+                agentic5b_url = results["agentic5beta"].url if "agentic5beta" in results else None
+                agentic_url = results["agentic"].url if "agentic" in results else None
+                legacy_url = results["legacy"].url if "legacy" in results else None
+
+                # Comparison output if relevant
+                if apply_url_mode == "compare":
+                    typer.echo("\n" + "🔄"*20 + " COMPARISON " + "🔄"*20)
+                    typer.echo(f"Agentic5:   {agentic5_url or 'None'}")
+                    typer.echo(f"Agentic5beta: {agentic5b_url or 'None'}")
+                    typer.echo(f"Agentic AI: {agentic_url or 'None'}")
+                    typer.echo(f"Legacy:     {legacy_url or 'None'}")
+
+                # Choose based on mode
+                if apply_url_mode == "agentic5":
+                    chosen_apply_url = agentic5_url or agentic_url or legacy_url
+                elif apply_url_mode == "agentic5beta":
+                    chosen_apply_url = agentic5b_url or agentic5_url or agentic_url or legacy_url
+                elif apply_url_mode == "agentic":
+                    chosen_apply_url = agentic_url or agentic5_url or legacy_url
+                elif apply_url_mode == "legacy":
+                    chosen_apply_url = legacy_url or agentic5_url or agentic_url
+                else:  # compare: the first confident pick wins, then the usual priority
+                    confident = [r.url for r in results.values() if r.confident]
+                    chosen_apply_url = (
+                        (confident[0] if confident else None) or agentic5b_url or agentic5_url or agentic_url or legacy_url
+                    )
 
-            # Navigate to the application form
-            if chosen_apply_url:
-                with action("navigate_apply", category="BROWSER", url=chosen_apply_url):
-                    await goto_and_wait(page, chosen_apply_url)
-                    try:
-                        png2 = await page.screenshot(full_page=False)
-                        image("BROWSER", "DEBUG", "apply_candidate_view", png2)
-                    except Exception:
-                        pass
+                # Print final picks to console for visibility
                 try:
-                    await page.wait_for_load_state(state="networkidle", timeout=20000)
-                except Exception:
-                    pass
-            else:
-                clicked = await _heuristic_click_apply(page)
-                if not clicked:
-                    typer.echo("⚠️  No 'Apply' control found via heuristics; staying on current page.")
-                try:
-                    await page.wait_for_load_state(state="networkidle", timeout=20000)
+                    if agentic5_url or agentic_url or legacy_url:
+                        typer.echo("\n" + "📌"*10 + " FINAL APPLY CANDIDATES " + "📌"*10)
+                        if agentic5_url:
+                            typer.echo(f"agentic5:   {agentic5_url}")
+                        if agentic5b_url:
+                            typer.echo(f"agentic5beta: {agentic5b_url}")
+                        if agentic_url:
+                            typer.echo(f"agentic:    {agentic_url}")
+                        if legacy_url:
+                            typer.echo(f"legacy:     {legacy_url}")
                 except Exception:
                     pass
 
+                # Navigate to the application form
+                if chosen_apply_url:
+                    with action("navigate_apply", category="BROWSER", url=chosen_apply_url):
+                        await goto_and_wait(page, chosen_apply_url)
+                        try:
+                            png2 = await page.screenshot(full_page=False)
+                            image("BROWSER", "DEBUG", "apply_candidate_view", png2)
+                        except Exception:
+                            pass
+                    try:
+                        await page.wait_for_load_state(state="networkidle", timeout=20000)
+                    except Exception:
+                        pass
+                else:
+                    clicked = await _heuristic_click_apply(page)
+                    if not clicked:
+                        typer.echo("⚠️  No 'Apply' control found via heuristics; staying on current page.")
+                    try:
+                        await page.wait_for_load_state(state="networkidle", timeout=20000)
+                    except Exception:
+                        pass
+
+                resolution = {
+                    "company_name": extract.company_name if extract else None,
+                    "title": job_title,
+                    "official_domain": (agentic5_trace.get("stages", {}).get("stage1") or {}).get("official_domain"),
+                    "job_description_summary": job_description_summary,
+                    "apply_url_mode": apply_url_mode,
+                    "picks": {
+                        "agentic5": agentic5_url,
+                        "agentic5beta": agentic5b_url,
+                        "agentic": agentic_url,
+                        "legacy": legacy_url,
+                    },
+                }
+
             # Extract form schema from the live form page; if none found, attempt to click the in-page Apply button/tab, then retry once
             with action("extract_form_schema", category="FORM", url=page.url):
                 schema = await extract_form_schema_from_page(page, url=page.url)
@@ -754,12 +1085,22 @@ def apply_flow(
                     msg = "No job application form detected after retry; aborting fill."
                     typer.echo(f"❌ {msg}")
                     event("FORM", "INFO", "no_form_after_retry_abort")
+                    if cached is not None:
+                        kb.forget_posting(initial_job_url)
                     return
+            if cached is None and kb is not None and chosen_apply_url:
+                kb.remember_posting(
+                    initial_job_url,
+                    official_identifier=chosen_apply_url,
+                    apply_url=page.url,
+                    title=resolution.get("title"),
+                    resolution=resolution,
+                )
             typer.echo("[apply-flow] Extracted schema; selecting best resume and generating answers...")
 
             # Select best resume for this job using live job description text
             try:
-                alignment, align_trace = select_best_resume_for_job_description(
+                alignment, align_trace = await aselect_best_resume_for_job_description(
                     profile=user_profile_obj, job_description_text=initial_text or (await page.title() or ""), model=model
                 )
                 typer.echo("\n" + "🔵"*20 + " RESUME ALIGNMENT PROMPT " + "🔵"*20)
@@ -808,15 +1149,39 @@ def apply_flow(
                 except Exception:
                     chosen_resume_txt = ""
 
+            if stream_answers:
+                # Generation and filling overlap; answers land in the schema as they stream
+                answers = astream_answers(
+                    schema,
+                    resume_text=chosen_resume_txt,
+                    job_context=f"URL: {page.url}",
+                    ignore_optional=ignore_optional,
+                    model=model,
+                    answer_bank=answer_bank,
+                )
+                with action("execute_fill_stream", category="FORM", hold_seconds=hold_seconds, model=model):
+                    await execute_fill_stream(
+                        page,
+                        schema,
+                        answers,
+                        user_profile_obj.path,
+                        wait_seconds=hold_seconds,
+                        preferred_resume_pdf=preferred_pdf_path,
+                    )
+                learned = answer_bank.learn_confirmed(schema)
+                _echo_answer_bank(answer_bank, learned)
+                return
+
             # Generate answers with resume + context
             try:
                 with action("generate_answers", category="LLM", model=model):
-                    answered_schema = generate_answers(
+                    answered_schema = await agenerate_answers(
                         schema,
                         resume_text=chosen_resume_txt,
                         job_context=f"URL: {page.url}",
                         ignore_optional=ignore_optional,
                         model=model,
+                        answer_bank=answer_bank,
                     )
             except Exception as e:
                 event("LLM", "INFO", "generate_answers_failed", error=str(e))
@@ -831,6 +1196,8 @@ def apply_flow(
                     wait_seconds=hold_seconds,
                     preferred_resume_pdf=preferred_pdf_path,
                 )
+            learned = answer_bank.learn_confirmed(answered_schema)
+            _echo_answer_bank(answer_bank, learned)
 
         finally:
             if hasattr(page, '_playwright'):
@@ -838,7 +1205,8 @@ def apply_flow(
             else:
                 await ctx.close()
 
-    asyncio.run(main())
+    with _llm_run_scope("apply-flow"):
+        asyncio.run(main())
 
     # Generate HTML report
     try:
@@ -847,6 +1215,7 @@ def apply_flow(
         typer.echo(f"📝 Trace report: {out_path}")
     except Exception as e:
         typer.echo(f"⚠️ Failed to generate trace HTML: {e}")
+    _fail_on_replay_misses()
 
 
 @app.command("snapshot-url")
@@ -1161,9 +1530,10 @@ def answer_form_from_snapshot(
 ):
     """Extract a form schema from a saved snapshot, generate LLM answers using the user's resumes, and print key Q&A pairs."""
     import json as _json
-    from .resume_alignment import run_alignment_for_files
+    from .resume_alignment import arun_alignment_for_files
 
     profile = _resolve_user_profile(user_profile)
+    answer_bank = AnswerBank.load(profile)
     job_desc_path = repo_root() / "data/test_job_desc1.txt"
 
     async def main():
@@ -1172,7 +1542,7 @@ def answer_form_from_snapshot(
 
         # Pick best resume for the provided job description (existing flow)
         try:
-            alignment, trace = run_alignment_for_files(profile=profile, job_desc_path=job_desc_path, model="gpt-4o")
+            alignment, trace = await arun_alignment_for_files(profile=profile, job_desc_path=job_desc_path, model="gpt-4o")
             chosen_resume_txt = ""
             # Find chosen resume txt from user profile's resumes.json (already handled in alignment module)
             # We don't have a direct path here; fallback: read all resume txts under the profile and concatenate
@@ -1205,12 +1575,13 @@ def answer_form_from_snapshot(
             job_context = None
 
         # Generate answers
-        answered = generate_answers(
+        answered = await agenerate_answers(
             schema,
             resume_text=chosen_resume_txt,
             job_context=job_context,
             ignore_optional=ignore_optional,
             model=model,
+            answer_bank=answer_bank,
         )
 
         # Print key questions and answers
@@ -1227,6 +1598,7 @@ def answer_form_from_snapshot(
             "valid": answered.validity.is_valid_job_application_form,
             "qa": pairs,
         }, indent=2))
+        _echo_answer_bank(answer_bank)
 
     asyncio.run(main())
 
@@ -1241,22 +1613,71 @@ def answer_realworld_fixtures(
     ),
     model: str = typer.Option("gpt-4o", "--model"),
     ignore_optional: bool = typer.Option(True, "--ignore-optional/--no-ignore-optional"),
+    batch: bool = typer.Option(False, "--batch", help="Queue all forms as one LLM batch job instead of live calls"),
+    batch_job_id: Optional[str] = typer.Option(None, "--batch-job-id", help="Resume a previously submitted batch job"),
+    batch_timeout: float = typer.Option(0.0, "--batch-timeout", help="Seconds to wait for the batch (0 = poll once)"),
+    batch_poll_interval: float = typer.Option(30.0, "--batch-poll-interval"),
 ):
     """Iterate each realworld fixture folder, load its initial/after_apply snapshots when present, generate answers, and print key Q&A."""
     import json as _json
     from .forms.snapshot_loader import load_snapshot_manifest
-    from .resume_alignment import run_alignment_for_files
+    from .resume_alignment import arun_alignment_for_files
 
     profile = _resolve_user_profile(user_profile)
+    answer_bank = AnswerBank.load(profile)
     job_desc_path = repo_root() / "data/test_job_desc1.txt"
 
+    def _qa(answered: FormSchema) -> list[dict]:
+        qa = []
+        for s in answered.sections:
+            for f in s.fields:
+                label = f.label or f.name or f.field_id
+                ans = f.meta.get("answer") if isinstance(f.meta, dict) else None
+                if ans:
+                    qa.append({"id": f.field_id, "label": label, "type": f.type, "answer": ans})
+        return qa
+
+    def _collect(job_id: str, results: list[dict]) -> None:
+        """Fan batch completions back into the stored schemas; unfinished forms are reported as pending."""
+        result = wait_for_batch(job_id, poll_interval_s=batch_poll_interval, timeout_s=batch_timeout)
+        for cid, ctx in result.job.contexts.items():
+            row = {"fixture": ctx["fixture"], "phase": ctx["phase"], "url": ctx["url"]}
+            if cid in result.completions:
+                schema = FormSchema.model_validate(ctx["schema"])
+                answered = apply_answer_completion(schema, result.completions[cid].choices[0].message.content, model=model)
+                row.update({"valid": answered.validity.is_valid_job_application_form, "qa": _qa(answered)})
+            elif cid in result.errors:
+                row["error"] = result.errors[cid]
+            else:
+                row["pending"] = True
+            results.append(row)
+        typer.echo(
+            f"[batch] job {job_id}: {result.job.status}, {len(result.completions)} done, "
+            f"{len(result.errors)} failed, {len(result.pending)} pending"
+        )
+        if result.pending:
+            typer.echo(f"[batch] resume with --batch-job-id {job_id}")
+
+    if batch_job_id:
+        results: list[dict] = []
+        try:
+            load_batch_job(batch_job_id)
+        except FileNotFoundError as e:
+            typer.echo(f"❌ {e}")
+            raise typer.Exit(code=2)
+        with _llm_run_scope("answer-realworld-fixtures"):
+            _collect(batch_job_id, results)
+        typer.echo(_json.dumps(results, indent=2))
+        return
+
     async def main():
         results: list[dict] = []
+        queued: list[BatchRequest] = []
 
         # Precompute resume text once
         chosen_resume_txt = ""
         try:
-            alignment, trace = run_alignment_for_files(profile=profile, job_desc_path=job_desc_path, model="gpt-4o")
+            alignment, trace = await arun_alignment_for_files(profile=profile, job_desc_path=job_desc_path, model="gpt-4o")
         except Exception:
             alignment = None
         if not chosen_resume_txt:
@@ -1285,33 +1706,131 @@ def answer_realworld_fixtures(
                 try:
                     schema = await extract_form_schema_from_snapshot_dir(snap)
                     man = load_snapshot_manifest(snap)
-                    answered = generate_answers(
-                        schema,
-                        resume_text=chosen_resume_txt,
-                        job_context=f"Fixture: {folder.name} | Phase: {phase} | URL: {man.url}",
-                        ignore_optional=ignore_optional,
-                        model=model,
-                    )
-                    qa = []
-                    for s in answered.sections:
-                        for f in s.fields:
-                            label = f.label or f.name or f.field_id
-                            ans = f.meta.get("answer") if isinstance(f.meta, dict) else None
-                            if ans:
-                                qa.append({"id": f.field_id, "label": label, "type": f.type, "answer": ans})
+                    if batch:
+                        request = build_answer_request(
+                            schema,
+                            resume_text=chosen_resume_txt,
+                            job_context=f"Fixture: {folder.name} | Phase: {phase} | URL: {man.url}",
+                            ignore_optional=ignore_optional,
+                            model=model,
+                            answer_bank=answer_bank,
+                        )
+                        if request is not None:
+                            ctx = {"fixture": folder.name, "phase": phase, "url": man.url, "schema": schema.model_dump(mode="json")}
+                            queued.append(BatchRequest(custom_id=f"{folder.name}/{phase}", body=request, context=ctx))
+                            continue
+                        answered = apply_answer_completion(schema, None, model=model)
+                    else:
+                        answered = await agenerate_answers(
+                            schema,
+                            resume_text=chosen_resume_txt,
+                            job_context=f"Fixture: {folder.name} | Phase: {phase} | URL: {man.url}",
+                            ignore_optional=ignore_optional,
+                            model=model,
+                            answer_bank=answer_bank,
+                        )
                     results.append({
                         "fixture": folder.name,
                         "phase": phase,
                         "url": man.url,
                         "valid": answered.validity.is_valid_job_application_form,
-                        "qa": qa,
+                        "qa": _qa(answered),
                     })
                 except Exception as e:
                     results.append({"fixture": folder.name, "phase": phase, "error": str(e)})
 
-        typer.echo(_json.dumps(results, indent=2))
+        return results, queued
+
+    with _llm_run_scope("answer-realworld-fixtures"):
+        results, queued = asyncio.run(main())
+        if queued:
+            job = submit_batch(queued, label="answer-realworld-fixtures")
+            typer.echo(f"[batch] submitted {len(queued)} forms as job {job.job_id}")
+            _collect(job.job_id, results)
+    typer.echo(_json.dumps(results, indent=2))
+    _echo_answer_bank(answer_bank)
+    cache = get_response_cache()
+    if cache is not None:
+        event("LLM", "INFO", "llm_cache_summary", **cache.summary())
+    _fail_on_replay_misses()
+
+@app.command("bench-form-fill")
+def bench_form_fill(
+    user_profile: str = typer.Option("user_ben", "--user-profile", help="User profile for resume text and PDF"),
+    base_dir: Path = typer.Option(Path("tests/fixtures/realworld"), "--base-dir", help="Base directory of realworld fixtures"),
+    model: str = typer.Option("gpt-4o", "--model"),
+    ignore_optional: bool = typer.Option(True, "--ignore-optional/--no-ignore-optional"),
+):
+    """Time end-to-end form completion on the realworld fixtures: serial (generate, then fill) vs streamed (fill while generating)."""
+    import glob
+    import time as _t
+    from .forms.snapshot_loader import load_snapshot_as_page
+
+    profile = _resolve_user_profile(user_profile)
+    resume_txt = ""
+    for p in glob.glob(str(profile.path / "**/resume_pdf/**/resume.txt"), recursive=True):
+        try:
+            resume_txt += Path(p).read_text(encoding="utf-8") + "\n\n"
+        except Exception:
+            pass
+    if not base_dir.exists():
+        typer.echo(f"⚠️ Base dir not found: {base_dir}")
+        raise typer.Exit(code=2)
+    # Cached replies would arrive all at once and hide the overlap being measured
+    set_cache_mode(CacheMode.OFF)
+
+    async def run_one(snap: Path, streamed: bool) -> tuple[int, float]:
+        ctx, page, man = await load_snapshot_as_page(snap)
+        try:
+            schema = await extract_form_schema_from_page(page, url=man.url)
+            fields = sum(len(s.fields) for s in schema.sections)
+            kwargs = dict(
+                resume_text=resume_txt[:20000],
+                job_context=f"URL: {man.url}",
+                ignore_optional=ignore_optional,
+                model=model,
+            )
+            t0 = _t.perf_counter()
+            if streamed:
+                await execute_fill_stream(page, schema, astream_answers(schema, **kwargs), profile.path, wait_seconds=0)
+            else:
+                answered = await agenerate_answers(schema, **kwargs)
+                await execute_fill_plan(page, answered, profile.path, wait_seconds=0)
+            return fields, _t.perf_counter() - t0
+        finally:
+            await ctx.close()
+
+    async def main():
+        rows = []
+        for folder in sorted(p for p in base_dir.iterdir() if p.is_dir()):
+            for phase in ("after_apply", "initial"):
+                snap = folder / phase
+                if not (snap / "manifest.json").exists():
+                    continue
+                try:
+                    fields, serial_s = await run_one(snap, streamed=False)
+                    if not fields:
+                        continue
+                    _, streamed_s = await run_one(snap, streamed=True)
+                except Exception as e:
+                    typer.echo(f"⚠️ {folder.name}/{phase}: {e}")
+                    continue
+                rows.append((f"{folder.name}/{phase}", fields, serial_s, streamed_s))
+                typer.echo(
+                    f"{folder.name + '/' + phase:<36} {fields:>3} fields  serial {serial_s:6.2f}s  "
+                    f"streamed {streamed_s:6.2f}s  ({1 - streamed_s / serial_s:+.0%} saved)"
+                )
+        if rows:
+            serial_total = sum(r[2] for r in rows)
+            streamed_total = sum(r[3] for r in rows)
+            typer.echo(
+                f"Total over {len(rows)} forms: serial {serial_total:.2f}s, streamed {streamed_total:.2f}s "
+                f"({1 - streamed_total / serial_total:.0%} saved)"
+            )
+
+    with _llm_run_scope("bench-form-fill"):
+        asyncio.run(main())
 
-    asyncio.run(main())
 
 @app.command("execute-form-url")
 def execute_form_url(
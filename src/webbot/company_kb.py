@@ -0,0 +1,810 @@
+from __future__ import annotations
+
+import json
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import tldextract
+
+from .config import load_settings, repo_root
+from .tracing import event
+
+# Stage 1 reports "High" / "Medium" / "Low"; stored as a float so it can decay on failed checks
+CONFIDENCE_LEVELS = {"high": 0.9, "medium": 0.6, "low": 0.3}
+
+_SUFFIXES = {
+    "inc", "incorporated", "llc", "ltd", "limited", "corp", "corporation", "co", "company", "gmbh",
+    "ag", "sa", "plc", "bv", "pty", "srl", "oy", "ab", "the",
+}
+_EXTRACT = tldextract.TLDExtract(suffix_list_urls=())  # bundled suffix list; never fetch at runtime
+
+
+def normalize_company_name(name: Optional[str]) -> str:
+    """Alias key for a company name: lowercase, no punctuation or legal suffixes."""
+    if not name:
+        return ""
+    t = name.lower().replace("&", " and ")
+    t = re.sub(r"[^a-z0-9 ]+", " ", t)
+    words = [w for w in t.split() if w not in _SUFFIXES]
+    return " ".join(words)
+
+
+def normalize_domain(value: Optional[str]) -> str:
+    """Registrable domain for a URL or host ("https://www.jobs.acme.co.uk/x" -> "acme.co.uk")."""
+    if not value:
+        return ""
+    v = value.strip().lower()
+    host = urlparse(v if "//" in v else f"//{v}").hostname or ""
+    ext = _EXTRACT(host)
+    if ext.domain and ext.suffix:
+        return f"{ext.domain}.{ext.suffix}"
+    return host.removeprefix("www.")
+
+
+def confidence_score(value: Any) -> float:
+    if isinstance(value, (int, float)):
+        return max(0.0, min(1.0, float(value)))
+    return CONFIDENCE_LEVELS.get(str(value or "").strip().lower(), 0.3)
+
+
+# (provider, host suffix, tenant taken from the subdomain or the first path segment)
+_ATS_HOSTS: List[Tuple[str, str, str]] = [
+    ("greenhouse", "greenhouse.io", "path"),
+    ("lever", "jobs.lever.co", "path"),
+    ("ashby", "jobs.ashbyhq.com", "path"),
+    ("workable", "apply.workable.com", "path"),
+    ("smartrecruiters", "jobs.smartrecruiters.com", "path"),
+    ("workday", "myworkdayjobs.com", "subdomain"),
+    ("workable", "workable.com", "subdomain"),
+    ("bamboohr", "bamboohr.com", "subdomain"),
+    ("recruitee", "recruitee.com", "subdomain"),
+    ("breezy", "breezy.hr", "subdomain"),
+]
+ATS_HOST_SUFFIXES: Tuple[str, ...] = tuple(dict.fromkeys(suffix for _, suffix, _ in _ATS_HOSTS))
+
+
+def detect_ats(url: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+    """(provider, tenant) for a hosted ATS board URL, e.g. ("greenhouse", "acme"); (None, None) otherwise."""
+    if not url:
+        return None, None
+    parsed = urlparse(url)
+    host = (parsed.hostname or "").lower()
+    segments = [p for p in parsed.path.split("/") if p]
+    for provider, suffix, where in _ATS_HOSTS:
+        if host != suffix and not host.endswith("." + suffix):
+            continue
+        if where == "path":
+            tenant = segments[0] if segments else None
+            if provider == "greenhouse" and tenant == "embed":
+                tenant = dict(q.split("=", 1) for q in parsed.query.split("&") if "=" in q).get("for")
+        else:
+            tenant = host[: -len(suffix) - 1].split(".")[0] if host != suffix else None
+        return provider, (tenant or None)
+    return None, None
+
+
+def normalize_posting_url(url: Optional[str]) -> str:
+    """Lookup key for an aggregator posting URL: no fragment or trailing slash."""
+    return (url or "").strip().split("#", 1)[0].rstrip("/")
+
+
+@dataclass
+class CompanyRecord:
+    """One row of the ``companies`` table as the resolver sees it."""
+
+    name: str
+    normalized_domain: str
+    website_url: Optional[str] = None
+    aliases: List[str] = field(default_factory=list)
+    confidence: float = 0.0
+    verified_at: Optional[float] = None  # epoch seconds
+
+    def is_stale(self, ttl_s: float, now: Optional[float] = None) -> bool:
+        if ttl_s <= 0:
+            return False
+        return self.verified_at is None or (now or time.time()) - self.verified_at > ttl_s
+
+
+@dataclass
+class CareersRecord:
+    """Stage 2 outcome for one official domain; ``found=False`` is a cached negative."""
+
+    normalized_domain: str
+    found: bool
+    careers_url: Optional[str] = None
+    ats_provider: Optional[str] = None
+    ats_tenant: Optional[str] = None
+    email_instructions: Optional[str] = None
+    checked_at: float = 0.0  # epoch seconds
+
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class PostingResolution:
+    """Where an aggregator posting led last time: the official job and its application form."""
+
+    source_aggregator_url: str
+    official_identifier: str
+    apply_url: str
+    title: Optional[str] = None
+    resolution: Dict[str, Any] = field(default_factory=dict)  # official domain, per-finder picks, summary
+    resolved_at: float = 0.0  # epoch seconds
+
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class SqliteCompanyStore:
+    """Local stand-in for the backend ``companies`` table (same columns, aliases as JSON)."""
+
+    name = "sqlite"
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._lock = threading.Lock()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS companies (
+                normalized_domain TEXT PRIMARY KEY,
+                name TEXT NOT NULL,
+                website_url TEXT,
+                aliases TEXT NOT NULL DEFAULT '[]',
+                confidence REAL NOT NULL DEFAULT 0,
+                verified_at REAL
+            );
+            CREATE TABLE IF NOT EXISTS company_aliases (
+                alias TEXT PRIMARY KEY,
+                normalized_domain TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS company_careers (
+                normalized_domain TEXT PRIMARY KEY,
+                found INTEGER NOT NULL,
+                careers_url TEXT,
+                ats_provider TEXT,
+                ats_tenant TEXT,
+                email_instructions TEXT,
+                checked_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS job_postings (
+                source_aggregator_url TEXT PRIMARY KEY,
+                official_identifier TEXT NOT NULL,
+                apply_url TEXT NOT NULL,
+                title TEXT,
+                resolution TEXT NOT NULL DEFAULT '{}',
+                resolved_at REAL NOT NULL
+            );
+            """
+        )
+        self._conn.commit()
+
+    def _row(self, row) -> CompanyRecord:
+        domain, name, url, aliases, confidence, verified_at = row
+        return CompanyRecord(
+            name=name,
+            normalized_domain=domain,
+            website_url=url,
+            aliases=json.loads(aliases or "[]"),
+            confidence=confidence,
+            verified_at=verified_at,
+        )
+
+    def lookup(self, alias: str) -> Optional[CompanyRecord]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT c.normalized_domain, c.name, c.website_url, c.aliases, c.confidence, c.verified_at "
+                "FROM company_aliases a JOIN companies c ON c.normalized_domain = a.normalized_domain "
+                "WHERE a.alias = ?",
+                (alias,),
+            ).fetchone()
+        return self._row(row) if row else None
+
+    def upsert(self, record: CompanyRecord) -> None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT aliases, verified_at FROM companies WHERE normalized_domain = ?", (record.normalized_domain,)
+            ).fetchone()
+            aliases = list(dict.fromkeys((json.loads(row[0]) if row else []) + record.aliases))
+            record.aliases = aliases
+            if record.verified_at is None and row:
+                record.verified_at = row[1]  # a new guess does not unverify a confirmed domain
+            self._conn.execute(
+                "INSERT OR REPLACE INTO companies (normalized_domain, name, website_url, aliases, confidence, verified_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    record.normalized_domain,
+                    record.name,
+                    record.website_url,
+                    json.dumps(aliases),
+                    record.confidence,
+                    record.verified_at,
+                ),
+            )
+            # An alias points at one domain; a later confident answer moves it
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO company_aliases (alias, normalized_domain) VALUES (?, ?)",
+                [(a, record.normalized_domain) for a in aliases],
+            )
+            self._conn.commit()
+
+    def get_careers(self, domain: str) -> Optional[CareersRecord]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT normalized_domain, found, careers_url, ats_provider, ats_tenant, email_instructions, checked_at "
+                "FROM company_careers WHERE normalized_domain = ?",
+                (domain,),
+            ).fetchone()
+        if row is None:
+            return None
+        return CareersRecord(
+            normalized_domain=row[0],
+            found=bool(row[1]),
+            careers_url=row[2],
+            ats_provider=row[3],
+            ats_tenant=row[4],
+            email_instructions=row[5],
+            checked_at=row[6],
+        )
+
+    def put_careers(self, record: CareersRecord) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO company_careers "
+                "(normalized_domain, found, careers_url, ats_provider, ats_tenant, email_instructions, checked_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    record.normalized_domain,
+                    int(record.found),
+                    record.careers_url,
+                    record.ats_provider,
+                    record.ats_tenant,
+                    record.email_instructions,
+                    record.checked_at,
+                ),
+            )
+            self._conn.commit()
+
+    def delete_careers(self, domain: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM company_careers WHERE normalized_domain = ?", (domain,))
+            self._conn.commit()
+
+    def get_posting(self, url: str) -> Optional[PostingResolution]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT source_aggregator_url, official_identifier, apply_url, title, resolution, resolved_at "
+                "FROM job_postings WHERE source_aggregator_url = ?",
+                (url,),
+            ).fetchone()
+        if row is None:
+            return None
+        return PostingResolution(
+            source_aggregator_url=row[0],
+            official_identifier=row[1],
+            apply_url=row[2],
+            title=row[3],
+            resolution=json.loads(row[4] or "{}"),
+            resolved_at=row[5],
+        )
+
+    def put_posting(self, record: PostingResolution) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO job_postings "
+                "(source_aggregator_url, official_identifier, apply_url, title, resolution, resolved_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    record.source_aggregator_url,
+                    record.official_identifier,
+                    record.apply_url,
+                    record.title,
+                    json.dumps(record.resolution, default=str),
+                    record.resolved_at,
+                ),
+            )
+            self._conn.commit()
+
+    def delete_posting(self, url: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM job_postings WHERE source_aggregator_url = ?", (url,))
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class PostgresCompanyStore:
+    """Reads and writes the backend ``companies`` table directly (needs DATABASE_URL + psycopg2)."""
+
+    name = "postgres"
+
+    _COLUMNS = "name, normalized_domain, website_url, aliases, confidence, EXTRACT(EPOCH FROM verified_at) AS verified_at"
+
+    def __init__(self, dsn: str):
+        import psycopg2
+        import psycopg2.extras
+
+        self._extras = psycopg2.extras
+        self._lock = threading.Lock()
+        self._conn = psycopg2.connect(dsn)
+        self._conn.autocommit = True
+
+    def _row(self, row: Dict[str, Any]) -> CompanyRecord:
+        return CompanyRecord(
+            name=row["name"],
+            normalized_domain=row["normalized_domain"],
+            website_url=row["website_url"],
+            aliases=list(row["aliases"] or []),
+            confidence=float(row["confidence"] or 0.0),
+            verified_at=float(row["verified_at"]) if row["verified_at"] is not None else None,
+        )
+
+    def lookup(self, alias: str) -> Optional[CompanyRecord]:
+        query = f"""
+            SELECT {self._COLUMNS}
+            FROM companies
+            WHERE aliases @> ARRAY[%s]::TEXT[]
+            ORDER BY confidence DESC, verified_at DESC NULLS LAST
+            LIMIT 1
+        """
+        with self._lock, self._conn.cursor(cursor_factory=self._extras.RealDictCursor) as cur:
+            cur.execute(query, (alias,))
+            row = cur.fetchone()
+        return self._row(row) if row else None
+
+    def upsert(self, record: CompanyRecord) -> None:
+        query = """
+            INSERT INTO companies (name, normalized_domain, website_url, aliases, confidence, verified_at)
+            VALUES (%s, %s, %s, %s, %s, TO_TIMESTAMP(%s))
+            ON CONFLICT (normalized_domain) DO UPDATE SET
+                website_url = COALESCE(EXCLUDED.website_url, companies.website_url),
+                aliases = ARRAY(SELECT DISTINCT unnest(companies.aliases || EXCLUDED.aliases)),
+                confidence = EXCLUDED.confidence,
+                verified_at = COALESCE(EXCLUDED.verified_at, companies.verified_at)
+        """
+        with self._lock, self._conn.cursor() as cur:
+            cur.execute(
+                query,
+                (
+                    record.name,
+                    record.normalized_domain,
+                    record.website_url,
+                    record.aliases,
+                    record.confidence,
+                    record.verified_at,
+                ),
+            )
+
+    def get_careers(self, domain: str) -> Optional[CareersRecord]:
+        query = """
+            SELECT normalized_domain, found, careers_url, ats_provider, ats_tenant, email_instructions,
+                   EXTRACT(EPOCH FROM checked_at) AS checked_at
+            FROM company_careers
+            WHERE normalized_domain = %s
+        """
+        with self._lock, self._conn.cursor(cursor_factory=self._extras.RealDictCursor) as cur:
+            cur.execute(query, (domain,))
+            row = cur.fetchone()
+        if row is None:
+            return None
+        row = dict(row)
+        row["checked_at"] = float(row["checked_at"])
+        return CareersRecord(**row)
+
+    def put_careers(self, record: CareersRecord) -> None:
+        query = """
+            INSERT INTO company_careers
+                (normalized_domain, found, careers_url, ats_provider, ats_tenant, email_instructions, checked_at)
+            VALUES (%s, %s, %s, %s, %s, %s, TO_TIMESTAMP(%s))
+            ON CONFLICT (normalized_domain) DO UPDATE SET
+                found = EXCLUDED.found,
+                careers_url = EXCLUDED.careers_url,
+                ats_provider = EXCLUDED.ats_provider,
+                ats_tenant = EXCLUDED.ats_tenant,
+                email_instructions = EXCLUDED.email_instructions,
+                checked_at = EXCLUDED.checked_at
+        """
+        with self._lock, self._conn.cursor() as cur:
+            cur.execute(
+                query,
+                (
+                    record.normalized_domain,
+                    record.found,
+                    record.careers_url,
+                    record.ats_provider,
+                    record.ats_tenant,
+                    record.email_instructions,
+                    record.checked_at,
+                ),
+            )
+
+    def delete_careers(self, domain: str) -> None:
+        with self._lock, self._conn.cursor() as cur:
+            cur.execute("DELETE FROM company_careers WHERE normalized_domain = %s", (domain,))
+
+    def get_posting(self, url: str) -> Optional[PostingResolution]:
+        query = """
+            SELECT source_aggregator_url, official_identifier, apply_url, title, resolution,
+                   EXTRACT(EPOCH FROM resolved_at) AS resolved_at
+            FROM job_postings
+            WHERE source_aggregator_url = %s AND apply_url IS NOT NULL
+            ORDER BY resolved_at DESC NULLS LAST
+            LIMIT 1
+        """
+        with self._lock, self._conn.cursor(cursor_factory=self._extras.RealDictCursor) as cur:
+            cur.execute(query, (url,))
+            row = cur.fetchone()
+        if row is None:
+            return None
+        row = dict(row)
+        row["resolution"] = row["resolution"] or {}
+        row["resolved_at"] = float(row["resolved_at"] or 0.0)
+        return PostingResolution(**row)
+
+    def put_posting(self, record: PostingResolution) -> None:
+        query = """
+            INSERT INTO job_postings
+                (company_id, title, official_identifier, source_aggregator_url, apply_url, resolution, resolved_at)
+            VALUES (
+                (SELECT id FROM companies WHERE normalized_domain = %s),
+                %s, %s, %s, %s, %s, TO_TIMESTAMP(%s)
+            )
+            ON CONFLICT (official_identifier) DO UPDATE SET
+                company_id = COALESCE(EXCLUDED.company_id, job_postings.company_id),
+                source_aggregator_url = EXCLUDED.source_aggregator_url,
+                apply_url = EXCLUDED.apply_url,
+                resolution = EXCLUDED.resolution,
+                resolved_at = EXCLUDED.resolved_at
+        """
+        with self._lock, self._conn.cursor() as cur:
+            cur.execute(
+                query,
+                (
+                    record.resolution.get("official_domain"),
+                    record.title or "Unknown Role",
+                    record.official_identifier,
+                    record.source_aggregator_url,
+                    record.apply_url,
+                    json.dumps(record.resolution, default=str),
+                    record.resolved_at,
+                ),
+            )
+
+    def delete_posting(self, url: str) -> None:
+        # Keep the posting row; only drop the resolution so the next run rediscovers it
+        query = "UPDATE job_postings SET apply_url = NULL, resolved_at = NULL WHERE source_aggregator_url = %s"
+        with self._lock, self._conn.cursor() as cur:
+            cur.execute(query, (url,))
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+@dataclass
+class CompanyKBStats:
+    lookups: int = 0
+    lru_hits: int = 0
+    store_hits: int = 0
+    misses: int = 0
+    unverified: int = 0
+    stale: int = 0
+    stores: int = 0
+    careers_hits: int = 0
+    careers_negative_hits: int = 0
+    careers_misses: int = 0
+    posting_hits: int = 0
+    posting_misses: int = 0
+
+
+class CompanyKnowledgeBase:
+    """Company name -> official domain resolver: in-process LRU over a persistent store.
+
+    Records older than ``ttl_s`` are still returned but flagged stale so the
+    caller can re-verify them lazily (see ``averify_domain``). Unconfirmed
+    guesses (``verified_at`` unset) are stored but never returned until
+    ``confirm`` stamps them. Stage 2 outcomes
+    per domain live alongside: careers pages for ``careers_ttl_s``, negative
+    results for the shorter ``negative_ttl_s``. Aggregator postings resolved
+    to an application form are kept for ``posting_ttl_s``.
+    """
+
+    def __init__(
+        self,
+        store,
+        *,
+        ttl_s: float,
+        lru_size: int = 512,
+        min_confidence: float = 0.6,
+        careers_ttl_s: float = 14 * 24 * 3600,
+        negative_ttl_s: float = 24 * 3600,
+        posting_ttl_s: float = 14 * 24 * 3600,
+    ):
+        self.store = store
+        self.ttl_s = ttl_s
+        self.careers_ttl_s = careers_ttl_s
+        self.negative_ttl_s = negative_ttl_s
+        self.posting_ttl_s = posting_ttl_s
+        self.lru_size = lru_size
+        self.min_confidence = min_confidence
+        self.stats = CompanyKBStats()
+        self._lru: "OrderedDict[str, CompanyRecord]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _remember_lru(self, alias: str, record: CompanyRecord) -> None:
+        with self._lock:
+            self._lru[alias] = record
+            self._lru.move_to_end(alias)
+            while len(self._lru) > self.lru_size:
+                self._lru.popitem(last=False)
+
+    def resolve(self, company_name: Optional[str]) -> Optional[CompanyRecord]:
+        """Known record for this name with usable confidence, or None."""
+        alias = normalize_company_name(company_name)
+        if not alias:
+            return None
+        self.stats.lookups += 1
+        with self._lock:
+            record = self._lru.get(alias)
+            if record is not None:
+                self._lru.move_to_end(alias)
+                self.stats.lru_hits += 1
+        if record is None:
+            try:
+                record = self.store.lookup(alias)
+            except Exception as e:
+                event("FIND_APPLY", "INFO", "company_kb_lookup_failed", company=company_name, error=str(e))
+                record = None
+            if record is None:
+                self.stats.misses += 1
+                return None
+            self.stats.store_hits += 1
+            self._remember_lru(alias, record)
+        if record.confidence < self.min_confidence:
+            return None
+        if record.verified_at is None:
+            self.stats.unverified += 1
+            return None
+        if self.is_stale(record):
+            self.stats.stale += 1
+        return record
+
+    def is_stale(self, record: CompanyRecord) -> bool:
+        return record.is_stale(self.ttl_s)
+
+    def remember(
+        self,
+        company_name: str,
+        domain: str,
+        *,
+        confidence: Any,
+        website_url: Optional[str] = None,
+        verified: bool = False,
+    ) -> Optional[CompanyRecord]:
+        """Store a (company, domain) pair, merging aliases with any existing row.
+
+        Unless ``verified``, the pair is a guess: ``resolve`` ignores it until
+        ``confirm`` is called for it.
+        """
+        normalized = normalize_domain(domain)
+        alias = normalize_company_name(company_name)
+        if not normalized or not alias:
+            return None
+        record = CompanyRecord(
+            name=company_name.strip(),
+            normalized_domain=normalized,
+            website_url=website_url or f"https://{normalized}",
+            aliases=[alias],
+            confidence=confidence_score(confidence),
+            verified_at=time.time() if verified else None,
+        )
+        try:
+            self.store.upsert(record)
+            self.stats.stores += 1
+        except Exception as e:
+            event("FIND_APPLY", "INFO", "company_kb_store_failed", company=company_name, error=str(e))
+        for a in record.aliases:
+            self._remember_lru(a, record)
+        return record
+
+    def confirm(self, company_name: str, domain: str) -> Optional[CompanyRecord]:
+        """Stamp the stored pair as verified once the domain proved itself (careers page found)."""
+        alias = normalize_company_name(company_name)
+        normalized = normalize_domain(domain)
+        if not alias or not normalized:
+            return None
+        try:
+            record = self.store.lookup(alias)
+        except Exception as e:
+            event("FIND_APPLY", "INFO", "company_kb_lookup_failed", company=company_name, error=str(e))
+            return None
+        if record is None or record.normalized_domain != normalized:
+            return None
+        return self.mark_verified(record, True)
+
+    def mark_verified(self, record: CompanyRecord, ok: bool) -> CompanyRecord:
+        """Refresh ``verified_at`` after a successful check; halve confidence after a failed one."""
+        record.verified_at = time.time()
+        if not ok:
+            record.confidence = round(record.confidence / 2, 3)
+        try:
+            self.store.upsert(record)
+        except Exception as e:
+            event("FIND_APPLY", "INFO", "company_kb_store_failed", company=record.name, error=str(e))
+        for a in record.aliases:
+            self._remember_lru(a, record)
+        return record
+
+    def careers(self, domain: str) -> Optional[CareersRecord]:
+        """Unexpired stage 2 outcome for ``domain`` (positive or negative), or None."""
+        normalized = normalize_domain(domain)
+        try:
+            record = self.store.get_careers(normalized) if normalized else None
+        except Exception as e:
+            event("FIND_APPLY", "INFO", "careers_cache_lookup_failed", domain=domain, error=str(e))
+            record = None
+        ttl = (self.careers_ttl_s if record.found else self.negative_ttl_s) if record else 0
+        if record is None or (ttl > 0 and time.time() - record.checked_at > ttl):
+            self.stats.careers_misses += 1
+            return None
+        if record.found:
+            self.stats.careers_hits += 1
+        else:
+            self.stats.careers_negative_hits += 1
+        return record
+
+    def remember_careers(
+        self,
+        domain: str,
+        *,
+        careers_url: Optional[str] = None,
+        email_instructions: Optional[str] = None,
+        apply_url: Optional[str] = None,
+    ) -> Optional[CareersRecord]:
+        """Store what stage 2 found for ``domain``; nothing found is stored as a negative."""
+        normalized = normalize_domain(domain)
+        if not normalized:
+            return None
+        provider, tenant = detect_ats(careers_url)
+        if provider is None:
+            provider, tenant = detect_ats(apply_url)
+        record = CareersRecord(
+            normalized_domain=normalized,
+            found=bool(careers_url or email_instructions),
+            careers_url=careers_url,
+            ats_provider=provider,
+            ats_tenant=tenant,
+            email_instructions=email_instructions or None,
+            checked_at=time.time(),
+        )
+        try:
+            self.store.put_careers(record)
+        except Exception as e:
+            event("FIND_APPLY", "INFO", "careers_cache_store_failed", domain=domain, error=str(e))
+        return record
+
+    def forget_careers(self, domain: str) -> None:
+        try:
+            self.store.delete_careers(normalize_domain(domain))
+        except Exception as e:
+            event("FIND_APPLY", "INFO", "careers_cache_store_failed", domain=domain, error=str(e))
+
+    def resolved_posting(self, url: str) -> Optional[PostingResolution]:
+        """Unexpired resolution for an aggregator posting URL, or None."""
+        key = normalize_posting_url(url)
+        try:
+            record = self.store.get_posting(key) if key else None
+        except Exception as e:
+            event("FIND_APPLY", "INFO", "posting_cache_lookup_failed", url=url, error=str(e))
+            record = None
+        if record is None or (self.posting_ttl_s > 0 and time.time() - record.resolved_at > self.posting_ttl_s):
+            self.stats.posting_misses += 1
+            return None
+        self.stats.posting_hits += 1
+        return record
+
+    def remember_posting(
+        self,
+        url: str,
+        *,
+        official_identifier: str,
+        apply_url: str,
+        title: Optional[str] = None,
+        resolution: Optional[Dict[str, Any]] = None,
+    ) -> Optional[PostingResolution]:
+        """Store where an aggregator posting led, once its application form has been confirmed."""
+        key = normalize_posting_url(url)
+        if not key or not apply_url:
+            return None
+        record = PostingResolution(
+            source_aggregator_url=key,
+            official_identifier=official_identifier or apply_url,
+            apply_url=apply_url,
+            title=title,
+            resolution=resolution or {},
+            resolved_at=time.time(),
+        )
+        try:
+            self.store.put_posting(record)
+        except Exception as e:
+            event("FIND_APPLY", "INFO", "posting_cache_store_failed", url=url, error=str(e))
+        return record
+
+    def forget_posting(self, url: str) -> None:
+        try:
+            self.store.delete_posting(normalize_posting_url(url))
+        except Exception as e:
+            event("FIND_APPLY", "INFO", "posting_cache_store_failed", url=url, error=str(e))
+
+    def summary(self) -> Dict[str, Any]:
+        data = asdict(self.stats)
+        data.update({"store": self.store.name, "lru_entries": len(self._lru)})
+        return data
+
+
+async def averify_domain(domain: str, *, timeout_s: float = 8.0) -> bool:
+    """Cheap liveness check for a remembered domain: does its homepage still answer?"""
+    import httpx
+
+    try:
+        async with httpx.AsyncClient(follow_redirects=True, timeout=timeout_s) as client:
+            resp = await client.get(f"https://{domain}", headers={"User-Agent": "Mozilla/5.0"})
+    except Exception as e:
+        event("FIND_APPLY", "DEBUG", "company_kb_verify_failed", domain=domain, error=str(e))
+        return False
+    # Bot walls (401/403/429) still prove the site exists; 404/5xx do not
+    return resp.status_code < 400 or resp.status_code in (401, 403, 429)
+
+
+_KB: Optional[CompanyKnowledgeBase] = None
+_KB_LOCK = threading.Lock()
+
+
+def get_company_kb() -> Optional[CompanyKnowledgeBase]:
+    """Shared resolver per Settings, or None when the knowledge base is disabled."""
+    global _KB
+    s = load_settings()
+    if s.company_kb_backend == "off":
+        return None
+    with _KB_LOCK:
+        if _KB is None:
+            store = None
+            if s.company_kb_backend == "postgres":
+                try:
+                    store = PostgresCompanyStore(s.database_url or "")
+                except Exception as e:
+                    event("FIND_APPLY", "INFO", "company_kb_postgres_unavailable", error=str(e))
+            if store is None:
+                path = Path(s.company_kb_path) if s.company_kb_path else repo_root() / ".cache" / "companies.sqlite3"
+                store = SqliteCompanyStore(path)
+            _KB = CompanyKnowledgeBase(
+                store,
+                ttl_s=s.company_kb_ttl_s,
+                lru_size=s.company_kb_lru_size,
+                min_confidence=s.company_kb_min_confidence,
+                careers_ttl_s=s.careers_cache_ttl_s,
+                negative_ttl_s=s.careers_negative_ttl_s,
+                posting_ttl_s=s.posting_cache_ttl_s,
+            )
+        return _KB
+
+
+def reset_company_kb() -> None:
+    """Drop the shared resolver (tests, or after changing settings)."""
+    global _KB
+    with _KB_LOCK:
+        if _KB is not None:
+            _KB.store.close()
+        _KB = None
@@ -7,6 +7,109 @@ import os
 
 class Settings(BaseModel):
     openai_api_key: str | None = None
+    # Shared OpenAI HTTP pool (see webbot.llm.client)
+    openai_max_connections: int = 20
+    openai_max_keepalive_connections: int = 10
+    openai_keepalive_expiry_s: float = 60.0
+    openai_timeout_s: float = 60.0
+    openai_connect_timeout_s: float = 10.0
+    # LLM response cache (see webbot.llm.cache)
+    llm_cache_mode: str = "off"  # off | read_through | record | replay
+    llm_cache_path: str | None = None
+    llm_cache_ttl_s: float = 7 * 24 * 3600
+    llm_cache_max_mb: float = 256.0
+    # Async gateway: in-flight calls per model (see webbot.llm.chat)
+    llm_max_concurrency_per_model: int = 4
+    llm_model_concurrency: str | None = None  # e.g. "gpt-4o=2,gpt-4o-mini=8"
+    # Rate limits and retries (see webbot.llm.ratelimit)
+    llm_rpm_limit: int = 500
+    llm_tpm_limit: int = 30000
+    llm_model_limits: str | None = None  # e.g. "gpt-4o=500/30000,gpt-4o-mini=500/200000"
+    llm_max_retries: int = 5
+    llm_backoff_base_s: float = 1.0
+    llm_backoff_max_s: float = 60.0
+    # Batch execution (see webbot.llm.batch)
+    llm_batch_backend: str = "openai"  # openai | local
+    llm_batch_dir: str | None = None
+    # Per-call telemetry upload to the backend (see webbot.llm.telemetry)
+    telemetry_backend_url: str | None = None  # e.g. "http://localhost:5000"
+    telemetry_run_id: int | None = None
+    # Job-page extraction: heuristics at or above this confidence skip the LLM (see webbot.struct_extract)
+    extract_confidence_threshold: float = 0.75
+    # Company -> official domain knowledge base (see webbot.company_kb)
+    company_kb_backend: str = "sqlite"  # sqlite | postgres | off
+    company_kb_path: str | None = None
+    company_kb_ttl_s: float = 30 * 24 * 3600
+    company_kb_lru_size: int = 512
+    company_kb_min_confidence: float = 0.6
+    careers_cache_ttl_s: float = 14 * 24 * 3600  # stage 2 careers page per domain
+    careers_negative_ttl_s: float = 24 * 3600  # "no careers page found"
+    posting_cache_ttl_s: float = 14 * 24 * 3600  # aggregator posting -> apply URL
+    database_url: str | None = None  # backend Postgres, used when company_kb_backend=postgres
+    # Web search for apply-URL discovery (see webbot.search)
+    search_backend: str = "ddgs"  # ddgs | static
+    search_ddgs_engine: str = "duckduckgo"
+    search_max_concurrency: int = 4
+    search_cache_ttl_s: float = 3600.0
+    # Local link pre-ranking ahead of agentic5 link-analysis prompts (see webbot.link_rank)
+    link_rank_top_n: int = 25
+    link_rank_skip_margin: float = 3.0  # score lead over the runner-up that skips the LLM
+    # Lean browsing during apply-URL discovery (see webbot.browser.LeanBrowsingPolicy)
+    lean_browsing: bool = True
+    lean_block_types: str = "image,media,font"  # Playwright resource types to abort
+    lean_tracker_domains: str | None = None  # extra comma-separated hosts to stub
+    # Resume embedding shortlist (see webbot.resume_index)
+    resume_embedding_model: str = "text-embedding-3-small"
+    resume_shortlist_k: int = 3
+    resume_decisive_margin: float = 0.08
+
+
+# Settings field -> environment variable override
+_ENV_OVERRIDES = {
+    "openai_max_connections": "OPENAI_MAX_CONNECTIONS",
+    "openai_max_keepalive_connections": "OPENAI_MAX_KEEPALIVE_CONNECTIONS",
+    "openai_keepalive_expiry_s": "OPENAI_KEEPALIVE_EXPIRY_S",
+    "openai_timeout_s": "OPENAI_TIMEOUT_S",
+    "openai_connect_timeout_s": "OPENAI_CONNECT_TIMEOUT_S",
+    "llm_cache_mode": "LLM_CACHE_MODE",
+    "llm_cache_path": "LLM_CACHE_PATH",
+    "llm_cache_ttl_s": "LLM_CACHE_TTL_S",
+    "llm_cache_max_mb": "LLM_CACHE_MAX_MB",
+    "llm_max_concurrency_per_model": "LLM_MAX_CONCURRENCY_PER_MODEL",
+    "llm_model_concurrency": "LLM_MODEL_CONCURRENCY",
+    "llm_rpm_limit": "LLM_RPM_LIMIT",
+    "llm_tpm_limit": "LLM_TPM_LIMIT",
+    "llm_model_limits": "LLM_MODEL_LIMITS",
+    "llm_max_retries": "LLM_MAX_RETRIES",
+    "llm_backoff_base_s": "LLM_BACKOFF_BASE_S",
+    "llm_backoff_max_s": "LLM_BACKOFF_MAX_S",
+    "llm_batch_backend": "LLM_BATCH_BACKEND",
+    "llm_batch_dir": "LLM_BATCH_DIR",
+    "telemetry_backend_url": "WEBBOT_BACKEND_URL",
+    "telemetry_run_id": "WEBBOT_RUN_ID",
+    "extract_confidence_threshold": "EXTRACT_CONFIDENCE_THRESHOLD",
+    "company_kb_backend": "COMPANY_KB_BACKEND",
+    "company_kb_path": "COMPANY_KB_PATH",
+    "company_kb_ttl_s": "COMPANY_KB_TTL_S",
+    "company_kb_lru_size": "COMPANY_KB_LRU_SIZE",
+    "company_kb_min_confidence": "COMPANY_KB_MIN_CONFIDENCE",
+    "careers_cache_ttl_s": "CAREERS_CACHE_TTL_S",
+    "careers_negative_ttl_s": "CAREERS_NEGATIVE_TTL_S",
+    "posting_cache_ttl_s": "POSTING_CACHE_TTL_S",
+    "database_url": "DATABASE_URL",
+    "search_backend": "SEARCH_BACKEND",
+    "search_ddgs_engine": "SEARCH_DDGS_ENGINE",
+    "search_max_concurrency": "SEARCH_MAX_CONCURRENCY",
+    "search_cache_ttl_s": "SEARCH_CACHE_TTL_S",
+    "link_rank_top_n": "LINK_RANK_TOP_N",
+    "link_rank_skip_margin": "LINK_RANK_SKIP_MARGIN",
+    "lean_browsing": "LEAN_BROWSING",
+    "lean_block_types": "LEAN_BLOCK_TYPES",
+    "lean_tracker_domains": "LEAN_TRACKER_DOMAINS",
+    "resume_embedding_model": "RESUME_EMBEDDING_MODEL",
+    "resume_shortlist_k": "RESUME_SHORTLIST_K",
+    "resume_decisive_margin": "RESUME_DECISIVE_MARGIN",
+}
 
 
 def repo_root() -> Path:
@@ -23,4 +126,7 @@ def load_settings() -> Settings:
     env_path = repo_root() / ".env"
     if env_path.exists():
         load_dotenv(env_path)
-    return Settings(openai_api_key=os.getenv("OPENAI_API_KEY"))
+    overrides = {
+        field: os.environ[var] for field, var in _ENV_OVERRIDES.items() if os.environ.get(var)
+    }
+    return Settings(openai_api_key=os.getenv("OPENAI_API_KEY"), **overrides)
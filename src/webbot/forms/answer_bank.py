@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+import json
+import re
+import time
+from difflib import SequenceMatcher
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from pydantic import BaseModel, Field
+
+from .schema import FormField, FormSchema
+from ..tracing import event
+from ..user_profiles import UserProfile, load_user_settings
+
+ANSWER_BANK_FILE = "answer_bank.json"
+
+# Scores at or above this count as the same question
+MATCH_THRESHOLD = 0.86
+# Free text longer than this is job-specific (cover letters, "why us"), never banked
+MAX_BANKED_ANSWER_CHARS = 200
+_UNBANKABLE_TYPES = {"file", "textarea"}
+
+_FILLER = {
+    "a", "an", "the", "your", "you", "please", "enter", "provide", "select", "choose", "what", "is",
+    "are", "do", "does", "to", "of", "if", "any", "optional", "required", "field",
+}
+# The country as written in labels: "US", "U.S.", "USA", "U.S.A." (case-sensitive, so the
+# pronoun "us" is left alone) or lowercase with dots; applied before lowercasing
+_US_COUNTRY = re.compile(r"\b(?:U\.?\s?S\.?(?:\s?A\.?)?|u\.s\.(?:a\.)?)(?![A-Za-z0-9])")
+# A question that differs from a banked one only by one of these asks the opposite
+_NEGATIONS = {"not", "no", "never", "without", "non", "don", "doesn", "cannot"}
+_SYNONYMS = [
+    (re.compile(r"\bunited states( of america)?\b"), "usa"),
+    (re.compile(r"\be\s*mail\b"), "email"),
+    (re.compile(r"\blinked\s*in\b"), "linkedin"),
+    (re.compile(r"\bphone number\b|\bmobile( number)?\b|\btelephone\b"), "phone"),
+    (re.compile(r"\bsurname\b|\bfamily name\b"), "last name"),
+    (re.compile(r"\bgiven name\b"), "first name"),
+]
+
+
+def normalize_question(text: Optional[str]) -> str:
+    """Canonical form of a label/name/placeholder for indexing and fuzzy matching."""
+    if not text:
+        return ""
+    t = _US_COUNTRY.sub(" usa ", text)
+    t = re.sub(r"([a-z])([A-Z])", r"\1 \2", t)  # firstName -> first Name
+    t = t.lower().replace("_", " ").replace("-", " ")
+    t = re.sub(r"[^a-z0-9 ]+", " ", t)
+    t = re.sub(r"\s+", " ", t).strip()
+    for pattern, repl in _SYNONYMS:
+        t = pattern.sub(repl, t)
+    return " ".join(w for w in t.split() if w not in _FILLER)
+
+
+def _similarity(a: str, b: str) -> float:
+    if not a or not b:
+        return 0.0
+    if a == b:
+        return 1.0
+    ta, tb = set(a.split()), set(b.split())
+    jaccard = len(ta & tb) / len(ta | tb)
+    return max(SequenceMatcher(None, a, b).ratio(), jaccard)
+
+
+def _distinctive_difference(a: str, b: str) -> bool:
+    """True when two keys differ in a token that carries the meaning.
+
+    Character-level similarity scores "work in the usa" vs "work in the uk",
+    "address line 1" vs "address line 2" or "require sponsorship" vs "not require
+    sponsorship" as near-identical. A differing number or negation, a word present
+    on only one side, or a short token (country code) swapped for another vetoes
+    the match; what is left are spelling variants such as "authorised"/"authorized".
+    """
+    ta, tb = set(a.split()), set(b.split())
+    only_a, only_b = ta - tb, tb - ta
+    diff = only_a | only_b
+    if any(any(c.isdigit() for c in t) for t in diff) or diff & _NEGATIONS:
+        return True
+    if bool(only_a) != bool(only_b):
+        return True
+    return any(len(t) <= 3 for t in diff)
+
+
+def _fuzzy_score(a: str, b: str) -> float:
+    """``_similarity`` for non-exact matches, zeroed when the keys differ in a distinctive token."""
+    if a != b and _distinctive_difference(a, b):
+        return 0.0
+    return _similarity(a, b)
+
+
+def field_keys(f: FormField) -> List[str]:
+    keys = [normalize_question(x) for x in (f.label, f.name, f.placeholder)]
+    return list(dict.fromkeys(k for k in keys if k))
+
+
+class AnswerBankEntry(BaseModel):
+    question: str
+    answer: str
+    source: str = "manual"  # manual | profile | llm
+    uses: int = 0
+    updated_at: float = Field(default_factory=time.time)
+
+
+class AnswerBankStats(BaseModel):
+    lookups: int = 0
+    hits: int = 0
+    learned: int = 0
+
+    def hit_rate(self) -> float:
+        return (self.hits / self.lookups) if self.lookups else 0.0
+
+
+class AnswerBank:
+    """Per-profile store of answers to recurring form questions.
+
+    Entries are keyed by normalized question text and persisted to
+    ``answer_bank.json`` in the user profile; edit that file to add answers
+    (email, phone, work authorization, ...) by hand.
+    """
+
+    def __init__(self, path: Path, entries: Optional[Dict[str, AnswerBankEntry]] = None):
+        self.path = path
+        self.entries: Dict[str, AnswerBankEntry] = entries or {}
+        self.stats = AnswerBankStats()
+
+    @classmethod
+    def load(cls, profile: UserProfile) -> "AnswerBank":
+        path = profile.path / ANSWER_BANK_FILE
+        entries: Dict[str, AnswerBankEntry] = {}
+        if path.exists():
+            try:
+                data = json.loads(path.read_text(encoding="utf-8"))
+                for key, raw in (data.get("entries") or {}).items():
+                    entry = AnswerBankEntry(**raw)
+                    # Re-keyed so entries saved under an older normalization still match
+                    entries[normalize_question(entry.question) or key] = entry
+            except Exception as e:
+                event("FORM", "INFO", "answer_bank_load_failed", path=str(path), error=str(e))
+        bank = cls(path, entries)
+        bank._seed_from_profile(profile)
+        return bank
+
+    def _seed_from_profile(self, profile: UserProfile) -> None:
+        human = (load_user_settings(profile).human_name or "").strip()
+        if not human:
+            return
+        parts = human.split()
+        seeds = {"full name": human, "name": human}
+        if len(parts) > 1:
+            seeds.update({"first name": parts[0], "last name": parts[-1]})
+        for question, answer in seeds.items():
+            key = normalize_question(question)
+            if key not in self.entries:
+                self.entries[key] = AnswerBankEntry(question=question, answer=answer, source="profile")
+
+    def save(self) -> None:
+        payload = {"entries": {k: v.model_dump() for k, v in sorted(self.entries.items())}}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+
+    def _best_entry(self, f: FormField) -> Tuple[Optional[AnswerBankEntry], float]:
+        keys = field_keys(f)
+        for k in keys:
+            if k in self.entries:
+                return self.entries[k], 1.0
+        best: Optional[AnswerBankEntry] = None
+        best_score = 0.0
+        for k in keys:
+            for entry_key, entry in self.entries.items():
+                score = _fuzzy_score(k, entry_key)
+                if score > best_score:
+                    best, best_score = entry, score
+        return best, best_score
+
+    def match(self, f: FormField) -> Optional[str]:
+        """Return a banked answer that fits this field, or None."""
+        if f.type == "file":
+            return None
+        self.stats.lookups += 1
+        entry, score = self._best_entry(f)
+        if entry is None or score < MATCH_THRESHOLD:
+            return None
+        value = _fit_to_field(f, entry.answer)
+        if value is None:
+            return None
+        entry.uses += 1
+        self.stats.hits += 1
+        return value
+
+    def learn(self, f: FormField, answer: str) -> bool:
+        """Store a confirmed answer for a recurring question; manual entries are never overwritten."""
+        answer = (answer or "").strip()
+        keys = field_keys(f)
+        if not keys or not answer or f.type in _UNBANKABLE_TYPES or len(answer) > MAX_BANKED_ANSWER_CHARS:
+            return False
+        key = keys[0]
+        existing = self.entries.get(key)
+        if existing is not None and existing.source == "manual":
+            return False
+        if existing is not None and existing.answer == answer:
+            return False
+        self.entries[key] = AnswerBankEntry(question=f.label or f.name or f.placeholder or key, answer=answer, source="llm")
+        self.stats.learned += 1
+        return True
+
+    def learn_confirmed(self, schema: FormSchema) -> int:
+        """Bank LLM answers the executor confirmed on the page after manual review."""
+        learned = 0
+        for section in schema.sections:
+            for f in section.fields:
+                meta = f.meta if isinstance(f.meta, dict) else {}
+                if meta.get("answer_source") != "llm" or not meta.get("confirmed_value"):
+                    continue
+                if self.learn(f, str(meta["confirmed_value"])):
+                    learned += 1
+        if learned:
+            self.save()
+        event("FORM", "INFO", "answer_bank_learned", learned=learned, entries=len(self.entries))
+        return learned
+
+
+def _fit_to_field(f: FormField, answer: str) -> Optional[str]:
+    """Coerce a banked answer to the field's type/options, or None if it does not fit."""
+    if f.options:
+        target = normalize_question(answer)
+        best, best_score = None, 0.0
+        for opt in f.options:
+            score = _fuzzy_score(target, normalize_question(opt))
+            if score > best_score:
+                best, best_score = opt, score
+        return best if best_score >= MATCH_THRESHOLD else None
+    if f.type in {"checkbox", "radio"}:
+        sval = answer.strip().lower()
+        if sval in {"1", "true", "yes", "on"}:
+            return "true"
+        if sval in {"0", "false", "no", "off"}:
+            return "false"
+        return None
+    return answer
@@ -1,16 +1,23 @@
 from __future__ import annotations
 
-from typing import Dict, Any, List, Optional
+import json
+import re
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
 
+from .answer_bank import AnswerBank
 from .schema import FormSchema, FormField
-from ..ai_search import get_openai_client
+from ..llm.chat import acreate_chat_completion, astream_chat_completion, create_chat_completion
+from ..llm.telemetry import llm_stage
+from ..llm.tokens import count_tokens, truncate_to_tokens
 from ..tracing import json_blob, event
 
 
-def _build_fields_brief(schema: FormSchema) -> List[Dict[str, Any]]:
+def _build_fields_brief(schema: FormSchema, skip: Optional[Set[str]] = None) -> List[Dict[str, Any]]:
     brief: List[Dict[str, Any]] = []
     for section in schema.sections:
         for f in section.fields:
+            if skip and f.field_id in skip:
+                continue
             brief.append(
                 {
                     "field_id": f.field_id,
@@ -25,30 +32,43 @@ def _build_fields_brief(schema: FormSchema) -> List[Dict[str, Any]]:
     return brief
 
 
-def _compose_prompt(
-    *,
-    fields_brief: List[Dict[str, Any]],
-    resume_text: str,
-    job_context: Optional[str],
-    ignore_optional: bool,
-) -> str:
-    lines: List[str] = []
-    lines.append(
-        "You are given a parsed job application form structure and a candidate resume.\n"
-        "Return answers for the fields as a compact JSON object with the shape:\n"
-        "{\n  \"answers\": { \"<field_id>\": <value> },\n  \"unanswerable\": [<field_id>...]\n}\n\n"
-        "Rules:\n"
-        "- Only return JSON. No commentary outside JSON.\n"
-        "- For checkboxes/radios, use string 'true' or 'false'.\n"
-        "- For dates, prefer 'YYYY-MM-DD' if a date is needed.\n"
-        "- For selects/comboboxes, prefer one of the provided options; if none provided, infer a concise value.\n"
-        "- Do not fabricate unknown facts; if not answerable, omit from answers and list in unanswerable.\n"
-    )
+# Static instructions go in the system message so the request prefix is identical
+# across forms; provider prompt caching only applies to an unchanged leading span.
+_SYSTEM_PROMPT = (
+    "You are a precise application-filling assistant. Return strictly JSON.\n\n"
+    "You are given a candidate resume, optional job context, and a parsed job application form structure.\n"
+    "Return answers for the fields as a compact JSON object with the shape:\n"
+    "{\n  \"answers\": { \"<field_id>\": <value> },\n  \"unanswerable\": [<field_id>...]\n}\n\n"
+    "Rules:\n"
+    "- Only return JSON. No commentary outside JSON.\n"
+    "- For checkboxes/radios, use string 'true' or 'false'.\n"
+    "- For dates, prefer 'YYYY-MM-DD' if a date is needed.\n"
+    "- For selects/comboboxes, prefer one of the provided options; if none provided, infer a concise value.\n"
+    "- Do not fabricate unknown facts; if not answerable, omit from answers and list in unanswerable.\n"
+)
+
+# Token budgets for the stable prefix (previously 12000/6000 characters)
+RESUME_TOKEN_BUDGET = 3000
+JOB_CONTEXT_TOKEN_BUDGET = 1500
+
+
+def _compose_prefix(*, resume_text: str, job_context: Optional[str], model: str) -> str:
+    """Resume and job context: the part of the prompt that repeats across a run's forms."""
+    lines: List[str] = ["[Resume]\n", truncate_to_tokens(resume_text.strip(), RESUME_TOKEN_BUDGET, model), ""]
+    if job_context:
+        lines.append("[Job Context]\n")
+        lines.append(truncate_to_tokens(job_context.strip(), JOB_CONTEXT_TOKEN_BUDGET, model))
+        lines.append("")
+    return "\n".join(lines)
+
+
+def _compose_suffix(*, fields_brief: List[Dict[str, Any]], ignore_optional: bool) -> str:
+    """Per-form payload, appended after the cacheable prefix."""
+    lines: List[str] = ["Additional rule:"]
     if ignore_optional:
         lines.append("- Ignore optional fields unless trivial (name/email/phone).\n")
     else:
         lines.append("- Optional fields may be answered when high-confidence.\n")
-    lines.append("")
     lines.append("[Form Fields]\n")
     for f in fields_brief:
         opts = ", ".join(f.get("options") or [])
@@ -57,69 +77,97 @@ def _compose_prompt(
             f"label={f.get('label') or ''} | placeholder={f.get('placeholder') or ''} | options=[{opts}]"
         )
     lines.append("")
-    if job_context:
-        lines.append("[Job Context]\n")
-        lines.append(job_context.strip())
-        lines.append("")
-    lines.append("[Resume]\n")
-    lines.append(resume_text.strip())
-    lines.append("")
     lines.append(
         "Return only valid JSON object with keys 'answers' and 'unanswerable'."
     )
     return "\n".join(lines)
 
 
-def generate_answers(
-    schema: FormSchema,
-    *,
-    resume_text: str,
-    job_context: Optional[str] = None,
-    ignore_optional: bool = True,
-    model: str = "gpt-4o",
-) -> FormSchema:
-    """
-    Populate FormSchema fields' meta["answer"] using an LLM, based on the provided
-    resume text and optional job context. Returns the same schema object with
-    answers filled where applicable.
-    """
-    fields_brief = _build_fields_brief(schema)
+def _prefill_from_bank(schema: FormSchema, bank: Optional[AnswerBank]) -> Set[str]:
+    """Answer fields the bank already knows; return their ids."""
+    answered: Set[str] = set()
+    if bank is None:
+        return answered
+    before_lookups, before_hits = bank.stats.lookups, bank.stats.hits
+    for section in schema.sections:
+        for f in section.fields:
+            value = bank.match(f)
+            if value is not None:
+                f.meta["answer"] = value
+                f.meta["answer_source"] = "bank"
+                answered.add(f.field_id)
+    lookups = bank.stats.lookups - before_lookups
+    hits = bank.stats.hits - before_hits
+    event(
+        "FORM",
+        "INFO",
+        "answer_bank_summary",
+        lookups=lookups,
+        hits=hits,
+        hit_rate=round(hits / lookups, 3) if lookups else 0.0,
+    )
+    return answered
 
-    # Safety trims: cap resume and context size to keep prompts reasonable
-    max_chars = 12000
-    resume_short = (resume_text or "")[:max_chars]
-    job_short = (job_context or "")[:6000]
 
-    prompt = _compose_prompt(
-        fields_brief=fields_brief,
-        resume_text=resume_short,
-        job_context=job_short or None,
-        ignore_optional=ignore_optional,
+def _has_residual(schema: FormSchema, answered: Set[str]) -> bool:
+    return any(
+        f.type != "file" and f.field_id not in answered for section in schema.sections for f in section.fields
     )
 
-    client = get_openai_client()
+
+def _answer_request(
+    schema: FormSchema,
+    *,
+    resume_text: str,
+    job_context: Optional[str],
+    ignore_optional: bool,
+    model: str,
+    skip: Optional[Set[str]] = None,
+) -> Dict[str, Any]:
+    """Build chat-completion kwargs for the form answering call."""
+    fields_brief = _build_fields_brief(schema, skip)
+    prefix = _compose_prefix(resume_text=resume_text or "", job_context=job_context, model=model)
+    suffix = _compose_suffix(fields_brief=fields_brief, ignore_optional=ignore_optional)
+    prompt = prefix + "\n" + suffix
+
     # Log prompt
-    json_blob("LLM", "DEBUG", "form_answer_prompt", {"model": model, "prompt": prompt})
-    resp = client.chat.completions.create(
+    json_blob(
+        "LLM",
+        "DEBUG",
+        "form_answer_prompt",
+        {
+            "model": model,
+            "prompt": prompt,
+            "prefix_tokens": count_tokens(_SYSTEM_PROMPT + prefix, model),
+            "suffix_tokens": count_tokens(suffix, model),
+        },
+    )
+    return dict(
         model=model,
         response_format={"type": "json_object"},
         messages=[
-            {
-                "role": "system",
-                "content": (
-                    "You are a precise application-filling assistant. Return strictly JSON."
-                ),
-            },
+            {"role": "system", "content": _SYSTEM_PROMPT},
             {"role": "user", "content": prompt},
         ],
         temperature=0.2,
         max_tokens=900,
     )
 
-    raw = resp.choices[0].message.content or "{}"
+
+def _set_answer(f: FormField, val: Any) -> None:
+    # Normalize booleanish to expected string for checkboxes/radios
+    if f.type in {"checkbox", "radio"}:
+        sval = str(val).strip().lower()
+        f.meta["answer"] = "true" if sval in {"1", "true", "yes", "on"} else "false"
+    else:
+        f.meta["answer"] = str(val)
+    f.meta["answer_source"] = "llm"
+
+
+def _apply_answers(schema: FormSchema, raw: str, *, model: str, banked: int = 0) -> FormSchema:
+    """Parse the model's JSON and write answers into field meta."""
     # Log raw response
     json_blob("LLM", "DEBUG", "form_answer_response", {"model": model, "response": raw})
-    import json
 
     data: Dict[str, Any]
     try:
@@ -137,25 +185,223 @@ def generate_answers(
     answer_count = 0
     for section in schema.sections:
         for f in section.fields:
-            if f.field_id in answers:
-                val = answers[f.field_id]
-                # Normalize booleanish to expected string for checkboxes/radios
-                if f.type in {"checkbox", "radio"}:
-                    sval = str(val).strip().lower()
-                    f.meta["answer"] = "true" if sval in {"1", "true", "yes", "on"} else "false"
-                else:
-                    f.meta["answer"] = str(val)
+            if f.field_id in answers and f.meta.get("answer_source") != "bank":
+                _set_answer(f, answers[f.field_id])
                 answer_count += 1
 
     # Attach a minimal summary into schema validity meta for debugging
     try:
         if hasattr(schema, "validity") and schema.validity and isinstance(schema.validity.meta, dict):
             schema.validity.meta["llm_answered_fields"] = answer_count
+            schema.validity.meta["bank_answered_fields"] = banked
     except Exception:
         pass
 
-    event("LLM", "INFO", "form_answers_summary", answered_fields=answer_count)
+    event("LLM", "INFO", "form_answers_summary", answered_fields=answer_count, bank_answered_fields=banked)
 
     return schema
 
 
+def generate_answers(
+    schema: FormSchema,
+    *,
+    resume_text: str,
+    job_context: Optional[str] = None,
+    ignore_optional: bool = True,
+    model: str = "gpt-4o",
+    answer_bank: Optional[AnswerBank] = None,
+) -> FormSchema:
+    """
+    Populate FormSchema fields' meta["answer"] using an LLM, based on the provided
+    resume text and optional job context. Returns the same schema object with
+    answers filled where applicable. Fields the answer bank recognizes are
+    answered locally and only the rest are sent to the model.
+    """
+    banked = _prefill_from_bank(schema, answer_bank)
+    if not _has_residual(schema, banked):
+        return _apply_answers(schema, "{}", model=model, banked=len(banked))
+    request = _answer_request(
+        schema,
+        resume_text=resume_text,
+        job_context=job_context,
+        ignore_optional=ignore_optional,
+        model=model,
+        skip=banked,
+    )
+    with llm_stage("form_answers"):
+        resp = create_chat_completion(**request)
+    return _apply_answers(schema, resp.choices[0].message.content or "{}", model=model, banked=len(banked))
+
+
+async def agenerate_answers(
+    schema: FormSchema,
+    *,
+    resume_text: str,
+    job_context: Optional[str] = None,
+    ignore_optional: bool = True,
+    model: str = "gpt-4o",
+    answer_bank: Optional[AnswerBank] = None,
+) -> FormSchema:
+    """Async variant of generate_answers; awaits the model without blocking the loop."""
+    banked = _prefill_from_bank(schema, answer_bank)
+    if not _has_residual(schema, banked):
+        return _apply_answers(schema, "{}", model=model, banked=len(banked))
+    request = _answer_request(
+        schema,
+        resume_text=resume_text,
+        job_context=job_context,
+        ignore_optional=ignore_optional,
+        model=model,
+        skip=banked,
+    )
+    with llm_stage("form_answers"):
+        resp = await acreate_chat_completion(**request)
+    return _apply_answers(schema, resp.choices[0].message.content or "{}", model=model, banked=len(banked))
+
+
+def build_answer_request(
+    schema: FormSchema,
+    *,
+    resume_text: str,
+    job_context: Optional[str] = None,
+    ignore_optional: bool = True,
+    model: str = "gpt-4o",
+    answer_bank: Optional[AnswerBank] = None,
+) -> Optional[Dict[str, Any]]:
+    """Prefill banked answers and return the chat request for the rest (None if nothing is left).
+
+    Used to queue forms for batch execution; feed the completion back through
+    apply_answer_completion.
+    """
+    banked = _prefill_from_bank(schema, answer_bank)
+    if not _has_residual(schema, banked):
+        return None
+    return _answer_request(
+        schema,
+        resume_text=resume_text,
+        job_context=job_context,
+        ignore_optional=ignore_optional,
+        model=model,
+        skip=banked,
+    )
+
+
+def apply_answer_completion(schema: FormSchema, content: Optional[str], *, model: str = "gpt-4o") -> FormSchema:
+    """Write a completion produced outside generate_answers (e.g. a batch result) into the schema."""
+    banked = sum(1 for s in schema.sections for f in s.fields if f.meta.get("answer_source") == "bank")
+    return _apply_answers(schema, content or "{}", model=model, banked=banked)
+
+
+_ANSWERS_OPEN = re.compile(r'"answers"\s*:\s*\{')
+_DECODER = json.JSONDecoder()
+
+
+def _skip_ws(buf: str, i: int) -> int:
+    while i < len(buf) and buf[i] in " \t\r\n":
+        i += 1
+    return i
+
+
+class AnswerStreamParser:
+    """Pull complete entries out of the "answers" object of a JSON reply as it streams in.
+
+    An entry is emitted once its value and the following "," or "}" have
+    arrived, so a number cut mid-stream is never emitted early.
+    """
+
+    def __init__(self) -> None:
+        self.buf = ""
+        self.pos: Optional[int] = None
+        self.done = False
+
+    def feed(self, text: str) -> List[Tuple[str, Any]]:
+        self.buf += text
+        out: List[Tuple[str, Any]] = []
+        if self.pos is None:
+            m = _ANSWERS_OPEN.search(self.buf)
+            if not m:
+                return out
+            self.pos = m.end()
+        buf = self.buf
+        while not self.done:
+            i = _skip_ws(buf, self.pos)
+            if i >= len(buf):
+                break
+            if buf[i] == "}":
+                self.done = True
+                break
+            if buf[i] == ",":
+                self.pos = i + 1
+                continue
+            try:
+                key, j = _DECODER.raw_decode(buf, i)
+            except ValueError:
+                break
+            j = _skip_ws(buf, j)
+            if j >= len(buf):
+                break
+            if not isinstance(key, str) or buf[j] != ":":
+                self.done = True  # not the shape we asked for; leave it to the final parse
+                break
+            k = _skip_ws(buf, j + 1)
+            if k >= len(buf):
+                break
+            try:
+                value, end = _DECODER.raw_decode(buf, k)
+            except ValueError:
+                break
+            end = _skip_ws(buf, end)
+            if end >= len(buf):
+                break
+            if buf[end] not in ",}":
+                self.done = True
+                break
+            out.append((key, value))
+            self.pos = end
+        return out
+
+
+async def astream_answers(
+    schema: FormSchema,
+    *,
+    resume_text: str,
+    job_context: Optional[str] = None,
+    ignore_optional: bool = True,
+    model: str = "gpt-4o",
+    answer_bank: Optional[AnswerBank] = None,
+) -> AsyncIterator[FormField]:
+    """Yield fields as soon as their answers are known: banked ones first, then
+    each model answer as its JSON entry completes.
+
+    When the stream ends the full reply is applied as in generate_answers, so
+    the schema ends up identical to the buffered path.
+    """
+    request = build_answer_request(
+        schema,
+        resume_text=resume_text,
+        job_context=job_context,
+        ignore_optional=ignore_optional,
+        model=model,
+        answer_bank=answer_bank,
+    )
+    for section in schema.sections:
+        for f in section.fields:
+            if f.meta.get("answer_source") == "bank":
+                yield f
+    if request is None:
+        apply_answer_completion(schema, None, model=model)
+        return
+
+    by_id = {f.field_id: f for section in schema.sections for f in section.fields}
+    parser = AnswerStreamParser()
+    parts: List[str] = []
+    with llm_stage("form_answers"):
+        async for delta in astream_chat_completion(**request):
+            parts.append(delta)
+            for field_id, value in parser.feed(delta):
+                f = by_id.get(field_id)
+                if f is None or f.meta.get("answer_source") == "bank":
+                    continue
+                _set_answer(f, value)
+                yield f
+    apply_answer_completion(schema, "".join(parts), model=model)
@@ -1,9 +1,10 @@
 from __future__ import annotations
+import asyncio
 import random
 import re
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional, List
+from typing import AsyncIterator, Optional, List
 
 from playwright.async_api import Page
 
@@ -237,74 +238,164 @@ async def _fill_field(page: Page, field: FormField, value: str, opts: ExecutionO
         return
 
 
-async def execute_fill_plan(page: Page, schema_with_answers: FormSchema, profile_root: Path, *, wait_seconds: int = 60, preferred_resume_pdf: Optional[Path] = None) -> None:
-    opts = ExecutionOptions()
-    print("[executor] Form loaded; starting execution")
-    event("FORM", "INFO", "form_execution_start", url=page.url)
-    # 1) Upload resume first to trigger autofill
+async def _upload_resume_first(
+    page: Page, schema: FormSchema, profile_root: Path, preferred_resume_pdf: Optional[Path], opts: ExecutionOptions
+) -> None:
+    # Upload resume first to trigger autofill
     resume = _pick_resume_pdf(profile_root, preferred=preferred_resume_pdf)
     if resume:
         with action("upload_resume", category="FORM", path=str(resume)):
-            await _upload_resume(page, schema_with_answers, resume, opts)
+            await _upload_resume(page, schema, resume, opts)
         # Give autofill a bit more time to propagate values and render
         await page.wait_for_timeout(2000)
 
+
+async def _fill_answered_field(page: Page, f: FormField, opts: ExecutionOptions) -> None:
+    """Fill one answered field unless autofill already populated it."""
+    answer = f.meta.get("answer") if isinstance(f.meta, dict) else None
+    if not answer:
+        return
+    # Skip upload fields (handled)
+    if f.type == "file":
+        return
+    # Check if already populated
+    sel = f.locators.css or None
+    if not sel:
+        print(f"[executor] No selector for field: {(f.label or f.name or f.field_id)}; trying label fallback")
+    try:
+        # Determine pre-populated differently by type
+        prepopulated = False
+        if f.type in {"text", "email", "tel", "number", "date", "textarea"}:
+            if sel:
+                loc = page.locator(sel)
+                if await loc.count() > 0:
+                    try:
+                        val = await loc.first.input_value()
+                        prepopulated = bool(val and val.strip())
+                        if prepopulated:
+                            print(f"[executor] Skipping pre-populated text: {(f.label or f.name or f.field_id)} -> '{val}'")
+                    except Exception:
+                        prepopulated = False
+        elif f.type in {"checkbox", "radio"}:
+            if sel:
+                loc = page.locator(sel)
+                if await loc.count() > 0:
+                    try:
+                        state = await loc.first.is_checked()
+                        prepopulated = bool(state)
+                        if prepopulated:
+                            print(f"[executor] Skipping pre-checked: {(f.label or f.name or f.field_id)}")
+                    except Exception:
+                        prepopulated = False
+        if prepopulated:
+            return
+        if f.type in {"text", "email", "tel", "number", "date", "textarea"}:
+            print(f"[executor] Filling {f.type}: {(f.label or f.name or f.field_id)} -> {answer}")
+        with action("fill_field", category="FORM", field_id=f.field_id, label=(f.label or f.name or f.field_id), type=f.type):
+            await _fill_field(page, f, str(answer), opts)
+            try:
+                png = await page.screenshot(full_page=False)
+                image("FORM", "TRACE", f"after_fill_{f.field_id}", png)
+            except Exception:
+                pass
+    except Exception as e:
+        print(f"[executor] Failed to fill field: {(f.label or f.name or f.field_id)} | error={e}")
+        event("FORM", "DEBUG", "fill_field_error", field_id=f.field_id, error=str(e))
+
+
+async def _hold_and_read_back(page: Page, schema: FormSchema, wait_seconds: int) -> None:
+    # Leave browser open for manual review
+    await page.wait_for_timeout(wait_seconds * 1000)
+    event("FORM", "INFO", "form_execution_complete", hold_seconds=wait_seconds)
+
+    # Read back what is on the page after review, so the answer bank learns
+    # the values the user kept (or corrected) rather than raw model output
+    await _read_back_confirmed(page, schema)
+
+
+async def execute_fill_plan(page: Page, schema_with_answers: FormSchema, profile_root: Path, *, wait_seconds: int = 60, preferred_resume_pdf: Optional[Path] = None) -> None:
+    opts = ExecutionOptions()
+    print("[executor] Form loaded; starting execution")
+    event("FORM", "INFO", "form_execution_start", url=page.url)
+    # 1) Upload resume first to trigger autofill
+    await _upload_resume_first(page, schema_with_answers, profile_root, preferred_resume_pdf, opts)
+
     # 2) Fill remaining fields; if field has existing value from autofill, do not override
     for section in schema_with_answers.sections:
         for f in section.fields:
-            answer = f.meta.get("answer") if isinstance(f.meta, dict) else None
-            if not answer:
-                continue
-            # Skip upload fields (handled)
-            if f.type == "file":
+            await _fill_answered_field(page, f, opts)
+
+    # 3) Hold for review, then read back confirmed values
+    await _hold_and_read_back(page, schema_with_answers, wait_seconds)
+
+
+async def execute_fill_stream(
+    page: Page,
+    schema: FormSchema,
+    answers: AsyncIterator[FormField],
+    profile_root: Path,
+    *,
+    wait_seconds: int = 60,
+    preferred_resume_pdf: Optional[Path] = None,
+) -> None:
+    """Like execute_fill_plan, but fills fields from ``answers`` as they arrive.
+
+    The answer stream runs in its own task and feeds a fill queue, so the resume
+    upload and typing overlap with generation. A failed stream stops the queue;
+    fields answered so far stay filled and the review hold still happens.
+    """
+    opts = ExecutionOptions()
+    print("[executor] Form loaded; starting streamed execution")
+    event("FORM", "INFO", "form_execution_start", url=page.url, streamed=True)
+    queue: asyncio.Queue[Optional[FormField]] = asyncio.Queue()
+
+    async def produce() -> None:
+        try:
+            async for f in answers:
+                queue.put_nowait(f)
+        finally:
+            queue.put_nowait(None)
+
+    producer = asyncio.create_task(produce())
+    filled = 0
+    try:
+        await _upload_resume_first(page, schema, profile_root, preferred_resume_pdf, opts)
+        while (f := await queue.get()) is not None:
+            await _fill_answered_field(page, f, opts)
+            filled += 1
+        try:
+            await producer
+        except Exception as e:
+            event("LLM", "INFO", "generate_answers_failed", error=str(e), filled_before_failure=filled)
+    finally:
+        if not producer.done():
+            producer.cancel()
+    event("FORM", "DEBUG", "form_stream_filled", fields=filled)
+
+    await _hold_and_read_back(page, schema, wait_seconds)
+
+
+async def _read_back_confirmed(page: Page, schema: FormSchema) -> None:
+    confirmed = 0
+    for section in schema.sections:
+        for f in section.fields:
+            if not isinstance(f.meta, dict) or f.meta.get("answer_source") != "llm" or not f.locators.css:
                 continue
-            # Check if already populated
-            sel = f.locators.css or None
-            if not sel:
-                print(f"[executor] No selector for field: {(f.label or f.name or f.field_id)}; trying label fallback")
             try:
-                # Determine pre-populated differently by type
-                prepopulated = False
-                if f.type in {"text", "email", "tel", "number", "date", "textarea"}:
-                    if sel:
-                        loc = page.locator(sel)
-                        if await loc.count() > 0:
-                            try:
-                                val = await loc.first.input_value()
-                                prepopulated = bool(val and val.strip())
-                                if prepopulated:
-                                    print(f"[executor] Skipping pre-populated text: {(f.label or f.name or f.field_id)} -> '{val}'")
-                            except Exception:
-                                prepopulated = False
-                elif f.type in {"checkbox", "radio"}:
-                    if sel:
-                        loc = page.locator(sel)
-                        if await loc.count() > 0:
-                            try:
-                                state = await loc.first.is_checked()
-                                prepopulated = bool(state)
-                                if prepopulated:
-                                    print(f"[executor] Skipping pre-checked: {(f.label or f.name or f.field_id)}")
-                            except Exception:
-                                prepopulated = False
-                if prepopulated:
+                loc = page.locator(f.locators.css)
+                if await loc.count() == 0:
                     continue
-                if f.type in {"text", "email", "tel", "number", "date", "textarea"}:
-                    print(f"[executor] Filling {f.type}: {(f.label or f.name or f.field_id)} -> {answer}")
-                with action("fill_field", category="FORM", field_id=f.field_id, label=(f.label or f.name or f.field_id), type=f.type):
-                    await _fill_field(page, f, str(answer), opts)
-                    try:
-                        png = await page.screenshot(full_page=False)
-                        image("FORM", "TRACE", f"after_fill_{f.field_id}", png)
-                    except Exception:
-                        pass
-            except Exception as e:
-                print(f"[executor] Failed to fill field: {(f.label or f.name or f.field_id)} | error={e}")
-                event("FORM", "DEBUG", "fill_field_error", field_id=f.field_id, error=str(e))
+                if f.type in {"text", "email", "tel", "number", "date"}:
+                    value = (await loc.first.input_value()).strip()
+                elif f.type in {"checkbox", "radio"} and not f.options:
+                    value = "true" if await loc.first.is_checked() else "false"
+                else:
+                    continue
+            except Exception:
                 continue
-
-    # 3) Leave browser open for manual review
-    await page.wait_for_timeout(wait_seconds * 1000)
-    event("FORM", "INFO", "form_execution_complete", hold_seconds=wait_seconds)
+            if value:
+                f.meta["confirmed_value"] = value
+                confirmed += 1
+    event("FORM", "DEBUG", "form_values_confirmed", fields=confirmed)
 
 
@@ -5,6 +5,7 @@ import json
 import re
 import os
 
+from .resume_index import build_resume_index
 from .user_profiles import (
     UserProfile,
     UserSecrets,
@@ -206,6 +207,7 @@ def refresh_resumes(profile: UserProfile) -> int:
     - Filter for names starting with "[AP]", containing "Resume" and the human name (case-insensitive)
     - Download updated/new items to [profile]/resume_pdf/<base>/ as resume.pdf + resume.txt
     - Remove local copies for items no longer present
+    - Refresh the resume embedding index (resume_embeddings.npy/.json)
     """
     service = _drive_service_from_secrets(profile)
     settings = load_user_settings(profile)
@@ -324,4 +326,10 @@ def refresh_resumes(profile: UserProfile) -> int:
                 pass
 
     _write_json(index_path, updated_index)
+
+    # Embed new/changed resumes for fast alignment; unchanged ones keep their vectors
+    try:
+        build_resume_index(profile)
+    except Exception as e:
+        print(f"⚠️ Resume embedding index not updated: {e}")
     return len(matched)
@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from playwright.async_api import Page
+
+from .tracing import event
+
+# Runs entirely in the page: scroll one viewport at a time, wait until the DOM and
+# the network are quiet, collect anchors, and stop once scrolling stops producing
+# new ones. fetch/XHR are wrapped only for the duration of the call.
+_HARVEST_JS = """
+async ({maxRounds, quietMs, settleMs, maxMs, idleRounds, includeText}) => {
+  const started = performance.now();
+  const sleep = ms => new Promise(r => setTimeout(r, ms));
+  let lastActivity = performance.now(), mutations = 0, inflight = 0, requests = 0;
+  const bump = () => { lastActivity = performance.now(); };
+  const observer = new MutationObserver(records => { mutations += records.length; bump(); });
+  observer.observe(document.documentElement, {childList: true, subtree: true});
+  let resourceCount = performance.getEntriesByType('resource').length;
+  const origFetch = window.fetch;
+  const origSend = XMLHttpRequest.prototype.send;
+  const track = () => { inflight++; requests++; bump(); };
+  const untrack = () => { inflight = Math.max(0, inflight - 1); bump(); };
+  if (origFetch) {
+    window.fetch = function(...args) { track(); return origFetch.apply(this, args).finally(untrack); };
+  }
+  XMLHttpRequest.prototype.send = function(...args) {
+    track();
+    this.addEventListener('loadend', untrack, {once: true});
+    return origSend.apply(this, args);
+  };
+  const settle = async () => {
+    const until = performance.now() + settleMs;
+    while (performance.now() < until) {
+      const n = performance.getEntriesByType('resource').length;
+      if (n !== resourceCount) { resourceCount = n; bump(); }
+      if (inflight === 0 && performance.now() - lastActivity >= quietMs) return true;
+      await sleep(50);
+    }
+    return false;
+  };
+  const links = new Map();
+  const pageUrl = location.href.split('#')[0];
+  const collect = () => {
+    let added = 0;
+    for (const a of document.querySelectorAll('a[href]')) {
+      let url;
+      try { url = new URL(a.getAttribute('href'), document.baseURI); } catch (e) { continue; }
+      if (!['http:', 'https:', 'mailto:'].includes(url.protocol)) continue;
+      const href = url.href;
+      if (url.hash && href.split('#')[0] === pageUrl) continue;  // same-page anchor
+      if (links.has(href)) continue;
+      const title = a.getAttribute('title') || '';
+      const text = (a.textContent || '').replace(/\\s+/g, ' ').trim() || a.getAttribute('aria-label') || title;
+      if (!text) continue;
+      links.set(href, {
+        text: text.slice(0, 200),
+        url: href,
+        title: title,
+        footer: !!a.closest('footer, [role=contentinfo]'),
+      });
+      added++;
+    }
+    return added;
+  };
+  const atBottom = () =>
+    window.innerHeight + window.scrollY >= document.documentElement.scrollHeight - 2;
+
+  let rounds = 0, idle = 0, stop = 'max_rounds', quiet = true;
+  try {
+    quiet = await settle();
+    collect();
+    while (rounds < maxRounds) {
+      if (performance.now() - started > maxMs) { stop = 'time_budget'; break; }
+      rounds++;
+      const before = mutations;
+      if (idle >= idleRounds) {
+        window.scrollTo(0, document.documentElement.scrollHeight);
+      } else {
+        window.scrollBy(0, Math.max(window.innerHeight, 600));
+      }
+      quiet = (await settle()) && quiet;
+      const added = collect();
+      if (added === 0 && atBottom()) { stop = 'no_new_links'; break; }
+      idle = (added === 0 && mutations === before) ? idle + 1 : 0;
+    }
+  } finally {
+    observer.disconnect();
+    if (origFetch) window.fetch = origFetch;
+    XMLHttpRequest.prototype.send = origSend;
+    window.scrollTo(0, 0);
+  }
+  return {
+    links: Array.from(links.values()),
+    title: document.title,
+    text: includeText && document.body ? document.body.innerText : null,
+    rounds, stop, quiet, mutations, requests,
+    elapsed_ms: performance.now() - started,
+  };
+}
+"""
+
+
+@dataclass
+class HarvestResult:
+    links: List[Dict[str, Any]] = field(default_factory=list)  # {text, url, title, footer}
+    title: str = ""
+    text: Optional[str] = None
+    rounds: int = 0
+    stop_reason: str = ""
+    quiet: bool = True  # False when a settle wait hit its cap with the page still busy
+    mutations: int = 0
+    requests: int = 0
+    elapsed_s: float = 0.0
+
+    def metrics(self, legacy_wait_s: float = 0.0) -> Dict[str, Any]:
+        """Trace-friendly summary; ``saved_s`` compares against the fixed sleeps it replaces."""
+        return {
+            "links": len(self.links),
+            "rounds": self.rounds,
+            "stop_reason": self.stop_reason,
+            "quiet": self.quiet,
+            "mutations": self.mutations,
+            "requests": self.requests,
+            "elapsed_s": round(self.elapsed_s, 3),
+            "legacy_wait_s": legacy_wait_s,
+            "saved_s": round(legacy_wait_s - self.elapsed_s, 3),
+        }
+
+
+async def harvest_links(
+    page: Page,
+    *,
+    include_text: bool = False,
+    max_rounds: int = 12,
+    quiet_ms: int = 300,
+    settle_ms: int = 1500,
+    idle_rounds: int = 2,
+    max_s: float = 8.0,
+) -> HarvestResult:
+    """Load lazy content and return the page's deduplicated absolute links in one round trip.
+
+    Each round scrolls a viewport and waits until no DOM mutation, request or
+    resource load has happened for ``quiet_ms`` (capped at ``settle_ms``). After
+    ``idle_rounds`` rounds that change nothing it jumps to the bottom; it stops at
+    the bottom as soon as a round adds no new anchors. The page ends scrolled to top.
+    """
+    started = time.perf_counter()
+    raw = await page.evaluate(
+        _HARVEST_JS,
+        {
+            "maxRounds": max_rounds,
+            "quietMs": quiet_ms,
+            "settleMs": settle_ms,
+            "maxMs": int(max_s * 1000),
+            "idleRounds": idle_rounds,
+            "includeText": include_text,
+        },
+    )
+    result = HarvestResult(
+        links=list(raw.get("links") or []),
+        title=raw.get("title") or "",
+        text=raw.get("text"),
+        rounds=int(raw.get("rounds") or 0),
+        stop_reason=raw.get("stop") or "",
+        quiet=bool(raw.get("quiet", True)),
+        mutations=int(raw.get("mutations") or 0),
+        requests=int(raw.get("requests") or 0),
+        elapsed_s=time.perf_counter() - started,
+    )
+    event(
+        "BROWSER",
+        "DEBUG",
+        "links_harvested",
+        url=getattr(page, "url", None),
+        links=len(result.links),
+        rounds=result.rounds,
+        stop_reason=result.stop_reason,
+        elapsed_s=round(result.elapsed_s, 3),
+    )
+    return result
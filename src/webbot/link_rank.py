@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+from urllib.parse import urlparse
+
+import numpy as np
+
+from .company_kb import ATS_HOST_SUFFIXES, normalize_domain
+
+# Anchor text / URL path vocabulary. Matching is substring-based on lowercased text.
+_CAREERS_TEXT = ("career", "jobs", "job openings", "open positions", "open roles", "join us", "join our team",
+                 "work with us", "work at", "we're hiring", "we are hiring", "hiring", "vacancies")
+_CAREERS_PATH = ("career", "/jobs", "/job/", "opening", "position", "/join", "work-with-us", "vacanc", "hiring")
+_JOB_PATH = ("/job", "/position", "/opening", "/role", "/apply", "/posting", "/o/", "/j/")
+# Links that essentially never lead to a company's own job postings
+_NOISE_HOSTS = ("linkedin.com", "twitter.com", "x.com", "facebook.com", "instagram.com", "youtube.com",
+                "tiktok.com", "glassdoor.com", "indeed.com", "medium.com", "apple.com", "play.google.com")
+_NOISE_TEXT = ("privacy", "cookie", "terms", "log in", "login", "sign in", "sign up", "press", "blog", "investor")
+
+# Feature weights, in column order of FEATURES
+_WEIGHTS = {
+    "careers": np.array([3.0, 2.5, 3.0, 0.0, 0.0, 1.0, -1.0, 0.5, -4.0]),
+    "jobs": np.array([1.0, 1.0, 2.0, 2.5, 3.0, 0.5, -1.0, -0.5, -4.0]),
+}
+FEATURES = (
+    "careers_text", "careers_path", "ats_host", "job_path", "query_overlap",
+    "same_domain", "offsite", "footer", "noise",
+)
+
+_WORD = re.compile(r"[a-z0-9+#]+")
+_STOPWORDS = {"the", "and", "for", "with", "of", "a", "an", "in", "at", "to", "on", "or", "senior", "junior", "sr", "jr"}
+
+
+def query_terms(text: Optional[str]) -> List[str]:
+    """Distinct lowercase words worth matching against link text (e.g. from a job title)."""
+    return sorted({w for w in _WORD.findall((text or "").lower()) if len(w) > 1 and w not in _STOPWORDS})
+
+
+def _contains_any(values: np.ndarray, needles: Iterable[str]) -> np.ndarray:
+    hits = [np.char.find(values, n) >= 0 for n in needles]
+    return np.logical_or.reduce(hits) if hits else np.zeros(values.shape, dtype=bool)
+
+
+def _host_matches(hosts: np.ndarray, suffixes: Sequence[str]) -> np.ndarray:
+    hits = [(hosts == s) | np.char.endswith(hosts, "." + s) for s in suffixes]
+    return np.logical_or.reduce(hits) if hits else np.zeros(hosts.shape, dtype=bool)
+
+
+def _features(links: Sequence[Dict[str, Any]], base_domain: Optional[str], terms: Sequence[str]) -> np.ndarray:
+    """(n_links, n_features) matrix, each column computed over all links at once."""
+    parsed = [urlparse(link.get("url") or "") for link in links]
+    texts = np.array([f"{link.get('text') or ''} {link.get('title') or ''}".lower() for link in links])
+    paths = np.array([(p.path or "/").lower() for p in parsed])
+    hosts = np.array([(p.hostname or "").lower() for p in parsed])
+    footer = np.array([bool(link.get("footer")) for link in links])
+
+    ats = _host_matches(hosts, ATS_HOST_SUFFIXES)
+    same = _host_matches(hosts, [base_domain]) if base_domain else np.zeros(len(links), dtype=bool)
+    if terms:
+        overlap = np.sum([np.char.find(texts, t) >= 0 for t in terms], axis=0) / len(terms)
+    else:
+        overlap = np.zeros(len(links))
+    noise = _host_matches(hosts, _NOISE_HOSTS) | _contains_any(texts, _NOISE_TEXT)
+    return np.column_stack([
+        _contains_any(texts, _CAREERS_TEXT),
+        _contains_any(paths, _CAREERS_PATH),
+        ats,
+        _contains_any(paths, _JOB_PATH) | (ats & (np.char.count(paths, "/") >= 2)),
+        overlap,
+        same,
+        ~same & ~ats,
+        footer,
+        noise,
+    ]).astype(np.float32)
+
+
+@dataclass
+class LinkRanking:
+    """Links ordered best first, with their scores and the shortlist sent to the LLM."""
+
+    ranked: List[Dict[str, Any]] = field(default_factory=list)
+    scores: List[float] = field(default_factory=list)
+    top_n: int = 25
+    original: List[Dict[str, Any]] = field(default_factory=list)  # input (DOM) order
+
+    @property
+    def shortlist(self) -> List[Dict[str, Any]]:
+        return self.ranked[: self.top_n]
+
+    def dominant(self, margin: float, min_score: float = 4.0) -> Optional[Dict[str, Any]]:
+        """The top link when it beats the runner-up by ``margin`` and scores at least ``min_score``."""
+        if not self.ranked or self.scores[0] < min_score:
+            return None
+        runner_up = self.scores[1] if len(self.scores) > 1 else 0.0
+        return self.ranked[0] if self.scores[0] - runner_up >= margin else None
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "links": len(self.ranked),
+            "shortlist": len(self.shortlist),
+            "top": [(link.get("url"), round(score, 2)) for link, score in zip(self.ranked[:5], self.scores[:5])],
+        }
+
+
+def rank_links(
+    links: Sequence[Dict[str, Any]],
+    *,
+    base_domain: Optional[str] = None,
+    purpose: str = "careers",
+    query: Optional[str] = None,
+    top_n: int = 25,
+) -> LinkRanking:
+    """Score links locally for a link-analysis prompt.
+
+    ``purpose`` is "careers" (find the careers page from a company site) or "jobs"
+    (find a specific posting on a careers/ATS page, matched against ``query``).
+    Ties keep DOM order, so the ranking degrades to the old first-N window.
+    """
+    if not links:
+        return LinkRanking(top_n=top_n)
+    weights = _WEIGHTS[purpose]
+    domain = normalize_domain(base_domain) if base_domain else None
+    scores = _features(links, domain, query_terms(query)) @ weights
+    order = np.argsort(-scores, kind="stable")
+    return LinkRanking(
+        ranked=[links[i] for i in order],
+        scores=[float(scores[i]) for i in order],
+        top_n=top_n,
+        original=list(links),
+    )
+
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+# Shared LLM plumbing: pooled clients, response cache and the chat entry point
+from .client import (
+    ClientPoolStats,
+    OpenAIConfigError,
+    get_async_openai_client,
+    get_client_pool_stats,
+    get_openai_client,
+    reset_openai_clients,
+)
+from .cache import CacheMode, LLMCacheMissError, LLMResponseCache, get_cache_mode, set_cache_mode
+from .chat import acreate_chat_completion, create_chat_completion
+from .telemetry import llm_stage, telemetry_scope
+from .batch import BatchRequest, collect_batch, load_batch_job, submit_batch, wait_for_batch
+
+__all__ = [
+    "llm_stage",
+    "telemetry_scope",
+    "BatchRequest",
+    "collect_batch",
+    "load_batch_job",
+    "submit_batch",
+    "wait_for_batch",
+    "CacheMode",
+    "LLMCacheMissError",
+    "LLMResponseCache",
+    "acreate_chat_completion",
+    "create_chat_completion",
+    "get_cache_mode",
+    "set_cache_mode",
+    "ClientPoolStats",
+    "OpenAIConfigError",
+    "get_async_openai_client",
+    "get_client_pool_stats",
+    "get_openai_client",
+    "reset_openai_clients",
+]
@@ -0,0 +1,283 @@
+from __future__ import annotations
+
+import io
+import json
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from openai.types.chat import ChatCompletion
+
+from ..config import load_settings, repo_root
+from ..tracing import event
+from .cache import CacheMode, cache_key, get_cache_mode, get_response_cache
+from .chat import create_chat_completion
+from .client import get_openai_client
+from .tokens import record_usage
+
+ENDPOINT = "/v1/chat/completions"
+TERMINAL = {"completed", "failed", "expired", "cancelled"}
+
+
+@dataclass
+class BatchRequest:
+    """One chat-completion call in a batch; ``context`` travels with it for fan-out."""
+
+    custom_id: str
+    body: Dict[str, Any]
+    context: Dict[str, Any] = field(default_factory=dict)
+
+    def to_line(self) -> str:
+        return json.dumps({"custom_id": self.custom_id, "method": "POST", "url": ENDPOINT, "body": self.body})
+
+
+@dataclass
+class BatchJob:
+    """Local record of a submitted batch; persisted so runs can be resumed by job id."""
+
+    job_id: str
+    backend: str
+    remote_id: str
+    status: str
+    created_at: float
+    contexts: Dict[str, Dict[str, Any]]
+    bodies: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    label: Optional[str] = None
+
+
+@dataclass
+class BatchResult:
+    job: BatchJob
+    completions: Dict[str, ChatCompletion]
+    errors: Dict[str, str]
+
+    @property
+    def pending(self) -> List[str]:
+        done = set(self.completions) | set(self.errors)
+        return [cid for cid in self.job.contexts if cid not in done]
+
+    @property
+    def done(self) -> bool:
+        return self.job.status in TERMINAL
+
+
+class OpenAIBatchBackend:
+    """Submit through the OpenAI Batch API (24h completion window, discounted pricing)."""
+
+    name = "openai"
+
+    def submit(self, job_id: str, jsonl: str) -> str:
+        client = get_openai_client()
+        uploaded = client.files.create(file=(f"{job_id}.jsonl", io.BytesIO(jsonl.encode("utf-8"))), purpose="batch")
+        batch = client.batches.create(
+            input_file_id=uploaded.id,
+            endpoint=ENDPOINT,
+            completion_window="24h",
+            metadata={"webbot_job_id": job_id},
+        )
+        return batch.id
+
+    def poll(self, remote_id: str) -> Dict[str, Any]:
+        client = get_openai_client()
+        batch = client.batches.retrieve(remote_id)
+        lines: List[str] = []
+        # Output is readable once the batch ends, including partially failed/expired ones
+        if batch.status in TERMINAL:
+            for file_id in (batch.output_file_id, batch.error_file_id):
+                if file_id:
+                    lines.extend(client.files.content(file_id).text.splitlines())
+        return {"status": batch.status, "lines": lines}
+
+
+class LocalBatchBackend:
+    """File-backed stand-in for the Batch API.
+
+    Requests are written under ``root/<remote_id>/input.jsonl`` and executed on
+    poll through ``responder`` (create_chat_completion by default, so the
+    response cache and replay mode apply). ``max_per_poll`` simulates a batch
+    that completes over several polls.
+    """
+
+    name = "local"
+
+    def __init__(self, root: Path, *, responder: Optional[Callable[..., ChatCompletion]] = None, max_per_poll: int = 0):
+        self.root = root
+        self.responder = responder
+        self.max_per_poll = max_per_poll
+
+    def submit(self, job_id: str, jsonl: str) -> str:
+        remote_id = f"local_{job_id}"
+        d = self.root / remote_id
+        d.mkdir(parents=True, exist_ok=True)
+        (d / "input.jsonl").write_text(jsonl, encoding="utf-8")
+        (d / "output.jsonl").touch()
+        return remote_id
+
+    def poll(self, remote_id: str) -> Dict[str, Any]:
+        respond = self.responder or create_chat_completion
+        d = self.root / remote_id
+        out_path = d / "output.jsonl"
+        done = {json.loads(line)["custom_id"] for line in out_path.read_text(encoding="utf-8").splitlines() if line}
+        todo = [json.loads(line) for line in (d / "input.jsonl").read_text(encoding="utf-8").splitlines() if line]
+        todo = [r for r in todo if r["custom_id"] not in done]
+        if self.max_per_poll:
+            todo = todo[: self.max_per_poll]
+        with out_path.open("a", encoding="utf-8") as out:
+            for req in todo:
+                line: Dict[str, Any] = {"id": f"req_{uuid.uuid4().hex[:12]}", "custom_id": req["custom_id"]}
+                try:
+                    resp = respond(**req["body"])
+                    line.update({"response": {"status_code": 200, "body": resp.model_dump(mode="json")}, "error": None})
+                except Exception as e:
+                    line.update({"response": None, "error": {"code": type(e).__name__, "message": str(e)}})
+                out.write(json.dumps(line) + "\n")
+        lines = out_path.read_text(encoding="utf-8").splitlines()
+        total = sum(1 for line in (d / "input.jsonl").read_text(encoding="utf-8").splitlines() if line)
+        status = "completed" if len([x for x in lines if x]) >= total else "in_progress"
+        return {"status": status, "lines": lines}
+
+
+def _batch_root() -> Path:
+    s = load_settings()
+    return Path(s.llm_batch_dir) if s.llm_batch_dir else repo_root() / ".cache" / "llm" / "batches"
+
+
+def get_batch_backend(name: Optional[str] = None):
+    name = name or load_settings().llm_batch_backend
+    if name == "local":
+        return LocalBatchBackend(_batch_root() / "local")
+    return OpenAIBatchBackend()
+
+
+def _job_path(job_id: str) -> Path:
+    return _batch_root() / "jobs" / f"{job_id}.json"
+
+
+def _results_path(job_id: str) -> Path:
+    return _batch_root() / "jobs" / f"{job_id}.results.jsonl"
+
+
+def _save_job(job: BatchJob) -> None:
+    path = _job_path(job.job_id)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(asdict(job), indent=2), encoding="utf-8")
+
+
+def load_batch_job(job_id: str) -> BatchJob:
+    path = _job_path(job_id)
+    if not path.exists():
+        raise FileNotFoundError(f"Unknown batch job id: {job_id}")
+    return BatchJob(**json.loads(path.read_text(encoding="utf-8")))
+
+
+def submit_batch(requests: List[BatchRequest], *, backend=None, label: Optional[str] = None) -> BatchJob:
+    """Write requests as JSONL, submit them, and persist a resumable job record."""
+    if not requests:
+        raise ValueError("Nothing to submit")
+    ids = [r.custom_id for r in requests]
+    if len(set(ids)) != len(ids):
+        raise ValueError("custom_id values must be unique within a batch")
+    backend = backend or get_batch_backend()
+    job_id = time.strftime("%Y%m%d-%H%M%S-") + uuid.uuid4().hex[:6]
+    jsonl = "\n".join(r.to_line() for r in requests) + "\n"
+    remote_id = backend.submit(job_id, jsonl)
+    job = BatchJob(
+        job_id=job_id,
+        backend=backend.name,
+        remote_id=remote_id,
+        status="validating",
+        created_at=time.time(),
+        contexts={r.custom_id: r.context for r in requests},
+        bodies={r.custom_id: r.body for r in requests},
+        label=label,
+    )
+    _save_job(job)
+    event("LLM", "INFO", "batch_submitted", job_id=job_id, backend=backend.name, remote_id=remote_id, requests=len(requests))
+    return job
+
+
+def _read_results(job_id: str) -> Dict[str, Dict[str, Any]]:
+    path = _results_path(job_id)
+    if not path.exists():
+        return {}
+    out: Dict[str, Dict[str, Any]] = {}
+    for line in path.read_text(encoding="utf-8").splitlines():
+        if line:
+            rec = json.loads(line)
+            out[rec["custom_id"]] = rec
+    return out
+
+
+def _store_in_response_cache(body: Dict[str, Any], completion: ChatCompletion) -> None:
+    # Batch results become cache entries so interactive re-runs are free; like
+    # chat.py, only record/read_through write (replay serves recordings only)
+    if not body or get_cache_mode() not in (CacheMode.READ_THROUGH, CacheMode.RECORD):
+        return
+    cache = get_response_cache()
+    if cache is None:
+        return
+    params = {k: v for k, v in body.items() if k not in ("model", "messages")}
+    try:
+        cache.put(cache_key(body["model"], body["messages"], params), body["model"], completion.model_dump(mode="json"))
+    except Exception as e:
+        event("LLM", "DEBUG", "batch_cache_store_failed", error=str(e))
+
+
+def collect_batch(job_id: str, *, backend=None) -> BatchResult:
+    """Poll once and merge any new output lines into the job's local results."""
+    job = load_batch_job(job_id)
+    seen = _read_results(job_id)
+    if job.status not in TERMINAL:
+        backend = backend or get_batch_backend(job.backend)
+        polled = backend.poll(job.remote_id)
+        job.status = polled["status"]
+        new_lines = [json.loads(x) for x in polled["lines"] if x]
+        with _results_path(job_id).open("a", encoding="utf-8") as fh:
+            for rec in new_lines:
+                if rec["custom_id"] in seen:
+                    continue
+                seen[rec["custom_id"]] = rec
+                fh.write(json.dumps(rec) + "\n")
+                body = (rec.get("response") or {}).get("body")
+                # The local backend already went through create_chat_completion (usage + cache)
+                if body and not rec.get("error") and job.backend != LocalBatchBackend.name:
+                    completion = ChatCompletion.model_validate(body)
+                    record_usage(completion.model, completion.usage)
+                    _store_in_response_cache(job.bodies.get(rec["custom_id"], {}), completion)
+        _save_job(job)
+
+    completions: Dict[str, ChatCompletion] = {}
+    errors: Dict[str, str] = {}
+    for cid, rec in seen.items():
+        resp = rec.get("response") or {}
+        if rec.get("error") or resp.get("status_code", 200) != 200 or not resp.get("body"):
+            err = rec.get("error") or {}
+            errors[cid] = err.get("message") or f"status {resp.get('status_code')}"
+        else:
+            completions[cid] = ChatCompletion.model_validate(resp["body"])
+    result = BatchResult(job=job, completions=completions, errors=errors)
+    event(
+        "LLM",
+        "INFO",
+        "batch_polled",
+        job_id=job_id,
+        status=job.status,
+        completed=len(completions),
+        failed=len(errors),
+        pending=len(result.pending),
+    )
+    return result
+
+
+def wait_for_batch(
+    job_id: str, *, poll_interval_s: float = 30.0, timeout_s: Optional[float] = None, backend=None
+) -> BatchResult:
+    """Poll until the batch ends or ``timeout_s`` passes; returns whatever has arrived."""
+    start = time.monotonic()
+    while True:
+        result = collect_batch(job_id, backend=backend)
+        if result.done or (timeout_s is not None and time.monotonic() - start >= timeout_s):
+            return result
+        time.sleep(poll_interval_s)
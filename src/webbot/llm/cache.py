@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import asdict, dataclass
+from enum import Enum
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from ..config import load_settings, repo_root
+
+
+class CacheMode(str, Enum):
+    OFF = "off"
+    READ_THROUGH = "read_through"  # serve hits, call + store on miss
+    RECORD = "record"  # always call, store every response
+    REPLAY = "replay"  # serve hits only; a miss fails the run
+
+
+class LLMCacheMissError(RuntimeError): ...
+
+
+# Request parameters that change the completion and therefore belong in the key
+_KEY_PARAMS = (
+    "temperature",
+    "top_p",
+    "max_tokens",
+    "response_format",
+    "seed",
+    "stop",
+    "n",
+    "presence_penalty",
+    "frequency_penalty",
+    "tools",
+    "tool_choice",
+)
+
+
+def cache_key(model: str, messages: List[Dict[str, Any]], params: Dict[str, Any]) -> str:
+    """Content address for a chat request: sha256 over model, messages and sampling params."""
+    material = {
+        "model": model,
+        "messages": messages,
+        "params": {k: params[k] for k in _KEY_PARAMS if params.get(k) is not None},
+    }
+    blob = json.dumps(material, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    evictions: int = 0
+    expired: int = 0
+    replay_misses: int = 0
+
+
+class LLMResponseCache:
+    """SQLite-backed response store with TTL expiry and an LRU byte cap."""
+
+    def __init__(self, path: Path, *, ttl_s: float, max_bytes: int):
+        self.path = path
+        self.ttl_s = ttl_s
+        self.max_bytes = max_bytes
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                response TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL,
+                hits INTEGER NOT NULL DEFAULT 0
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses(last_access)")
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.stats.misses += 1
+                return None
+            response, created_at = row
+            if self.ttl_s > 0 and now - created_at > self.ttl_s:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._conn.commit()
+                self.stats.expired += 1
+                self.stats.misses += 1
+                return None
+            self._conn.execute(
+                "UPDATE responses SET last_access = ?, hits = hits + 1 WHERE key = ?", (now, key)
+            )
+            self._conn.commit()
+            self.stats.hits += 1
+        return json.loads(response)
+
+    def put(self, key: str, model: str, response: Dict[str, Any]) -> None:
+        blob = json.dumps(response, ensure_ascii=False)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, model, response, size, created_at, last_access, hits) "
+                "VALUES (?, ?, ?, ?, ?, ?, 0)",
+                (key, model, blob, len(blob), now, now),
+            )
+            self.stats.stores += 1
+            self._evict_locked()
+            self._conn.commit()
+
+    def _evict_locked(self) -> None:
+        if self.max_bytes <= 0:
+            return
+        (total,) = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()
+        if total <= self.max_bytes:
+            return
+        for key, size in self._conn.execute(
+            "SELECT key, size FROM responses ORDER BY last_access ASC"
+        ).fetchall():
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            self.stats.evictions += 1
+
+    def purge_expired(self) -> int:
+        if self.ttl_s <= 0:
+            return 0
+        with self._lock:
+            cur = self._conn.execute(
+                "DELETE FROM responses WHERE created_at < ?", (time.time() - self.ttl_s,)
+            )
+            self._conn.commit()
+            self.stats.expired += cur.rowcount
+            return cur.rowcount
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            count, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+        data = asdict(self.stats)
+        data.update({"entries": count, "bytes": total, "path": str(self.path)})
+        return data
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_MODE_OVERRIDE: Optional[CacheMode] = None
+_CACHE: Optional[LLMResponseCache] = None
+_CACHE_LOCK = threading.Lock()
+
+
+def set_cache_mode(mode: Optional[CacheMode | str]) -> None:
+    """Override the configured cache mode for this process (CLI flag); None restores Settings."""
+    global _MODE_OVERRIDE
+    _MODE_OVERRIDE = CacheMode(mode) if mode is not None else None
+
+
+def get_cache_mode() -> CacheMode:
+    if _MODE_OVERRIDE is not None:
+        return _MODE_OVERRIDE
+    try:
+        return CacheMode(load_settings().llm_cache_mode)
+    except ValueError:
+        return CacheMode.OFF
+
+
+def get_response_cache() -> Optional[LLMResponseCache]:
+    """Return the shared cache, or None when caching is off."""
+    global _CACHE
+    if get_cache_mode() == CacheMode.OFF:
+        return None
+    with _CACHE_LOCK:
+        if _CACHE is None:
+            s = load_settings()
+            path = Path(s.llm_cache_path) if s.llm_cache_path else repo_root() / ".cache" / "llm" / "responses.sqlite3"
+            _CACHE = LLMResponseCache(
+                path,
+                ttl_s=s.llm_cache_ttl_s,
+                max_bytes=int(s.llm_cache_max_mb * 1024 * 1024),
+            )
+        return _CACHE
+
+
+def reset_response_cache() -> None:
+    global _CACHE
+    with _CACHE_LOCK:
+        if _CACHE is not None:
+            _CACHE.close()
+        _CACHE = None
@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+import asyncio
+import time
+import weakref
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Type, TypeVar
+
+from openai import AsyncOpenAI, OpenAI
+from openai.types.chat import ChatCompletion
+from pydantic import BaseModel
+
+from ..config import load_settings
+from ..tracing import event
+from .cache import CacheMode, LLMCacheMissError, LLMResponseCache, cache_key, get_cache_mode, get_response_cache
+from .client import get_async_openai_client, get_openai_client
+from .ratelimit import acall_with_limits, call_with_limits, estimate_tokens
+from .telemetry import record_call
+from .tokens import record_usage
+
+R = TypeVar("R", bound=BaseModel)
+
+
+def _cache_lookup(
+    model: str,
+    messages: List[Dict[str, Any]],
+    params: Dict[str, Any],
+    response_type: Type[R] = ChatCompletion,
+) -> Tuple[Optional[LLMResponseCache], Optional[str], Optional[R]]:
+    """Return (cache, key, hit). Raises LLMCacheMissError on a replay-mode miss."""
+    mode = get_cache_mode()
+    cache = get_response_cache()
+    key = cache_key(model, messages, params) if cache else None
+
+    if cache and mode in (CacheMode.READ_THROUGH, CacheMode.REPLAY):
+        hit = cache.get(key)
+        if hit is not None:
+            event("LLM", "DEBUG", "llm_cache_hit", model=model, key=key[:16])
+            return cache, key, response_type.model_validate(hit)
+        if mode == CacheMode.REPLAY:
+            cache.stats.replay_misses += 1
+            event("LLM", "INFO", "llm_cache_replay_miss", model=model, key=key[:16])
+            raise LLMCacheMissError(
+                f"LLM cache miss in replay mode (model={model}, key={key[:16]}). "
+                "Re-run with LLM_CACHE_MODE=record to capture it."
+            )
+    return cache, key, None
+
+
+def _cache_store(cache: Optional[LLMResponseCache], key: Optional[str], model: str, resp: BaseModel) -> None:
+    if cache is None or get_cache_mode() not in (CacheMode.READ_THROUGH, CacheMode.RECORD):
+        return
+    try:
+        cache.put(key, model, resp.model_dump(mode="json"))
+        event("LLM", "TRACE", "llm_cache_store", model=model, key=key[:16])
+    except Exception as e:
+        event("LLM", "DEBUG", "llm_cache_store_failed", error=str(e))
+
+
+def create_chat_completion(
+    *,
+    model: str,
+    messages: List[Dict[str, Any]],
+    client: Optional[OpenAI] = None,
+    **params: Any,
+) -> ChatCompletion:
+    """Single entry point for chat completions.
+
+    Consults the response cache according to the active CacheMode before touching
+    the network. In replay mode a miss raises LLMCacheMissError without building
+    a client, so replayed runs need neither a key nor connectivity. Network calls
+    go through the per-model RPM/TPM limiter and retry 429/5xx with backoff.
+    """
+    started = time.perf_counter()
+    cache, key, hit = _cache_lookup(model, messages, params)
+    if hit is not None:
+        record_call(model, started, cache_hit=True)
+        return hit
+
+    client = client or get_openai_client()
+    try:
+        resp = call_with_limits(
+            model,
+            estimate_tokens(messages, params.get("max_tokens"), model),
+            lambda: client.chat.completions.create(model=model, messages=messages, **params),
+        )
+    except Exception as e:
+        record_call(model, started, error=e)
+        raise
+    record_usage(model, resp.usage)
+    record_call(model, started, usage=resp.usage)
+    _cache_store(cache, key, model, resp)
+    return resp
+
+
+# Per-loop, per-model semaphores: asyncio primitives must not cross event loops
+_SEMAPHORES: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _model_limit(model: str) -> int:
+    s = load_settings()
+    for part in (s.llm_model_concurrency or "").split(","):
+        name, _, limit = part.partition("=")
+        if name.strip() == model and limit.strip().isdigit():
+            return max(1, int(limit))
+    return max(1, s.llm_max_concurrency_per_model)
+
+
+def _model_semaphore(model: str) -> asyncio.Semaphore:
+    per_loop = _SEMAPHORES.setdefault(asyncio.get_running_loop(), {})
+    sem = per_loop.get(model)
+    if sem is None:
+        sem = per_loop[model] = asyncio.Semaphore(_model_limit(model))
+    return sem
+
+
+async def acreate_chat_completion(
+    *,
+    model: str,
+    messages: List[Dict[str, Any]],
+    client: Optional[AsyncOpenAI] = None,
+    **params: Any,
+) -> ChatCompletion:
+    """Async counterpart of create_chat_completion for code running on an event loop.
+
+    The request is awaited on the pooled AsyncOpenAI client, so Playwright and
+    socket work keeps running while the model thinks. In-flight calls are capped
+    per model; cancelling the awaiting task aborts the HTTP request and frees
+    the slot.
+    """
+    started = time.perf_counter()
+    cache, key, hit = _cache_lookup(model, messages, params)
+    if hit is not None:
+        record_call(model, started, cache_hit=True)
+        return hit
+
+    client = client or await get_async_openai_client()
+    sem = _model_semaphore(model)
+    try:
+        async with sem:
+            resp = await acall_with_limits(
+                model,
+                estimate_tokens(messages, params.get("max_tokens"), model),
+                lambda: client.chat.completions.create(model=model, messages=messages, **params),
+            )
+    except asyncio.CancelledError:
+        event("LLM", "DEBUG", "llm_call_cancelled", model=model)
+        raise
+    except Exception as e:
+        record_call(model, started, error=e)
+        raise
+    record_usage(model, resp.usage)
+    record_call(model, started, usage=resp.usage)
+    _cache_store(cache, key, model, resp)
+    return resp
+
+
+async def astream_chat_completion(
+    *,
+    model: str,
+    messages: List[Dict[str, Any]],
+    client: Optional[AsyncOpenAI] = None,
+    **params: Any,
+) -> AsyncIterator[str]:
+    """Yield the reply's content deltas as they arrive.
+
+    Shares the cache key with acreate_chat_completion (a hit is yielded as one
+    chunk), and the assembled reply is cached, so streamed and buffered callers
+    replay each other's recordings. Retries only cover opening the stream.
+    """
+    started = time.perf_counter()
+    cache, key, hit = _cache_lookup(model, messages, params)
+    if hit is not None:
+        record_call(model, started, cache_hit=True)
+        yield hit.choices[0].message.content or ""
+        return
+
+    client = client or await get_async_openai_client()
+    sem = _model_semaphore(model)
+    parts: List[str] = []
+    usage = None
+    first_token: Optional[float] = None
+    resp_id, finish_reason = "", "stop"
+    try:
+        async with sem:
+            stream = await acall_with_limits(
+                model,
+                estimate_tokens(messages, params.get("max_tokens"), model),
+                lambda: client.chat.completions.create(
+                    model=model, messages=messages, stream=True, stream_options={"include_usage": True}, **params
+                ),
+            )
+            async for chunk in stream:
+                resp_id = chunk.id or resp_id
+                if chunk.usage is not None:
+                    usage = chunk.usage
+                for choice in chunk.choices:
+                    finish_reason = choice.finish_reason or finish_reason
+                    delta = choice.delta.content if choice.delta else None
+                    if delta:
+                        if first_token is None:
+                            first_token = time.perf_counter() - started
+                        parts.append(delta)
+                        yield delta
+    except asyncio.CancelledError:
+        event("LLM", "DEBUG", "llm_call_cancelled", model=model)
+        raise
+    except Exception as e:
+        record_call(model, started, error=e)
+        raise
+    resp = ChatCompletion.model_validate(
+        {
+            "id": resp_id or "stream",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [
+                {"index": 0, "finish_reason": finish_reason, "message": {"role": "assistant", "content": "".join(parts)}}
+            ],
+            "usage": usage.model_dump() if usage is not None else None,
+        }
+    )
+    record_usage(model, resp.usage)
+    record_call(model, started, usage=resp.usage, ttft_s=first_token)
+    _cache_store(cache, key, model, resp)
+
+
+def replay_misses() -> int:
+    cache = get_response_cache()
+    return cache.stats.replay_misses if cache else 0
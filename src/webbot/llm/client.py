@@ -0,0 +1,235 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import threading
+import weakref
+from dataclasses import asdict, dataclass
+from typing import Any, Dict
+
+import httpx
+from openai import AsyncOpenAI, OpenAI
+
+from ..config import Settings, load_settings
+from ..tracing import event
+
+
+class OpenAIConfigError(RuntimeError): ...
+
+
+@dataclass
+class ClientPoolStats:
+    """Process-wide counters for the shared OpenAI client(s)."""
+
+    clients_created: int = 0
+    key_validations: int = 0
+    requests: int = 0
+    connections_opened: int = 0
+    connections_reused: int = 0
+
+    def reuse_ratio(self) -> float:
+        total = self.connections_opened + self.connections_reused
+        return (self.connections_reused / total) if total else 0.0
+
+
+_LOCK = threading.Lock()
+_VALIDATE_LOCK = threading.Lock()
+_CLIENTS: Dict[str, OpenAI] = {}
+# httpx.AsyncClient connections are bound to the loop that opened them, so async
+# clients are pooled per event loop (apply-flow and Flask handlers each run their own)
+_ASYNC_CLIENTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, AsyncOpenAI]]" = (
+    weakref.WeakKeyDictionary()
+)
+_VALIDATED: set[str] = set()
+_STATS = ClientPoolStats()
+
+
+def _fingerprint(api_key: str) -> str:
+    # Never keep raw keys around as registry keys
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+
+
+def _require_key(s: Settings) -> str:
+    if not s.openai_api_key:
+        raise OpenAIConfigError(
+            "Missing OPENAI_API_KEY. Create a .env at repo root with OPENAI_API_KEY=sk-..."
+        )
+    return s.openai_api_key
+
+
+def _limits(s: Settings) -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=s.openai_max_connections,
+        max_keepalive_connections=s.openai_max_keepalive_connections,
+        keepalive_expiry=s.openai_keepalive_expiry_s,
+    )
+
+
+def _timeout(s: Settings) -> httpx.Timeout:
+    return httpx.Timeout(s.openai_timeout_s, connect=s.openai_connect_timeout_s)
+
+
+def _record_request(opened: bool) -> None:
+    with _LOCK:
+        _STATS.requests += 1
+        if opened:
+            _STATS.connections_opened += 1
+        else:
+            _STATS.connections_reused += 1
+
+
+def _on_request(request: httpx.Request) -> None:
+    """httpx request hook: attach an httpcore trace that notices new TCP connects."""
+    state = {"opened": False}
+
+    def _trace(name: str, info: Dict[str, Any]) -> None:
+        if name.startswith("connection.connect_tcp"):
+            state["opened"] = True
+
+    request.extensions["trace"] = _trace
+    request.extensions["webbot_conn"] = state
+
+
+def _on_response(response: httpx.Response) -> None:
+    state = response.request.extensions.get("webbot_conn") or {}
+    _record_request(bool(state.get("opened")))
+
+
+def _build_http_client(s: Settings) -> httpx.Client:
+    return httpx.Client(
+        limits=_limits(s),
+        timeout=_timeout(s),
+        event_hooks={"request": [_on_request], "response": [_on_response]},
+    )
+
+
+async def _aon_request(request: httpx.Request) -> None:
+    # httpcore's async interface requires a coroutine trace callback
+    state = {"opened": False}
+
+    async def _trace(name: str, info: Dict[str, Any]) -> None:
+        if name.startswith("connection.connect_tcp"):
+            state["opened"] = True
+
+    request.extensions["trace"] = _trace
+    request.extensions["webbot_conn"] = state
+
+
+async def _aon_response(response: httpx.Response) -> None:
+    _on_response(response)
+
+
+def _build_async_http_client(s: Settings) -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        limits=_limits(s),
+        timeout=_timeout(s),
+        event_hooks={"request": [_aon_request], "response": [_aon_response]},
+    )
+
+
+def _validate_once(client: OpenAI, fp: str) -> None:
+    if fp in _VALIDATED:
+        return
+    with _VALIDATE_LOCK:
+        if fp in _VALIDATED:
+            return
+        try:
+            _ = client.models.list()
+        except Exception as e:
+            raise OpenAIConfigError(
+                "OPENAI_API_KEY appears invalid or not authorized. "
+                "Check the key and billing."
+            ) from e
+        _VALIDATED.add(fp)
+        with _LOCK:
+            _STATS.key_validations += 1
+        event("LLM", "DEBUG", "openai_key_validated", key_fp=fp)
+
+
+def get_openai_client(*, validate: bool = True) -> OpenAI:
+    """Return the process-wide pooled OpenAI client for the configured key.
+
+    The client is built once per API key with a keep-alive HTTP pool sized from
+    Settings, and the key is validated with a single ``models.list()`` round-trip
+    the first time it is seen in this process.
+    """
+    s = load_settings()
+    api_key = _require_key(s)
+    fp = _fingerprint(api_key)
+    with _LOCK:
+        client = _CLIENTS.get(fp)
+        if client is None:
+            client = OpenAI(
+                api_key=api_key,
+                http_client=_build_http_client(s),
+                timeout=_timeout(s),
+                max_retries=0,  # retries are owned by webbot.llm.ratelimit
+            )
+            _CLIENTS[fp] = client
+            _STATS.clients_created += 1
+            event(
+                "LLM",
+                "DEBUG",
+                "openai_client_created",
+                key_fp=fp,
+                max_connections=s.openai_max_connections,
+                max_keepalive=s.openai_max_keepalive_connections,
+            )
+    if validate:
+        _validate_once(client, fp)
+    return client
+
+
+async def get_async_openai_client(*, validate: bool = True) -> AsyncOpenAI:
+    """Return the pooled AsyncOpenAI client for the configured key and running loop.
+
+    Key validation is shared with the sync pool: it happens at most once per key
+    per process, off the event loop.
+    """
+    s = load_settings()
+    api_key = _require_key(s)
+    fp = _fingerprint(api_key)
+    loop = asyncio.get_running_loop()
+    with _LOCK:
+        for stale in [lp for lp in _ASYNC_CLIENTS if lp.is_closed()]:
+            del _ASYNC_CLIENTS[stale]
+        per_loop = _ASYNC_CLIENTS.setdefault(loop, {})
+        client = per_loop.get(fp)
+        if client is None:
+            client = AsyncOpenAI(
+                api_key=api_key,
+                http_client=_build_async_http_client(s),
+                timeout=_timeout(s),
+                max_retries=0,  # retries are owned by webbot.llm.ratelimit
+            )
+            per_loop[fp] = client
+            _STATS.clients_created += 1
+            event("LLM", "DEBUG", "openai_async_client_created", key_fp=fp)
+    if validate and fp not in _VALIDATED:
+        await asyncio.to_thread(_validate_once, get_openai_client(validate=False), fp)
+    return client
+
+
+def get_client_pool_stats() -> Dict[str, Any]:
+    with _LOCK:
+        data = asdict(_STATS)
+        data["reuse_ratio"] = round(_STATS.reuse_ratio(), 3)
+        data["clients_cached"] = len(_CLIENTS) + sum(len(v) for v in _ASYNC_CLIENTS.values())
+    return data
+
+
+def reset_openai_clients() -> None:
+    """Close and forget all pooled clients (tests, key rotation, shutdown)."""
+    global _STATS
+    with _LOCK:
+        clients = list(_CLIENTS.values())
+        _CLIENTS.clear()
+        # Async clients are dropped, not closed: their loop may already be gone
+        _ASYNC_CLIENTS.clear()
+        _VALIDATED.clear()
+        _STATS = ClientPoolStats()
+    for c in clients:
+        try:
+            c.close()
+        except Exception:
+            pass
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import time
+from typing import List, Optional
+
+import numpy as np
+from openai import AsyncOpenAI, OpenAI
+from openai.types import CreateEmbeddingResponse
+
+from .chat import _cache_lookup, _cache_store
+from .client import get_async_openai_client, get_openai_client
+from .ratelimit import acall_with_limits, call_with_limits
+from .telemetry import record_call
+from .tokens import count_tokens, record_usage, truncate_to_tokens
+
+DEFAULT_EMBEDDING_MODEL = "text-embedding-3-small"
+# text-embedding-3-* accept up to 8191 tokens per input
+MAX_INPUT_TOKENS = 8000
+
+
+def _prepare(texts: List[str], model: str) -> List[str]:
+    return [truncate_to_tokens(t or " ", MAX_INPUT_TOKENS, model) or " " for t in texts]
+
+
+def _to_matrix(resp: CreateEmbeddingResponse) -> np.ndarray:
+    rows = sorted(resp.data, key=lambda d: d.index)
+    mat = np.asarray([r.embedding for r in rows], dtype=np.float32)
+    norms = np.linalg.norm(mat, axis=1, keepdims=True)
+    return mat / np.where(norms == 0, 1.0, norms)
+
+
+def embed_texts(texts: List[str], *, model: str = DEFAULT_EMBEDDING_MODEL, client: Optional[OpenAI] = None) -> np.ndarray:
+    """Embed ``texts`` and return an L2-normalized float32 matrix (one row per text).
+
+    Shares the response cache and rate limiter with chat completions.
+    """
+    if not texts:
+        return np.zeros((0, 0), dtype=np.float32)
+    inputs = _prepare(texts, model)
+    messages = [{"role": "input", "content": t} for t in inputs]
+    started = time.perf_counter()
+    cache, key, hit = _cache_lookup(model, messages, {}, CreateEmbeddingResponse)
+    if hit is not None:
+        record_call(model, started, kind="embedding", cache_hit=True)
+        return _to_matrix(hit)
+    client = client or get_openai_client()
+    est = sum(count_tokens(t, model) for t in inputs)
+    try:
+        resp = call_with_limits(model, est, lambda: client.embeddings.create(model=model, input=inputs))
+    except Exception as e:
+        record_call(model, started, kind="embedding", error=e)
+        raise
+    record_usage(model, resp.usage)
+    record_call(model, started, usage=resp.usage, kind="embedding")
+    _cache_store(cache, key, model, resp)
+    return _to_matrix(resp)
+
+
+async def aembed_texts(
+    texts: List[str], *, model: str = DEFAULT_EMBEDDING_MODEL, client: Optional[AsyncOpenAI] = None
+) -> np.ndarray:
+    """Async variant of embed_texts."""
+    if not texts:
+        return np.zeros((0, 0), dtype=np.float32)
+    inputs = _prepare(texts, model)
+    messages = [{"role": "input", "content": t} for t in inputs]
+    started = time.perf_counter()
+    cache, key, hit = _cache_lookup(model, messages, {}, CreateEmbeddingResponse)
+    if hit is not None:
+        record_call(model, started, kind="embedding", cache_hit=True)
+        return _to_matrix(hit)
+    client = client or await get_async_openai_client()
+    est = sum(count_tokens(t, model) for t in inputs)
+    try:
+        resp = await acall_with_limits(model, est, lambda: client.embeddings.create(model=model, input=inputs))
+    except Exception as e:
+        record_call(model, started, kind="embedding", error=e)
+        raise
+    record_usage(model, resp.usage)
+    record_call(model, started, usage=resp.usage, kind="embedding")
+    _cache_store(cache, key, model, resp)
+    return _to_matrix(resp)
@@ -0,0 +1,237 @@
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import random
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple, TypeVar
+
+import openai
+
+from ..config import Settings, load_settings
+from ..tracing import event
+from .tokens import count_message_tokens
+
+T = TypeVar("T")
+
+
+class TokenBucket:
+    """Thread-safe token bucket that hands out reservations instead of blocking.
+
+    ``reserve(n)`` deducts immediately (the balance may go negative) and returns
+    how long the caller must wait before its reservation is covered, so sync and
+    async callers can sleep in their own way.
+    """
+
+    def __init__(self, capacity: float, per_minute: float):
+        self.capacity = float(capacity)
+        self.rate = float(per_minute) / 60.0
+        self._tokens = float(capacity)
+        self._stamp = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float) -> float:
+        amount = min(float(amount), self.capacity)
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._stamp) * self.rate)
+            self._stamp = now
+            self._tokens -= amount
+            if self._tokens >= 0 or self.rate <= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def penalize(self, seconds: float) -> None:
+        """Drain the bucket so nothing is admitted for ``seconds`` (server said slow down)."""
+        with self._lock:
+            self._tokens = min(self._tokens, -seconds * self.rate)
+            self._stamp = time.monotonic()
+
+
+class ModelLimiter:
+    """Requests-per-minute and tokens-per-minute buckets for one model."""
+
+    def __init__(self, rpm: int, tpm: int):
+        self.requests = TokenBucket(rpm, rpm)
+        self.tokens = TokenBucket(tpm, tpm)
+
+    def reserve(self, est_tokens: int) -> float:
+        return max(self.requests.reserve(1), self.tokens.reserve(est_tokens))
+
+    def penalize(self, seconds: float) -> None:
+        self.requests.penalize(seconds)
+
+
+@dataclass
+class ThrottleStats:
+    calls: int = 0
+    attempts: int = 0
+    throttled_s: float = 0.0  # time spent waiting on local buckets
+    retries: int = 0
+    backoff_s: float = 0.0  # time spent sleeping between retries
+    rate_limited: int = 0  # 429 responses
+    server_errors: int = 0  # 5xx / connection / timeout
+    failures: int = 0  # gave up after retries
+
+    def as_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["throttled_s"] = round(self.throttled_s, 3)
+        data["backoff_s"] = round(self.backoff_s, 3)
+        return data
+
+
+_LOCK = threading.Lock()
+_LIMITERS: Dict[str, ModelLimiter] = {}
+_GLOBAL = ThrottleStats()
+# Stack of scoped counters (apply-flow run, fixture batch, ...); every level sees every call
+_SCOPES: contextvars.ContextVar[Tuple[ThrottleStats, ...]] = contextvars.ContextVar("llm_throttle_scopes", default=())
+
+
+def _parse_limits(spec: Optional[str]) -> Dict[str, Tuple[int, int]]:
+    """Parse "gpt-4o=500/30000,gpt-4o-mini=500/200000" into {model: (rpm, tpm)}."""
+    out: Dict[str, Tuple[int, int]] = {}
+    for part in (spec or "").split(","):
+        name, _, limits = part.partition("=")
+        rpm, _, tpm = limits.partition("/")
+        if name.strip() and rpm.strip().isdigit() and tpm.strip().isdigit():
+            out[name.strip()] = (int(rpm), int(tpm))
+    return out
+
+
+def get_limiter(model: str) -> ModelLimiter:
+    with _LOCK:
+        limiter = _LIMITERS.get(model)
+        if limiter is None:
+            s = load_settings()
+            rpm, tpm = _parse_limits(s.llm_model_limits).get(model, (s.llm_rpm_limit, s.llm_tpm_limit))
+            limiter = _LIMITERS[model] = ModelLimiter(rpm, tpm)
+        return limiter
+
+
+def estimate_tokens(
+    messages: List[Dict[str, Any]], max_tokens: Optional[int] = None, model: str = "gpt-4o"
+) -> int:
+    """Prompt tokens plus the completion budget, which is how OpenAI meters TPM."""
+    return count_message_tokens(messages, model) + int(max_tokens or 256)
+
+
+def _bump(**deltas: float) -> None:
+    with _LOCK:
+        for stats in (_GLOBAL, *_SCOPES.get()):
+            for name, delta in deltas.items():
+                setattr(stats, name, getattr(stats, name) + delta)
+
+
+@contextmanager
+def throttle_scope(name: str) -> Iterator[ThrottleStats]:
+    """Collect throttling counters for the enclosed run or batch."""
+    stats = ThrottleStats()
+    token = _SCOPES.set(_SCOPES.get() + (stats,))
+    try:
+        yield stats
+    finally:
+        _SCOPES.reset(token)
+        event("LLM", "INFO", "llm_throttle_summary", scope=name, **stats.as_dict())
+
+
+def get_throttle_stats() -> Dict[str, Any]:
+    with _LOCK:
+        return _GLOBAL.as_dict()
+
+
+def reset_rate_limits() -> None:
+    global _GLOBAL
+    with _LOCK:
+        _LIMITERS.clear()
+        _GLOBAL = ThrottleStats()
+
+
+def _retry_after(exc: Exception) -> Optional[float]:
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000.0
+        if headers.get("retry-after"):
+            return float(headers["retry-after"])
+    except ValueError:
+        return None  # HTTP-date form; fall back to our own backoff
+    return None
+
+
+def _classify(exc: Exception) -> Optional[str]:
+    """Return "rate_limited" / "server_errors" for retryable failures, else None."""
+    if isinstance(exc, openai.RateLimitError):
+        return "rate_limited"
+    if isinstance(exc, (openai.APIConnectionError, openai.InternalServerError)):
+        return "server_errors"  # APITimeoutError is an APIConnectionError
+    if isinstance(exc, openai.APIStatusError) and exc.status_code in (408, 409):
+        return "server_errors"
+    return None
+
+
+def _backoff(attempt: int, s: Settings, exc: Exception) -> float:
+    # Full jitter, but never earlier than the server asked for
+    delay = random.uniform(0, min(s.llm_backoff_max_s, s.llm_backoff_base_s * (2**attempt)))
+    hint = _retry_after(exc)
+    return max(delay, hint) if hint is not None else delay
+
+
+def _on_failure(model: str, attempt: int, exc: Exception, s: Settings) -> float:
+    """Record a failed attempt; return the sleep before retrying or re-raise."""
+    kind = _classify(exc)
+    if kind is not None:
+        _bump(**{kind: 1})
+    if kind is None or attempt >= s.llm_max_retries:
+        _bump(failures=1)
+        event("LLM", "INFO", "llm_call_failed", model=model, attempts=attempt + 1, error=str(exc)[:300])
+        raise exc
+    delay = _backoff(attempt, s, exc)
+    if kind == "rate_limited":
+        get_limiter(model).penalize(delay)
+    _bump(retries=1, backoff_s=delay)
+    event("LLM", "DEBUG", "llm_call_retry", model=model, attempt=attempt + 1, kind=kind, delay_s=round(delay, 3))
+    return delay
+
+
+def call_with_limits(model: str, est_tokens: int, fn: Callable[[], T]) -> T:
+    """Run ``fn`` under the model's RPM/TPM buckets, retrying transient failures."""
+    s = load_settings()
+    limiter = get_limiter(model)
+    _bump(calls=1)
+    attempt = 0
+    while True:
+        wait = limiter.reserve(est_tokens)
+        if wait > 0:
+            _bump(throttled_s=wait)
+            time.sleep(wait)
+        _bump(attempts=1)
+        try:
+            return fn()
+        except Exception as e:
+            time.sleep(_on_failure(model, attempt, e, s))
+            attempt += 1
+
+
+async def acall_with_limits(model: str, est_tokens: int, fn: Callable[[], Awaitable[T]]) -> T:
+    """Async variant of call_with_limits; waits with asyncio.sleep so the loop keeps running."""
+    s = load_settings()
+    limiter = get_limiter(model)
+    _bump(calls=1)
+    attempt = 0
+    while True:
+        wait = limiter.reserve(est_tokens)
+        if wait > 0:
+            _bump(throttled_s=wait)
+            await asyncio.sleep(wait)
+        _bump(attempts=1)
+        try:
+            return await fn()
+        except Exception as e:
+            await asyncio.sleep(_on_failure(model, attempt, e, s))
+            attempt += 1
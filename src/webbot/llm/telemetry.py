@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from ..tracing import event
+from .tokens import cached_prompt_tokens
+
+# USD per 1M tokens: (input, cached input, output). Matched by longest model-name prefix,
+# so dated snapshots ("gpt-4o-mini-2024-07-18") price like their family.
+MODEL_PRICES: Dict[str, Tuple[float, float, float]] = {
+    "gpt-4o-mini": (0.15, 0.075, 0.60),
+    "gpt-4o": (2.50, 1.25, 10.00),
+    "gpt-4.1-mini": (0.40, 0.10, 1.60),
+    "gpt-4.1": (2.00, 0.50, 8.00),
+    "gpt-5-mini": (0.25, 0.025, 2.00),
+    "gpt-5": (1.25, 0.125, 10.00),
+    "text-embedding-3-small": (0.02, 0.02, 0.0),
+    "text-embedding-3-large": (0.13, 0.13, 0.0),
+}
+
+
+def estimate_cost(model: str, prompt_tokens: int, cached_tokens: int, completion_tokens: int) -> Optional[float]:
+    """Estimated USD cost of one call, or None for models missing from MODEL_PRICES."""
+    name = next((m for m in sorted(MODEL_PRICES, key=len, reverse=True) if model.startswith(m)), None)
+    if name is None:
+        return None
+    inp, cached, out = MODEL_PRICES[name]
+    uncached = max(0, prompt_tokens - cached_tokens)
+    return (uncached * inp + cached_tokens * cached + completion_tokens * out) / 1_000_000
+
+
+@dataclass
+class LLMCallRecord:
+    model: str
+    stage: str
+    kind: str  # chat | embedding | assistant
+    outcome: str  # ok | cache_hit | error
+    wall_ms: float
+    ttft_ms: Optional[float]  # equals wall_ms for non-streamed calls
+    prompt_tokens: int = 0
+    cached_tokens: int = 0
+    completion_tokens: int = 0
+    cost_usd: Optional[float] = None
+    ts: float = 0.0
+    error: Optional[str] = None
+
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+_STAGE: contextvars.ContextVar[str] = contextvars.ContextVar("llm_stage", default="unscoped")
+_SCOPES: contextvars.ContextVar[Tuple[List[LLMCallRecord], ...]] = contextvars.ContextVar(
+    "llm_telemetry_scopes", default=()
+)
+_SINKS: List[Callable[[LLMCallRecord], None]] = []
+_LOCK = threading.Lock()
+
+
+@contextmanager
+def llm_stage(name: str) -> Iterator[None]:
+    """Attribute model calls made inside the block to ``name`` (e.g. "agentic5.stage2")."""
+    token = _STAGE.set(name)
+    try:
+        yield
+    finally:
+        _STAGE.reset(token)
+
+
+def current_stage() -> str:
+    return _STAGE.get()
+
+
+def add_telemetry_sink(sink: Callable[[LLMCallRecord], None]) -> None:
+    with _LOCK:
+        _SINKS.append(sink)
+
+
+def remove_telemetry_sink(sink: Callable[[LLMCallRecord], None]) -> None:
+    with _LOCK:
+        if sink in _SINKS:
+            _SINKS.remove(sink)
+
+
+def record_call(
+    model: str,
+    started: float,
+    *,
+    usage: Optional[Any] = None,
+    kind: str = "chat",
+    cache_hit: bool = False,
+    error: Optional[BaseException] = None,
+    ttft_s: Optional[float] = None,
+) -> LLMCallRecord:
+    """Record one model call that began at ``started`` (time.perf_counter()).
+
+    Cache hits are recorded with zero tokens and cost since nothing was billed.
+    """
+    wall_ms = (time.perf_counter() - started) * 1000.0
+    prompt = cached = completion = 0
+    if usage is not None and not cache_hit:
+        prompt = int(getattr(usage, "prompt_tokens", 0) or 0)
+        cached = cached_prompt_tokens(usage)
+        completion = int(getattr(usage, "completion_tokens", 0) or 0)
+    outcome = "error" if error is not None else "cache_hit" if cache_hit else "ok"
+    record = LLMCallRecord(
+        model=model,
+        stage=_STAGE.get(),
+        kind=kind,
+        outcome=outcome,
+        wall_ms=round(wall_ms, 1),
+        ttft_ms=round(ttft_s * 1000.0, 1) if ttft_s is not None else (None if error else round(wall_ms, 1)),
+        prompt_tokens=prompt,
+        cached_tokens=cached,
+        completion_tokens=completion,
+        cost_usd=0.0 if cache_hit else estimate_cost(model, prompt, cached, completion),
+        ts=time.time(),
+        error=str(error)[:300] if error is not None else None,
+    )
+    for records in _SCOPES.get():
+        records.append(record)
+    event("LLM", "INFO", "llm_call", **record.as_dict())
+    with _LOCK:
+        sinks = list(_SINKS)
+    for sink in sinks:
+        try:
+            sink(record)
+        except Exception as e:
+            event("LLM", "DEBUG", "llm_telemetry_sink_failed", error=str(e))
+    return record
+
+
+def rollup(records: List[LLMCallRecord], key: str = "stage") -> Dict[str, Dict[str, Any]]:
+    """Aggregate records by ``key`` ("stage" or "model"); "total" covers everything."""
+    out: Dict[str, Dict[str, Any]] = {}
+    for r in records:
+        for group in ("total", getattr(r, key)):
+            agg = out.setdefault(
+                group,
+                {
+                    "calls": 0,
+                    "errors": 0,
+                    "cache_hits": 0,
+                    "wall_ms": 0.0,
+                    "max_wall_ms": 0.0,
+                    "prompt_tokens": 0,
+                    "cached_tokens": 0,
+                    "completion_tokens": 0,
+                    "cost_usd": 0.0,
+                },
+            )
+            agg["calls"] += 1
+            agg["errors"] += r.outcome == "error"
+            agg["cache_hits"] += r.outcome == "cache_hit"
+            agg["wall_ms"] = round(agg["wall_ms"] + r.wall_ms, 1)
+            agg["max_wall_ms"] = max(agg["max_wall_ms"], r.wall_ms)
+            agg["prompt_tokens"] += r.prompt_tokens
+            agg["cached_tokens"] += r.cached_tokens
+            agg["completion_tokens"] += r.completion_tokens
+            agg["cost_usd"] = round(agg["cost_usd"] + (r.cost_usd or 0.0), 6)
+    return out
+
+
+@contextmanager
+def telemetry_scope(name: str) -> Iterator[List[LLMCallRecord]]:
+    """Collect call records for the enclosed run and emit per-stage rollups at the end."""
+    records: List[LLMCallRecord] = []
+    token = _SCOPES.set(_SCOPES.get() + (records,))
+    try:
+        yield records
+    finally:
+        _SCOPES.reset(token)
+        event("LLM", "INFO", "llm_telemetry_summary", scope=name, by_stage=rollup(records), by_model=rollup(records, "model"))
+
+
+def post_run_telemetry(base_url: str, run_id: int, records: List[LLMCallRecord], *, timeout_s: float = 10.0) -> bool:
+    """Send a run's call records and rollup to the backend (stored in run_events and runs.raw)."""
+    import requests
+
+    payload = {
+        "calls": [r.as_dict() for r in records],
+        "rollup": {"by_stage": rollup(records), "by_model": rollup(records, "model")},
+    }
+    try:
+        resp = requests.post(f"{base_url.rstrip('/')}/api/runs/{run_id}/llm-calls", json=payload, timeout=timeout_s)
+        resp.raise_for_status()
+        return True
+    except Exception as e:
+        event("LLM", "INFO", "llm_telemetry_post_failed", run_id=run_id, error=str(e))
+        return False
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import contextvars
+import threading
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from ..tracing import event
+
+try:
+    import tiktoken
+except ImportError:  # pragma: no cover - optional at runtime, pinned in pyproject
+    tiktoken = None
+
+# Used when tiktoken or its BPE files are unavailable (offline box, unknown model)
+_CHARS_PER_TOKEN = 4
+# Chat framing overhead per message (role, separators)
+_PER_MESSAGE_TOKENS = 4
+
+
+@lru_cache(maxsize=16)
+def _encoding(model: str):
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        pass
+    except Exception as e:
+        event("LLM", "DEBUG", "tiktoken_unavailable", model=model, error=str(e)[:200])
+        return None
+    try:
+        return tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        event("LLM", "DEBUG", "tiktoken_unavailable", model=model, error=str(e)[:200])
+        return None
+
+
+def count_tokens(text: str, model: str = "gpt-4o") -> int:
+    if not text:
+        return 0
+    enc = _encoding(model)
+    if enc is None:
+        return (len(text) + _CHARS_PER_TOKEN - 1) // _CHARS_PER_TOKEN
+    return len(enc.encode(text, disallowed_special=()))
+
+
+def truncate_to_tokens(text: str, max_tokens: int, model: str = "gpt-4o") -> str:
+    """Cut ``text`` to at most ``max_tokens`` tokens, on a token boundary."""
+    if not text or max_tokens <= 0:
+        return ""
+    enc = _encoding(model)
+    if enc is None:
+        return text[: max_tokens * _CHARS_PER_TOKEN]
+    ids = enc.encode(text, disallowed_special=())
+    if len(ids) <= max_tokens:
+        return text
+    return enc.decode(ids[:max_tokens])
+
+
+def count_message_tokens(messages: List[Dict[str, Any]], model: str = "gpt-4o") -> int:
+    total = 0
+    for m in messages:
+        content = m.get("content")
+        total += _PER_MESSAGE_TOKENS + count_tokens(content if isinstance(content, str) else str(content or ""), model)
+    return total
+
+
+def cached_prompt_tokens(usage: Optional[Any]) -> int:
+    """Provider-side prompt cache hits reported on a ChatCompletion's usage block."""
+    details = getattr(usage, "prompt_tokens_details", None)
+    return int(getattr(details, "cached_tokens", 0) or 0)
+
+
+@dataclass
+class UsageStats:
+    calls: int = 0
+    prompt_tokens: int = 0
+    cached_tokens: int = 0
+    completion_tokens: int = 0
+
+    def cached_ratio(self) -> float:
+        return (self.cached_tokens / self.prompt_tokens) if self.prompt_tokens else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["cached_ratio"] = round(self.cached_ratio(), 3)
+        return data
+
+
+_USAGE_LOCK = threading.Lock()
+_USAGE = UsageStats()
+_USAGE_SCOPES: contextvars.ContextVar[Tuple[UsageStats, ...]] = contextvars.ContextVar("llm_usage_scopes", default=())
+
+
+def record_usage(model: str, usage: Optional[Any]) -> None:
+    """Add a response's token usage to the process and scoped counters."""
+    if usage is None:
+        return
+    prompt = int(getattr(usage, "prompt_tokens", 0) or 0)
+    cached = cached_prompt_tokens(usage)
+    completion = int(getattr(usage, "completion_tokens", 0) or 0)
+    with _USAGE_LOCK:
+        for stats in (_USAGE, *_USAGE_SCOPES.get()):
+            stats.calls += 1
+            stats.prompt_tokens += prompt
+            stats.cached_tokens += cached
+            stats.completion_tokens += completion
+    event(
+        "LLM",
+        "DEBUG",
+        "llm_usage",
+        model=model,
+        prompt_tokens=prompt,
+        cached_tokens=cached,
+        completion_tokens=completion,
+    )
+
+
+@contextmanager
+def usage_scope(name: str) -> Iterator[UsageStats]:
+    """Collect prompt/cached/completion token counts for the enclosed run."""
+    stats = UsageStats()
+    token = _USAGE_SCOPES.set(_USAGE_SCOPES.get() + (stats,))
+    try:
+        yield stats
+    finally:
+        _USAGE_SCOPES.reset(token)
+        event("LLM", "INFO", "llm_usage_summary", scope=name, **stats.as_dict())
+
+
+def get_usage_stats() -> Dict[str, Any]:
+    with _USAGE_LOCK:
+        return _USAGE.as_dict()
@@ -2,11 +2,18 @@ from __future__ import annotations
 
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
+import asyncio
 import json
 
 from pydantic import BaseModel
 
-from .ai_search import get_openai_client
+from .llm.chat import acreate_chat_completion, create_chat_completion
+from .config import load_settings
+from .llm.embeddings import aembed_texts, embed_texts
+from .llm.telemetry import llm_stage
+from .llm.tokens import truncate_to_tokens
+from .resume_index import ResumeEmbeddingIndex, build_resume_index
+from .tracing import event
 from .user_profiles import UserProfile
 
 
@@ -46,43 +53,45 @@ def _load_resume_index(profile: UserProfile) -> List[ResumeIndexItem]:
         return []
 
 
-def _compose_alignment_prompt(job_description: str, resumes: List[tuple[ResumeIndexItem, str]]) -> str:
+_ALIGNMENT_SYSTEM_PROMPT = (
+    "You are a precise recruiting assistant. Return strictly JSON.\n\n"
+    "You are given a small set of candidate resumes and a job description.\n"
+    "Choose the single resume that best aligns with the job description.\n"
+    "Focus on technical alignment (role/title/domain/skills), not soft skills.\n"
+    "Return a JSON object with keys: chosen_resume_id, chosen_resume_name, confidence_label, missing_summary, reasoning.\n"
+    "- confidence_label must be one of: 'Perfect alignment', 'Strong alignment', 'Average alignment', 'Poorly aligned'.\n"
+    "- If confidence_label is not 'Perfect alignment', include a brief missing_summary of key gaps.\n"
+    "Be concise."
+)
+
+RESUME_TOKEN_BUDGET = 4000
+JOB_DESCRIPTION_TOKEN_BUDGET = 4000
+
+
+def _compose_alignment_prompt(
+    job_description: str, resumes: List[tuple[ResumeIndexItem, str]], model: str = "gpt-4o"
+) -> str:
+    # Resumes first: they are the same for every job this user applies to, so the
+    # provider can reuse the cached prefix; only the job description varies.
     lines: List[str] = []
-    lines.append(
-        "You are given a job description and a small set of candidate resumes.\n"
-        "Choose the single resume that best aligns with the job description.\n"
-        "Focus on technical alignment (role/title/domain/skills), not soft skills.\n"
-        "Return a JSON object with keys: chosen_resume_id, chosen_resume_name, confidence_label, missing_summary, reasoning.\n"
-        "- confidence_label must be one of: 'Perfect alignment', 'Strong alignment', 'Average alignment', 'Poorly aligned'.\n"
-        "- If confidence_label is not 'Perfect alignment', include a brief missing_summary of key gaps.\n"
-        "Be concise."
-    )
-    lines.append("")
-    lines.append("[Job description]")
-    lines.append(job_description)
-    lines.append("")
     lines.append("[Resumes]")
     for idx, (meta, content) in enumerate(resumes, start=1):
         lines.append(f"RESUME {idx}:")
         lines.append(f"ID: {meta.id}")
         lines.append(f"NAME: {meta.name}")
         lines.append("CONTENT:")
-        lines.append(content.strip())
+        lines.append(truncate_to_tokens(content.strip(), RESUME_TOKEN_BUDGET, model))
         lines.append("")
+    lines.append("[Job description]")
+    lines.append(truncate_to_tokens(job_description, JOB_DESCRIPTION_TOKEN_BUDGET, model))
+    lines.append("")
     lines.append(
         "Return only a compact JSON object. Do not include any commentary outside of JSON."
     )
     return "\n".join(lines)
 
 
-def select_best_resume_for_job_description(
-    *, profile: UserProfile, job_description_text: str, model: str = "gpt-4o"
-) -> Tuple[AlignmentResponse, Dict[str, Any]]:
-    """Run an LLM comparison to pick the best-aligned resume.
-
-    Returns (parsed_alignment, trace) where trace includes prompt and raw response.
-    """
-    # Load resumes and contents
+def _load_resume_pairs(profile: UserProfile) -> List[tuple[ResumeIndexItem, str]]:
     index_items = _load_resume_index(profile)
     resume_pairs: List[tuple[ResumeIndexItem, str]] = []
     for itm in index_items:
@@ -94,25 +103,85 @@ def select_best_resume_for_job_description(
 
     if not resume_pairs:
         raise RuntimeError("No resume texts found for this user.")
+    # Stable order so the resume prefix is byte-identical between runs
+    resume_pairs.sort(key=lambda pair: pair[0].id)
+    return resume_pairs
+
+
+def _confidence_from_score(score: float) -> str:
+    if score >= 0.6:
+        return "Strong alignment"
+    if score >= 0.45:
+        return "Average alignment"
+    return "Poorly aligned"
+
+
+def _shortlist(
+    resume_pairs: List[tuple[ResumeIndexItem, str]],
+    index: Optional[ResumeEmbeddingIndex],
+    job_vec: Optional[Any],
+) -> Tuple[List[tuple[ResumeIndexItem, str]], Optional[Tuple[AlignmentResponse, Dict[str, Any]]]]:
+    """Narrow resumes by embedding similarity.
+
+    Returns (pairs for the LLM, decided). ``decided`` is set when a single resume
+    exists or the top score beats the runner-up by the configured margin, in
+    which case no LLM call is needed.
+    """
+    if len(resume_pairs) == 1:
+        itm = resume_pairs[0][0]
+        decided = AlignmentResponse(
+            chosen_resume_id=itm.id,
+            chosen_resume_name=itm.name,
+            confidence_label="Average alignment",
+            reasoning="Only one resume available.",
+        )
+        return resume_pairs, (decided, {"prompt": "", "response": "", "ranking": []})
+    if index is None or job_vec is None:
+        return resume_pairs, None
+
+    s = load_settings()
+    by_id = {itm.id: (itm, txt) for itm, txt in resume_pairs}
+    ranking = [(e, score) for e, score in index.rank(job_vec) if e.id in by_id]
+    if not ranking:
+        return resume_pairs, None
+    summary = [{"id": e.id, "name": e.name, "score": round(score, 4)} for e, score in ranking]
+    top, top_score = ranking[0]
+    margin = top_score - ranking[1][1] if len(ranking) > 1 else 1.0
+    event("LLM", "INFO", "resume_ranking", top=top.id, top_score=round(top_score, 4), margin=round(margin, 4))
+
+    if margin >= s.resume_decisive_margin:
+        itm = by_id[top.id][0]
+        decided = AlignmentResponse(
+            chosen_resume_id=itm.id,
+            chosen_resume_name=itm.name,
+            confidence_label=_confidence_from_score(top_score),
+            reasoning=f"Embedding ranking: score {top_score:.3f}, {margin:.3f} ahead of the next resume.",
+        )
+        return [by_id[top.id]], (decided, {"prompt": "", "response": json.dumps(summary), "ranking": summary})
 
-    # Compose prompt and call model
-    prompt = _compose_alignment_prompt(job_description_text, resume_pairs)
-    client = get_openai_client()
-    resp = client.chat.completions.create(
+    keep = {e.id for e, _ in ranking[: max(1, s.resume_shortlist_k)]}
+    return [pair for pair in resume_pairs if pair[0].id in keep], None
+
+
+def _alignment_request(
+    resume_pairs: List[tuple[ResumeIndexItem, str]], job_description_text: str, model: str
+) -> Tuple[str, Dict[str, Any]]:
+    """Build (prompt, chat-completion kwargs) for the alignment call."""
+    prompt = _compose_alignment_prompt(job_description_text, resume_pairs, model)
+    request = dict(
         model=model,
         response_format={"type": "json_object"},
         messages=[
-            {
-                "role": "system",
-                "content": "You are a precise recruiting assistant. Return strictly JSON.",
-            },
+            {"role": "system", "content": _ALIGNMENT_SYSTEM_PROMPT},
             {"role": "user", "content": prompt},
         ],
         temperature=0.2,
         max_tokens=600,
     )
+    return prompt, request
+
 
-    raw = resp.choices[0].message.content or "{}"
+def _parse_alignment(prompt: str, raw: str) -> Tuple[AlignmentResponse, Dict[str, Any]]:
     try:
         data = json.loads(raw)
     except Exception:
@@ -123,14 +192,73 @@ def select_best_resume_for_job_description(
     return parsed, trace
 
 
-def run_alignment_for_files(
-    *, profile: UserProfile, job_desc_path: Path, model: str = "gpt-4o"
+def select_best_resume_for_job_description(
+    *, profile: UserProfile, job_description_text: str, model: str = "gpt-4o"
+) -> Tuple[AlignmentResponse, Dict[str, Any]]:
+    """Pick the best-aligned resume.
+
+    Resumes are first ranked against the job by embedding similarity; only the
+    top-k go to the LLM, and none do when the leader is clear by a margin.
+    Returns (parsed_alignment, trace) where trace includes prompt and raw response.
+    """
+    resume_pairs = _load_resume_pairs(profile)
+    index = job_vec = None
+    if len(resume_pairs) > 1:
+        try:
+            index = build_resume_index(profile)
+            with llm_stage("resume_alignment"):
+                job_vec = embed_texts([job_description_text], model=index.model)[0]
+        except Exception as e:
+            event("LLM", "INFO", "resume_ranking_unavailable", error=str(e)[:300])
+    resume_pairs, decided = _shortlist(resume_pairs, index, job_vec)
+    if decided is not None:
+        return decided
+    prompt, request = _alignment_request(resume_pairs, job_description_text, model)
+    with llm_stage("resume_alignment"):
+        resp = create_chat_completion(**request)
+    return _parse_alignment(prompt, resp.choices[0].message.content or "{}")
+
+
+async def aselect_best_resume_for_job_description(
+    *, profile: UserProfile, job_description_text: str, model: str = "gpt-4o"
 ) -> Tuple[AlignmentResponse, Dict[str, Any]]:
+    """Async variant of select_best_resume_for_job_description."""
+    resume_pairs = _load_resume_pairs(profile)
+    index = job_vec = None
+    if len(resume_pairs) > 1:
+        try:
+            index = await asyncio.to_thread(build_resume_index, profile)
+            with llm_stage("resume_alignment"):
+                job_vec = (await aembed_texts([job_description_text], model=index.model))[0]
+        except Exception as e:
+            event("LLM", "INFO", "resume_ranking_unavailable", error=str(e)[:300])
+    resume_pairs, decided = _shortlist(resume_pairs, index, job_vec)
+    if decided is not None:
+        return decided
+    prompt, request = _alignment_request(resume_pairs, job_description_text, model)
+    with llm_stage("resume_alignment"):
+        resp = await acreate_chat_completion(**request)
+    return _parse_alignment(prompt, resp.choices[0].message.content or "{}")
+
+
+def _read_job_description(job_desc_path: Path) -> str:
     job_text = _read_text_file(job_desc_path)
     if not job_text.strip():
         raise RuntimeError(f"Job description file is empty or unreadable: {job_desc_path}")
+    return job_text
+
+
+def run_alignment_for_files(
+    *, profile: UserProfile, job_desc_path: Path, model: str = "gpt-4o"
+) -> Tuple[AlignmentResponse, Dict[str, Any]]:
     return select_best_resume_for_job_description(
-        profile=profile, job_description_text=job_text, model=model
+        profile=profile, job_description_text=_read_job_description(job_desc_path), model=model
     )
 
 
+async def arun_alignment_for_files(
+    *, profile: UserProfile, job_desc_path: Path, model: str = "gpt-4o"
+) -> Tuple[AlignmentResponse, Dict[str, Any]]:
+    return await aselect_best_resume_for_job_description(
+        profile=profile, job_description_text=_read_job_description(job_desc_path), model=model
+    )
@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .config import load_settings
+from .llm.embeddings import embed_texts
+from .llm.telemetry import llm_stage
+from .llm.tokens import count_tokens
+from .tracing import event
+from .user_profiles import UserProfile
+
+# Stored next to resumes.json
+VECTORS_FILE = "resume_embeddings.npy"
+META_FILE = "resume_embeddings.json"
+
+_SECTION_TOKEN_LIMIT = 500
+_MAX_SECTIONS = 24
+_KNOWN_HEADINGS = {
+    "summary", "profile", "experience", "work experience", "professional experience", "employment",
+    "education", "skills", "technical skills", "projects", "certifications", "publications", "awards",
+}
+
+
+@dataclass
+class ResumeEntry:
+    id: str
+    name: str
+    modified_time: str
+    start: int  # first row (whole-document vector); section rows follow
+    count: int
+    sections: List[str] = field(default_factory=list)
+
+
+@dataclass
+class ResumeEmbeddingIndex:
+    model: str
+    vectors: np.ndarray  # (rows, dim) float32, L2-normalized
+    entries: List[ResumeEntry]
+    # id -> modifiedTime of resumes left out because their text was empty or unreadable
+    skipped: Dict[str, str] = field(default_factory=dict)
+
+    def is_current(self, items: List[Dict[str, Any]], model: str) -> bool:
+        if model != self.model:
+            return False
+        have = {**self.skipped, **{e.id: e.modified_time for e in self.entries}}
+        want = {i.get("id"): i.get("modifiedTime") or "" for i in items if i.get("txt_path")}
+        return have == want
+
+    def rank(self, query: np.ndarray) -> List[Tuple[ResumeEntry, float]]:
+        """Score every resume against a normalized query vector, best first.
+
+        Score blends whole-document similarity with the best-matching section so a
+        resume with one highly relevant section is not buried by unrelated ones.
+        """
+        if not self.entries:
+            return []
+        sims = self.vectors @ query.astype(np.float32)
+        starts = np.fromiter((e.start for e in self.entries), dtype=np.int64)
+        doc = sims[starts]
+        best_section = np.maximum.reduceat(sims, starts)
+        scores = 0.5 * doc + 0.5 * best_section
+        order = np.argsort(-scores)
+        return [(self.entries[i], float(scores[i])) for i in order]
+
+
+def split_sections(text: str) -> List[Tuple[str, str]]:
+    """Split resume text into (heading, body) chunks of bounded token size."""
+    sections: List[Tuple[str, List[str]]] = [("", [])]
+    for raw in text.splitlines():
+        line = raw.strip()
+        if not line:
+            sections[-1][1].append("")
+            continue
+        bare = line.rstrip(":").strip()
+        is_heading = len(bare) <= 40 and not bare.endswith(".") and (
+            bare.lower() in _KNOWN_HEADINGS or (bare.isupper() and any(c.isalpha() for c in bare))
+        )
+        if is_heading:
+            sections.append((bare, []))
+        else:
+            sections[-1][1].append(line)
+
+    chunks: List[Tuple[str, str]] = []
+    for heading, lines in sections:
+        paragraphs = [p.strip() for p in "\n".join(lines).split("\n\n") if p.strip()]
+        buf: List[str] = []
+        for para in paragraphs:
+            if buf and count_tokens("\n\n".join(buf + [para])) > _SECTION_TOKEN_LIMIT:
+                chunks.append((heading, "\n\n".join(buf)))
+                buf = []
+            buf.append(para)
+        if buf:
+            chunks.append((heading, "\n\n".join(buf)))
+    return chunks[:_MAX_SECTIONS]
+
+
+def _read_items(profile: UserProfile) -> List[Dict[str, Any]]:
+    path = profile.path / "resumes.json"
+    try:
+        return [i for i in json.loads(path.read_text(encoding="utf-8")).get("resumes", []) if isinstance(i, dict)]
+    except Exception:
+        return []
+
+
+def load_resume_index(profile: UserProfile) -> Optional[ResumeEmbeddingIndex]:
+    meta_path = profile.path / META_FILE
+    vec_path = profile.path / VECTORS_FILE
+    if not meta_path.exists() or not vec_path.exists():
+        return None
+    try:
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        vectors = np.load(vec_path, allow_pickle=False).astype(np.float32)
+        entries = [ResumeEntry(**e) for e in meta.get("resumes", [])]
+        return ResumeEmbeddingIndex(
+            model=meta["model"], vectors=vectors, entries=entries, skipped=meta.get("skipped") or {}
+        )
+    except Exception as e:
+        event("LLM", "DEBUG", "resume_index_load_failed", error=str(e))
+        return None
+
+
+def _save(profile: UserProfile, index: ResumeEmbeddingIndex) -> None:
+    # float16 on disk halves the file; cosine ranking is insensitive to the lost precision
+    np.save(profile.path / VECTORS_FILE, index.vectors.astype(np.float16), allow_pickle=False)
+    meta = {
+        "model": index.model,
+        "dim": int(index.vectors.shape[1]) if index.vectors.size else 0,
+        "resumes": [e.__dict__ for e in index.entries],
+        "skipped": index.skipped,
+    }
+    (profile.path / META_FILE).write_text(json.dumps(meta, indent=2), encoding="utf-8")
+
+
+def build_resume_index(profile: UserProfile, *, force: bool = False) -> ResumeEmbeddingIndex:
+    """Embed each resume and its sections, reusing rows whose modifiedTime is unchanged."""
+    model = load_settings().resume_embedding_model
+    items = _read_items(profile)
+    previous = None if force else load_resume_index(profile)
+    if previous is not None and previous.is_current(items, model):
+        return previous
+    reusable: Dict[Tuple[str, str], Tuple[ResumeEntry, np.ndarray]] = {}
+    if previous is not None and previous.model == model:
+        for e in previous.entries:
+            reusable[(e.id, e.modified_time)] = (e, previous.vectors[e.start : e.start + e.count])
+
+    blocks: List[np.ndarray] = []
+    entries: List[ResumeEntry] = []
+    skipped: Dict[str, str] = {}
+    row = 0
+    embedded = 0
+    for item in items:
+        txt_path = item.get("txt_path")
+        if not txt_path:
+            continue
+        rid, modified = item.get("id"), item.get("modifiedTime") or ""
+        cached = reusable.get((rid, modified))
+        if cached is not None:
+            old, vecs = cached
+            sections = old.sections
+        else:
+            try:
+                text = Path(txt_path).read_text(encoding="utf-8")
+            except Exception:
+                text = ""
+            if not text.strip():
+                # Remembered so is_current() holds until this resume's modifiedTime changes
+                skipped[rid] = modified
+                continue
+            chunks = split_sections(text)
+            sections = [h for h, _ in chunks]
+            with llm_stage("resume_index"):
+                vecs = embed_texts([text] + [f"{h}\n{b}".strip() for h, b in chunks], model=model)
+            embedded += 1
+        entries.append(
+            ResumeEntry(
+                id=rid,
+                name=item.get("name") or rid,
+                modified_time=modified,
+                start=row,
+                count=int(vecs.shape[0]),
+                sections=sections,
+            )
+        )
+        blocks.append(vecs)
+        row += int(vecs.shape[0])
+
+    vectors = np.vstack(blocks) if blocks else np.zeros((0, 0), dtype=np.float32)
+    index = ResumeEmbeddingIndex(model=model, vectors=vectors, entries=entries, skipped=skipped)
+    _save(profile, index)
+    event(
+        "LLM", "INFO", "resume_index_built",
+        resumes=len(entries), rows=row, embedded=embedded, skipped=len(skipped),
+    )
+    return index
@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qs, parse_qsl, unquote, urlencode, urlparse, urlunparse
+
+from .config import load_settings
+from .tracing import event
+
+# Query parameters that only track the click and never change the target page
+_TRACKING_PARAMS = {"gclid", "fbclid", "msclkid", "ref", "ref_src", "mc_cid", "mc_eid", "_hsenc", "_hsmi"}
+
+
+def normalize_result_url(url: Optional[str]) -> Optional[str]:
+    """Canonical form of a search hit: redirects unwrapped, tracking params and fragment dropped."""
+    if not url:
+        return None
+    parsed = urlparse(url.strip())
+    # DuckDuckGo HTML results wrap the target as /l/?uddg=<encoded url>
+    if parsed.netloc.endswith("duckduckgo.com") and parsed.path.startswith("/l/"):
+        target = parse_qs(parsed.query).get("uddg")
+        if target:
+            parsed = urlparse(unquote(target[0]))
+    if parsed.scheme not in ("http", "https") or not parsed.netloc:
+        return None
+    query = urlencode(
+        [(k, v) for k, v in parse_qsl(parsed.query, keep_blank_values=True)
+         if not k.lower().startswith("utm_") and k.lower() not in _TRACKING_PARAMS]
+    )
+    path = parsed.path.rstrip("/") or ""
+    return urlunparse((parsed.scheme, parsed.netloc.lower(), path, parsed.params, query, ""))
+
+
+def dedup_urls(urls: Iterable[Optional[str]]) -> List[str]:
+    """Normalize and dedup, keeping first-seen order."""
+    out: Dict[str, None] = {}
+    for u in urls:
+        n = normalize_result_url(u)
+        if n and n not in out:
+            out[n] = None
+    return list(out)
+
+
+class DDGSSearchBackend:
+    """Web search over HTTP through the ``ddgs`` metasearch library (no browser involved)."""
+
+    name = "ddgs"
+
+    def __init__(self, *, engine: str = "duckduckgo", timeout_s: int = 10):
+        self.engine = engine
+        self.timeout_s = timeout_s
+
+    def search(self, query: str, limit: int) -> List[str]:
+        from ddgs import DDGS
+
+        hits = DDGS(timeout=self.timeout_s).text(query, max_results=limit, backend=self.engine)
+        return [h.get("href") for h in hits if h.get("href")]
+
+
+class StaticSearchBackend:
+    """Canned results per query, for tests and offline runs; unknown queries return nothing."""
+
+    name = "static"
+
+    def __init__(self, results: Optional[Dict[str, List[str]]] = None, *, delay_s: float = 0.0):
+        self.results = results or {}
+        self.delay_s = delay_s
+        self.calls: List[str] = []
+
+    def search(self, query: str, limit: int) -> List[str]:
+        self.calls.append(query)
+        if self.delay_s:
+            time.sleep(self.delay_s)
+        return list(self.results.get(query, []))[:limit]
+
+
+@dataclass
+class SearchStats:
+    queries: int = 0
+    cache_hits: int = 0
+    backend_calls: int = 0
+    errors: int = 0
+    backend_s: float = 0.0
+
+
+class SearchClient:
+    """Concurrent web search with a bounded worker pool and a per-query TTL cache.
+
+    Backends are synchronous (``search(query, limit) -> urls``) and run in worker
+    threads, at most ``max_concurrency`` at a time.
+    """
+
+    def __init__(self, backend, *, max_concurrency: int = 4, ttl_s: float = 3600.0, max_entries: int = 1024):
+        self.backend = backend
+        self.max_concurrency = max(1, max_concurrency)
+        self.ttl_s = ttl_s
+        self.max_entries = max_entries
+        self.stats = SearchStats()
+        self._cache: "OrderedDict[Tuple[str, int], Tuple[float, List[str]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._semaphores: Dict[asyncio.AbstractEventLoop, asyncio.Semaphore] = {}
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            for stale in [lp for lp in self._semaphores if lp.is_closed()]:
+                del self._semaphores[stale]
+            sem = self._semaphores.get(loop)
+            if sem is None:
+                sem = self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+            return sem
+
+    def _cached(self, key: Tuple[str, int]) -> Optional[List[str]]:
+        with self._lock:
+            hit = self._cache.get(key)
+            if hit is None:
+                return None
+            stored_at, urls = hit
+            if self.ttl_s > 0 and time.time() - stored_at > self.ttl_s:
+                del self._cache[key]
+                return None
+            self._cache.move_to_end(key)
+            return list(urls)
+
+    def _store(self, key: Tuple[str, int], urls: List[str]) -> None:
+        with self._lock:
+            self._cache[key] = (time.time(), list(urls))
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+
+    async def search(self, query: str, limit: int = 10) -> List[str]:
+        """Normalized, deduplicated result URLs for one query; errors yield an empty list."""
+        key = (" ".join(query.split()).lower(), limit)
+        self.stats.queries += 1
+        cached = self._cached(key)
+        if cached is not None:
+            self.stats.cache_hits += 1
+            return cached
+        async with self._semaphore():
+            started = time.perf_counter()
+            try:
+                raw = await asyncio.to_thread(self.backend.search, query, limit)
+            except Exception as e:
+                self.stats.errors += 1
+                event("FIND_APPLY", "INFO", "search_failed", backend=self.backend.name, query=query, error=str(e))
+                return []
+            finally:
+                self.stats.backend_calls += 1
+                self.stats.backend_s += time.perf_counter() - started
+        urls = dedup_urls(raw)[:limit]
+        self._store(key, urls)
+        event("FIND_APPLY", "TRACE", "search_results", backend=self.backend.name, query=query, results=urls)
+        return urls
+
+    async def search_many(self, queries: List[str], limit: int = 10) -> Dict[str, List[str]]:
+        """Run queries concurrently; the result keeps the order of ``queries``."""
+        results = await asyncio.gather(*(self.search(q, limit) for q in queries))
+        return dict(zip(queries, results))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    def summary(self) -> Dict[str, object]:
+        data = asdict(self.stats)
+        data.update({"backend": self.backend.name, "entries": len(self._cache)})
+        return data
+
+
+_CLIENT: Optional[SearchClient] = None
+_CLIENT_LOCK = threading.Lock()
+
+
+def get_search_client() -> SearchClient:
+    """Process-wide search client configured from Settings."""
+    global _CLIENT
+    with _CLIENT_LOCK:
+        if _CLIENT is None:
+            s = load_settings()
+            backend = (
+                StaticSearchBackend() if s.search_backend == "static" else DDGSSearchBackend(engine=s.search_ddgs_engine)
+            )
+            _CLIENT = SearchClient(backend, max_concurrency=s.search_max_concurrency, ttl_s=s.search_cache_ttl_s)
+        return _CLIENT
+
+
+def set_search_client(client: Optional[SearchClient]) -> None:
+    """Replace the shared client (tests, or a custom backend); None rebuilds it from Settings."""
+    global _CLIENT
+    with _CLIENT_LOCK:
+        _CLIENT = client
@@ -1,11 +1,19 @@
 from __future__ import annotations
-from typing import List, Literal, Optional
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Literal, Optional
 from enum import Enum
+import json
 import re
+import threading
 from pydantic import BaseModel, Field
 
+from .config import load_settings
 from .extract import extract_visible_text
-from .ai_search import get_openai_client, OpenAIConfigError
+from .ai_search import OpenAIConfigError
+from .llm.chat import acreate_chat_completion
+from .llm.telemetry import llm_stage
+from .llm.tokens import truncate_to_tokens
+from .tracing import event
 
 
 class AIMode(str, Enum):
@@ -195,35 +203,196 @@ def heuristic_extract(text: str, page_title: Optional[str]) -> JobPostingExtract
     )
 
 
-def _llm_structured_extract(text: str, heuristic: JobPostingExtract) -> JobPostingExtract:
-    client = get_openai_client()  # will raise if missing/invalid
-    system = (
-        "Extract strictly structured data about a job posting. "
-        "If a field is unknown, use null or an empty list. Do not invent details."
-    )
-    schema = JobPostingExtract.model_json_schema()
-    prompt = (
-        "Return a compact JSON object with exactly these keys and types.\n\n"
-        f"Schema: {schema}\n\n"
-        "Heuristic candidates (may be incomplete, prefer page text if conflicting):\n"
-        f"{heuristic.model_dump_json()}\n\n"
-        "Page text (truncated if long):\n"
-        f"{text[:15000]}"
-    )
-    resp = client.chat.completions.create(
-        model="gpt-4o-mini",
+# Fields the LLM can improve on; currencies and indicia are plain regex matches
+SCORED_FIELDS = ("is_job_posting", "title", "company_name", "work_mode", "locations", "requirements")
+
+
+def _job_signal_hits(text: str) -> int:
+    hay = text.lower()
+    hits = sum(1 for kw in ["apply", "requirements", "responsibilities", "qualifications", "full-time", "benefits"] if kw in hay)
+    hits += sum(1 for kw in ["engineer", "developer", "designer", "manager", "scientist", "analyst"] if kw in hay)
+    return hits
+
+
+def score_heuristic(text: str, extract: JobPostingExtract, page_title: Optional[str]) -> Dict[str, float]:
+    """Per-field confidence (0..1) that the heuristic value is right, based on how it was found."""
+    hay = text.lower()
+    lines = _normalize_lines(text)
+    scores: Dict[str, float] = {}
+
+    hits = _job_signal_hits(text)
+    scores["is_job_posting"] = 0.95 if hits >= 5 else 0.9 if hits == 0 else 0.5
+
+    title = extract.title or ""
+    role_word = re.search(r"engineer|developer|designer|manager|scientist|analyst|lead|director|intern", title, re.I)
+    in_page_title = bool(page_title and title and title.lower() in page_title.lower())
+    if not title:
+        scores["title"] = 0.0
+    elif role_word and (in_page_title or title in lines[:5]):
+        scores["title"] = 0.9
+    else:
+        scores["title"] = 0.5 if role_word else 0.3
+
+    company = extract.company_name
+    if company:
+        via_at = bool(title and re.search(rf"\bat\s+{re.escape(company)}$", title))
+        in_title = bool(page_title and company.lower() in page_title.lower())
+        scores["company_name"] = 0.9 if (via_at or in_title) else 0.6
+    else:
+        scores["company_name"] = 0.8 if extract.company_redacted else 0.0
+
+    modes = {m for m, pat in (("remote", r"\bremote\b"), ("hybrid", r"\bhybrid\b"), ("in_office", r"in[ -]?office|on[ -]?site")) if re.search(pat, hay)}
+    scores["work_mode"] = 0.9 if len(modes) == 1 else 0.5 if modes else 0.3
+
+    labelled = any(re.match(r"^(location|locations|office)s?\s*[:\-]", ln, re.I) for ln in lines)
+    if extract.locations:
+        scores["locations"] = 0.85 if labelled else 0.6
+    else:
+        scores["locations"] = 0.8 if modes == {"remote"} else 0.2
+
+    headed = bool(re.search(r"requirement|qualification|what you'?ll need|must have", hay))
+    n = len(extract.requirements)
+    scores["requirements"] = 0.85 if headed and n >= 2 else 0.5 if n else 0.2
+    return scores
+
+
+def weak_fields(scores: Dict[str, float], threshold: Optional[float] = None) -> List[str]:
+    """Scored fields below the confidence threshold, in SCORED_FIELDS order."""
+    if threshold is None:
+        threshold = load_settings().extract_confidence_threshold
+    return [f for f in SCORED_FIELDS if scores.get(f, 0.0) < threshold]
+
+
+@dataclass
+class ExtractRoutingStats:
+    pages: int = 0
+    skipped: int = 0  # heuristics trusted, no LLM call
+    narrowed: int = 0  # LLM asked only for weak fields
+    full: int = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["skip_rate"] = round(self.skipped / self.pages, 3) if self.pages else 0.0
+        data["partial_rate"] = round(self.narrowed / self.pages, 3) if self.pages else 0.0
+        return data
+
+
+_ROUTING_LOCK = threading.Lock()
+_ROUTING = ExtractRoutingStats()
+
+
+def record_extract_route(weak: List[str]) -> str:
+    """Count one page's routing decision ("skip", "narrow" or "full") and return it."""
+    route = "skip" if not weak else "full" if len(weak) == len(SCORED_FIELDS) else "narrow"
+    with _ROUTING_LOCK:
+        _ROUTING.pages += 1
+        if route == "skip":
+            _ROUTING.skipped += 1
+        elif route == "narrow":
+            _ROUTING.narrowed += 1
+        else:
+            _ROUTING.full += 1
+        totals = _ROUTING.as_dict()
+    event("EXTRACT", "INFO", "extract_route", route=route, weak_fields=weak, **totals)
+    return route
+
+
+def get_extract_stats() -> Dict[str, Any]:
+    with _ROUTING_LOCK:
+        return _ROUTING.as_dict()
+
+
+# Instructions and schema never change, so they form the cacheable prefix;
+# heuristics and page text follow as the per-page suffix.
+_EXTRACT_SYSTEM_PROMPT = (
+    "Extract strictly structured data about a job posting. "
+    "If a field is unknown, use null or an empty list. Do not invent details.\n\n"
+    "Return a compact JSON object with exactly these keys and types.\n\n"
+    f"Schema: {JobPostingExtract.model_json_schema()}"
+)
+PAGE_TEXT_TOKEN_BUDGET = 4000
+# Narrowed calls only need the neighbourhood of the weak fields
+NARROW_TEXT_TOKEN_BUDGET = 1200
+
+_NARROW_SYSTEM_PROMPT = (
+    "Extract only the requested fields of a job posting from the page excerpt. "
+    "If a field is unknown, use null or an empty list. Do not invent details.\n\n"
+    "Return a compact JSON object containing exactly the requested keys, typed as in this schema.\n\n"
+    f"Schema: {JobPostingExtract.model_json_schema()}"
+)
+
+
+def _narrow_window(text: str, fields: List[str], model: str) -> str:
+    """The page head (title, company, work mode) plus the requirements section when asked for."""
+    head_budget = NARROW_TEXT_TOKEN_BUDGET // 2 if "requirements" in fields else NARROW_TEXT_TOKEN_BUDGET
+    parts = [truncate_to_tokens(text, head_budget, model)]
+    if "requirements" in fields:
+        m = re.search(r"requirement|qualification|what you'?ll need|must have", text, re.I)
+        if m and m.start() > len(parts[0]):
+            parts.append(truncate_to_tokens(text[m.start():], NARROW_TEXT_TOKEN_BUDGET - head_budget, model))
+    if "locations" in fields:
+        loc_lines = [ln for ln in _normalize_lines(text) if re.search(r"\blocation|\boffice\b|\bbased in\b", ln, re.I)]
+        parts.append("\n".join(loc_lines[:8]))
+    return "\n...\n".join(p for p in parts if p)
+
+
+def build_extract_request(
+    text: str, heuristic: JobPostingExtract, fields: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """Chat-completion kwargs for the structured extraction call (also used for batch jobs).
+
+    With ``fields``, only those keys are requested and a much smaller text window is sent.
+    """
+    model = "gpt-4o-mini"
+    if fields:
+        known = heuristic.model_dump(exclude=set(fields), include=set(SCORED_FIELDS))
+        prompt = (
+            f"Fields to extract: {', '.join(fields)}\n"
+            f"Already known (for context): {json.dumps(known)}\n\n"
+            "Page excerpt:\n"
+            f"{_narrow_window(text, fields, model)}"
+        )
+        system, max_tokens = _NARROW_SYSTEM_PROMPT, 400
+    else:
+        prompt = (
+            "Heuristic candidates (may be incomplete, prefer page text if conflicting):\n"
+            f"{heuristic.model_dump_json()}\n\n"
+            "Page text (truncated if long):\n"
+            f"{truncate_to_tokens(text, PAGE_TEXT_TOKEN_BUDGET, model)}"
+        )
+        system, max_tokens = _EXTRACT_SYSTEM_PROMPT, 800
+    return dict(
+        model=model,
         response_format={"type": "json_object"},
         messages=[
             {"role": "system", "content": system},
             {"role": "user", "content": prompt},
         ],
         temperature=0.1,
-        max_tokens=800,
+        max_tokens=max_tokens,
     )
-    import json
 
-    data = json.loads(resp.choices[0].message.content or "{}")
-    return JobPostingExtract.model_validate(data)
+
+def parse_extract_completion(
+    content: Optional[str], heuristic: Optional[JobPostingExtract] = None, fields: Optional[List[str]] = None
+) -> JobPostingExtract:
+    """Parse a full extraction, or merge a narrowed one's ``fields`` over ``heuristic``."""
+    data = json.loads(content or "{}")
+    if heuristic is None or not fields:
+        return JobPostingExtract.model_validate(data)
+    merged = heuristic.model_dump()
+    for f in fields:
+        if f in data and data[f] is not None:
+            merged[f] = data[f]
+    return JobPostingExtract.model_validate(merged)
+
+
+async def _llm_structured_extract(
+    text: str, heuristic: JobPostingExtract, fields: Optional[List[str]] = None
+) -> JobPostingExtract:
+    with llm_stage("extract_job"):
+        resp = await acreate_chat_completion(**build_extract_request(text, heuristic, fields))
+    return parse_extract_completion(resp.choices[0].message.content, heuristic, fields)
 
 
 async def parse_job_page(page, *, mode: AIMode = AIMode.OPEN_AI) -> JobPostingExtract:
@@ -232,5 +401,9 @@ async def parse_job_page(page, *, mode: AIMode = AIMode.OPEN_AI) -> JobPostingEx
     heur = heuristic_extract(text, title)
     if mode == AIMode.LLM_OFF:
         return heur
-    # OPEN_AI mode
-    return _llm_structured_extract(text, heur)
+    # OPEN_AI mode: trust confident heuristics, ask the model only about weak fields
+    weak = weak_fields(score_heuristic(text, heur, title))
+    route = record_extract_route(weak)
+    if route == "skip":
+        return heur
+    return await _llm_structured_extract(text, heur, weak if route == "narrow" else None)
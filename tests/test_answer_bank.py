@@ -0,0 +1,113 @@
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# Add src to Python path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from webbot.forms import answerer
+from webbot.forms.answer_bank import AnswerBank, AnswerBankEntry, normalize_question
+from webbot.forms.schema import FormField, FormSchema, FormSection, Validity
+from webbot.user_profiles import UserProfile, UserSecrets
+
+
+def _schema(fields):
+    return FormSchema(sections=[FormSection(fields=fields)], validity=Validity(is_valid_job_application_form=True, confidence=1.0))
+
+
+@pytest.fixture
+def bank(tmp_path):
+    (tmp_path / "settings.json").write_text('{"human_name": "Ada Lovelace"}', encoding="utf-8")
+    bank = AnswerBank.load(UserProfile(name="u", path=tmp_path, secrets=UserSecrets()))
+    bank.entries[normalize_question("Email")] = AnswerBankEntry(question="Email", answer="ada@example.com")
+    bank.entries[normalize_question("Are you legally authorized to work in the US?")] = AnswerBankEntry(
+        question="Are you legally authorized to work in the US?", answer="Yes"
+    )
+    return bank
+
+
+def test_normalization_and_fuzzy_matching(bank):
+    assert normalize_question("firstName") == normalize_question("First Name*") == "first name"
+    assert bank.match(FormField(field_id="a", label="E-mail", type="email")) == "ada@example.com"
+    assert bank.match(FormField(field_id="b", name="last_name", type="text")) == "Lovelace"
+    auth = FormField(
+        field_id="c",
+        label="Are you legally authorized to work in the United States?",
+        type="select",
+        options=["Yes", "No"],
+    )
+    assert bank.match(auth) == "Yes"
+    assert bank.match(FormField(field_id="d", label="Why do you want to work here?", type="textarea")) is None
+    assert bank.stats.hits == 3 and bank.stats.lookups == 4
+
+
+def test_fuzzy_match_rejects_keys_differing_in_a_distinctive_token(bank):
+    bank.entries[normalize_question("Are you 18 years or older?")] = AnswerBankEntry(
+        question="Are you 18 years or older?", answer="Yes"
+    )
+    bank.entries[normalize_question("Address line 1")] = AnswerBankEntry(question="Address line 1", answer="1 Main St")
+    for label in ("Are you legally authorized to work in the UK?", "Are you 21 years or older?", "Address line 2"):
+        assert bank.match(FormField(field_id="x", label=label, type="text")) is None, label
+    # Options get the same guard: a banked "US" must not pick "UK"
+    bank.entries[normalize_question("Country")] = AnswerBankEntry(question="Country", answer="US")
+    assert bank.match(FormField(field_id="y", label="Country", type="select", options=["UK", "Canada"])) is None
+
+
+def test_fuzzy_match_rejects_negated_questions(bank):
+    bank.entries[normalize_question("Do you require visa sponsorship?")] = AnswerBankEntry(
+        question="Do you require visa sponsorship?", answer="No"
+    )
+    for label in (
+        "Are you not legally authorized to work in the United States?",
+        "Do you not require visa sponsorship?",
+        "Don't you require visa sponsorship?",
+    ):
+        assert bank.match(FormField(field_id="x", label=label, type="select", options=["Yes", "No"])) is None, label
+    # Spelling variants still match
+    auth = FormField(field_id="y", label="Are you legally authorised to work in the US?", type="text")
+    assert bank.match(auth) == "Yes"
+
+
+def test_us_synonym_keeps_word_boundaries_and_the_pronoun():
+    assert normalize_question("US citizen?") == normalize_question("United States citizen") == "usa citizen"
+    assert normalize_question("U.S. citizen") == normalize_question("U.S.A. citizen") == "usa citizen"
+    assert normalize_question("Are you located in the US or Canada?") == "located in usa or canada"
+    assert normalize_question("Have you worked for us before?") == "have worked for us before"
+
+
+def test_only_residual_fields_reach_the_llm(bank, monkeypatch):
+    seen = {}
+
+    def fake_llm(**kwargs):
+        seen["prompt"] = kwargs["messages"][1]["content"]
+        content = '{"answers": {"pronouns": "she/her"}}'
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+    monkeypatch.setattr(answerer, "create_chat_completion", fake_llm)
+    schema = _schema(
+        [
+            FormField(field_id="email", label="Email", type="email"),
+            FormField(field_id="pronouns", label="Pronouns", type="text"),
+        ]
+    )
+    answered = answerer.generate_answers(schema, resume_text="resume", answer_bank=bank)
+
+    fields = {f.field_id: f for f in answered.sections[0].fields}
+    assert fields["email"].meta == {"answer": "ada@example.com", "answer_source": "bank"}
+    assert fields["pronouns"].meta["answer_source"] == "llm"
+    assert "id=pronouns" in seen["prompt"] and "id=email" not in seen["prompt"]
+
+    fields["pronouns"].meta["confirmed_value"] = "she/her"
+    assert bank.learn_confirmed(answered) == 1
+    reloaded = AnswerBank.load(UserProfile(name="u", path=bank.path.parent, secrets=UserSecrets()))
+    assert reloaded.match(FormField(field_id="p", label="Your pronouns", type="text")) == "she/her"
+
+
+def test_fully_banked_form_skips_llm(bank, monkeypatch):
+    monkeypatch.setattr(answerer, "create_chat_completion", lambda **kw: pytest.fail("LLM called"))
+    schema = _schema([FormField(field_id="email", label="Email address", type="email"), FormField(field_id="cv", type="file")])
+    bank.entries[normalize_question("Email address")] = AnswerBankEntry(question="Email address", answer="ada@example.com")
+    answered = answerer.generate_answers(schema, resume_text="resume", answer_bank=bank)
+    assert answered.validity.meta["bank_answered_fields"] == 1
@@ -0,0 +1,46 @@
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add src to Python path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from webbot.forms.answerer import RESUME_TOKEN_BUDGET, _answer_request
+from webbot.forms.schema import FormField, FormSchema, FormSection, Validity
+from webbot.llm.tokens import count_tokens, record_usage, truncate_to_tokens, usage_scope
+
+
+def _schema(*labels: str) -> FormSchema:
+    fields = [FormField(field_id=f"f{i}", label=label, type="text") for i, label in enumerate(labels)]
+    return FormSchema(sections=[FormSection(fields=fields)], validity=Validity(is_valid_job_application_form=True, confidence=1.0))
+
+
+def test_forms_share_a_stable_prompt_prefix():
+    resume = "Senior engineer. " * 2000
+    a = _answer_request(_schema("Email"), resume_text=resume, job_context="URL: x", ignore_optional=True, model="gpt-4o")
+    b = _answer_request(_schema("Phone", "LinkedIn"), resume_text=resume, job_context="URL: x", ignore_optional=True, model="gpt-4o")
+
+    assert a["messages"][0] == b["messages"][0]
+    user_a, user_b = a["messages"][1]["content"], b["messages"][1]["content"]
+    prefix = user_a[: user_a.index("Additional rule:")]
+    assert user_b.startswith(prefix)
+    assert "[Resume]" in prefix and "[Job Context]" in prefix
+    assert count_tokens(prefix) <= RESUME_TOKEN_BUDGET + 50
+
+
+def test_truncate_to_tokens_respects_budget():
+    text = "word " * 5000
+    cut = truncate_to_tokens(text, 100)
+    assert count_tokens(cut) <= 100
+    assert truncate_to_tokens("short", 100) == "short"
+
+
+def test_usage_scope_records_cached_tokens():
+    usage = SimpleNamespace(prompt_tokens=2000, completion_tokens=50, prompt_tokens_details=SimpleNamespace(cached_tokens=1536))
+    with usage_scope("test") as stats:
+        record_usage("gpt-4o", usage)
+        record_usage("gpt-4o", SimpleNamespace(prompt_tokens=2000, completion_tokens=50, prompt_tokens_details=None))
+    assert stats.calls == 2
+    assert stats.prompt_tokens == 4000
+    assert stats.cached_tokens == 1536
+    assert round(stats.cached_ratio(), 3) == 0.384
@@ -0,0 +1,93 @@
+import asyncio
+import json
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add src to Python path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from webbot.forms.answerer import AnswerStreamParser, astream_answers
+from webbot.forms.schema import FormField, FormSchema, FormSection, Validity
+
+from openai.types.chat import ChatCompletionChunk
+
+
+REPLY = json.dumps(
+    {"answers": {"f0": "Ada Lovelace", "f1": 12, "f2": "yes", "f3": "line one, \"quoted\" }"}, "unanswerable": []}
+)
+
+
+def _schema() -> FormSchema:
+    fields = [
+        FormField(field_id="f0", label="Full name", type="text"),
+        FormField(field_id="f1", label="Years of experience", type="number"),
+        FormField(field_id="f2", label="Authorized to work", type="checkbox"),
+        FormField(field_id="f3", label="Anything else", type="textarea"),
+    ]
+    return FormSchema(sections=[FormSection(fields=fields)], validity=Validity(is_valid_job_application_form=True, confidence=1.0))
+
+
+def test_parser_emits_entries_only_once_complete():
+    parser = AnswerStreamParser()
+    emitted = []
+    for i, ch in enumerate(REPLY):
+        for key, value in parser.feed(ch):
+            emitted.append((key, value, i))
+    assert [(k, v) for k, v, _ in emitted] == [("f0", "Ada Lovelace"), ("f1", 12), ("f2", "yes"), ("f3", 'line one, "quoted" }')]
+    # "12" is held back until the comma proves the number is finished
+    assert REPLY[emitted[1][2]] == ","
+    # Each entry is emitted before the reply ends
+    assert emitted[0][2] < emitted[1][2] < emitted[2][2] < len(REPLY) - 1
+
+
+def _chunk(content):
+    return ChatCompletionChunk.model_validate(
+        {
+            "id": "chunk-1",
+            "object": "chat.completion.chunk",
+            "created": 0,
+            "model": "gpt-4o",
+            "choices": [{"index": 0, "delta": {"content": content}, "finish_reason": None}],
+        }
+    )
+
+
+class _StreamingClient:
+    def __init__(self, text: str, size: int = 5):
+        self.pieces = [text[i : i + size] for i in range(0, len(text), size)]
+        self.served = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    async def _create(self, **kwargs):
+        assert kwargs["stream"] is True
+
+        async def gen():
+            for piece in self.pieces:
+                self.served += 1
+                yield _chunk(piece)
+
+        return gen()
+
+
+def test_stream_yields_fields_before_generation_finishes(monkeypatch):
+    client = _StreamingClient(REPLY)
+
+    async def fake_client():
+        return client
+
+    monkeypatch.setattr("webbot.llm.chat.get_async_openai_client", fake_client)
+    schema = _schema()
+
+    async def run():
+        seen = []
+        async for f in astream_answers(schema, resume_text="resume", model="gpt-4o"):
+            seen.append((f.field_id, f.meta["answer"], client.served))
+        return seen
+
+    seen = asyncio.run(run())
+    assert [s[:2] for s in seen] == [("f0", "Ada Lovelace"), ("f1", "12"), ("f2", "true"), ("f3", 'line one, "quoted" }')]
+    assert seen[0][2] < len(client.pieces)
+    # Final pass leaves the schema as the buffered path would
+    assert all(f.meta["answer_source"] == "llm" for f in schema.sections[0].fields)
+    assert schema.validity.meta["llm_answered_fields"] == 4
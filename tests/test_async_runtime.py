@@ -0,0 +1,68 @@
+import asyncio
+import sys
+import threading
+from pathlib import Path
+
+# Repo root on the path so the backend package imports the way the server does
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.backend.services.async_runtime import AsyncRuntime
+
+
+def test_coroutines_from_many_threads_share_one_loop():
+    runtime = AsyncRuntime(name="test-runtime")
+    try:
+        # State bound to the loop (like Playwright objects) survives across calls
+        queue = runtime.run(_make_queue())
+        loops = []
+
+        def worker(i):
+            loops.append(runtime.run(_put(queue, i), timeout=5))
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert len(set(loops)) == 1 and loops[0] is runtime.loop
+        assert sorted(runtime.run(_drain(queue), timeout=5)) == [0, 1, 2, 3]
+    finally:
+        runtime.stop()
+    assert not runtime.is_running
+
+
+def test_spawn_returns_immediately_and_stop_cancels_pending_work():
+    runtime = AsyncRuntime(name="test-runtime")
+    started = threading.Event()
+
+    async def long_run():
+        started.set()
+        await asyncio.sleep(60)
+
+    future = runtime.spawn(long_run(), description="long run")
+    assert not future.done()
+    assert started.wait(5)
+    failed = runtime.spawn(_fail(), description="failing run")
+    assert isinstance(failed.exception(timeout=5), RuntimeError)
+    runtime.stop()
+    assert future.cancelled()
+
+
+async def _make_queue():
+    return asyncio.Queue()
+
+
+async def _put(queue, item):
+    await queue.put(item)
+    return asyncio.get_running_loop()
+
+
+async def _drain(queue):
+    items = []
+    while not queue.empty():
+        items.append(queue.get_nowait())
+    return items
+
+
+async def _fail():
+    raise RuntimeError("browser launch failed")
@@ -0,0 +1,181 @@
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Add src to Python path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import webbot.agents.find_apply_page_gpt5 as gpt5
+from webbot.company_kb import (
+    CareersRecord,
+    CompanyKnowledgeBase,
+    PostingResolution,
+    SqliteCompanyStore,
+    detect_ats,
+    get_company_kb,
+    normalize_company_name,
+    normalize_domain,
+    reset_company_kb,
+)
+
+
+@pytest.fixture
+def kb(tmp_path):
+    store = SqliteCompanyStore(tmp_path / "companies.sqlite3")
+    yield CompanyKnowledgeBase(store, ttl_s=3600, lru_size=2)
+    store.close()
+
+
+def test_normalization():
+    assert normalize_company_name("Acme, Inc.") == "acme"
+    assert normalize_company_name("The Acme Corporation") == "acme"
+    assert normalize_company_name("AT&T") == "at and t"
+    assert normalize_domain("https://www.jobs.acme.co.uk/careers?x=1") == "acme.co.uk"
+    assert normalize_domain("Acme.com") == "acme.com"
+
+
+def test_remember_and_resolve_merges_aliases(kb, tmp_path):
+    kb.remember("Acme Inc", "www.acme.com", confidence="High", verified=True)
+    kb.remember("ACME Corporation", "acme.com", confidence="High", verified=True)
+    rec = kb.resolve("acme")
+    assert rec is not None and rec.normalized_domain == "acme.com"
+    assert kb.stats.lru_hits == 1
+
+    # A fresh resolver over the same file answers from the store, not the LRU
+    other = CompanyKnowledgeBase(SqliteCompanyStore(tmp_path / "companies.sqlite3"), ttl_s=3600)
+    rec = other.resolve("Acme, Inc.")
+    assert rec is not None and set(rec.aliases) == {"acme"}
+    assert other.stats.store_hits == 1
+    assert other.resolve("Globex") is None and other.stats.misses == 1
+
+
+def test_low_confidence_and_stale_records(kb):
+    kb.remember("Initech", "initech.com", confidence="Low")
+    assert kb.resolve("Initech") is None
+
+    rec = kb.remember("Globex", "globex.com", confidence="High", verified=True)
+    rec.verified_at = time.time() - 7200
+    assert kb.is_stale(kb.resolve("Globex"))
+    kb.mark_verified(rec, ok=False)
+    assert kb.resolve("Globex") is None  # halved below min_confidence
+
+
+def test_unverified_guess_is_ignored_until_confirmed(kb):
+    kb.remember("Hooli", "hooli.xyz", confidence="High")
+    assert kb.resolve("Hooli") is None and kb.stats.unverified == 1
+    assert kb.confirm("Hooli", "hooli.com") is None  # a different domain confirms nothing
+    assert kb.confirm("Hooli", "www.hooli.xyz").verified_at is not None
+    assert kb.resolve("Hooli").normalized_domain == "hooli.xyz"
+
+    # Guessing the same domain again does not unverify it
+    kb.remember("Hooli Inc", "hooli.xyz", confidence="High")
+    assert kb.resolve("Hooli Inc") is not None
+
+
+def test_lru_is_bounded(kb):
+    for name in ("A Co", "B Co", "C Co"):
+        kb.remember(name, f"{name[0].lower()}example.com", confidence="High", verified=True)
+    assert len(kb._lru) == 2
+    assert kb.resolve("A Co") is not None and kb.stats.store_hits == 1
+
+
+def test_stage1_answered_from_knowledge_base(tmp_path, monkeypatch):
+    monkeypatch.setenv("COMPANY_KB_PATH", str(tmp_path / "kb.sqlite3"))
+    reset_company_kb()
+    calls = []
+
+    async def fake_completion(**kwargs):
+        calls.append(kwargs)
+        raise AssertionError("stage 1 should not call the LLM on a knowledge-base hit")
+
+    monkeypatch.setattr(gpt5, "acreate_chat_completion", fake_completion)
+    try:
+        get_company_kb().remember("Acme Inc", "acme.com", confidence="High", verified=True)
+        trace = {"stages": {}}
+        result = asyncio.run(
+            gpt5._stage1_find_official_website("https://board/x", "Title: Eng\nCompany: Acme, Inc.\n", None, trace)
+        )
+        assert result["official_domain"] == "acme.com"
+        assert trace["stages"]["stage1"]["source"] == "company_kb"
+        assert not calls
+    finally:
+        reset_company_kb()
+
+
+def test_detect_ats():
+    assert detect_ats("https://boards.greenhouse.io/acme/jobs/123") == ("greenhouse", "acme")
+    assert detect_ats("https://boards.greenhouse.io/embed/job_board?for=acme") == ("greenhouse", "acme")
+    assert detect_ats("https://jobs.lever.co/globex") == ("lever", "globex")
+    assert detect_ats("https://initech.wd5.myworkdayjobs.com/en-US/careers") == ("workday", "initech")
+    assert detect_ats("https://acme.com/careers") == (None, None)
+
+
+def test_careers_cache_positive_and_negative_ttls(kb):
+    rec = kb.remember_careers("www.acme.com", careers_url="https://jobs.lever.co/acme")
+    assert (rec.found, rec.ats_provider, rec.ats_tenant) == (True, "lever", "acme")
+    assert kb.careers("acme.com").careers_url == "https://jobs.lever.co/acme"
+
+    neg = kb.remember_careers("globex.com")
+    assert neg.found is False
+    assert kb.careers("globex.com").found is False
+    assert kb.stats.careers_negative_hits == 1
+
+    kb.negative_ttl_s = 60
+    kb.store.put_careers(CareersRecord(**{**neg.as_dict(), "checked_at": time.time() - 120}))
+    assert kb.careers("globex.com") is None  # negative expired, positive still cached
+    assert kb.careers("acme.com") is not None
+
+
+def test_stage2_skips_crawl_on_cached_domain(tmp_path, monkeypatch):
+    monkeypatch.setenv("COMPANY_KB_PATH", str(tmp_path / "kb.sqlite3"))
+    reset_company_kb()
+    crawled, analyzed = [], []
+
+    async def fake_crawl(domain, page, trace):
+        crawled.append(domain)
+        return None
+
+    async def fake_analyze(url, page, trace):
+        analyzed.append(url)
+        return {"careers_url": url}
+
+    monkeypatch.setattr(gpt5, "_crawl_for_careers_page", fake_crawl)
+    monkeypatch.setattr(gpt5, "_analyze_careers_page", fake_analyze)
+    try:
+        # First run finds nothing and caches the negative; the second skips the crawl
+        assert asyncio.run(gpt5._stage2_find_careers_page("globex.com", None, {"stages": {}})) is None
+        assert asyncio.run(gpt5._stage2_find_careers_page("globex.com", None, {"stages": {}})) is None
+        assert crawled == ["globex.com"]
+
+        get_company_kb().remember_careers("acme.com", careers_url="https://acme.com/careers")
+        result = asyncio.run(gpt5._stage2_find_careers_page("acme.com", None, {"stages": {}}))
+        assert result == {"careers_url": "https://acme.com/careers"}
+        assert crawled == ["globex.com"] and analyzed == ["https://acme.com/careers"]
+    finally:
+        reset_company_kb()
+
+
+def test_posting_resolution_roundtrip_and_expiry(kb):
+    url = "https://www.workatastartup.com/jobs/123/#apply"
+    kb.remember_posting(
+        url,
+        official_identifier="https://jobs.ashbyhq.com/acme/abc",
+        apply_url="https://jobs.ashbyhq.com/acme/abc/application",
+        title="Engineer",
+        resolution={"official_domain": "acme.com", "picks": {"agentic5": "https://jobs.ashbyhq.com/acme/abc"}},
+    )
+    hit = kb.resolved_posting("https://www.workatastartup.com/jobs/123")
+    assert hit.apply_url.endswith("/application")
+    assert hit.resolution["picks"]["agentic5"] == "https://jobs.ashbyhq.com/acme/abc"
+
+    kb.posting_ttl_s = 60
+    kb.store.put_posting(PostingResolution(**{**hit.as_dict(), "resolved_at": time.time() - 120}))
+    assert kb.resolved_posting(url) is None
+
+    kb.posting_ttl_s = 0
+    kb.forget_posting(url)
+    assert kb.resolved_posting(url) is None
+    assert (kb.stats.posting_hits, kb.stats.posting_misses) == (1, 2)
@@ -0,0 +1,198 @@
+import asyncio
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+# Repo root on the path so the backend package imports the way the server does
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.backend.services.context_pool import BrowserContextPool
+
+
+class FakePage:
+    def __init__(self, context):
+        self.context = context
+        self.closed = False
+        self.broken = False
+        self.handlers = {}
+
+    def on(self, event, handler):
+        self.handlers.setdefault(event, []).append(handler)
+
+    def remove_listener(self, event, handler):
+        self.handlers[event].remove(handler)
+
+    def is_closed(self):
+        return self.closed
+
+    async def evaluate(self, script):
+        if self.broken:
+            raise RuntimeError("Target crashed")
+        return 1
+
+    async def close(self):
+        self.closed = True
+        self.context.pages.remove(self)
+
+
+class FakeCDPSession:
+    def __init__(self, context):
+        self.context = context
+
+    async def send(self, method, params):
+        assert method == "Storage.clearDataForOrigin"
+        self.context.storage.pop(params["origin"], None)
+
+    async def detach(self):
+        pass
+
+
+class FakeContext:
+    def __init__(self, options):
+        self.options = options
+        self.storage = {}  # origin -> data the page saved (localStorage, IndexedDB, ...)
+        self.supports_cdp = True
+        self.pages = []
+        self.closed = False
+        self.cookies_cleared = 0
+        self.handlers = {}
+
+    def on(self, event, handler):
+        self.handlers.setdefault(event, []).append(handler)
+
+    def remove_listener(self, event, handler):
+        self.handlers[event].remove(handler)
+
+    async def new_page(self):
+        page = FakePage(self)
+        self.pages.append(page)
+        return page
+
+    def visit(self, url, saved):
+        origin = "/".join(url.split("/")[:3])
+        self.storage[origin] = saved
+        for handler in self.handlers.get("request", []):
+            handler(SimpleNamespace(url=url))
+
+    async def new_cdp_session(self, page):
+        if not self.supports_cdp:
+            raise RuntimeError("CDP sessions are only supported on Chromium")
+        return FakeCDPSession(self)
+
+    async def clear_cookies(self):
+        self.cookies_cleared += 1
+
+    async def clear_permissions(self):
+        pass
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.contexts = []
+
+    async def new_context(self, **options):
+        ctx = FakeContext(options)
+        self.contexts.append(ctx)
+        return ctx
+
+
+def test_warm_contexts_are_leased_reset_and_reused():
+    async def scenario():
+        browser = FakeBrowser()
+        pool = BrowserContextPool(browser, max_contexts=2, warm_contexts=1, context_options={"viewport": {}})
+        await pool.start()
+        assert len(browser.contexts) == 1
+
+        lease = await pool.acquire(1)
+        assert lease.context is browser.contexts[0]
+        lease.on(lease.page, "console", lambda msg: None)
+        first_page = lease.page
+        await pool.release(1)
+        # Reset: cookies cleared, run listeners dropped, a fresh page for the next run
+        assert lease.context.cookies_cleared == 1 and first_page.closed
+        assert first_page.handlers["console"] == []
+
+        again = await pool.acquire(2)
+        assert again.context is lease.context and pool.counters["reused"] == 2
+        await pool.release(2)
+        return pool.stats()
+
+    stats = asyncio.run(scenario())
+    assert stats["leased"] == 0 and stats["idle"] == 1
+
+
+def test_runs_queue_when_pool_is_exhausted():
+    async def scenario():
+        pool = BrowserContextPool(FakeBrowser(), max_contexts=1, warm_contexts=0)
+        await pool.acquire(1)
+        assert pool.exhausted
+        waiter = asyncio.create_task(pool.acquire(2))
+        await asyncio.sleep(0)
+        assert not waiter.done() and pool.stats()["waiting"] == 1
+        await pool.release(1)
+        lease = await asyncio.wait_for(waiter, timeout=1)
+        assert lease.run_id == 2 and pool.counters["queued"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_health_check_evicts_crashed_contexts_and_refills():
+    async def scenario():
+        browser = FakeBrowser()
+        pool = BrowserContextPool(browser, max_contexts=2, warm_contexts=1)
+        await pool.start()
+        browser.contexts[0].pages[0].broken = True
+        assert await pool.health_check() == 1
+        assert browser.contexts[0].closed and len(browser.contexts) == 2
+
+        # A dedicated (e.g. video) context is closed on release instead of reused
+        lease = await pool.acquire(7, context_options={"record_video_dir": "./videos"})
+        assert lease.context.options == {"record_video_dir": "./videos"}
+        await pool.release(7)
+        assert lease.context.closed
+
+    asyncio.run(scenario())
+
+
+def test_overlapping_releases_do_not_overfill_warm_contexts():
+    class SlowBrowser(FakeBrowser):
+        async def new_context(self, **options):
+            await asyncio.sleep(0.01)
+            return await super().new_context(**options)
+
+    async def scenario():
+        browser = SlowBrowser()
+        pool = BrowserContextPool(browser, max_contexts=3, warm_contexts=1, max_uses=1)
+        await pool.acquire(1)
+        await pool.acquire(2)
+        # Both contexts are used up, so each release closes one and refills
+        await asyncio.gather(pool.release(1), pool.release(2))
+        return browser, pool.stats()
+
+    browser, stats = asyncio.run(scenario())
+    assert stats["idle"] == 1 and stats["leased"] == 0
+    assert len([c for c in browser.contexts if not c.closed]) == 1
+
+
+def test_origin_storage_does_not_carry_over_to_the_next_run():
+    async def scenario():
+        browser = FakeBrowser()
+        pool = BrowserContextPool(browser, max_contexts=1, warm_contexts=0)
+        lease = await pool.acquire(1)
+        lease.context.visit("https://boards.example.com/jobs/1/apply", {"draft": "cover letter", "session": "abc"})
+        await pool.release(1)
+        again = await pool.acquire(2)
+        assert again.context is lease.context and again.context.storage == {}
+        await pool.release(2)
+
+        # Without CDP the storage cannot be wiped, so a context that navigated is closed
+        other = await pool.acquire(3)
+        other.context.supports_cdp = False
+        other.context.visit("https://boards.example.com/jobs/2/apply", {"draft": "x"})
+        await pool.release(3)
+        assert other.context.closed and pool.stats()["idle"] == 0
+
+    asyncio.run(scenario())
@@ -0,0 +1,76 @@
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# Repo root on the path so the backend package imports the way the server does
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.backend.database.pool import ConnectionPool, PoolTimeout, numbered_placeholders, statement_name
+
+
+class FakeConnection:
+    def __init__(self):
+        self.closed = 0
+        self.healthy = True
+
+    def close(self):
+        self.closed = 1
+
+
+def _pool(**kwargs):
+    made = []
+
+    def connect():
+        made.append(FakeConnection())
+        return made[-1]
+
+    defaults = dict(validate=lambda conn: conn.healthy, reset=lambda conn: not conn.closed)
+    return ConnectionPool(connect, **{**defaults, **kwargs}), made
+
+
+def test_pool_grows_to_max_then_makes_callers_wait():
+    pool, made = _pool(min_size=1, max_size=2, timeout_s=0.05)
+    a, b = pool.getconn(), pool.getconn()
+    assert len(made) == 2 and pool.stats()["utilization"] == 1.0
+    with pytest.raises(PoolTimeout):
+        pool.getconn()
+
+    # A waiting caller gets the connection as soon as it is returned
+    pool.timeout_s = 2.0
+    got = []
+    waiter = threading.Thread(target=lambda: got.append(pool.getconn()))
+    waiter.start()
+    time.sleep(0.05)
+    pool.putconn(a)
+    waiter.join(1)
+    assert got == [a]
+    stats = pool.stats()
+    assert stats["waits"] == 2 and stats["timeouts"] == 1 and stats["max_wait_ms"] > 0
+    pool.putconn(b)
+    pool.putconn(a)
+
+
+def test_stale_connections_are_validated_and_idle_ones_shrink():
+    pool, made = _pool(min_size=1, max_size=3, validate_idle_s=0.0, idle_timeout_s=0.0)
+    first = pool.getconn()
+    pool.putconn(first)
+    first.healthy = False
+    second = pool.getconn()
+    assert second is not first and first.closed and pool.stats()["validation_failures"] == 1
+
+    extra = pool.getconn()
+    pool.putconn(second)
+    time.sleep(0.01)
+    pool.putconn(extra)
+    # Back down to min_size once the surplus has sat idle
+    assert pool.stats()["size"] == 1 and pool.stats()["idle"] == 1
+
+
+def test_prepared_statement_helpers():
+    query = "UPDATE runs SET summary = %s WHERE id = %s"
+    assert numbered_placeholders(query) == "UPDATE runs SET summary = $1 WHERE id = $2"
+    assert statement_name(query) == statement_name(query)
+    assert statement_name(query) != statement_name(query + " ")
@@ -0,0 +1,85 @@
+import asyncio
+import sys
+from pathlib import Path
+
+import psycopg2
+
+# Repo root on the path so the backend package imports the way the server does
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.backend.models.entities import EventCategory, EventLevel, RunEvent
+from src.backend.services.event_sink import RunEventSink
+
+
+def _event(n, level=EventLevel.INFO):
+    return RunEvent(run_id=1, level=level, category=EventCategory.BROWSER, message=f"event {n}")
+
+
+def test_events_are_written_in_batches_and_flushed_on_demand():
+    batches = []
+
+    async def scenario():
+        sink = RunEventSink(lambda batch: batches.append(list(batch)), max_batch=3, flush_interval_s=60)
+        sink.start()
+        for n in range(7):
+            sink.add(_event(n))
+        # A full batch wakes the writer without waiting for the interval
+        for _ in range(20):
+            await asyncio.sleep(0.01)
+            if batches:
+                break
+        assert sum(len(b) for b in batches) >= 3
+        # Run end: everything queued so far is written before flush() returns
+        await sink.flush()
+        metrics = sink.metrics()
+        await sink.close()
+        return metrics
+
+    metrics = asyncio.run(scenario())
+    assert [e.message for b in batches for e in b] == [f"event {n}" for n in range(7)]
+    assert all(len(b) <= 3 for b in batches)
+    assert metrics["queue_depth"] == 0 and metrics["written"] == 7 and metrics["max_queue_depth"] >= 3
+
+
+def test_overflow_sheds_debug_events_first_and_failed_writes_are_retried():
+    attempts = []
+
+    def flaky_write(batch):
+        attempts.append(len(batch))
+        if len(attempts) == 1:
+            raise psycopg2.OperationalError("connection reset")
+
+    async def scenario():
+        sink = RunEventSink(flaky_write, max_batch=2, max_buffered=2)
+        assert sink.add(_event(0)) and sink.add(_event(1))
+        assert not sink.add(_event(2, level=EventLevel.DEBUG))
+        assert sink.add(_event(3, level=EventLevel.ERROR))  # evicts the oldest
+        assert await sink.flush() == 0
+        assert sink.metrics()["queue_depth"] == 2
+        assert await sink.flush() == 2
+        return sink.metrics()
+
+    metrics = asyncio.run(scenario())
+    assert metrics["dropped"] == 2 and metrics["failed_batches"] == 1 and metrics["written"] == 2
+
+
+def test_a_rejected_event_is_dropped_without_blocking_the_rest():
+    attempts = []
+
+    def write(batch):
+        attempts.append(len(batch))
+        if any("\x00" in e.message for e in batch):
+            raise ValueError("A string literal cannot contain NUL (0x00) characters.")
+
+    async def scenario():
+        sink = RunEventSink(write, max_batch=8)
+        for n in range(8):
+            sink.add(_event(f"bad\x00{n}" if n == 5 else n))
+        written = await sink.flush()
+        return written, sink.metrics()
+
+    written, metrics = asyncio.run(scenario())
+    assert written == 7 and metrics["queue_depth"] == 0
+    assert metrics["rejected"] == 1 and metrics["dropped"] == 1 and metrics["written"] == 7
+    # Bisected down to the bad row rather than retried per row from the start
+    assert len(attempts) < 8
@@ -0,0 +1,79 @@
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add src to Python path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from webbot.agents.find_apply_concurrent import Finder, is_confident, run_finders
+
+
+class _Page:
+    def __init__(self, log):
+        self.log = log
+
+    async def close(self):
+        self.log.append("closed")
+
+
+class _Context:
+    def __init__(self):
+        self.log = []
+
+    async def new_page(self):
+        self.log.append("opened")
+        return _Page(self.log)
+
+
+def _sleeper(seconds, url=None, trace=None):
+    async def run(page):
+        await asyncio.sleep(seconds)
+        return url, trace or {}
+
+    return run
+
+
+def test_is_confident():
+    assert is_confident("https://jobs.ashbyhq.com/acme/1234", {})
+    assert not is_confident("https://jobs.ashbyhq.com/acme", {})
+    assert is_confident("https://acme.com/jobs/1", {"raw": {"confidence": 0.9}})
+    assert not is_confident("https://acme.com/jobs/1", {"raw": {"confidence": "n/a"}})
+    assert not is_confident(None, {"raw": {"confidence": 1.0}})
+
+
+def test_finders_run_concurrently_in_own_pages():
+    ctx = _Context()
+    finders = [
+        Finder("a", _sleeper(0.2, "https://acme.com/careers")),
+        Finder("b", _sleeper(0.2, None)),
+        Finder("c", _sleeper(0.2, "https://acme.com/apply"), needs_page=False),
+    ]
+    seen = []
+    started = time.perf_counter()
+    results = asyncio.run(run_finders(ctx, finders, deadline_s=5, on_result=lambda r: seen.append(r.name)))
+    assert time.perf_counter() - started < 0.5
+    assert sorted(seen) == ["a", "b", "c"]
+    assert results["a"].url == "https://acme.com/careers" and results["b"].url is None
+    assert ctx.log.count("opened") == 2 and ctx.log.count("closed") == 2
+
+
+def test_deadline_and_early_exit_cancel_the_rest():
+    ctx = _Context()
+    results = asyncio.run(
+        run_finders(ctx, [Finder("fast", _sleeper(0.05, "x")), Finder("slow", _sleeper(5))], deadline_s=0.3)
+    )
+    assert results["fast"].url == "x"
+    assert results["slow"].error == "cancelled (deadline)"
+    assert ctx.log.count("closed") == 2
+
+    results = asyncio.run(
+        run_finders(
+            _Context(),
+            [Finder("ats", _sleeper(0.05, "https://jobs.lever.co/acme/abc")), Finder("slow", _sleeper(5))],
+            deadline_s=10,
+            early_exit=True,
+        )
+    )
+    assert results["ats"].confident
+    assert results["slow"].error == "cancelled (early_exit)"
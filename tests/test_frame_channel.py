@@ -0,0 +1,79 @@
+import sys
+from pathlib import Path
+
+# Repo root on the path so the backend package imports the way the server does
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.backend.websocket.frames import FrameChannel, FrameHub
+
+
+class RecordingSender:
+    def __init__(self):
+        self.sent = []
+        self.acks = []
+
+    def __call__(self, payload, on_ack):
+        self.sent.append(payload["frame"])
+        self.acks.append(on_ack)
+
+
+def _frame(n):
+    return {"run_id": 1, "frame": bytes([n]) * 10}
+
+
+def test_slow_client_gets_only_the_latest_frame():
+    sender = RecordingSender()
+    channel = FrameChannel("sid-1", sender)
+    for n in range(5):
+        channel.offer(_frame(n), now=0.0)
+    # Frame 0 is in flight; 1-3 were replaced by newer frames while waiting
+    assert sender.sent == [bytes([0]) * 10]
+    assert channel.counters["dropped"] == 3
+
+    sender.acks[-1]()
+    assert sender.sent[-1] == bytes([4]) * 10
+    sender.acks[-1]()
+    assert channel.counters == {"sent": 2, "acked": 2, "dropped": 3, "timeouts": 0, "bytes": 20}
+
+
+def test_unacked_frame_times_out_and_channel_recovers():
+    sender = RecordingSender()
+    channel = FrameChannel("sid-1", sender, ack_timeout_s=2.0)
+    channel.offer(_frame(0), now=0.0)
+    channel.offer(_frame(1), now=5.0)
+    assert len(sender.sent) == 2 and channel.counters["timeouts"] == 1
+
+
+def test_late_ack_for_timed_out_frame_does_not_release_the_next():
+    sender = RecordingSender()
+    channel = FrameChannel("sid-1", sender, ack_timeout_s=2.0)
+    channel.offer(_frame(0), now=0.0)
+    channel.offer(_frame(1), now=5.0)  # frame 0 written off, frame 1 in flight
+    channel.offer(_frame(2), now=5.1)
+    sender.acks[0]()  # frame 0's ack finally arrives
+    assert len(sender.sent) == 2 and channel.counters["acked"] == 0
+    sender.acks[1]()
+    assert sender.sent == [_frame(n)["frame"] for n in (0, 1, 2)]
+    assert channel.counters["acked"] == 1
+
+
+def test_hub_routes_frames_per_run_and_aggregates_stats():
+    senders = {}
+
+    def make_sender(sid):
+        senders[sid] = RecordingSender()
+        return senders[sid]
+
+    hub = FrameHub(make_sender)
+    hub.watch(1, "a")
+    hub.watch(1, "b")
+    hub.watch(2, "c")
+    assert hub.publish(1, _frame(7)) == 2
+    assert senders["c"].sent == []
+
+    hub.disconnect("b")
+    assert hub.publish(1, _frame(8)) == 1
+    senders["a"].acks[-1]()
+    stats = hub.stats(1)
+    assert senders["a"].sent == [bytes([7]) * 10, bytes([8]) * 10]
+    assert stats["sockets"] == 1 and stats["sent"] == 2 and stats["acked"] == 1
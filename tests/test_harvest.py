@@ -0,0 +1,67 @@
+import asyncio
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add src to Python path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import webbot.agents.find_apply_page_gpt5 as gpt5
+from webbot.harvest import harvest_links
+
+
+class FakePage:
+    """Records navigation and answers the single harvest evaluate call."""
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.url = "about:blank"
+        self.evaluations = []
+
+    async def goto(self, url, **kwargs):
+        self.url = url
+
+    async def evaluate(self, script, arg=None):
+        self.evaluations.append(arg)
+        return self.raw
+
+
+RAW = {
+    "links": [
+        {"text": "Careers", "url": "https://acme.com/careers", "title": "", "footer": True},
+        {"text": "Senior Engineer", "url": "https://jobs.lever.co/acme/123", "title": "", "footer": False},
+    ],
+    "title": "Acme Careers",
+    "text": "Join us",
+    "rounds": 2,
+    "stop": "no_new_links",
+    "quiet": True,
+    "mutations": 7,
+    "requests": 1,
+}
+
+
+def test_harvest_links_single_round_trip():
+    page = FakePage(RAW)
+    result = asyncio.run(harvest_links(page, include_text=True, max_s=2))
+    assert len(page.evaluations) == 1
+    assert page.evaluations[0]["includeText"] is True and page.evaluations[0]["maxMs"] == 2000
+    assert [link["url"] for link in result.links] == ["https://acme.com/careers", "https://jobs.lever.co/acme/123"]
+    assert (result.title, result.text, result.stop_reason) == ("Acme Careers", "Join us", "no_new_links")
+    metrics = result.metrics(legacy_wait_s=4.4)
+    assert metrics["links"] == 2 and metrics["saved_s"] > 4
+
+
+def test_careers_analysis_records_harvest_metrics(monkeypatch):
+    async def fake_completion(**kwargs):
+        content = '{"apply_url": "https://jobs.lever.co/acme/123", "confidence": "High"}'
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+    monkeypatch.setattr(gpt5, "acreate_chat_completion", fake_completion)
+    trace = {"stages": {}}
+    result = asyncio.run(gpt5._analyze_careers_page("https://acme.com/careers", FakePage(RAW), trace))
+    assert result["apply_url"] == "https://jobs.lever.co/acme/123"
+    pages = trace["harvest"]["pages"]
+    assert [p["where"] for p in pages] == ["careers_page"]
+    assert pages[0]["legacy_wait_s"] == 1.0
+    assert trace["harvest"]["saved_s"] == pages[0]["saved_s"]
@@ -0,0 +1,87 @@
+import asyncio
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add src to Python path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from webbot.browser import LeanBrowsingPolicy
+
+
+class FakeContext:
+    def __init__(self):
+        self.handler = None
+
+    async def route(self, pattern, handler):
+        self.handler = handler
+
+    async def unroute(self, pattern, handler):
+        assert handler == self.handler
+        self.handler = None
+
+
+class FakeRoute:
+    def __init__(self):
+        self.action = None
+
+    async def fallback(self):
+        self.action = "fallback"
+
+    async def abort(self, reason=None):
+        self.action = "abort"
+
+    async def fulfill(self, status=200, **kwargs):
+        self.action = f"fulfill {status}"
+
+
+def _request(url, rtype, frame, nav=False):
+    return SimpleNamespace(url=url, resource_type=rtype, frame=frame, is_navigation_request=lambda: nav)
+
+
+def test_lean_policy_blocks_stubs_and_reports_per_navigation():
+    reported = []
+    policy = LeanBrowsingPolicy(tracker_domains=["google-analytics.com"], on_navigation=reported.append)
+    ctx = FakeContext()
+    main = SimpleNamespace(page=object(), parent_frame=None)
+
+    async def scenario():
+        await policy.lean(ctx)
+        requests = [
+            _request("https://acme.com/", "document", main, nav=True),
+            _request("https://acme.com/logo.png", "image", main),
+            _request("https://acme.com/app.js", "script", main),
+            _request("https://www.google-analytics.com/analytics.js", "script", main),
+            _request("https://www.google-analytics.com/collect", "xhr", main),
+            _request("https://acme.com/careers", "document", main, nav=True),
+            _request("https://acme.com/font.woff2", "font", main),
+        ]
+        actions = []
+        for req in requests:
+            route = FakeRoute()
+            await ctx.handler(route, req)
+            actions.append(route.action)
+        await policy.full()
+        return actions
+
+    actions = asyncio.run(scenario())
+    assert actions == ["fallback", "abort", "fallback", "fulfill 200", "fulfill 204", "fallback", "abort"]
+    assert ctx.handler is None and policy.mode == "full"
+    assert [(r["url"], r["blocked"], r["stubbed"]) for r in reported] == [
+        ("https://acme.com/", 1, 2),
+        ("https://acme.com/careers", 1, 0),
+    ]
+    summary = policy.summary()
+    assert summary["navigations"] == 2 and summary["bytes_saved_est"] > 0 and summary["ms_saved_est"] > 0
+
+
+def test_from_settings_respects_toggle_and_extra_trackers(monkeypatch):
+    monkeypatch.setenv("LEAN_BROWSING", "false")
+    assert LeanBrowsingPolicy.from_settings() is None
+    monkeypatch.setenv("LEAN_BROWSING", "true")
+    monkeypatch.setenv("LEAN_TRACKER_DOMAINS", "tracker.example")
+    monkeypatch.setenv("LEAN_BLOCK_TYPES", "image,media")
+    policy = LeanBrowsingPolicy.from_settings()
+    assert policy.is_tracker("https://cdn.tracker.example/t.js")
+    assert policy.is_tracker("https://www.googletagmanager.com/gtm.js")
+    assert policy.block_types == {"image", "media"}
@@ -0,0 +1,96 @@
+import asyncio
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add src to Python path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import webbot.agents.find_apply_page_gpt5 as gpt5
+from webbot.link_rank import query_terms, rank_links
+
+
+def _nav(n):
+    return [{"text": f"Product {i}", "url": f"https://acme.com/product/{i}", "title": ""} for i in range(n)]
+
+
+def test_careers_link_ranked_first_even_past_old_window():
+    links = _nav(90) + [
+        {"text": "LinkedIn", "url": "https://www.linkedin.com/company/acme", "title": ""},
+        {"text": "Careers", "url": "https://acme.com/careers", "title": "", "footer": True},
+    ]
+    ranking = rank_links(links, base_domain="www.acme.com", purpose="careers", top_n=10)
+    assert ranking.shortlist[0]["url"] == "https://acme.com/careers"
+    assert ranking.ranked[-1]["url"].startswith("https://www.linkedin.com")
+    assert len(ranking.shortlist) == 10 and ranking.original[0]["url"] == "https://acme.com/product/0"
+    assert ranking.dominant(margin=3.0)["url"] == "https://acme.com/careers"
+
+
+def test_job_ranking_uses_query_and_needs_clear_lead():
+    links = [
+        {"text": "Product Designer", "url": "https://jobs.lever.co/acme/1", "title": ""},
+        {"text": "Backend Engineer, Payments", "url": "https://jobs.lever.co/acme/2", "title": ""},
+        {"text": "Backend Engineer, Platform", "url": "https://jobs.lever.co/acme/3", "title": ""},
+    ]
+    assert query_terms("Senior Backend Engineer") == ["backend", "engineer"]
+    ranking = rank_links(links, base_domain="jobs.lever.co", purpose="jobs", query="Backend Engineer, Payments")
+    assert ranking.ranked[0]["url"] == "https://jobs.lever.co/acme/2"
+    # Two near-identical matches: not dominant, so the LLM still decides
+    assert rank_links(links, purpose="jobs", query="Backend Engineer").dominant(margin=3.0) is None
+    assert rank_links([], purpose="jobs").shortlist == []
+
+
+class FakePage:
+    def __init__(self, links):
+        self.links = links
+        self.url = "about:blank"
+
+    async def goto(self, url, **kwargs):
+        self.url = url
+
+    async def evaluate(self, script, arg=None):
+        return {"links": self.links, "title": "Acme", "rounds": 1, "stop": "no_new_links"}
+
+
+def test_stage2_skips_llm_when_careers_link_dominates(monkeypatch):
+    async def fail_completion(**kwargs):
+        raise AssertionError("link analysis should be skipped")
+
+    async def fake_analyze(url, page, trace):
+        return {"careers_url": url}
+
+    monkeypatch.setattr(gpt5, "acreate_chat_completion", fail_completion)
+    monkeypatch.setattr(gpt5, "_analyze_careers_page", fake_analyze)
+    links = _nav(30) + [{"text": "Join us", "url": "https://acme.com/careers", "title": ""}]
+    trace = {"stages": {}}
+    result = asyncio.run(gpt5._crawl_for_careers_page("acme.com", FakePage(links), trace))
+    assert result == {"careers_url": "https://acme.com/careers"}
+    assert trace["link_rank"]["llm_skipped"] == 1 and trace["link_rank"]["llm_calls"] == 0
+
+
+def test_stage3_falls_back_to_llm_when_dominant_job_link_fails_to_load(monkeypatch):
+    class BrokenJobPage(FakePage):
+        async def goto(self, url, **kwargs):
+            if "/jobs/" in url:
+                raise TimeoutError("Timeout 15000ms exceeded")
+            self.url = url
+
+    prompts = []
+
+    async def fake_completion(**kwargs):
+        prompts.append(kwargs["messages"][0]["content"])
+        content = '{"page_type": "job_posting", "confidence": "Low", "apply_button_found": false}'
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+    monkeypatch.setattr(gpt5, "acreate_chat_completion", fake_completion)
+    links = _nav(10) + [
+        {"text": "Backend Engineer, Payments", "url": "https://acme.com/jobs/2", "title": ""},
+        {"text": "Product Designer", "url": "https://acme.com/jobs/1", "title": ""},
+    ]
+    page = BrokenJobPage(links)
+    trace = {"stages": {}}
+    summary = "Title: Backend Engineer, Payments\nCompany: Acme\n"
+    assert asyncio.run(gpt5._stage3_validate_and_navigate("https://acme.com/careers", summary, page, trace)) is None
+    assert "Timeout" in trace["stages"]["stage3_shortcut_error"]
+    assert len(prompts) == 1 and "Analyze this careers page" in prompts[0]
+    assert page.url == "https://acme.com/careers"
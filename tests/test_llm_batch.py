@@ -0,0 +1,143 @@
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src to Python path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from webbot.forms.answerer import apply_answer_completion, build_answer_request
+from webbot.forms.schema import FormField, FormSchema, FormSection, Validity
+from webbot.llm.cache import CacheMode, cache_key, get_response_cache, reset_response_cache, set_cache_mode
+from webbot.llm.batch import (
+    BatchRequest,
+    LocalBatchBackend,
+    collect_batch,
+    load_batch_job,
+    submit_batch,
+    wait_for_batch,
+)
+from webbot.struct_extract import build_extract_request, heuristic_extract, parse_extract_completion
+
+from openai.types.chat import ChatCompletion
+
+
+def _completion(content: str) -> ChatCompletion:
+    return ChatCompletion.model_validate(
+        {
+            "id": "cmpl-1",
+            "object": "chat.completion",
+            "created": 0,
+            "model": "gpt-4o-mini",
+            "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": content}}],
+        }
+    )
+
+
+@pytest.fixture
+def batch_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("LLM_BATCH_DIR", str(tmp_path))
+    return tmp_path
+
+
+def _backend(root: Path, responder, max_per_poll: int = 0) -> LocalBatchBackend:
+    return LocalBatchBackend(root / "local", responder=responder, max_per_poll=max_per_poll)
+
+
+def _schema() -> FormSchema:
+    fields = [
+        FormField(field_id="f1", type="text", label="Years of Python experience", required=True),
+        FormField(field_id="f2", type="checkbox", label="Willing to relocate"),
+    ]
+    return FormSchema(
+        sections=[FormSection(title="Main", fields=fields)],
+        validity=Validity(is_valid_job_application_form=True, confidence=1.0),
+    )
+
+
+def test_partial_results_resume_by_job_id(batch_dir):
+    calls = []
+
+    def responder(**body):
+        calls.append(body["messages"][-1]["content"])
+        if body["messages"][-1]["content"] == "boom":
+            raise RuntimeError("bad request")
+        return _completion(json.dumps({"echo": body["messages"][-1]["content"]}))
+
+    requests = [
+        BatchRequest(custom_id=f"r{i}", body={"model": "gpt-4o-mini", "messages": [{"role": "user", "content": c}]}, context={"i": i})
+        for i, c in enumerate(["a", "boom", "c"])
+    ]
+    backend = _backend(batch_dir, responder, max_per_poll=2)
+    job = submit_batch(requests, backend=backend, label="test")
+
+    first = collect_batch(job.job_id, backend=backend)
+    assert not first.done
+    assert set(first.completions) == {"r0"}
+    assert first.errors == {"r1": "bad request"}
+    assert first.pending == ["r2"]
+
+    # A later process only knows the job id
+    assert load_batch_job(job.job_id).status == "in_progress"
+    final = wait_for_batch(job.job_id, poll_interval_s=0, backend=backend)
+    assert final.done and not final.pending
+    assert json.loads(final.completions["r2"].choices[0].message.content) == {"echo": "c"}
+    assert final.job.contexts["r2"] == {"i": 2}
+    assert len(calls) == 3  # nothing re-executed
+
+    # Finished jobs are answered from local results without polling again
+    again = collect_batch(job.job_id, backend=_backend(batch_dir, lambda **_: pytest.fail("polled")))
+    assert set(again.completions) == {"r0", "r2"}
+
+
+def test_batch_results_fan_out_into_form_and_extract(batch_dir):
+    schema = _schema()
+    form_body = build_answer_request(schema, resume_text="Python for 6 years", model="gpt-4o-mini")
+    text = "Senior Python Engineer\nAcme\nRemote\nRequirements:\n- 5+ years Python"
+    heur = heuristic_extract(text, "Senior Python Engineer")
+    requests = [
+        BatchRequest(custom_id="form", body=form_body, context={"schema": schema.model_dump(mode="json")}),
+        BatchRequest(custom_id="job", body=build_extract_request(text, heur)),
+    ]
+
+    def responder(**body):
+        if body["messages"][0]["content"].startswith("You are a precise application-filling"):
+            return _completion(json.dumps({"answers": {"f1": 6, "f2": "yes"}, "unanswerable": []}))
+        return _completion(json.dumps({"is_job_posting": True, "title": "Senior Python Engineer", "work_mode": "remote"}))
+
+    backend = _backend(batch_dir, responder)
+    result = wait_for_batch(submit_batch(requests, backend=backend).job_id, poll_interval_s=0, backend=backend)
+
+    restored = FormSchema.model_validate(result.job.contexts["form"]["schema"])
+    answered = apply_answer_completion(restored, result.completions["form"].choices[0].message.content)
+    f1, f2 = answered.sections[0].fields
+    assert (f1.meta["answer"], f2.meta["answer"]) == ("6", "true")
+    assert f1.meta["answer_source"] == "llm"
+
+    extract = parse_extract_completion(result.completions["job"].choices[0].message.content)
+    assert extract.is_job_posting and extract.work_mode == "remote"
+
+
+def test_submit_rejects_duplicate_ids(batch_dir):
+    req = BatchRequest(custom_id="x", body={"model": "m", "messages": []})
+    with pytest.raises(ValueError):
+        submit_batch([req, req], backend=_backend(batch_dir, None))
+
+
+@pytest.mark.parametrize("mode, stored", [(CacheMode.READ_THROUGH, True), (CacheMode.REPLAY, False)])
+def test_batch_results_fill_the_response_cache_only_when_recording(batch_dir, monkeypatch, mode, stored):
+    monkeypatch.setenv("LLM_CACHE_PATH", str(batch_dir / "llm.sqlite3"))
+    reset_response_cache()
+    set_cache_mode(mode)
+    try:
+        body = {"model": "gpt-4o-mini", "messages": [{"role": "user", "content": "hi"}]}
+        backend = _backend(batch_dir, lambda **_: _completion("hello"))
+        backend.name = "remote"  # results the process has not seen before, as from the OpenAI backend
+        job = submit_batch([BatchRequest(custom_id="r0", body=body)], backend=backend)
+        assert wait_for_batch(job.job_id, poll_interval_s=0, backend=backend).done
+        cached = get_response_cache().get(cache_key(body["model"], body["messages"], {}))
+        assert (cached is not None) == stored
+    finally:
+        set_cache_mode(None)
+        reset_response_cache()
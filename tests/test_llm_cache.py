@@ -0,0 +1,96 @@
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# Add src to Python path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from webbot.llm.cache import (
+    CacheMode,
+    LLMCacheMissError,
+    LLMResponseCache,
+    cache_key,
+    reset_response_cache,
+    set_cache_mode,
+)
+from webbot.llm.chat import create_chat_completion
+
+from openai.types.chat import ChatCompletion
+
+
+MESSAGES = [{"role": "system", "content": "sys"}, {"role": "user", "content": "hi"}]
+
+
+def _completion(content: str) -> ChatCompletion:
+    return ChatCompletion.model_validate(
+        {
+            "id": "cmpl-1",
+            "object": "chat.completion",
+            "created": 0,
+            "model": "gpt-4o-mini",
+            "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": content}}],
+        }
+    )
+
+
+class _CountingClient:
+    def __init__(self):
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, **kwargs):
+        self.calls += 1
+        return _completion(f"answer {self.calls}")
+
+
+@pytest.fixture
+def cache_env(tmp_path, monkeypatch):
+    monkeypatch.setenv("LLM_CACHE_PATH", str(tmp_path / "llm.sqlite3"))
+    reset_response_cache()
+    yield
+    set_cache_mode(None)
+    reset_response_cache()
+
+
+def test_cache_key_is_stable_and_param_sensitive():
+    k1 = cache_key("gpt-4o", MESSAGES, {"temperature": 0.2, "response_format": {"type": "json_object"}})
+    k2 = cache_key("gpt-4o", MESSAGES, {"response_format": {"type": "json_object"}, "temperature": 0.2})
+    assert k1 == k2
+    assert k1 != cache_key("gpt-4o", MESSAGES, {"temperature": 0.3})
+    assert k1 != cache_key("gpt-4o-mini", MESSAGES, {"temperature": 0.2, "response_format": {"type": "json_object"}})
+
+
+def test_ttl_and_lru_cap(tmp_path):
+    cache = LLMResponseCache(tmp_path / "c.sqlite3", ttl_s=3600, max_bytes=250)
+    cache.put("a", "m", {"v": "x" * 100})
+    cache.put("b", "m", {"v": "y" * 100})
+    assert cache.get("a") is not None  # touch a so b is least recently used
+    cache.put("c", "m", {"v": "z" * 100})
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert cache.stats.evictions == 1
+
+    cache.ttl_s = 0.01
+    time.sleep(0.02)
+    assert cache.get("a") is None
+    assert cache.stats.expired == 1
+    cache.close()
+
+
+def test_read_through_then_replay(cache_env):
+    client = _CountingClient()
+    set_cache_mode(CacheMode.READ_THROUGH)
+    first = create_chat_completion(model="gpt-4o-mini", messages=MESSAGES, temperature=0, client=client)
+    again = create_chat_completion(model="gpt-4o-mini", messages=MESSAGES, temperature=0, client=client)
+    assert client.calls == 1
+    assert again.choices[0].message.content == first.choices[0].message.content == "answer 1"
+
+    set_cache_mode(CacheMode.REPLAY)
+    replayed = create_chat_completion(model="gpt-4o-mini", messages=MESSAGES, temperature=0, client=client)
+    assert replayed.choices[0].message.content == "answer 1"
+    with pytest.raises(LLMCacheMissError):
+        create_chat_completion(model="gpt-4o-mini", messages=MESSAGES, temperature=0.5, client=client)
+    assert client.calls == 1
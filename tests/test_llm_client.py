@@ -0,0 +1,77 @@
+import json
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+# Add src to Python path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from webbot.llm.client import get_client_pool_stats, get_openai_client, reset_openai_clients
+
+
+class _FakeOpenAI(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    hits: dict = {}
+
+    def _send(self, payload: dict) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        _FakeOpenAI.hits[self.path] = _FakeOpenAI.hits.get(self.path, 0) + 1
+        self._send({"object": "list", "data": []})
+
+    def do_POST(self):
+        _FakeOpenAI.hits[self.path] = _FakeOpenAI.hits.get(self.path, 0) + 1
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        self._send(
+            {
+                "id": "cmpl-1",
+                "object": "chat.completion",
+                "created": 0,
+                "model": "gpt-4o-mini",
+                "choices": [
+                    {"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": "OK"}}
+                ],
+            }
+        )
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def fake_openai(monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FakeOpenAI)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    _FakeOpenAI.hits = {}
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    monkeypatch.setenv("OPENAI_BASE_URL", f"http://127.0.0.1:{server.server_port}/v1")
+    reset_openai_clients()
+    yield _FakeOpenAI.hits
+    reset_openai_clients()
+    server.shutdown()
+
+
+def test_client_is_pooled_and_key_validated_once(fake_openai):
+    first = get_openai_client()
+    for _ in range(3):
+        client = get_openai_client()
+        assert client is first
+        client.chat.completions.create(model="gpt-4o-mini", messages=[{"role": "user", "content": "hi"}])
+
+    assert fake_openai.get("/v1/models") == 1
+    assert fake_openai.get("/v1/chat/completions") == 3
+    stats = get_client_pool_stats()
+    assert stats["clients_created"] == 1
+    assert stats["key_validations"] == 1
+    assert stats["requests"] == 4
+    assert stats["connections_opened"] == 1
+    assert stats["connections_reused"] == 3
@@ -0,0 +1,92 @@
+import asyncio
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# Add src to Python path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from openai.types.chat import ChatCompletion
+
+from webbot.llm.chat import acreate_chat_completion
+
+
+def _completion() -> ChatCompletion:
+    return ChatCompletion.model_validate(
+        {
+            "id": "cmpl-1",
+            "object": "chat.completion",
+            "created": 0,
+            "model": "gpt-4o-mini",
+            "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": "OK"}}],
+        }
+    )
+
+
+class _SlowAsyncClient:
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.in_flight = 0
+        self.peak = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    async def _create(self, **kwargs):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            return _completion()
+        finally:
+            self.in_flight -= 1
+
+
+@pytest.fixture(autouse=True)
+def _limits(monkeypatch):
+    monkeypatch.setenv("LLM_CACHE_MODE", "off")
+    monkeypatch.setenv("LLM_MAX_CONCURRENCY_PER_MODEL", "2")
+    monkeypatch.setenv("LLM_MODEL_CONCURRENCY", "gpt-4o=1")
+
+
+def _call(client, model="gpt-4o-mini"):
+    return acreate_chat_completion(model=model, messages=[{"role": "user", "content": "hi"}], client=client)
+
+
+def test_calls_overlap_with_loop_work_and_respect_model_limit():
+    async def main():
+        client = _SlowAsyncClient(0.05)
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.005)
+
+        t = asyncio.create_task(ticker())
+        await asyncio.gather(*[_call(client) for _ in range(6)])
+        t.cancel()
+        assert client.peak == 2
+        assert ticks > 5  # event loop stayed responsive while calls were pending
+
+        strict = _SlowAsyncClient(0.01)
+        await asyncio.gather(*[_call(strict, model="gpt-4o") for _ in range(3)])
+        assert strict.peak == 1
+
+    asyncio.run(main())
+
+
+def test_cancellation_releases_model_slot():
+    async def main():
+        slow = _SlowAsyncClient(10)
+        pending = [asyncio.create_task(_call(slow)) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        assert slow.in_flight == 0
+        resp = await asyncio.wait_for(_call(_SlowAsyncClient(0)), timeout=1)
+        assert resp.choices[0].message.content == "OK"
+
+    asyncio.run(main())
@@ -0,0 +1,72 @@
+import sys
+from pathlib import Path
+
+import httpx
+import openai
+import pytest
+
+# Add src to Python path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from webbot.llm import ratelimit
+from webbot.llm.ratelimit import TokenBucket, call_with_limits, reset_rate_limits, throttle_scope
+
+
+def _status_error(cls, status: int, headers: dict | None = None):
+    request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+    response = httpx.Response(status, headers=headers or {}, request=request)
+    return cls("boom", response=response, body=None)
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    monkeypatch.setenv("LLM_MAX_RETRIES", "3")
+    monkeypatch.setenv("LLM_BACKOFF_BASE_S", "0.01")
+    monkeypatch.setenv("LLM_MODEL_LIMITS", "m=60/1000")
+    reset_rate_limits()
+    slept = []
+    monkeypatch.setattr(ratelimit.time, "sleep", slept.append)
+    yield slept
+    reset_rate_limits()
+
+
+def test_token_bucket_reservations():
+    bucket = TokenBucket(capacity=10, per_minute=60)  # 1 token/s
+    assert bucket.reserve(10) == 0
+    assert bucket.reserve(2) == pytest.approx(2, abs=0.05)
+
+
+def test_retry_honors_retry_after_and_counts(sleeps):
+    failures = [
+        _status_error(openai.RateLimitError, 429, {"retry-after-ms": "1500"}),
+        _status_error(openai.InternalServerError, 503),
+    ]
+
+    def flaky():
+        if failures:
+            raise failures.pop(0)
+        return "ok"
+
+    with throttle_scope("test") as stats:
+        assert call_with_limits("m", 10, flaky) == "ok"
+
+    assert sleeps[0] >= 1.5
+    assert stats.calls == 1 and stats.attempts == 3 and stats.retries == 2
+    assert stats.rate_limited == 1 and stats.server_errors == 1 and stats.failures == 0
+
+
+def test_non_retryable_errors_raise_immediately(sleeps):
+    def bad():
+        raise _status_error(openai.BadRequestError, 400)
+
+    with throttle_scope("test") as stats:
+        with pytest.raises(openai.BadRequestError):
+            call_with_limits("m", 10, bad)
+    assert stats.attempts == 1 and stats.failures == 1 and not sleeps
+
+
+def test_tpm_bucket_throttles_large_requests(sleeps):
+    with throttle_scope("test") as stats:
+        call_with_limits("m", 900, lambda: None)
+        call_with_limits("m", 900, lambda: None)
+    assert stats.throttled_s > 40  # 1000 TPM: the second 900-token call waits most of a minute
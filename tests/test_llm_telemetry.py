@@ -0,0 +1,93 @@
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import openai
+import pytest
+
+# Add src to Python path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from webbot.llm.cache import CacheMode, reset_response_cache, set_cache_mode
+from webbot.llm.chat import create_chat_completion
+from webbot.llm.ratelimit import reset_rate_limits
+from webbot.llm.telemetry import add_telemetry_sink, estimate_cost, llm_stage, remove_telemetry_sink, rollup, telemetry_scope
+
+from openai.types.chat import ChatCompletion
+
+
+MESSAGES = [{"role": "user", "content": "hi"}]
+
+
+def _completion(prompt: int, cached: int, completion: int) -> ChatCompletion:
+    return ChatCompletion.model_validate(
+        {
+            "id": "cmpl-1",
+            "object": "chat.completion",
+            "created": 0,
+            "model": "gpt-4o-mini",
+            "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": "ok"}}],
+            "usage": {
+                "prompt_tokens": prompt,
+                "completion_tokens": completion,
+                "total_tokens": prompt + completion,
+                "prompt_tokens_details": {"cached_tokens": cached},
+            },
+        }
+    )
+
+
+def _client(create):
+    return SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+
+
+@pytest.fixture
+def llm_env(tmp_path, monkeypatch):
+    monkeypatch.setenv("LLM_CACHE_PATH", str(tmp_path / "llm.sqlite3"))
+    monkeypatch.setenv("LLM_MAX_RETRIES", "0")
+    reset_response_cache()
+    reset_rate_limits()
+    yield
+    set_cache_mode(None)
+    reset_response_cache()
+    reset_rate_limits()
+
+
+def test_estimate_cost_uses_family_prices_and_cached_discount():
+    assert estimate_cost("gpt-4o-mini-2024-07-18", 1_000_000, 0, 0) == pytest.approx(0.15)
+    assert estimate_cost("gpt-4o", 1_000_000, 1_000_000, 1_000_000) == pytest.approx(1.25 + 10.0)
+    assert estimate_cost("some-local-model", 10, 0, 10) is None
+
+
+def test_calls_are_recorded_per_stage_with_cache_hits_and_errors(llm_env):
+    set_cache_mode(CacheMode.READ_THROUGH)
+    seen = []
+    add_telemetry_sink(seen.append)
+    ok = _client(lambda **_: _completion(1000, 400, 200))
+
+    def fail(**_):
+        raise openai.APIConnectionError(request=None)
+
+    try:
+        with telemetry_scope("test") as records:
+            with llm_stage("agentic5.stage1"):
+                create_chat_completion(model="gpt-4o-mini", messages=MESSAGES, client=ok)
+                create_chat_completion(model="gpt-4o-mini", messages=MESSAGES, client=ok)  # cache hit
+            with llm_stage("agentic5.stage2"), pytest.raises(openai.APIConnectionError):
+                create_chat_completion(model="gpt-4o-mini", messages=[{"role": "user", "content": "x"}], client=_client(fail))
+    finally:
+        remove_telemetry_sink(seen.append)
+
+    assert [r.outcome for r in records] == ["ok", "cache_hit", "error"]
+    assert seen == records
+    first = records[0]
+    assert (first.stage, first.prompt_tokens, first.cached_tokens, first.completion_tokens) == ("agentic5.stage1", 1000, 400, 200)
+    assert first.ttft_ms == first.wall_ms
+    assert first.cost_usd == pytest.approx((600 * 0.15 + 400 * 0.075 + 200 * 0.60) / 1_000_000)
+    assert records[1].cost_usd == 0.0 and records[1].prompt_tokens == 0
+
+    by_stage = rollup(records)
+    assert by_stage["agentic5.stage1"]["calls"] == 2 and by_stage["agentic5.stage1"]["cache_hits"] == 1
+    assert by_stage["agentic5.stage2"]["errors"] == 1
+    assert by_stage["total"]["calls"] == 3
+    assert by_stage["total"]["cost_usd"] == pytest.approx(first.cost_usd, abs=1e-6)
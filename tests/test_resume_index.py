@@ -0,0 +1,120 @@
+import json
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+# Add src to Python path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from webbot import resume_alignment, resume_index
+from webbot.resume_index import VECTORS_FILE, build_resume_index, load_resume_index
+from webbot.user_profiles import UserProfile, UserSecrets
+
+VOCAB = ["python", "backend", "frontend", "react", "sales", "kubernetes"]
+
+
+def _fake_embed(texts, model="test"):
+    _fake_embed.calls += len(texts)
+    rows = []
+    for t in texts:
+        low = t.lower()
+        v = np.array([low.count(w) for w in VOCAB], dtype=np.float32) + 0.01
+        rows.append(v / np.linalg.norm(v))
+    return np.vstack(rows)
+
+
+@pytest.fixture
+def profile(tmp_path, monkeypatch):
+    _fake_embed.calls = 0
+    monkeypatch.setattr(resume_index, "embed_texts", _fake_embed)
+    monkeypatch.setattr(resume_alignment, "embed_texts", _fake_embed)
+    resumes = {
+        "r1": "SUMMARY\nPython backend engineer\n\nEXPERIENCE\nBuilt python backend services on kubernetes",
+        "r2": "SUMMARY\nFrontend engineer\n\nEXPERIENCE\nReact frontend apps and react tooling",
+        "r3": "SUMMARY\nSales lead\n\nEXPERIENCE\nSales sales sales",
+    }
+    items = []
+    for rid, text in resumes.items():
+        p = tmp_path / rid / "resume.txt"
+        p.parent.mkdir()
+        p.write_text(text, encoding="utf-8")
+        items.append({"id": rid, "name": f"[AP] {rid} Resume", "modifiedTime": "t1", "txt_path": str(p)})
+    (tmp_path / "resumes.json").write_text(json.dumps({"resumes": items}), encoding="utf-8")
+    return UserProfile(name="u", path=tmp_path, secrets=UserSecrets())
+
+
+def _touch(profile, rid):
+    idx_path = profile.path / "resumes.json"
+    data = json.loads(idx_path.read_text())
+    for itm in data["resumes"]:
+        if itm["id"] == rid:
+            itm["modifiedTime"] = "t2"
+    idx_path.write_text(json.dumps(data))
+
+
+def test_index_is_reused_until_modified_time_changes(profile):
+    index = build_resume_index(profile)
+    assert (profile.path / VECTORS_FILE).exists()
+    assert [e.id for e in index.entries] == ["r1", "r2", "r3"]
+    first_calls = _fake_embed.calls
+    assert first_calls > 3  # whole documents plus sections
+
+    build_resume_index(profile)
+    assert _fake_embed.calls == first_calls
+
+    _touch(profile, "r2")
+    rebuilt = build_resume_index(profile)
+    r2 = next(e for e in rebuilt.entries if e.id == "r2")
+    assert _fake_embed.calls == first_calls + r2.count
+    assert load_resume_index(profile).is_current(resume_index._read_items(profile), rebuilt.model)
+
+
+def test_empty_resume_text_does_not_invalidate_the_index(profile):
+    (profile.path / "r3" / "resume.txt").write_text("  \n", encoding="utf-8")
+    index = build_resume_index(profile)
+    assert [e.id for e in index.entries] == ["r1", "r2"]
+    assert load_resume_index(profile).is_current(resume_index._read_items(profile), index.model)
+    calls = _fake_embed.calls
+    build_resume_index(profile)
+    assert _fake_embed.calls == calls
+
+    # Once the resume changes it is picked up again
+    (profile.path / "r3" / "resume.txt").write_text("SUMMARY\nSales lead", encoding="utf-8")
+    _touch(profile, "r3")
+    assert [e.id for e in build_resume_index(profile).entries] == ["r1", "r2", "r3"]
+
+
+def test_decisive_margin_skips_llm(profile, monkeypatch):
+    def no_llm(**kwargs):
+        raise AssertionError("LLM should not be called")
+
+    monkeypatch.setattr(resume_alignment, "create_chat_completion", no_llm)
+    result, trace = resume_alignment.select_best_resume_for_job_description(
+        profile=profile, job_description_text="Senior Python backend engineer, kubernetes"
+    )
+    assert result.chosen_resume_id == "r1"
+    assert trace["ranking"][0]["id"] == "r1"
+
+
+def test_close_call_sends_only_top_k(profile, monkeypatch):
+    monkeypatch.setenv("RESUME_SHORTLIST_K", "2")
+    monkeypatch.setenv("RESUME_DECISIVE_MARGIN", "0.99")
+    seen = {}
+
+    def fake_llm(**kwargs):
+        seen["prompt"] = kwargs["messages"][1]["content"]
+        content = json.dumps(
+            {"chosen_resume_id": "r1", "chosen_resume_name": "r1", "confidence_label": "Strong alignment"}
+        )
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+    monkeypatch.setattr(resume_alignment, "create_chat_completion", fake_llm)
+    result, _ = resume_alignment.select_best_resume_for_job_description(
+        profile=profile, job_description_text="Python backend engineer who also knows react frontend"
+    )
+    assert result.chosen_resume_id == "r1"
+    assert "ID: r1" in seen["prompt"] and "ID: r2" in seen["prompt"]
+    assert "ID: r3" not in seen["prompt"]
@@ -0,0 +1,74 @@
+import asyncio
+import sys
+from pathlib import Path
+
+# Repo root on the path so the backend package imports the way the server does
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.backend.services.screencast import RunScreencast, ScreencastStats
+
+
+class FakeSession:
+    def __init__(self):
+        self.handlers = {}
+        self.sent = []
+
+    def on(self, event, handler):
+        self.handlers[event] = handler
+
+    async def send(self, method, params=None):
+        self.sent.append((method, params))
+
+    async def detach(self):
+        self.sent.append(("detach", None))
+
+
+class FakeContext:
+    def __init__(self):
+        self.sessions = []
+
+    async def new_cdp_session(self, page):
+        session = FakeSession()
+        self.sessions.append(session)
+        return session
+
+
+class FakePage:
+    def __init__(self):
+        self.context = FakeContext()
+
+
+def test_screencast_streams_jpeg_frames_and_acks_each_one():
+    frames = []
+    page = FakePage()
+    screencast = RunScreencast(page, lambda data, meta: frames.append(data), quality=50, max_width=800)
+
+    async def scenario():
+        await asyncio.gather(screencast.start(), screencast.start())
+        assert len(page.context.sessions) == 1
+        session = page.context.sessions[0]
+        method, params = session.sent[0]
+        assert method == "Page.startScreencast"
+        assert params["format"] == "jpeg" and params["quality"] == 50 and params["maxWidth"] == 800
+
+        session.handlers["Page.screencastFrame"]({"data": "AAAA", "sessionId": 7, "metadata": {}})
+        await asyncio.sleep(0)
+        assert frames == ["AAAA"]
+        assert ("Page.screencastFrameAck", {"sessionId": 7}) in session.sent
+
+        await screencast.stop()
+        assert not screencast.active
+        assert [m for m, _ in session.sent[-2:]] == ["Page.stopScreencast", "detach"]
+
+    asyncio.run(scenario())
+    assert screencast.summary()["frames"] == 1 and screencast.summary()["bytes"] == 3
+
+
+def test_stats_report_rates_over_the_window():
+    stats = ScreencastStats(window_s=2.0)
+    for i in range(10):
+        stats.record(1000, now=100.0 + i * 0.5)
+    snapshot = stats.snapshot(now=104.5)
+    # Only frames from the last two seconds count towards the rates
+    assert snapshot["frames"] == 10 and snapshot["bytes"] == 10_000
+    assert snapshot["fps"] == 2.5 and snapshot["bytes_per_s"] == 2500.0
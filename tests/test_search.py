@@ -0,0 +1,64 @@
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add src to Python path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from webbot.search import SearchClient, StaticSearchBackend, dedup_urls, normalize_result_url
+
+
+def test_normalize_and_dedup():
+    wrapped = "https://duckduckgo.com/l/?uddg=https%3A%2F%2Fjobs.lever.co%2Facme%2F%3Futm_source%3Dddg&rut=x"
+    assert normalize_result_url(wrapped) == "https://jobs.lever.co/acme"
+    assert normalize_result_url("https://Acme.com/careers/?ref=hn&team=eng#open") == "https://acme.com/careers?team=eng"
+    assert normalize_result_url("mailto:jobs@acme.com") is None
+    assert dedup_urls(["https://acme.com/", "https://acme.com", None, "https://acme.com/jobs"]) == [
+        "https://acme.com",
+        "https://acme.com/jobs",
+    ]
+
+
+def test_queries_run_concurrently_and_are_cached():
+    backend = StaticSearchBackend(
+        {
+            "acme careers": ["https://acme.com/careers/", "https://acme.com/careers"],
+            "acme jobs": ["https://jobs.lever.co/acme?utm_medium=x"],
+        },
+        delay_s=0.2,
+    )
+    client = SearchClient(backend, max_concurrency=4, ttl_s=60)
+    started = time.perf_counter()
+    results = asyncio.run(client.search_many(["acme careers", "acme jobs", "acme unknown"]))
+    assert time.perf_counter() - started < 0.5
+    assert results == {
+        "acme careers": ["https://acme.com/careers"],
+        "acme jobs": ["https://jobs.lever.co/acme"],
+        "acme unknown": [],
+    }
+    asyncio.run(client.search("ACME  careers"))
+    assert client.stats.cache_hits == 1 and len(backend.calls) == 3
+
+
+def test_pool_bound_and_ttl_expiry():
+    backend = StaticSearchBackend({f"q{i}": [f"https://x{i}.com"] for i in range(4)}, delay_s=0.1)
+    client = SearchClient(backend, max_concurrency=1, ttl_s=0.01)
+    started = time.perf_counter()
+    asyncio.run(client.search_many([f"q{i}" for i in range(4)]))
+    assert time.perf_counter() - started >= 0.4  # one at a time
+    time.sleep(0.02)
+    asyncio.run(client.search("q0"))
+    assert client.stats.cache_hits == 0 and backend.calls.count("q0") == 2
+
+
+def test_backend_errors_yield_empty_results():
+    class Broken:
+        name = "broken"
+
+        def search(self, query, limit):
+            raise RuntimeError("rate limited")
+
+    client = SearchClient(Broken())
+    assert asyncio.run(client.search("acme")) == []
+    assert client.stats.errors == 1
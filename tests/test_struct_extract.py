@@ -0,0 +1,91 @@
+import asyncio
+import json
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add src to Python path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import webbot.struct_extract as se
+from webbot.struct_extract import (
+    AIMode,
+    NARROW_TEXT_TOKEN_BUDGET,
+    build_extract_request,
+    heuristic_extract,
+    parse_extract_completion,
+    score_heuristic,
+    weak_fields,
+)
+from webbot.llm.tokens import count_tokens
+
+
+POSTING = """Senior Backend Engineer at Acme Robotics
+Remote (US)
+Location: Austin, Texas
+Responsibilities
+- Build data pipelines
+Requirements
+- 5+ years Python
+- Experience with AWS and Kubernetes
+- Strong SQL skills
+Benefits
+Apply now
+"""
+
+
+def _page(title: str):
+    async def _title():
+        return title
+
+    return SimpleNamespace(title=_title)
+
+
+def _run(text: str, title: str, monkeypatch, reply: dict):
+    sent = []
+
+    async def fake_text(page):
+        return text
+
+    async def fake_completion(**request):
+        sent.append(request)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=json.dumps(reply)))])
+
+    monkeypatch.setattr(se, "extract_visible_text", fake_text)
+    monkeypatch.setattr(se, "acreate_chat_completion", fake_completion)
+    result = asyncio.run(se.parse_job_page(_page(title), mode=AIMode.OPEN_AI))
+    return result, sent
+
+
+def test_well_structured_posting_skips_the_llm(monkeypatch):
+    heur = heuristic_extract(POSTING, "Senior Backend Engineer at Acme Robotics")
+    assert weak_fields(score_heuristic(POSTING, heur, "Senior Backend Engineer at Acme Robotics")) == []
+
+    before = se.get_extract_stats()
+    result, sent = _run(POSTING, "Senior Backend Engineer at Acme Robotics", monkeypatch, {})
+    assert sent == []
+    assert result.company_name == "Acme Robotics" and result.work_mode == "remote"
+    assert se.get_extract_stats()["skipped"] == before["skipped"] + 1
+
+
+def test_weak_fields_get_a_narrowed_call_and_are_merged(monkeypatch):
+    text = POSTING.replace(" at Acme Robotics", "") + ("Filler paragraph about our culture. " * 800)
+    result, sent = _run(text, "Careers", monkeypatch, {"company_name": "Acme Robotics", "title": "ignored"})
+
+    assert len(sent) == 1
+    prompt = sent[0]["messages"][1]["content"]
+    assert prompt.startswith("Fields to extract: company_name")
+    assert count_tokens(prompt) <= NARROW_TEXT_TOKEN_BUDGET + 200
+    # Only the requested field is taken from the model; confident ones stay heuristic
+    assert result.company_name == "Acme Robotics"
+    assert result.title == "Senior Backend Engineer"
+    assert "5+ years Python" in result.requirements
+
+
+def test_full_request_and_parse_are_unchanged_without_fields():
+    heur = heuristic_extract(POSTING, None)
+    request = build_extract_request(POSTING, heur)
+    assert request["max_tokens"] == 800
+    assert "Heuristic candidates" in request["messages"][1]["content"]
+    parsed = parse_extract_completion(json.dumps({"is_job_posting": True, "title": "X"}))
+    assert parsed.title == "X" and parsed.requirements == []